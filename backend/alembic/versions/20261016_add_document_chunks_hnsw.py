@@ -0,0 +1,41 @@
+"""add HNSW index on document_chunks.embedding
+
+Reference chat ranks chunks with `embedding <=> :query ORDER BY ... LIMIT k`
+in SQL instead of loading every chunk into Python.
+
+Revision ID: 20261016_add_document_chunks_hnsw
+Revises: 20261016_add_pdf_link_cache
+Create Date: 2026-10-16
+"""
+from typing import Union
+
+from alembic import op
+
+
+revision: str = "20261016_add_document_chunks_hnsw"
+down_revision: Union[str, None] = "20261016_add_pdf_link_cache"
+branch_labels: Union[str, None] = None
+depends_on: Union[str, None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY so existing chunk tables stay writable while it builds;
+    # that can't run inside the migration transaction
+    with op.get_context().autocommit_block():
+        op.execute('''
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_document_chunks_embedding_hnsw
+            ON document_chunks
+            USING hnsw (embedding vector_cosine_ops)
+            WITH (m = 16, ef_construction = 64)
+        ''')
+        # Scope filters of the nearest-chunk query
+        op.execute('''
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_document_chunks_reference_id
+            ON document_chunks (reference_id)
+        ''')
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_document_chunks_reference_id')
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS idx_document_chunks_embedding_hnsw')
@@ -0,0 +1,72 @@
+"""add generated tsvector columns and GIN indexes for chat retrieval
+
+Keyword retrieval in reference and document chat runs as ts_rank over these
+columns instead of counting terms in Python. The columns are GENERATED
+ALWAYS ... STORED, so Postgres keeps them current on every insert and update.
+
+Revision ID: 20261016_add_fulltext_search
+Revises: 20261016_add_document_chunks_hnsw
+Create Date: 2026-10-16
+"""
+from typing import Union
+
+from alembic import op
+
+
+revision: str = "20261016_add_fulltext_search"
+down_revision: Union[str, None] = "20261016_add_document_chunks_hnsw"
+branch_labels: Union[str, None] = None
+depends_on: Union[str, None] = None
+
+
+def upgrade() -> None:
+    op.execute('''
+        ALTER TABLE document_chunks ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (to_tsvector('english'::regconfig, coalesce(chunk_text, ''))) STORED
+    ''')
+    op.execute('''
+        ALTER TABLE "references" ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A')
+            || setweight(to_tsvector('english'::regconfig, coalesce(abstract, '')), 'B')
+        ) STORED
+    ''')
+    # Document bodies are indexed through their chunks; this covers the
+    # metadata only
+    op.execute('''
+        ALTER TABLE documents ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english'::regconfig, coalesce(title, '') || ' ' || coalesce(original_filename, '')), 'A')
+            || setweight(to_tsvector('english'::regconfig, coalesce(abstract, '')), 'B')
+        ) STORED
+    ''')
+
+    with op.get_context().autocommit_block():
+        op.execute('''
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_document_chunks_search_vector
+            ON document_chunks USING gin (search_vector)
+        ''')
+        op.execute('''
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_references_search_vector
+            ON "references" USING gin (search_vector)
+        ''')
+        op.execute('''
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_documents_search_vector
+            ON documents USING gin (search_vector)
+        ''')
+        # Scope filter of document chat retrieval
+        op.execute('''
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_document_chunks_document_id
+            ON document_chunks (document_id)
+        ''')
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_document_chunks_document_id')
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_documents_search_vector')
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_references_search_vector')
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_document_chunks_search_vector')
+    op.execute('ALTER TABLE documents DROP COLUMN IF EXISTS search_vector')
+    op.execute('ALTER TABLE "references" DROP COLUMN IF EXISTS search_vector')
+    op.execute('ALTER TABLE document_chunks DROP COLUMN IF EXISTS search_vector')
@@ -0,0 +1,41 @@
+"""add paper_doi_metadata cache table
+
+Revision ID: 20261016_add_paper_doi_metadata
+Revises: 20260415_add_paper_abstracts_cache
+Create Date: 2026-10-16
+"""
+from typing import Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20261016_add_paper_doi_metadata"
+down_revision: Union[str, None] = "20260415_add_paper_abstracts_cache"
+branch_labels: Union[str, None] = None
+depends_on: Union[str, None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "paper_doi_metadata",
+        sa.Column("doi", sa.String(255), primary_key=True),
+        # Crossref (journal/year/url immutable; citations refreshed by TTL)
+        sa.Column("journal", sa.Text(), nullable=True),
+        sa.Column("year", sa.Integer(), nullable=True),
+        sa.Column("url", sa.Text(), nullable=True),
+        sa.Column("citations_count", sa.Integer(), nullable=True),
+        sa.Column("crossref_status", sa.String(20), nullable=True),
+        sa.Column("crossref_fetched_at", sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column("citations_fetched_at", sa.TIMESTAMP(timezone=True), nullable=True),
+        # Unpaywall (refreshed by TTL)
+        sa.Column("is_open_access", sa.Boolean(), nullable=True),
+        sa.Column("pdf_url", sa.Text(), nullable=True),
+        sa.Column("landing_url", sa.Text(), nullable=True),
+        sa.Column("unpaywall_status", sa.String(20), nullable=True),
+        sa.Column("unpaywall_fetched_at", sa.TIMESTAMP(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("paper_doi_metadata")
@@ -0,0 +1,34 @@
+"""add pdf_link_cache table
+
+Revision ID: 20261016_add_pdf_link_cache
+Revises: 20261016_add_paper_doi_metadata
+Create Date: 2026-10-16
+"""
+from typing import Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20261016_add_pdf_link_cache"
+down_revision: Union[str, None] = "20261016_add_paper_doi_metadata"
+branch_labels: Union[str, None] = None
+depends_on: Union[str, None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "pdf_link_cache",
+        # sha1 of the URL; URLs can exceed the btree key size
+        sa.Column("url_hash", sa.String(40), primary_key=True),
+        sa.Column("kind", sa.String(10), primary_key=True),  # check | scrape
+        sa.Column("url", sa.Text(), nullable=False),
+        sa.Column("status", sa.String(10), nullable=False),  # ok | dead
+        sa.Column("resolved_url", sa.Text(), nullable=True),
+        sa.Column("failures", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("checked_at", sa.TIMESTAMP(timezone=True), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("pdf_link_cache")
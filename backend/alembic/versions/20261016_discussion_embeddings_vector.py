@@ -0,0 +1,44 @@
+"""store discussion embeddings as pgvector, with an HNSW index
+
+project_discussion_embeddings.embedding was created as JSONB although the
+model declares vector(1536), and nothing wrote the table. Discussion AI now
+indexes channel exchanges, messages and resources there and retrieves the
+nearest ones per turn with `embedding <=> :query ORDER BY ... LIMIT k`.
+
+Revision ID: 20261016_discussion_embeddings_vector
+Revises: 20261016_share_paper_embeddings
+Create Date: 2026-10-16
+"""
+from typing import Union
+
+from alembic import op
+
+
+revision: str = "20261016_discussion_embeddings_vector"
+down_revision: Union[str, None] = "20261016_share_paper_embeddings"
+branch_labels: Union[str, None] = None
+depends_on: Union[str, None] = None
+
+
+def upgrade() -> None:
+    # A JSON array's text form ("[0.1, 0.2]") is valid vector input
+    op.execute('''
+        ALTER TABLE project_discussion_embeddings
+        ALTER COLUMN embedding TYPE vector(1536)
+        USING (embedding::text)::vector(1536)
+    ''')
+    op.execute('''
+        CREATE INDEX IF NOT EXISTS ix_discussion_embeddings_embedding_hnsw
+        ON project_discussion_embeddings
+        USING hnsw (embedding vector_cosine_ops)
+        WITH (m = 16, ef_construction = 64)
+    ''')
+
+
+def downgrade() -> None:
+    op.execute('DROP INDEX IF EXISTS ix_discussion_embeddings_embedding_hnsw')
+    op.execute('''
+        ALTER TABLE project_discussion_embeddings
+        ALTER COLUMN embedding TYPE jsonb
+        USING (embedding::text)::jsonb
+    ''')
@@ -0,0 +1,126 @@
+"""share library paper embeddings across project references
+
+Library embeddings were stored once per project reference, so a paper in 30
+projects had 30 identical vectors. They are now stored once per
+(content_hash, model_name), and project_references.paper_embedding_id points
+at the shared row. Existing duplicates collapse onto the most recently
+updated row of each group.
+
+Revision ID: 20261016_share_paper_embeddings
+Revises: 20261016_add_fulltext_search
+Create Date: 2026-10-16
+"""
+from typing import Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "20261016_share_paper_embeddings"
+down_revision: Union[str, None] = "20261016_add_fulltext_search"
+branch_labels: Union[str, None] = None
+depends_on: Union[str, None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "project_references",
+        sa.Column("paper_embedding_id", postgresql.UUID(as_uuid=True), nullable=True),
+    )
+    op.create_foreign_key(
+        "fk_project_references_paper_embedding_id",
+        "project_references",
+        "paper_embeddings",
+        ["paper_embedding_id"],
+        ["id"],
+        ondelete="SET NULL",
+    )
+
+    # Point every project reference at the surviving row of its group...
+    op.execute('''
+        WITH ranked AS (
+            SELECT
+                id,
+                project_reference_id,
+                first_value(id) OVER (
+                    PARTITION BY content_hash, model_name
+                    ORDER BY updated_at DESC, id
+                ) AS keep_id
+            FROM paper_embeddings
+            WHERE project_reference_id IS NOT NULL
+        )
+        UPDATE project_references pr
+        SET paper_embedding_id = ranked.keep_id
+        FROM ranked
+        WHERE ranked.project_reference_id = pr.id
+    ''')
+    # ...and drop the rest
+    op.execute('''
+        DELETE FROM paper_embeddings pe
+        WHERE pe.project_reference_id IS NOT NULL
+            AND NOT EXISTS (
+                SELECT 1 FROM project_references pr WHERE pr.paper_embedding_id = pe.id
+            )
+    ''')
+
+    op.drop_index("ix_paper_embeddings_reference_unique", table_name="paper_embeddings")
+    # Drops the column's FK and any remaining index with it
+    op.drop_column("paper_embeddings", "project_reference_id")
+
+    op.create_index(
+        "ix_paper_embeddings_content_model",
+        "paper_embeddings",
+        ["content_hash", "model_name"],
+        unique=True,
+        postgresql_where=sa.text("external_paper_id IS NULL"),
+    )
+    op.create_index(
+        "ix_project_references_paper_embedding_id",
+        "project_references",
+        ["paper_embedding_id"],
+    )
+
+
+def downgrade() -> None:
+    op.add_column(
+        "paper_embeddings",
+        sa.Column("project_reference_id", postgresql.UUID(as_uuid=True), nullable=True),
+    )
+    op.create_foreign_key(
+        "paper_embeddings_project_reference_id_fkey",
+        "paper_embeddings",
+        "project_references",
+        ["project_reference_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+    op.drop_index("ix_paper_embeddings_content_model", table_name="paper_embeddings")
+
+    # One copy of the shared vector per linked project reference
+    op.execute('''
+        INSERT INTO paper_embeddings (
+            id, project_reference_id, content_hash, embedded_text, embedding,
+            model_name, model_version, created_at, updated_at
+        )
+        SELECT
+            gen_random_uuid(), pr.id, pe.content_hash, pe.embedded_text, pe.embedding,
+            pe.model_name, pe.model_version, pe.created_at, pe.updated_at
+        FROM project_references pr
+        JOIN paper_embeddings pe ON pe.id = pr.paper_embedding_id
+    ''')
+    op.drop_index("ix_project_references_paper_embedding_id", table_name="project_references")
+    op.drop_constraint("fk_project_references_paper_embedding_id", "project_references", type_="foreignkey")
+    op.drop_column("project_references", "paper_embedding_id")
+    op.execute('''
+        DELETE FROM paper_embeddings
+        WHERE project_reference_id IS NULL AND external_paper_id IS NULL
+    ''')
+
+    op.create_index(
+        "ix_paper_embeddings_reference_unique",
+        "paper_embeddings",
+        ["project_reference_id"],
+        unique=True,
+        postgresql_where=sa.text("project_reference_id IS NOT NULL"),
+    )
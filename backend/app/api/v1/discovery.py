@@ -4,7 +4,7 @@ Paper Discovery API endpoints
 
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
 from sqlalchemy.orm import Session
-from typing import List, Optional, Dict
+from typing import Any, List, Optional, Dict
 from pydantic import BaseModel, Field
 import logging
 import time
@@ -698,7 +698,12 @@ async def discover_papers_stream(
     """
     Stream discovered papers incrementally as they are returned from sources.
     Emits Server-Sent Events (SSE) with events of the form:
+      data: {"type":"partial","stage":"provisional"|"enriched","papers":[...],"total": N,...}\n\n
       data: {"type":"final","papers":[...],"total": N,"search_time": seconds}\n\n
+      data: {"type":"pdf_links","papers":[...],"total": N,"search_time": seconds}\n\n
+    Partial batches are deduped and lexically ranked; the final batch replaces them.
+    PDF links are resolved after the final batch is sent; the pdf_links event
+    carries the same papers with their PDF/open-access fields filled in.
     This endpoint delegates to the orchestrated PaperDiscoveryService to ensure
     consistent source filtering and ranking.
     """
@@ -726,47 +731,63 @@ async def discover_papers_stream(
             logger.info(f"🎯 Discovery stream called with query='{request.query}', research_topic='{request.research_topic}', sources={request.sources}, mode={request.mode}")
             logger.info(f"📋 Sources breakdown: {', '.join(request.sources) if request.sources else 'NO SOURCES'}")
 
+            def _paper_payload(p) -> Dict[str, Any]:
+                return {
+                    'title': p.title,
+                    'authors': p.authors,
+                    'abstract': p.abstract or '',
+                    'year': p.year,
+                    'doi': p.doi,
+                    'url': p.url,
+                    'source': p.source,
+                    'relevance_score': p.relevance_score,
+                    'citations_count': p.citations_count,
+                    'journal': p.journal,
+                    'keywords': p.keywords,
+                    'is_open_access': getattr(p, 'is_open_access', False),
+                    'open_access_url': getattr(p, 'open_access_url', None),
+                    'pdf_url': getattr(p, 'pdf_url', None),
+                }
+
             async with PaperDiscoveryService(is_manual=True) as svc:
-                discovery_result = await svc.discover_papers(
+                # Provisional batches (deduped + lexically ranked) arrive as each
+                # source completes; the final batch is the fully ranked result,
+                # followed by the same papers once PDF links are resolved.
+                async for result_batch in svc.discover_papers_stream(
                     query=effective_query,
                     max_results=request.max_results,
                     target_text=request.paper_text or request.research_topic,
                     sources=request.sources,
                     debug=False # Consider making this configurable
-                )
-                papers = discovery_result.papers if hasattr(discovery_result, 'papers') else discovery_result
-
-                # Stream results as a single batch
-                batch = []
-                for p in papers:
-                    batch.append({
-                        'title': p.title,
-                        'authors': p.authors,
-                        'abstract': p.abstract or '',
-                        'year': p.year,
-                        'doi': p.doi,
-                        'url': p.url,
-                        'source': p.source,
-                        'relevance_score': p.relevance_score,
-                        'citations_count': p.citations_count,
-                        'journal': p.journal,
-                        'keywords': p.keywords,
-                        'is_open_access': getattr(p, 'is_open_access', False),
-                        'open_access_url': getattr(p, 'open_access_url', None),
-                        'pdf_url': getattr(p, 'pdf_url', None),
-                    })
-
-                payload = {'type': 'final', 'papers': batch, 'total': len(batch), 'search_time': time.time() - start_ts}
-                yield f"data: {json.dumps(payload)}\n\n"
-
-                # Increment usage counter after successful discovery (streaming)
-                try:
-                    from app.database import SessionLocal
-                    streaming_db = SessionLocal()
-                    SubscriptionService.increment_usage(streaming_db, current_user.id, "paper_discovery_searches")
-                    streaming_db.close()
-                except Exception as e:
-                    logger.error(f"Failed to increment discovery usage for user {current_user.id}: {e}")
+                ):
+                    batch = [_paper_payload(p) for p in result_batch.papers]
+                    if result_batch.is_final:
+                        payload = {'type': 'final', 'papers': batch, 'total': len(batch), 'search_time': time.time() - start_ts}
+                        yield f"data: {json.dumps(payload)}\n\n"
+
+                        # Increment usage counter after successful discovery (streaming)
+                        try:
+                            from app.database import SessionLocal
+                            streaming_db = SessionLocal()
+                            SubscriptionService.increment_usage(streaming_db, current_user.id, "paper_discovery_searches")
+                            streaming_db.close()
+                        except Exception as e:
+                            logger.error(f"Failed to increment discovery usage for user {current_user.id}: {e}")
+                        continue
+                    if result_batch.stage == "pdf_links":
+                        payload = {'type': 'pdf_links', 'papers': batch, 'total': len(batch), 'search_time': time.time() - start_ts}
+                        yield f"data: {json.dumps(payload)}\n\n"
+                        continue
+                    partial = {
+                        'type': 'partial',
+                        'stage': result_batch.stage,
+                        'papers': batch,
+                        'total': len(batch),
+                        'sources_completed': result_batch.sources_completed,
+                        'sources_total': result_batch.sources_total,
+                        'search_time': time.time() - start_ts,
+                    }
+                    yield f"data: {json.dumps(partial)}\n\n"
 
         except asyncio.TimeoutError:
             yield f"data: {json.dumps({'type': 'done', 'total': 0, 'timeout': True})}\n\n"
@@ -82,3 +82,36 @@ async def reset_discussion_ai_metrics(
         return {"ok": True, "enabled": True}
     except Exception as exc:
         return {"ok": False, "enabled": True, "error": str(exc)}
+
+
+@router.get("/metrics/reranker")
+async def get_reranker_metrics(
+    current_user: User = Depends(get_current_user),
+):
+    """Cross-encoder batching stats (batch-size and queue-depth histograms)
+    and GptRanker token, cache and wall-clock usage."""
+    if not settings.ENABLE_METRICS:
+        return {"ok": True, "enabled": False, "batcher": {}, "gpt_ranker": {}}
+
+    from app.services.paper_discovery.rankers import get_gpt_ranker_stats
+    from app.services.paper_discovery.reranker import get_cross_encoder_batcher
+
+    return {
+        "ok": True,
+        "enabled": True,
+        "batcher": get_cross_encoder_batcher().stats(),
+        "gpt_ranker": get_gpt_ranker_stats().snapshot(),
+    }
+
+
+@router.get("/metrics/http")
+async def get_http_pool_metrics(
+    current_user: User = Depends(get_current_user),
+):
+    """Pooled outbound HTTP session stats: connection reuse and DNS cache hits."""
+    if not settings.ENABLE_METRICS:
+        return {"ok": True, "enabled": False, "http": {}}
+
+    from app.services.http_client import get_http_client_registry
+
+    return {"ok": True, "enabled": True, "http": get_http_client_registry().snapshot()}
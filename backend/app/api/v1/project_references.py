@@ -691,36 +691,42 @@ async def suggest_citations(
         logger.error("Citation suggestion embedding failed: %s", e)
         return {"suggestions": []}
 
-    embedding_str = "[" + ",".join(str(x) for x in query_embedding) + "]"
+    from app.services.vector_search import apply_hnsw_search_hints, to_pgvector_literal
 
+    # KNN first (served by the HNSW index), similarity floor on those rows
     sql = sa_text("""
-        SELECT
-            pr.id as project_reference_id,
-            r.id as reference_id,
-            r.title,
-            r.authors,
-            r.year,
-            1 - (pe.embedding <=> :query_embedding) as similarity
-        FROM paper_embeddings pe
-        JOIN project_references pr ON pe.project_reference_id = pr.id
-        JOIN "references" r ON pr.reference_id = r.id
-        WHERE pr.project_id = :project_id
-            AND pr.status = 'approved'
-            AND 1 - (pe.embedding <=> :query_embedding) > 0.15
-        ORDER BY pe.embedding <=> :query_embedding
-        LIMIT :limit
+        SELECT * FROM (
+            SELECT
+                pr.id as project_reference_id,
+                r.id as reference_id,
+                r.title,
+                r.authors,
+                r.year,
+                1 - (pe.embedding <=> CAST(:query_embedding AS vector)) as similarity
+            FROM paper_embeddings pe
+            JOIN project_references pr ON pr.paper_embedding_id = pe.id
+            JOIN "references" r ON pr.reference_id = r.id
+            WHERE pr.project_id = :project_id
+                AND pr.status = 'approved'
+            ORDER BY pe.embedding <=> CAST(:query_embedding AS vector)
+            LIMIT :limit
+        ) nearest
+        WHERE similarity > 0.15
+        ORDER BY similarity DESC
     """)
 
     try:
-        result = db.execute(
-            sql,
-            {
-                "query_embedding": embedding_str,
-                "project_id": str(project.id),
-                "limit": payload.limit,
-            },
-        )
-        rows = result.fetchall()
+        with db.begin_nested():
+            apply_hnsw_search_hints(db, payload.limit)
+            result = db.execute(
+                sql,
+                {
+                    "query_embedding": to_pgvector_literal(query_embedding),
+                    "project_id": str(project.id),
+                    "limit": payload.limit,
+                },
+            )
+            rows = result.fetchall()
     except Exception as e:
         logger.error("Citation suggestion vector query failed: %s", e)
         return {"suggestions": []}
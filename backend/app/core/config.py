@@ -161,6 +161,115 @@ class Settings(BaseSettings):
     # Metrics / Telemetry
     ENABLE_METRICS: bool = False
 
+    # Embedding cache: in-process LRU budget plus optional Redis tier shared
+    # across uvicorn workers (keyed by model name + content hash)
+    EMBEDDING_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    EMBEDDING_CACHE_REDIS_ENABLED: bool = True
+    EMBEDDING_CACHE_REDIS_TTL_SECONDS: int = 7 * 24 * 3600
+    # "float32" or "float16" (halves memory-tier size; scores shift < 1e-3)
+    EMBEDDING_CACHE_DTYPE: str = "float32"
+
+    # Embedding worker: batched mode claims up to BATCH_SIZE jobs per cycle and
+    # encodes them in CONCURRENCY concurrent embed_batch_array calls. Only
+    # remote providers (OpenAI) overlap those calls; the local model encodes
+    # under one lock per process, so scale it with EMBEDDING_WORKER_PROCS.
+    EMBEDDING_WORKER_BATCHED: bool = True
+    EMBEDDING_WORKER_BATCH_SIZE: int = Field(default=50, ge=1)
+    EMBEDDING_WORKER_CONCURRENCY: int = Field(default=1, ge=1)
+    # Run the worker thread inside each API process. Disable when running the
+    # standalone pool (python -m app.services.embedding_worker --procs N).
+    EMBEDDING_WORKER_IN_PROCESS: bool = True
+    EMBEDDING_WORKER_PROCS: int = Field(default=2, ge=1)
+    # Standalone pool: a crashed process is restarted after BACKOFF seconds,
+    # doubling per consecutive crash up to BACKOFF_MAX. After MAX_RESTARTS
+    # consecutive crashes the pool shuts down and exits with an error. A
+    # process that stays up for BACKOFF_MAX seconds resets its count.
+    EMBEDDING_WORKER_RESTART_BACKOFF_SECONDS: float = Field(default=1.0, gt=0)
+    EMBEDDING_WORKER_RESTART_BACKOFF_MAX_SECONDS: float = Field(default=300.0, gt=0)
+    EMBEDDING_WORKER_MAX_RESTARTS: int = Field(default=10, ge=0)
+    # Library embeddings no project reference links to are kept for re-adds,
+    # then deleted by the worker once not written for this many days
+    EMBEDDING_UNLINKED_TTL_DAYS: int = Field(default=30, ge=1)
+
+    # Per-source discovery result cache (memory LRU + shared Redis tier).
+    # Entries are served as-is while fresh; stale entries are served while a
+    # background refresh runs, until they expire.
+    DISCOVERY_RESULT_CACHE_ENABLED: bool = True
+    DISCOVERY_RESULT_CACHE_REDIS_ENABLED: bool = True
+    DISCOVERY_RESULT_CACHE_MAX_ENTRIES: int = Field(default=2000, ge=1)
+    DISCOVERY_RESULT_CACHE_FRESH_SECONDS: int = Field(default=15 * 60, ge=0)
+    DISCOVERY_RESULT_CACHE_STALE_SECONDS: int = Field(default=24 * 3600, ge=0)
+    # Per-source timeouts from observed p95 latency, circuit breaker after
+    # consecutive timeouts/429s, and hedged duplicate requests at p95
+    DISCOVERY_ADAPTIVE_TIMEOUTS_ENABLED: bool = True
+    DISCOVERY_HEDGING_ENABLED: bool = True
+    DISCOVERY_CIRCUIT_FAILURE_THRESHOLD: int = Field(default=3, ge=1)
+    DISCOVERY_CIRCUIT_COOLDOWN_SECONDS: float = Field(default=60.0, ge=0)
+    # Cross-encoder dynamic batching: pairs from concurrent rerank calls are
+    # coalesced into one predict, flushed at MAX_PAIRS or after WAIT_MS
+    CROSS_ENCODER_BATCH_MAX_PAIRS: int = Field(default=256, ge=1)
+    CROSS_ENCODER_BATCH_WAIT_MS: float = Field(default=10.0, ge=0)
+    # Cross-encoder (query, paper) score cache: memory LRU + shared Redis tier
+    CROSS_ENCODER_SCORE_CACHE_ENABLED: bool = True
+    CROSS_ENCODER_SCORE_CACHE_REDIS_ENABLED: bool = True
+    CROSS_ENCODER_SCORE_CACHE_MAX_ENTRIES: int = Field(default=50_000, ge=1)
+    CROSS_ENCODER_SCORE_CACHE_TTL_SECONDS: int = Field(default=7 * 24 * 3600, ge=1)
+    # GptRanker: candidates are scored in parallel shards of SHARD_SIZE (at
+    # most MAX_PARALLEL in flight); a shard past SHARD_TIMEOUT keeps its
+    # lexical scores. Per (model, project context, paper) scores are cached.
+    GPT_RANKER_SHARD_SIZE: int = Field(default=20, ge=1)
+    GPT_RANKER_MAX_PARALLEL: int = Field(default=4, ge=1)
+    GPT_RANKER_SHARD_TIMEOUT_SECONDS: float = Field(default=25.0, gt=0)
+    GPT_RANKER_SCORE_CACHE_ENABLED: bool = True
+    GPT_RANKER_SCORE_CACHE_REDIS_ENABLED: bool = True
+    GPT_RANKER_SCORE_CACHE_MAX_ENTRIES: int = Field(default=20_000, ge=1)
+    GPT_RANKER_SCORE_CACHE_TTL_SECONDS: int = Field(default=3 * 24 * 3600, ge=1)
+    # Inference backend for the local bi-encoder and cross-encoder: "torch"
+    # (sentence-transformers) or "onnx" (exported on first use, int8-quantized
+    # when ONNX_QUANTIZE, run by onnxruntime with THREADS intra-op threads)
+    INFERENCE_BACKEND: str = "torch"
+    INFERENCE_ONNX_THREADS: int = Field(default=4, ge=1)
+    INFERENCE_ONNX_QUANTIZE: bool = True
+    INFERENCE_ONNX_CACHE_DIR: str = "model_cache/onnx"
+
+    # DOI metadata cache (paper_doi_metadata) for the Crossref/Unpaywall
+    # enrichers. Journal/year/URL never expire; other fields refresh per TTL.
+    DOI_METADATA_CACHE_ENABLED: bool = True
+    DOI_METADATA_CITATIONS_TTL_DAYS: int = Field(default=7, ge=0)
+    DOI_METADATA_OA_TTL_DAYS: int = Field(default=30, ge=0)
+    DOI_METADATA_MISSING_TTL_DAYS: int = Field(default=30, ge=0)
+    # PDF link cache (pdf_link_cache) for PDF augmentation: live links are
+    # reused for OK_TTL_DAYS; dead ones are retried after BACKOFF_HOURS,
+    # doubling per consecutive failure up to DEAD_MAX_DAYS
+    PDF_LINK_CACHE_ENABLED: bool = True
+    PDF_LINK_CACHE_OK_TTL_DAYS: int = Field(default=14, ge=0)
+    PDF_LINK_CACHE_DEAD_BACKOFF_HOURS: float = Field(default=6.0, ge=0)
+    PDF_LINK_CACHE_DEAD_MAX_DAYS: int = Field(default=30, ge=0)
+    # Concurrent PDF probes per host, and how long streamed searches keep
+    # resolving PDF links in the background after the final result
+    PDF_LINK_PER_HOST_CONCURRENCY: int = Field(default=2, ge=1)
+    PDF_LINK_BACKGROUND_DEADLINE_SECONDS: float = Field(default=45.0, gt=0)
+    # Process-wide pooled aiohttp sessions for discovery searchers/enrichers
+    # (per-provider connection limits, keep-alive, DNS cache)
+    HTTP_POOL_ENABLED: bool = True
+    HTTP_POOL_LIMIT: int = Field(default=100, ge=1)
+    HTTP_POOL_KEEPALIVE_SECONDS: float = Field(default=30.0, ge=0)
+    HTTP_DNS_CACHE_SECONDS: int = Field(default=300, ge=0)
+
+    # pgvector HNSW search width (hnsw.ef_search) for scoped top-k queries:
+    # at least EF_SEARCH, and 4x the LIMIT when that is larger
+    VECTOR_SEARCH_EF_SEARCH: int = Field(default=40, ge=1, le=1000)
+
+    # Discussion AI context: each turn sends the last RECENT_MESSAGES messages
+    # verbatim plus up to TOP_K earlier exchanges/messages/resources of the
+    # channel (project_discussion_embeddings) at or above MIN_SIMILARITY,
+    # within TOKEN_BUDGET. Disabled: token-fitted history and summarization.
+    DISCUSSION_RETRIEVAL_ENABLED: bool = True
+    DISCUSSION_RETRIEVAL_RECENT_MESSAGES: int = Field(default=8, ge=0)
+    DISCUSSION_RETRIEVAL_TOP_K: int = Field(default=6, ge=1, le=50)
+    DISCUSSION_RETRIEVAL_TOKEN_BUDGET: int = Field(default=2000, ge=0)
+    DISCUSSION_RETRIEVAL_MIN_SIMILARITY: float = Field(default=0.3, ge=0.0, le=1.0)
+
     # Rate limits
     RATE_LIMIT_BACKEND: str = "100/minute"
 
@@ -25,6 +25,7 @@ from app.services.latex_warmup import warmup_latex_cache
 from app.services.latex_cache_cleanup import start_cache_cleanup_task
 from app.services.project_discovery_scheduler import start_auto_discovery_task
 from app.services.paper_discovery.warmup import warmup_semantic_models
+from app.services.http_client import close_http_client_registry, start_http_client_registry
 try:
     import redis as redis_lib
 except Exception:  # pragma: no cover
@@ -175,6 +176,9 @@ app.include_router(annotations.router, prefix="/api/v1", tags=["annotations"])
 @app.on_event("startup")
 async def startup_warmup_event() -> None:
     """Warm up services on startup (non-blocking)."""
+    # Pooled outbound HTTP sessions (keep-alive + DNS cache) for discovery
+    await start_http_client_registry()
+
     # LaTeX cache warmup (async task)
     if settings.LATEX_WARMUP_ON_STARTUP:
         asyncio.create_task(warmup_latex_cache())
@@ -189,14 +193,16 @@ async def startup_warmup_event() -> None:
     # Project auto discovery scheduler (periodic background task)
     asyncio.create_task(start_auto_discovery_task())
 
-    # Start embedding worker for semantic search (background thread)
-    try:
-        from app.services.embedding_worker import start_embedding_worker
-        start_embedding_worker()
-    except Exception as e:
-        # Don't fail startup if embedding worker fails
-        import logging
-        logging.getLogger(__name__).warning(f"Failed to start embedding worker: {e}")
+    # Start embedding worker for semantic search (background thread), unless
+    # a standalone worker pool owns the embedding_jobs queue
+    if settings.EMBEDDING_WORKER_IN_PROCESS:
+        try:
+            from app.services.embedding_worker import start_embedding_worker
+            start_embedding_worker()
+        except Exception as e:
+            # Don't fail startup if embedding worker fails
+            import logging
+            logging.getLogger(__name__).warning(f"Failed to start embedding worker: {e}")
 
 
 @app.on_event("shutdown")
@@ -207,6 +213,7 @@ async def shutdown_event() -> None:
         stop_embedding_worker()
     except Exception:
         pass
+    await close_http_client_registry()
 
 if __name__ == "__main__":
     import uvicorn
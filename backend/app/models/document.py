@@ -1,7 +1,7 @@
-from sqlalchemy import Column, String, Text, DateTime, Boolean, ForeignKey, Enum, Integer, Float
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, Computed, String, Text, DateTime, Boolean, ForeignKey, Enum, Integer, Float
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 from app.database import Base
 import uuid
 import enum
@@ -47,6 +47,15 @@ class Document(Base):
     publication_year = Column(Integer)
     journal = Column(String(500))
     doi = Column(String(255))
+    # Maintained by Postgres; queried by app.services.hybrid_search
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english'::regconfig, coalesce(title, '') || ' ' || coalesce(original_filename, '')), 'A') "
+            "|| setweight(to_tsvector('english'::regconfig, coalesce(abstract, '')), 'B')",
+            persisted=True,
+        ),
+    ))
     
     # Relationships
     owner_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
@@ -1,6 +1,6 @@
-from sqlalchemy import Column, String, Text, Integer, DateTime, Boolean, ForeignKey, JSON
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Computed, String, Text, Integer, DateTime, Boolean, ForeignKey, JSON
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 from app.database import Base
 import uuid
@@ -24,6 +24,11 @@ class DocumentChunk(Base):
     chunk_index = Column(Integer, nullable=False)
     embedding = Column(VECTOR(1536), nullable=True)
     chunk_metadata = Column(JSON, nullable=True, default={})  # page, section, etc.
+    # Maintained by Postgres; queried by app.services.hybrid_search
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed("to_tsvector('english'::regconfig, coalesce(chunk_text, ''))", persisted=True),
+    ))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
@@ -2,7 +2,8 @@
 Paper Embedding model for semantic search.
 
 Stores embeddings for:
-- Library papers (project_reference_id set)
+- Library papers (shared per content_hash + model; project references link
+  to them via ProjectReference.paper_embedding_id)
 - Search cache papers (external_paper_id set)
 """
 
@@ -40,20 +41,15 @@ class PaperEmbedding(Base):
     Stores paper embeddings for semantic search.
 
     Two use cases:
-    1. Library papers: project_reference_id is set, can find similar in library
+    1. Library papers: external_paper_id is NULL; one row per (content_hash,
+       model_name), shared by every project reference with that content
     2. Search cache: external_paper_id is set, used for search reranking
     """
     __tablename__ = "paper_embeddings"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
-    # Reference - one of these should be set
-    project_reference_id = Column(
-        UUID(as_uuid=True),
-        ForeignKey("project_references.id", ondelete="CASCADE"),
-        nullable=True,
-        index=True
-    )
+    # Set for search cache rows only
     external_paper_id = Column(String(255), nullable=True)
 
     # Content fingerprint
@@ -72,10 +68,10 @@ class PaperEmbedding(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
     # Relationships
-    project_reference = relationship("ProjectReference", back_populates="embedding")
+    project_references = relationship("ProjectReference", back_populates="embedding")
 
     def __repr__(self) -> str:
-        ref = self.project_reference_id or self.external_paper_id
+        ref = self.external_paper_id or self.content_hash[:12]
         return f"<PaperEmbedding(id={self.id}, ref={ref}, model={self.model_name})>"
 
 
@@ -134,6 +130,14 @@ Index(
     postgresql_where=PaperEmbedding.external_paper_id.isnot(None)
 )
 
+Index(
+    "ix_paper_embeddings_content_model",
+    PaperEmbedding.content_hash,
+    PaperEmbedding.model_name,
+    unique=True,
+    postgresql_where=PaperEmbedding.external_paper_id.is_(None)
+)
+
 Index(
     "ix_embedding_jobs_pending",
     EmbeddingJob.status,
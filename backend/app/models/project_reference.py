@@ -68,6 +68,13 @@ class ProjectReference(Base):
         ForeignKey("users.id", ondelete="SET NULL"),
         nullable=True,
     )
+    # Shared library embedding for this reference's content (semantic search)
+    paper_embedding_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("paper_embeddings.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
+    )
     annotations = Column(JSONB, default=dict)
     confidence = Column(Float)
     decided_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
@@ -81,7 +88,7 @@ class ProjectReference(Base):
     added_by = relationship("User", foreign_keys=[added_by_user_id])
     discovery_run = relationship("ProjectDiscoveryRun", back_populates="promoted_references")
     added_via_channel = relationship("ProjectDiscussionChannel", foreign_keys=[added_via_channel_id])
-    embedding = relationship("PaperEmbedding", back_populates="project_reference", uselist=False, cascade="all, delete-orphan")
+    embedding = relationship("PaperEmbedding", back_populates="project_references")
 
     def __repr__(self) -> str:
         return f"<ProjectReference(project_id={self.project_id}, reference_id={self.reference_id}, status={self.status})>"
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, Text, DateTime, Boolean, ForeignKey, Integer, Float
-from sqlalchemy.dialects.postgresql import UUID, ARRAY
+from sqlalchemy import Column, Computed, String, Text, DateTime, Boolean, ForeignKey, Integer, Float
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID, ARRAY
 from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -23,6 +23,15 @@ class Reference(Base):
     entry_type = deferred(Column(String(100)))
     journal = Column(String(500))
     abstract = Column(Text)
+    # Maintained by Postgres; queried by app.services.hybrid_search
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') "
+            "|| setweight(to_tsvector('english'::regconfig, coalesce(abstract, '')), 'B')",
+            persisted=True,
+        ),
+    ))
 
     is_open_access = Column(Boolean, default=False)
     pdf_url = Column(String(1000))
@@ -5,6 +5,7 @@ from typing import List, Dict, Any, Optional
 from sqlalchemy.orm import Session
 
 from app.services.ai_client import AIClient
+from app.services.hybrid_search import ChunkScope, hybrid_chunk_search
 from app.services.writing_tools_service import WritingToolsMixin
 from app.services.reference_chat_service import ReferenceChatMixin
 
@@ -156,24 +157,83 @@ class AIService(AIClient, WritingToolsMixin, ReferenceChatMixin):
             return []
 
     def get_relevant_documents(self, db: Session, query: str, user_id: str, limit: int = 3) -> List[Dict[str, Any]]:
+        """The `limit` processed documents that best match `query`, each with
+        up to three of its best-matching chunks as content.
+
+        Chunks are ranked by hybrid full-text/vector search; documents with no
+        matching chunk fill any remaining slots, newest first, with their
+        opening chunks."""
         try:
+            from sqlalchemy import func
+            from sqlalchemy.orm import defer
             from app.models.document import Document
             from app.models.document_chunk import DocumentChunk
 
-            documents = db.query(Document).filter(
+            chunks_per_doc = 3
+            qemb = None
+            if self.openai_client:
+                try:
+                    qemb = self.openai_client.embeddings.create(
+                        model=self.embedding_model,
+                        input=query
+                    ).data[0].embedding
+                except Exception as e:
+                    logger.warning(f"Query embedding failed, using full-text search only: {e}")
+
+            try:
+                hits = hybrid_chunk_search(
+                    db, ChunkScope.for_documents(owner_id=user_id), query, qemb,
+                    limit=limit * chunks_per_doc,
+                )
+            except Exception as e:
+                logger.warning(f"Hybrid document search failed: {e}")
+                hits = []
+
+            # Matched chunks per document; a document ranks by its best chunk
+            doc_scores: Dict[Any, float] = {}
+            doc_chunks: Dict[Any, List[Any]] = {}
+            if hits:
+                scores = {hit.chunk_id: hit.score for hit in hits}
+                rows = db.query(
+                    DocumentChunk.id, DocumentChunk.document_id, DocumentChunk.chunk_index, DocumentChunk.chunk_text
+                ).filter(DocumentChunk.id.in_(list(scores))).all()
+                for row in rows:
+                    doc_scores[row.document_id] = max(doc_scores.get(row.document_id, 0.0), scores[row.id])
+                    doc_chunks.setdefault(row.document_id, []).append(row)
+            doc_ids = sorted(doc_scores, key=doc_scores.get, reverse=True)[:limit]
+
+            documents_query = db.query(Document).options(defer(Document.extracted_text)).filter(
                 Document.owner_id == user_id,
                 Document.is_processed_for_ai == True
-            ).all()
-
+            )
+            documents = documents_query.filter(Document.id.in_(doc_ids)).all() if doc_ids else []
+            if len(documents) < limit:
+                documents += documents_query.filter(
+                    Document.id.notin_(doc_ids)
+                ).order_by(Document.created_at.desc()).limit(limit - len(documents)).all()
             if not documents:
                 return []
 
+            unmatched = [doc.id for doc in documents if doc.id not in doc_chunks]
+            if unmatched:
+                numbered = db.query(
+                    DocumentChunk.document_id,
+                    DocumentChunk.chunk_index,
+                    DocumentChunk.chunk_text,
+                    func.row_number().over(
+                        partition_by=DocumentChunk.document_id,
+                        order_by=DocumentChunk.chunk_index
+                    ).label('position')
+                ).filter(DocumentChunk.document_id.in_(unmatched)).subquery()
+                for row in db.query(numbered).filter(numbered.c.position <= chunks_per_doc).all():
+                    doc_chunks.setdefault(row.document_id, []).append(row)
+
+            order = {doc_id: i for i, doc_id in enumerate(doc_ids)}
+            documents.sort(key=lambda doc: order.get(doc.id, len(order)))
+
             relevant_docs = []
             for doc in documents:
-                chunks = db.query(DocumentChunk).filter(
-                    DocumentChunk.document_id == doc.id
-                ).order_by(DocumentChunk.chunk_index).limit(3).all()
-
+                chunks = sorted(doc_chunks.get(doc.id, []), key=lambda c: c.chunk_index)[:chunks_per_doc]
                 doc_content = "\n\n".join([chunk.chunk_text for chunk in chunks])
 
                 display_name = doc.title or doc.original_filename
@@ -186,7 +246,7 @@ class AIService(AIClient, WritingToolsMixin, ReferenceChatMixin):
                     'uploaded_at': doc.created_at.isoformat()
                 })
 
-            return relevant_docs[:limit]
+            return relevant_docs
 
         except Exception as e:
             logger.error(f"Error getting relevant documents: {str(e)}")
@@ -0,0 +1,334 @@
+"""Earlier discussion context retrieved from project_discussion_embeddings.
+
+Rather than sending a channel's whole history every turn (and compressing it
+with an extra LLM call once it outgrows the budget), the orchestrator sends
+the last few messages verbatim and adds the earlier items most similar to the
+new message:
+
+  - `pending_items` lists what the channel has that is not indexed yet:
+    completed assistant exchanges, member messages (again when edited) and
+    channel resources, oldest first, at most INDEX_BATCH_SIZE per turn.
+  - The caller embeds the new message and the pending texts in one
+    embeddings request; `store_items` upserts the pending rows by
+    (origin_type, origin_id).
+  - `nearest_items` returns the channel's nearest indexed items (HNSW index
+    on `embedding`); `fit_items_in_budget` keeps as many as fit.
+
+Assistant exchanges and member messages are both stored with origin type
+MESSAGE; their ids never collide. Deleted messages are marked stale and are
+not retrieved.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import uuid
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import and_, func, or_, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.models.project_discussion import (
+    ProjectDiscussionAssistantExchange,
+    ProjectDiscussionChannelResource,
+    ProjectDiscussionMessage,
+)
+from app.models.project_discussion_embedding import (
+    DiscussionEmbeddingOrigin,
+    ProjectDiscussionEmbedding,
+)
+from app.services.discussion_ai.token_utils import count_tokens
+from app.services.vector_search import apply_hnsw_search_hints, to_pgvector_literal
+
+logger = logging.getLogger(__name__)
+
+# Items embedded per turn; a channel's backlog catches up over a few turns
+INDEX_BATCH_SIZE = 64
+# Well inside the embedding model's input limit
+MAX_ITEM_CHARS = 4000
+# Per-item cap when injected into the prompt
+MAX_PROMPT_ITEM_CHARS = 2400
+
+_RESOURCE_FIELDS = ("title", "summary", "authors", "year", "doi", "url")
+
+
+@dataclass
+class DiscussionItem:
+    """A channel exchange, message or resource to index."""
+
+    origin_type: DiscussionEmbeddingOrigin
+    origin_id: uuid.UUID
+    project_id: uuid.UUID
+    text: str
+
+    @property
+    def signature(self) -> str:
+        return hashlib.sha256(self.text.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class RetrievedItem:
+    origin_type: str
+    origin_id: uuid.UUID
+    text: str
+    similarity: float
+
+
+def _clip(value: str) -> str:
+    value = value.strip()
+    return value if len(value) <= MAX_ITEM_CHARS else value[:MAX_ITEM_CHARS].rstrip() + "…"
+
+
+def exchange_text(question: str, response: Optional[Dict[str, Any]]) -> str:
+    answer = (response or {}).get("message") or ""
+    return _clip(f"User: {question.strip()}\nAssistant: {answer.strip()}")
+
+
+def message_text(content: str) -> str:
+    return _clip(f"Channel message: {content.strip()}")
+
+
+def resource_text(
+    resource_type: str,
+    details: Optional[Dict[str, Any]],
+    external_url: Optional[str] = None,
+    tag: Optional[str] = None,
+) -> str:
+    details = details or {}
+    parts = []
+    for key in _RESOURCE_FIELDS:
+        value = details.get(key)
+        if not value:
+            continue
+        if isinstance(value, (list, tuple)):
+            value = ", ".join(str(v) for v in value)
+        parts.append(f"{key}: {value}")
+    for label, value in (("url", external_url), ("tag", tag)):
+        if value and f"{label}: {value}" not in parts:
+            parts.append(f"{label}: {value}")
+    return _clip(f"Channel resource ({resource_type}): " + "; ".join(parts))
+
+
+def _embedding_of(origin_type: DiscussionEmbeddingOrigin, origin_id_column) -> Any:
+    """Outer-join condition matching a source row to its embedding, if any."""
+    return and_(
+        ProjectDiscussionEmbedding.origin_type == origin_type,
+        ProjectDiscussionEmbedding.origin_id == origin_id_column,
+    )
+
+
+def pending_items(
+    db: Session,
+    channel_id: uuid.UUID,
+    project_id: uuid.UUID,
+    limit: int = INDEX_BATCH_SIZE,
+) -> List[DiscussionItem]:
+    """Channel items with no embedding yet (or an outdated one), oldest first."""
+    Exchange = ProjectDiscussionAssistantExchange
+    Message = ProjectDiscussionMessage
+    Resource = ProjectDiscussionChannelResource
+    Embedding = ProjectDiscussionEmbedding
+
+    items: List[DiscussionItem] = []
+
+    exchanges = (
+        db.query(Exchange.id, Exchange.question, Exchange.response)
+        .outerjoin(Embedding, _embedding_of(DiscussionEmbeddingOrigin.MESSAGE, Exchange.id))
+        .filter(
+            Exchange.channel_id == channel_id,
+            Exchange.status == "completed",
+            Embedding.id.is_(None),
+        )
+        .order_by(Exchange.created_at)
+        .limit(limit)
+        .all()
+    )
+    for exchange_id, question, response in exchanges:
+        if (response or {}).get("message"):
+            items.append(DiscussionItem(
+                DiscussionEmbeddingOrigin.MESSAGE, exchange_id, project_id, exchange_text(question, response),
+            ))
+
+    remaining = limit - len(items)
+    if remaining > 0:
+        messages = (
+            db.query(Message.id, Message.content)
+            .outerjoin(Embedding, _embedding_of(DiscussionEmbeddingOrigin.MESSAGE, Message.id))
+            .filter(
+                Message.channel_id == channel_id,
+                Message.is_deleted.is_not(True),
+                or_(Embedding.id.is_(None), Message.updated_at > Embedding.updated_at),
+            )
+            .order_by(Message.created_at)
+            .limit(remaining)
+            .all()
+        )
+        items.extend(
+            DiscussionItem(DiscussionEmbeddingOrigin.MESSAGE, message_id, project_id, message_text(content))
+            for message_id, content in messages
+            if content and content.strip()
+        )
+
+    remaining = limit - len(items)
+    if remaining > 0:
+        resources = (
+            db.query(Resource.id, Resource.resource_type, Resource.details, Resource.external_url, Resource.tag)
+            .outerjoin(Embedding, _embedding_of(DiscussionEmbeddingOrigin.RESOURCE, Resource.id))
+            .filter(Resource.channel_id == channel_id, Embedding.id.is_(None))
+            .order_by(Resource.created_at)
+            .limit(remaining)
+            .all()
+        )
+        items.extend(
+            DiscussionItem(
+                DiscussionEmbeddingOrigin.RESOURCE,
+                resource_id,
+                project_id,
+                resource_text(resource_type, details, external_url, tag),
+            )
+            for resource_id, resource_type, details, external_url, tag in resources
+        )
+
+    return items
+
+
+def mark_deleted_messages_stale(db: Session, channel_id: uuid.UUID) -> None:
+    deleted_ids = (
+        db.query(ProjectDiscussionMessage.id)
+        .filter(
+            ProjectDiscussionMessage.channel_id == channel_id,
+            ProjectDiscussionMessage.is_deleted.is_(True),
+        )
+    )
+    db.execute(
+        update(ProjectDiscussionEmbedding)
+        .where(
+            ProjectDiscussionEmbedding.channel_id == channel_id,
+            ProjectDiscussionEmbedding.stale.is_(False),
+            ProjectDiscussionEmbedding.origin_id.in_(deleted_ids.scalar_subquery()),
+        )
+        .values(stale=True)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def store_items(
+    db: Session,
+    channel_id: uuid.UUID,
+    items: Sequence[DiscussionItem],
+    embeddings: Sequence[Sequence[float]],
+) -> None:
+    """Upsert embeddings for `items` (same order as `embeddings`)."""
+    if not items:
+        return
+    values = [
+        {
+            "project_id": item.project_id,
+            "channel_id": channel_id,
+            "origin_type": item.origin_type,
+            "origin_id": item.origin_id,
+            "text": item.text,
+            "text_signature": item.signature,
+            # pgvector boundary: write plain floats
+            "embedding": [float(x) for x in embedding],
+            "stale": False,
+        }
+        for item, embedding in zip(items, embeddings)
+    ]
+    insert_stmt = pg_insert(ProjectDiscussionEmbedding).values(values)
+    db.execute(insert_stmt.on_conflict_do_update(
+        constraint="uq_discussion_embedding_origin",
+        set_={
+            "text": insert_stmt.excluded.text,
+            "text_signature": insert_stmt.excluded.text_signature,
+            "embedding": insert_stmt.excluded.embedding,
+            "stale": False,
+            "updated_at": func.now(),
+        },
+    ))
+
+
+def nearest_items(
+    db: Session,
+    channel_id: uuid.UUID,
+    query_embedding: Sequence[float],
+    limit: int,
+    min_similarity: float,
+) -> List[RetrievedItem]:
+    """The channel's `limit` nearest indexed items above `min_similarity`, best first."""
+    apply_hnsw_search_hints(db, limit)
+    rows = db.execute(
+        text("""
+            SELECT origin_type, origin_id, text, similarity
+            FROM (
+                SELECT
+                    e.origin_type,
+                    e.origin_id,
+                    e.text,
+                    1 - (e.embedding <=> CAST(:query_embedding AS vector)) AS similarity
+                FROM project_discussion_embeddings e
+                WHERE e.channel_id = :channel_id AND NOT e.stale
+                ORDER BY e.embedding <=> CAST(:query_embedding AS vector)
+                LIMIT :limit
+            ) nearest
+            WHERE similarity >= :min_similarity
+            ORDER BY similarity DESC
+        """),
+        {
+            "query_embedding": to_pgvector_literal(query_embedding),
+            "channel_id": str(channel_id),
+            "limit": limit,
+            "min_similarity": min_similarity,
+        },
+    ).fetchall()
+    return [
+        RetrievedItem(
+            origin_type=str(origin_type),
+            origin_id=origin_id if isinstance(origin_id, uuid.UUID) else uuid.UUID(str(origin_id)),
+            text=item_text,
+            similarity=float(similarity),
+        )
+        for origin_type, origin_id, item_text, similarity in rows
+    ]
+
+
+def fit_items_in_budget(
+    items: Iterable[RetrievedItem],
+    budget: int,
+    model: str,
+    recent_user_messages: Iterable[str] = (),
+) -> List[RetrievedItem]:
+    """Best-first items that fit `budget` tokens, each clipped to MAX_PROMPT_ITEM_CHARS.
+
+    Exchanges whose question is one of `recent_user_messages` are skipped;
+    they are in the prompt verbatim already."""
+    recent_prefixes = tuple(
+        f"User: {content.strip()}\n" for content in recent_user_messages if content and content.strip()
+    )
+    fitted: List[RetrievedItem] = []
+    used = 0
+    for item in items:
+        if recent_prefixes and item.text.startswith(recent_prefixes):
+            continue
+        if len(item.text) > MAX_PROMPT_ITEM_CHARS:
+            item = replace(item, text=item.text[:MAX_PROMPT_ITEM_CHARS].rstrip() + "…")
+        tokens = count_tokens(item.text, model)
+        if used + tokens > budget:
+            break
+        fitted.append(item)
+        used += tokens
+    return fitted
+
+
+def format_items(items: Sequence[RetrievedItem]) -> str:
+    lines = [
+        "## RELEVANT EARLIER DISCUSSION",
+        "Earlier items from this channel that relate to the new message, most relevant first. "
+        "They may be out of date; the recent messages take precedence.",
+    ]
+    for item in items:
+        lines.append(f"\n---\n{item.text}")
+    return "\n".join(lines)
@@ -14,6 +14,7 @@ from typing import Any, Dict, List, Optional, TYPE_CHECKING
 
 from sqlalchemy.orm.attributes import flag_modified
 
+from app.core.config import settings
 from app.services.discussion_ai.utils import sanitize_for_context
 
 if TYPE_CHECKING:
@@ -130,6 +131,105 @@ class MemoryMixin:
 
         return None, None
 
+    def _get_embedding_client(self) -> tuple:
+        """Return (client, model) for 1536-dim text embeddings, same preference as above."""
+        or_client = getattr(self, "openrouter_client", None)
+        if or_client:
+            return or_client, "openai/text-embedding-3-small"
+
+        client = getattr(self.ai_service, "openai_client", None)
+        if client:
+            return client, "text-embedding-3-small"
+
+        return None, None
+
+    def _uses_retrieval_context(self) -> bool:
+        """Whether earlier context comes from project_discussion_embeddings this turn."""
+        if not settings.DISCUSSION_RETRIEVAL_ENABLED:
+            return False
+        client, _ = self._get_embedding_client()
+        return client is not None
+
+    def _retrieve_turn_context(
+        self,
+        channel: "ProjectDiscussionChannel",
+        message: str,
+        conversation_history: Optional[List[Dict[str, str]]],
+    ) -> Optional[str]:
+        """Retrieved earlier context for this turn, None when retrieval is off or failed.
+
+        Blocking (embeddings request and DB work); async callers run it with
+        asyncio.to_thread and hand the result to _build_messages via ctx.
+        """
+        if not self._uses_retrieval_context():
+            return None
+        recent_size = settings.DISCUSSION_RETRIEVAL_RECENT_MESSAGES
+        recent = (conversation_history or [])[-recent_size:] if recent_size else []
+        return self._retrieve_discussion_context(
+            channel,
+            message,
+            [m["content"] for m in recent if m.get("role") == "user"],
+        )
+
+    def _retrieve_discussion_context(
+        self,
+        channel: "ProjectDiscussionChannel",
+        message: str,
+        recent_user_messages: List[str],
+    ) -> Optional[str]:
+        """Index the channel's new items, then return its earlier items relevant to `message`.
+
+        The new message and the unindexed items are embedded in one request.
+        Returns None when retrieval is unavailable (callers fall back to the
+        full history window), "" when nothing relevant was found.
+        """
+        from app.database import SessionLocal
+        from app.services.discussion_ai import context_retrieval
+
+        client, model = self._get_embedding_client()
+        if not client:
+            return None
+
+        # Own session: like _save_ai_memory, this may run off the request thread
+        db = SessionLocal()
+        try:
+            pending = context_retrieval.pending_items(db, channel.id, channel.project_id)
+            response = client.embeddings.create(
+                model=model,
+                input=[message] + [item.text for item in pending],
+            )
+            vectors = [d.embedding for d in sorted(response.data, key=lambda d: d.index)]
+            query_embedding, item_embeddings = vectors[0], vectors[1:]
+
+            context_retrieval.mark_deleted_messages_stale(db, channel.id)
+            context_retrieval.store_items(db, channel.id, pending, item_embeddings)
+            db.commit()
+            if pending:
+                logger.info(f"[RetrievalContext] Indexed {len(pending)} items for channel {channel.id}")
+
+            hits = context_retrieval.nearest_items(
+                db,
+                channel.id,
+                query_embedding,
+                limit=settings.DISCUSSION_RETRIEVAL_TOP_K,
+                min_similarity=settings.DISCUSSION_RETRIEVAL_MIN_SIMILARITY,
+            )
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Discussion context retrieval failed: {e}")
+            return None
+        finally:
+            db.close()
+
+        fitted = context_retrieval.fit_items_in_budget(
+            hits,
+            budget=settings.DISCUSSION_RETRIEVAL_TOKEN_BUDGET,
+            model=self.model,
+            recent_user_messages=recent_user_messages,
+        )
+        logger.debug(f"[RetrievalContext] {len(fitted)}/{len(hits)} retrieved items fit the budget")
+        return context_retrieval.format_items(fitted) if fitted else ""
+
     def _refresh_focused_papers_with_library_data(
         self, focused_papers: List[Dict], project: "Project"
     ) -> List[Dict]:
@@ -844,11 +944,17 @@ Return ONLY valid JSON, no explanation:"""
         ai_response: str,
         conversation_history: List[Dict[str, str]],
         user_id: Optional[Any] = None,
+        retrieval_used: bool = False,
     ) -> Optional[str]:
         """
         Update AI memory after an exchange. Called after each successful response.
         Handles summarization, fact extraction, quote preservation, and pruning.
 
+        `retrieval_used` says whether this turn's prompt got its earlier context
+        from project_discussion_embeddings. If it didn't (retrieval disabled or
+        failed), the prompt fell back to the sliding window and the summary is
+        kept up to date as before.
+
         Returns: Optional contradiction warning if detected.
         """
         memory = self._get_ai_memory(channel)
@@ -882,10 +988,12 @@ Return ONLY valid JSON, no explanation:"""
                 logger.info(f"[Memory] Direct topic extraction: {direct_topic[:80]}")
 
         # Check if we need to summarize (conversation exceeds token budget)
-        # Use token-based check instead of message count
+        # Use token-based check instead of message count. Not needed when
+        # this turn's earlier context was retrieved from project_discussion_embeddings.
         from app.services.discussion_ai.token_utils import count_messages_tokens, should_summarize
 
-        if should_summarize(conversation_history, self.model):
+        summarize = not retrieval_used
+        if summarize and should_summarize(conversation_history, self.model):
             # Get messages that exceed budget for summarization
             # Keep the newest messages that fit in budget, summarize the rest
             total_tokens = count_messages_tokens(conversation_history, self.model)
@@ -903,7 +1011,7 @@ Return ONLY valid JSON, no explanation:"""
         # Incremental summary for short sessions (no token overflow yet)
         # Count exchanges: history user messages + current exchange (not yet in history)
         exchange_count = sum(1 for m in conversation_history if m.get("role") == "user") + 1
-        if not memory.get("summary") and exchange_count >= 6:
+        if summarize and not memory.get("summary") and exchange_count >= 6:
             memory["summary"] = self._summarize_old_messages(
                 conversation_history,
                 None,
@@ -545,6 +545,19 @@ Respond ONLY with valid JSON, no markdown or explanation."""
                     if message:
                         _emit_progress(ctx, str(message))
 
+            shown_top_titles: set = set()
+
+            def _batch_progress(batch):
+                # Provisional batches arrive as each source completes; surface
+                # the current best match so the first result shows in ~1-2s
+                # rather than after the slowest source and the reranker.
+                if batch.is_final or not batch.papers:
+                    return
+                title = (batch.papers[0].title or "").strip()
+                if title and title not in shown_top_titles:
+                    shown_top_titles.add(title)
+                    _emit_progress(ctx, f"Top match so far: {title[:80]}")
+
             async def _run_search():
                 discovery_service = PaperDiscoveryService()
                 try:
@@ -557,6 +570,7 @@ Respond ONLY with valid JSON, no markdown or explanation."""
                         year_to=year_to,
                         open_access_only=open_access_only,
                         progress_callback=_source_progress,
+                        batch_callback=_batch_progress,
                     )
                 finally:
                     await discovery_service.close()
@@ -1458,20 +1472,23 @@ Respond ONLY with valid JSON, no markdown or explanation."""
         Uses embeddings to find papers that match the query conceptually,
         not just by keyword overlap.
         """
-        from app.models import ProjectReference, Reference, PaperEmbedding
+        from app.models import ProjectReference, Reference
 
         count = count if count is not None else limit
         project = ctx["project"]
 
-        # Check if we have any embeddings for this project's papers
-        embeddings_count = (
-            self.db.query(PaperEmbedding)
-            .join(ProjectReference, PaperEmbedding.project_reference_id == ProjectReference.id)
-            .filter(ProjectReference.project_id == project.id)
-            .count()
-        )
+        # Check if we have any embeddings for this project's papers (EXISTS
+        # stops at the first row; a count() would visit all of them)
+        has_embeddings = self.db.query(
+            self.db.query(ProjectReference.id)
+            .filter(
+                ProjectReference.project_id == project.id,
+                ProjectReference.paper_embedding_id.isnot(None),
+            )
+            .exists()
+        ).scalar()
 
-        if embeddings_count == 0:
+        if not has_embeddings:
             # Check how many papers are in the library
             library_count = (
                 self.db.query(ProjectReference)
@@ -1514,43 +1531,50 @@ Respond ONLY with valid JSON, no markdown or explanation."""
         # Query pgvector for similar papers
         # Note: This requires raw SQL for the vector similarity operator
         from sqlalchemy import text
+        from app.services.vector_search import apply_hnsw_search_hints, to_pgvector_literal
 
-        # pgvector cosine distance: 1 - (embedding <=> query_embedding) = similarity
+        # pgvector cosine distance: 1 - (embedding <=> query_embedding) = similarity.
+        # The inner query is a plain KNN (ORDER BY distance LIMIT k) so the HNSW
+        # index serves it; the similarity threshold applies to those k rows.
         sql = text("""
-            SELECT
-                pe.project_reference_id,
-                r.title,
-                r.authors,
-                r.year,
-                r.doi,
-                r.abstract,
-                r.journal,
-                r.pdf_url,
-                r.is_open_access,
-                1 - (pe.embedding <=> :query_embedding) as similarity
-            FROM paper_embeddings pe
-            JOIN project_references pr ON pe.project_reference_id = pr.id
-            JOIN "references" r ON pr.reference_id = r.id
-            WHERE pr.project_id = :project_id
-                AND 1 - (pe.embedding <=> :query_embedding) > :threshold
-            ORDER BY pe.embedding <=> :query_embedding
-            LIMIT :limit
+            SELECT * FROM (
+                SELECT
+                    pr.id AS project_reference_id,
+                    r.title,
+                    r.authors,
+                    r.year,
+                    r.doi,
+                    r.abstract,
+                    r.journal,
+                    r.pdf_url,
+                    r.is_open_access,
+                    1 - (pe.embedding <=> CAST(:query_embedding AS vector)) as similarity
+                FROM paper_embeddings pe
+                JOIN project_references pr ON pr.paper_embedding_id = pe.id
+                JOIN "references" r ON pr.reference_id = r.id
+                WHERE pr.project_id = :project_id
+                ORDER BY pe.embedding <=> CAST(:query_embedding AS vector)
+                LIMIT :limit
+            ) nearest
+            WHERE similarity > :threshold
+            ORDER BY similarity DESC
         """)
 
         try:
-            # Convert embedding to pgvector format
-            embedding_str = "[" + ",".join(str(x) for x in query_embedding) + "]"
-
-            result = self.db.execute(
-                sql,
-                {
-                    "query_embedding": embedding_str,
-                    "project_id": str(project.id),
-                    "threshold": similarity_threshold,
-                    "limit": count,
-                }
-            )
-            rows = result.fetchall()
+            # Savepoint: the hints are SET LOCAL, and a failed query must not
+            # abort the session's transaction
+            with self.db.begin_nested():
+                apply_hnsw_search_hints(self.db, count)
+                result = self.db.execute(
+                    sql,
+                    {
+                        "query_embedding": to_pgvector_literal(query_embedding),
+                        "project_id": str(project.id),
+                        "threshold": similarity_threshold,
+                        "limit": count,
+                    }
+                )
+                rows = result.fetchall()
 
         except Exception as e:
             logger.error(f"[SemanticSearch] Vector query failed: {e}")
@@ -1220,6 +1220,7 @@ class OpenRouterOrchestrator(ToolOrchestrator):
                 final_message,
                 ctx.get("conversation_history", []),
                 getattr(ctx.get("current_user"), "id", None),
+                retrieval_used=ctx.get("retrieval_context_used", False),
             )
             if contradiction_warning:
                 logger.info(f"Contradiction detected: {contradiction_warning}")
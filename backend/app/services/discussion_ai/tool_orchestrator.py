@@ -7,6 +7,7 @@ Instead of hardcoding what data each skill uses, the AI calls tools on-demand.
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import re
@@ -351,6 +352,12 @@ class ToolOrchestrator(MemoryMixin, SearchToolsMixin, LibraryToolsMixin, Analysi
 
             # Paper chat: no tools, no route classification — just answer from the paper context
             is_paper_chat = getattr(channel, 'is_paper_chat', False)
+            if is_paper_chat or route_decision.route != "lite":
+                # Embeddings request + DB work: keep it off the event loop
+                ctx["retrieved_context"] = await asyncio.to_thread(
+                    self._retrieve_turn_context, channel, message, conversation_history,
+                )
+
             if is_paper_chat:
                 messages = self._build_messages(project, channel, message, recent_search_results, conversation_history, ctx=ctx)
                 ctx["paper_chat"] = True
@@ -545,6 +552,23 @@ Never claim to create, update, or modify project/library content for a viewer.
 If asked to perform write actions, explain that editor/admin access is required."""
             messages.append({"role": "system", "content": viewer_notice})
 
+        # Earlier context: the channel's past items most relevant to this
+        # message, plus a short verbatim window instead of the long history
+        # (prefetched off the event loop by handle_message_streaming)
+        window_size = self.SLIDING_WINDOW_SIZE
+        if ctx is not None and "retrieved_context" in ctx:
+            retrieved = ctx["retrieved_context"]
+        else:
+            retrieved = self._retrieve_turn_context(channel, message, conversation_history)
+        retrieval_used = retrieved is not None
+        if retrieval_used:
+            window_size = settings.DISCUSSION_RETRIEVAL_RECENT_MESSAGES
+            if retrieved:
+                messages.append({"role": "system", "content": retrieved})
+        if ctx is not None:
+            # Memory update skips summarization only if retrieval worked this turn
+            ctx["retrieval_context_used"] = retrieval_used
+
         # Calculate tokens used by system messages
         system_tokens = sum(count_message_tokens(m, self.model) for m in messages)
         user_message_tokens = count_tokens(message, self.model) + 4  # +4 for message overhead
@@ -565,10 +589,10 @@ If asked to perform write actions, explain that editor/admin access is required.
             # Cap at our explicit budget to prevent runaway context
             history_budget = min(available_for_history, self.CONVERSATION_HISTORY_TOKEN_BUDGET)
 
-            # Apply count-based cap first (SLIDING_WINDOW_SIZE), then fit by tokens
+            # Apply count-based cap first (window_size), then fit by tokens
             capped_history = conversation_history
-            if len(capped_history) > self.SLIDING_WINDOW_SIZE:
-                capped_history = capped_history[-self.SLIDING_WINDOW_SIZE:]
+            if len(capped_history) > window_size:
+                capped_history = capped_history[-window_size:] if window_size else []
 
             # Fit messages within budget (keeping newest)
             fitted_messages, tokens_used = fit_messages_in_budget(
@@ -852,6 +876,7 @@ If asked to perform write actions, explain that editor/admin access is required.
                     final_message,
                     ctx.get("conversation_history", []),
                     user_id=getattr(ctx.get("current_user"), "id", None),
+                    retrieval_used=ctx.get("retrieval_context_used", False),
                 )
                 if contradiction_warning:
                     logger.info(f"Contradiction detected: {contradiction_warning}")
@@ -0,0 +1,231 @@
+"""
+Two-tier cache for embedding vectors.
+
+Tier 1: in-process LRU bounded by a memory budget (bytes, not entry count).
+Tier 2: optional Redis tier shared by every uvicorn worker and the embedding
+worker, keyed by model name + content hash.
+
+Both tiers are looked up in bulk so `EmbeddingService.embed` and
+`EmbeddingService.embed_batch` share identical caching semantics. Redis calls
+are blocking and run in a worker thread, off the event loop.
+
+Vectors are held as numpy arrays. The memory tier can store float16
+(`EMBEDDING_CACHE_DTYPE`) to halve its footprint; Redis always holds float32.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# Redis key prefix (model name and content hash are appended)
+EMBEDDING_CACHE_PREFIX = "embedding:v1:"
+
+def _entry_size(vector: Sequence[float]) -> int:
+    """Approximate resident size of a cached vector in bytes."""
+    nbytes = getattr(vector, "nbytes", None)
+    if nbytes is not None:
+        return int(nbytes)
+    # list[float]: list header + one pointer and one PyFloat per element
+    return sys.getsizeof(vector) + 24 * len(vector)
+
+
+@dataclass
+class EmbeddingCacheStats:
+    """Counters exposed for telemetry and tests."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    redis_hits: int = 0
+    redis_errors: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "redis_hits": self.redis_hits,
+            "redis_errors": self.redis_errors,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+class MemoryEmbeddingCache:
+    """Thread-safe LRU cache bounded by total vector size in bytes."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self._entries: OrderedDict[str, Sequence[float]] = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._max_bytes = max_bytes
+        self._current_bytes = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def current_bytes(self) -> int:
+        return self._current_bytes
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Sequence[float]]:
+        found: Dict[str, Sequence[float]] = {}
+        with self._lock:
+            for key in keys:
+                vector = self._entries.get(key)
+                if vector is not None:
+                    self._entries.move_to_end(key)
+                    found[key] = vector
+        return found
+
+    def put_many(self, items: Dict[str, Sequence[float]]) -> None:
+        with self._lock:
+            for key, vector in items.items():
+                size = _entry_size(vector)
+                if size > self._max_bytes:
+                    continue
+                if key in self._entries:
+                    self._current_bytes -= self._sizes[key]
+                    self._entries.move_to_end(key)
+                self._entries[key] = vector
+                self._sizes[key] = size
+                self._current_bytes += size
+                while self._current_bytes > self._max_bytes and self._entries:
+                    oldest, _ = self._entries.popitem(last=False)
+                    self._current_bytes -= self._sizes.pop(oldest)
+                    self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._current_bytes = 0
+
+
+class RedisEmbeddingCache:
+    """Shared tier storing float32 vectors as raw bytes with a TTL."""
+
+    def __init__(self, ttl_seconds: int) -> None:
+        self._ttl = ttl_seconds
+
+    @staticmethod
+    def _redis_key(key: str) -> str:
+        return f"{EMBEDDING_CACHE_PREFIX}{key}"
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        client = get_redis_client()
+        if client is None or not keys:
+            return {}
+        raw_values = client.mget([self._redis_key(k) for k in keys])
+        found: Dict[str, np.ndarray] = {}
+        for key, raw in zip(keys, raw_values):
+            if raw:
+                found[key] = np.frombuffer(raw, dtype=np.float32)
+        return found
+
+    def put_many(self, items: Dict[str, Sequence[float]]) -> None:
+        client = get_redis_client()
+        if client is None or not items:
+            return
+        pipe = client.pipeline(transaction=False)
+        for key, vector in items.items():
+            payload = np.asarray(vector, dtype=np.float32).tobytes()
+            pipe.setex(self._redis_key(key), self._ttl, payload)
+        pipe.execute()
+
+
+@dataclass
+class EmbeddingCache:
+    """Memory LRU in front of an optional shared Redis tier."""
+
+    memory: MemoryEmbeddingCache
+    redis: Optional[RedisEmbeddingCache] = None
+    dtype: np.dtype = np.dtype(np.float32)
+    stats: EmbeddingCacheStats = field(default_factory=EmbeddingCacheStats)
+
+    @staticmethod
+    def make_key(model_name: str, content_hash: str) -> str:
+        return f"{model_name}:{content_hash}"
+
+    async def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Look up keys in memory, then Redis; Redis hits are promoted to memory."""
+        found = self.memory.get_many(keys)
+        missing = [k for k in keys if k not in found]
+
+        if missing and self.redis is not None:
+            try:
+                remote = await asyncio.to_thread(self.redis.get_many, missing)
+            except Exception as exc:
+                self.stats.redis_errors += 1
+                logger.debug("[EmbeddingCache] Redis lookup failed: %s", exc)
+                remote = {}
+            if remote:
+                self.stats.redis_hits += len(remote)
+                self.memory.put_many(self._to_storage(remote))
+                found.update(remote)
+
+        self.stats.hits += len(found)
+        self.stats.misses += len(keys) - len(found)
+        self.stats.evictions = self.memory.evictions
+        return found
+
+    def _to_storage(self, items: Dict[str, Sequence[float]]) -> Dict[str, np.ndarray]:
+        # Copy so cached rows never pin the caller's whole batch matrix
+        return {k: np.array(v, dtype=self.dtype) for k, v in items.items()}
+
+    async def put_many(self, items: Dict[str, Sequence[float]]) -> None:
+        if not items:
+            return
+        self.memory.put_many(self._to_storage(items))
+        self.stats.evictions = self.memory.evictions
+        if self.redis is not None:
+            try:
+                await asyncio.to_thread(self.redis.put_many, items)
+            except Exception as exc:
+                self.stats.redis_errors += 1
+                logger.debug("[EmbeddingCache] Redis write failed: %s", exc)
+
+    def clear(self) -> None:
+        """Clear the in-process tier. The shared Redis tier expires by TTL."""
+        self.memory.clear()
+
+
+_shared_cache: Optional[EmbeddingCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_embedding_cache() -> EmbeddingCache:
+    """Process-wide embedding cache, configured from settings."""
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                redis_tier = (
+                    RedisEmbeddingCache(settings.EMBEDDING_CACHE_REDIS_TTL_SECONDS)
+                    if settings.EMBEDDING_CACHE_REDIS_ENABLED
+                    else None
+                )
+                _shared_cache = EmbeddingCache(
+                    memory=MemoryEmbeddingCache(settings.EMBEDDING_CACHE_MAX_BYTES),
+                    redis=redis_tier,
+                    dtype=np.dtype(settings.EMBEDDING_CACHE_DTYPE),
+                )
+    return _shared_cache
@@ -12,7 +12,7 @@ Used by:
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Sequence
 import hashlib
 import logging
 import asyncio
@@ -20,12 +20,22 @@ import threading
 
 import numpy as np
 
+from app.services.embedding_cache import (
+    EmbeddingCache,
+    EmbeddingCacheStats,
+    get_shared_embedding_cache,
+)
+
 logger = logging.getLogger(__name__)
 
 
 class EmbeddingProvider(ABC):
     """Abstract base class for embedding providers."""
 
+    # True when every returned vector already has unit L2 norm, which lets
+    # similarity scoring skip the norm computation entirely.
+    returns_normalized: bool = False
+
     @property
     @abstractmethod
     def model_name(self) -> str:
@@ -48,6 +58,13 @@ class EmbeddingProvider(ABC):
         """Generate embeddings for multiple texts."""
         ...
 
+    async def embed_batch_array(self, texts: List[str]) -> np.ndarray:
+        """Generate embeddings as a contiguous (len(texts), dimensions) float32 matrix."""
+        if not texts:
+            return np.empty((0, self.dimensions), dtype=np.float32)
+        embeddings = await self.embed_batch(texts)
+        return np.ascontiguousarray(embeddings, dtype=np.float32)
+
 
 class SentenceTransformerProvider(EmbeddingProvider):
     """
@@ -62,6 +79,7 @@ class SentenceTransformerProvider(EmbeddingProvider):
 
     MODEL = "all-MiniLM-L6-v2"
     DIMENSIONS = 384
+    returns_normalized = True  # encode(..., normalize_embeddings=True)
 
     def __init__(self):
         self._model = None
@@ -69,8 +87,22 @@ class SentenceTransformerProvider(EmbeddingProvider):
         self._lock = threading.Lock()
 
     def _load_model(self):
-        """Lazy load the model on first use."""
+        """Lazy load the model on first use (PyTorch or ONNX, per INFERENCE_BACKEND)."""
         if self._model is None:
+            from app.services.onnx_inference import (
+                BACKEND_ONNX,
+                inference_backend,
+                load_onnx_embedder,
+                mark_onnx_load_failed,
+                onnx_load_failed,
+            )
+            if inference_backend() == BACKEND_ONNX and not onnx_load_failed(self.MODEL):
+                try:
+                    self._model = load_onnx_embedder(self.MODEL)
+                    return self._model
+                except Exception as exc:
+                    logger.warning(f"[EmbeddingService] ONNX backend unavailable, falling back to PyTorch: {exc}")
+                    mark_onnx_load_failed(self.MODEL)
             from sentence_transformers import SentenceTransformer
             logger.info(f"[EmbeddingService] Loading SentenceTransformer model: {self.MODEL}")
             self._model = SentenceTransformer(self.MODEL)
@@ -79,7 +111,10 @@ class SentenceTransformerProvider(EmbeddingProvider):
 
     @property
     def model_name(self) -> str:
-        return self.MODEL
+        # Includes the backend variant: int8 ONNX vectors differ slightly from
+        # PyTorch ones, so caches and stored embeddings keep them apart
+        from app.services.onnx_inference import model_variant
+        return model_variant(self.MODEL)
 
     @property
     def dimensions(self) -> int:
@@ -87,30 +122,35 @@ class SentenceTransformerProvider(EmbeddingProvider):
 
     async def embed(self, text: str) -> List[float]:
         """Generate embedding for a single text."""
-        loop = asyncio.get_event_loop()
-
-        def _encode():
-            with self._lock:
-                model = self._load_model()
-                return model.encode(text, normalize_embeddings=True)
-
-        embedding = await loop.run_in_executor(None, _encode)
-        return embedding.tolist()
+        embeddings = await self.embed_batch_array([text])
+        return embeddings[0].tolist()
 
     async def embed_batch(self, texts: List[str]) -> List[List[float]]:
         """Generate embeddings for multiple texts in batch."""
         if not texts:
             return []
+        embeddings = await self.embed_batch_array(texts)
+        return embeddings.tolist()
+
+    async def embed_batch_array(self, texts: List[str]) -> np.ndarray:
+        """Generate embeddings for multiple texts as a float32 matrix."""
+        if not texts:
+            return np.empty((0, self.DIMENSIONS), dtype=np.float32)
 
         loop = asyncio.get_event_loop()
 
         def _encode_batch():
             with self._lock:
                 model = self._load_model()
-                return model.encode(texts, normalize_embeddings=True, batch_size=32)
+                return model.encode(
+                    texts,
+                    normalize_embeddings=True,
+                    batch_size=32,
+                    convert_to_numpy=True,
+                )
 
         embeddings = await loop.run_in_executor(None, _encode_batch)
-        return embeddings.tolist()
+        return np.ascontiguousarray(embeddings, dtype=np.float32)
 
 
 class OpenAIEmbeddingProvider(EmbeddingProvider):
@@ -126,6 +166,7 @@ class OpenAIEmbeddingProvider(EmbeddingProvider):
 
     MODEL = "openai/text-embedding-3-small"
     DIMENSIONS = 1536
+    returns_normalized = True  # OpenAI embeddings are unit length
 
     def __init__(self, api_key: str, base_url: str | None = None, default_headers: dict | None = None):
         from openai import AsyncOpenAI
@@ -173,27 +214,28 @@ class EmbeddingService:
     - Multiple provider support (local + API)
     - Content hashing for deduplication
     - Batch processing for efficiency
-    - Memory cache for repeated queries
+    - Shared two-tier cache (memory LRU + Redis) for repeated texts
     """
 
-    # In-memory LRU cache size
-    CACHE_SIZE = 1000
-
     def __init__(
         self,
         provider: Optional[EmbeddingProvider] = None,
-        use_cache: bool = True
+        use_cache: bool = True,
+        cache: Optional[EmbeddingCache] = None,
     ):
         """
         Initialize embedding service.
 
         Args:
             provider: Embedding provider instance. Defaults to SentenceTransformer.
-            use_cache: Whether to use in-memory LRU cache.
+            use_cache: Whether to use the embedding cache.
+            cache: Cache instance. Defaults to the process-wide shared cache.
         """
         self.provider = provider or SentenceTransformerProvider()
         self.use_cache = use_cache
-        self._cache: Dict[str, List[float]] = {}
+        self._cache: Optional[EmbeddingCache] = None
+        if use_cache:
+            self._cache = cache or get_shared_embedding_cache()
 
         logger.info(
             f"[EmbeddingService] Initialized with provider={self.provider.model_name}, "
@@ -234,76 +276,75 @@ class EmbeddingService:
             parts.append(f"Abstract: {truncated}")
         return "\n".join(parts)
 
+    @property
+    def cache_stats(self) -> Optional[EmbeddingCacheStats]:
+        """Hit/miss/eviction counters, or None when caching is disabled."""
+        return self._cache.stats if self._cache is not None else None
+
+    def _cache_key(self, text: str) -> str:
+        return EmbeddingCache.make_key(self.model_name, self.content_hash(text))
+
     async def embed(self, text: str) -> List[float]:
         """
         Generate embedding for text, using cache if available.
         """
+        return (await self.embed_array(text)).tolist()
+
+    async def embed_array(self, text: str) -> np.ndarray:
+        """Generate a single float32 embedding vector, using cache if available."""
         if not text or not text.strip():
             raise ValueError("Cannot embed empty text")
 
-        # Check cache
-        if self.use_cache:
-            cache_key = self.content_hash(text)
-            if cache_key in self._cache:
-                return self._cache[cache_key]
-
-        # Generate embedding
-        embedding = await self.provider.embed(text)
-
-        # Update cache
-        if self.use_cache:
-            if len(self._cache) >= self.CACHE_SIZE:
-                # Simple cache eviction: remove oldest entries
-                keys_to_remove = list(self._cache.keys())[:self.CACHE_SIZE // 4]
-                for k in keys_to_remove:
-                    del self._cache[k]
-            self._cache[cache_key] = embedding
-
-        return embedding
+        return (await self.embed_batch_array([text]))[0]
 
     async def embed_batch(self, texts: List[str]) -> List[List[float]]:
         """
         Generate embeddings for multiple texts.
 
-        Uses cache for already-embedded texts and batches the rest.
+        List-of-floats wrapper around `embed_batch_array` for JSON callers.
         """
         if not texts:
             return []
+        return (await self.embed_batch_array(texts)).tolist()
 
-        results: List[Optional[List[float]]] = [None] * len(texts)
-        to_embed_indices: List[int] = []
-        to_embed_texts: List[str] = []
+    async def embed_batch_array(self, texts: List[str]) -> np.ndarray:
+        """
+        Generate embeddings for multiple texts as a (len(texts), dims) float32 matrix.
 
-        # Check cache for each text
-        for i, text in enumerate(texts):
-            if not text or not text.strip():
-                results[i] = [0.0] * self.dimensions  # Zero vector for empty text
-                continue
+        Uses cache for already-embedded texts and batches the rest.
+        Empty texts map to zero rows.
+        """
+        results = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        if not texts:
+            return results
 
-            cache_key = self.content_hash(text)
-            if self.use_cache and cache_key in self._cache:
-                results[i] = self._cache[cache_key]
-                continue
+        # Cache key -> row indices in `texts` (duplicates are embedded once)
+        pending: Dict[str, List[int]] = {}
+        for i, text in enumerate(texts):
+            if text and text.strip():
+                pending.setdefault(self._cache_key(text), []).append(i)
 
-            to_embed_indices.append(i)
-            to_embed_texts.append(text)
+        if self._cache is not None and pending:
+            cached = await self._cache.get_many(list(pending))
+            for key, embedding in cached.items():
+                results[pending.pop(key)] = embedding
 
         # Batch embed uncached texts
-        if to_embed_texts:
-            embeddings = await self.provider.embed_batch(to_embed_texts)
+        if pending:
+            keys = list(pending)
+            keyed_model = self.model_name
+            to_embed_texts = [texts[pending[k][0]] for k in keys]
+            embeddings = await self.provider.embed_batch_array(to_embed_texts)
 
-            for idx, orig_idx in enumerate(to_embed_indices):
-                embedding = embeddings[idx]
-                results[orig_idx] = embedding
+            for key, embedding in zip(keys, embeddings):
+                results[pending[key]] = embedding
 
-                # Update cache
-                if self.use_cache and len(self._cache) < self.CACHE_SIZE:
-                    text = to_embed_texts[idx]
-                    cache_key = self.content_hash(text)
-                    self._cache[cache_key] = embedding
+            # Not cached if the model that ran differs from the keyed variant
+            # (first load fell back from ONNX to PyTorch)
+            if self._cache is not None and self.model_name == keyed_model:
+                await self._cache.put_many(dict(zip(keys, embeddings)))
 
-        # Convert to non-optional list (all None should be filled)
-        return [r if r is not None else [0.0] * self.dimensions for r in results]
+        return results
 
     async def embed_papers(
         self,
@@ -340,11 +381,29 @@ class EmbeddingService:
 
         return {pid: emb for pid, emb in zip(ids, embeddings)}
 
+    async def embed_papers_array(
+        self,
+        papers: List[Dict[str, Any]],
+        title_key: str = "title",
+        abstract_key: str = "abstract"
+    ) -> np.ndarray:
+        """
+        Embed multiple papers into a float32 matrix whose rows follow `papers` order.
+
+        Preferred over `embed_papers` for internal scoring: no ID mapping and
+        no per-vector Python lists.
+        """
+        texts = [
+            self.prepare_paper_text(paper.get(title_key, ""), paper.get(abstract_key))
+            for paper in papers
+        ]
+        return await self.embed_batch_array(texts)
+
     @staticmethod
-    def cosine_similarity(a: List[float], b: List[float]) -> float:
-        """Compute cosine similarity between two vectors."""
-        a_arr = np.array(a)
-        b_arr = np.array(b)
+    def cosine_similarity(a: Sequence[float], b: Sequence[float]) -> float:
+        """Compute cosine similarity between two vectors (lists or ndarrays)."""
+        a_arr = np.asarray(a, dtype=np.float32)
+        b_arr = np.asarray(b, dtype=np.float32)
 
         dot_product = np.dot(a_arr, b_arr)
         norm_a = np.linalg.norm(a_arr)
@@ -355,9 +414,74 @@ class EmbeddingService:
 
         return float(dot_product / (norm_a * norm_b))
 
+    @staticmethod
+    def _unit_rows(vectors: Any, assume_normalized: bool) -> np.ndarray:
+        """Return `vectors` as a 2-D float32 matrix with unit-norm rows (zero rows stay zero)."""
+        matrix = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        if assume_normalized:
+            return matrix
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def similarity_matrix(
+        self,
+        queries: Any,
+        docs: Any,
+        assume_normalized: Optional[bool] = None,
+    ) -> np.ndarray:
+        """
+        Cosine similarity of every query against every doc in one matmul.
+
+        Args:
+            queries: (n_queries, dims) matrix or a single vector
+            docs: (n_docs, dims) matrix
+            assume_normalized: Skip norm computation. Defaults to whether the
+                provider returns unit vectors.
+
+        Returns:
+            (n_queries, n_docs) float32 matrix. Zero vectors score 0.0.
+        """
+        if assume_normalized is None:
+            assume_normalized = self.provider.returns_normalized
+        q = self._unit_rows(queries, assume_normalized)
+        d = self._unit_rows(docs, assume_normalized)
+        if d.shape[0] == 0 or d.shape[1] == 0:
+            return np.zeros((q.shape[0], 0), dtype=np.float32)
+        return q @ d.T
+
+    def top_k(
+        self,
+        query: Any,
+        docs: Any,
+        k: int,
+        assume_normalized: Optional[bool] = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Indices and scores of the `k` docs most similar to `query`.
+
+        Uses argpartition so only the selected k entries are sorted.
+
+        Returns:
+            (indices, scores), both ordered by score descending.
+        """
+        scores = self.similarity_matrix(query, docs, assume_normalized)[0]
+        n = scores.shape[0]
+        k = max(0, min(k, n))
+        if k == 0:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float32)
+        if k < n:
+            candidates = np.sort(np.argpartition(-scores, k - 1)[:k])
+        else:
+            candidates = np.arange(n)
+        # Stable sort keeps input order among ties, like list.sort()
+        order = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return order, scores[order]
+
     def clear_cache(self):
-        """Clear the in-memory cache."""
-        self._cache.clear()
+        """Clear the in-memory cache tier."""
+        if self._cache is not None:
+            self._cache.clear()
         logger.info("[EmbeddingService] Cache cleared")
 
 
@@ -411,7 +535,7 @@ def get_embedding_service_with_openai(api_key: str) -> EmbeddingService:
     return EmbeddingService(provider=provider)
 
 
-def validate_embedding_dimensions(embedding: List[float], for_persistence: bool = False) -> bool:
+def validate_embedding_dimensions(embedding: Sequence[float], for_persistence: bool = False) -> bool:
     """
     Validate embedding dimensions.
 
@@ -18,22 +18,61 @@ Usage:
     async def shutdown():
         stop_embedding_worker()
 
-    # Queue a job when paper is added to library
+    # Queue a job when paper is added to library (returns None, without
+    # queuing, when a stored embedding of the same content can be linked)
     queue_library_paper_embedding_sync(reference_id, project_id, db_session)
+
+    # Or run a standalone pool of N model-owning processes (set
+    # EMBEDDING_WORKER_IN_PROCESS=false on the API so it doesn't also run one)
+    python -m app.services.embedding_worker --procs 4
+
+Wakeup:
+    Queue helpers issue NOTIFY on EMBEDDING_JOBS_CHANNEL in the same
+    transaction as the job insert. The worker LISTENs on a dedicated
+    connection, drains the queue while jobs keep completing, and when idle
+    waits for a notification with exponential backoff (IDLE_BACKOFF_MIN ..
+    IDLE_BACKOFF_MAX) as a safety-net poll for retries and missed notifies.
+
+Modes:
+    - Batched (default, EMBEDDING_WORKER_BATCHED=true): claims up to
+      EMBEDDING_WORKER_BATCH_SIZE jobs, loads every affected reference in one
+      query, encodes all new texts with one embed_batch_array call per
+      concurrency slot and upserts every PaperEmbedding row in one statement.
+    - Per-job: processes claimed jobs one at a time via _process_job.
+
+Sharing:
+    Library embeddings are stored once per (content_hash, model_name) and
+    project references link to them (ProjectReference.paper_embedding_id).
+    A paper already embedded for any project is linked, not re-encoded. A
+    row that loses its last link on a content change is deleted; rows left
+    by removed project references stay, ready for re-adds, until the worker's
+    periodic sweep deletes those not written for EMBEDDING_UNLINKED_TTL_DAYS.
 """
 
 from __future__ import annotations
 
+import argparse
+import asyncio
 import logging
+import multiprocessing
+import os
+import queue
+import select as select_module
+import signal
 import threading
 import time
-from datetime import datetime, timezone
-from typing import Optional
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
 from uuid import UUID
 
-from sqlalchemy import select, update, text
+import numpy as np
+from sqlalchemy import delete, func, or_, select, update, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.database import SessionLocal
 from app.models.paper_embedding import EmbeddingJob, PaperEmbedding
 from app.models.project_reference import ProjectReference
@@ -46,32 +85,87 @@ from app.services.embedding_service import (
 
 logger = logging.getLogger(__name__)
 
+# Postgres NOTIFY channel used to wake workers when a job is queued
+EMBEDDING_JOBS_CHANNEL = "embedding_jobs"
+
 # Global worker instance
 _worker_instance: Optional["EmbeddingWorker"] = None
 _worker_thread: Optional[threading.Thread] = None
 
 
+@dataclass
+class EmbeddingWorkerStats:
+    """Cumulative throughput counters for one worker."""
+
+    jobs_completed: int = 0
+    jobs_failed: int = 0
+    papers_embedded: int = 0
+    papers_skipped: int = 0
+    papers_reused: int = 0
+    busy_seconds: float = 0.0
+
+    @property
+    def jobs_per_second(self) -> float:
+        return self.jobs_completed / self.busy_seconds if self.busy_seconds else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "jobs_completed": self.jobs_completed,
+            "jobs_failed": self.jobs_failed,
+            "papers_embedded": self.papers_embedded,
+            "papers_skipped": self.papers_skipped,
+            "papers_reused": self.papers_reused,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "jobs_per_second": round(self.jobs_per_second, 2),
+        }
+
+
 class EmbeddingWorker:
     """
     Background worker that processes embedding jobs.
 
-    Runs in a separate thread, polling the embedding_jobs table.
+    Runs in a separate thread, woken by LISTEN/NOTIFY on the embedding_jobs
+    channel and falling back to backoff polling when idle.
     Uses synchronous SQLAlchemy sessions (matches rest of app).
     """
 
     BATCH_SIZE = 10
-    POLL_INTERVAL = 5  # seconds
+    IDLE_BACKOFF_MIN = 1.0  # seconds
+    IDLE_BACKOFF_MAX = 30.0  # seconds
     MAX_RETRIES = 3
-
-    def __init__(self, embedding_service: Optional[EmbeddingService] = None):
+    STATS_LOG_INTERVAL = 60.0  # seconds
+    SWEEP_INTERVAL = 3600.0  # seconds
+    SWEEP_BATCH_SIZE = 1000
+
+    def __init__(
+        self,
+        embedding_service: Optional[EmbeddingService] = None,
+        *,
+        batched: Optional[bool] = None,
+        batch_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+    ):
         """
         Initialize the worker.
 
         Args:
             embedding_service: Optional embedding service (uses default if not provided)
+            batched: Use batched mode (defaults to EMBEDDING_WORKER_BATCHED)
+            batch_size: Jobs claimed per cycle in batched mode
+            concurrency: Concurrent embed_batch_array calls per cycle in batched mode
+                (no in-process parallelism with the local model; see _encode_texts)
         """
         self.embedding_service = embedding_service or get_embedding_service_for_persistence()
+        self.batched = settings.EMBEDDING_WORKER_BATCHED if batched is None else batched
+        self.batch_size = max(1, batch_size or settings.EMBEDDING_WORKER_BATCH_SIZE)
+        self.concurrency = max(1, concurrency or settings.EMBEDDING_WORKER_CONCURRENCY)
+        self.stats = EmbeddingWorkerStats()
         self._running = False
+        self._stop_event = threading.Event()
+        # One event loop per worker thread, reused for every encode call
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Dedicated psycopg2 connection holding LISTEN (None when unavailable)
+        self._listen_conn = None
 
     def start(self):
         """Start the background worker loop (blocking - run in thread)."""
@@ -80,24 +174,128 @@ class EmbeddingWorker:
             return
 
         self._running = True
-        logger.info("[EmbeddingWorker] Starting background worker")
+        logger.info(
+            f"[EmbeddingWorker] Starting background worker "
+            f"(batched={self.batched}, batch_size={self.batch_size}, concurrency={self.concurrency})"
+        )
 
-        while self._running:
-            try:
-                processed = self._process_pending_jobs()
-                if processed > 0:
-                    logger.debug(f"[EmbeddingWorker] Processed {processed} jobs")
-            except Exception as e:
-                logger.error(f"[EmbeddingWorker] Error in worker loop: {e}")
+        self._stop_event.clear()
+        idle_wait = self.IDLE_BACKOFF_MIN
+        last_stats_log = time.monotonic()
+        last_logged_jobs = 0
+        # First sweep one interval after startup, not on every restart
+        last_sweep = time.monotonic()
+
+        try:
+            while self._running:
+                if time.monotonic() - last_stats_log >= self.STATS_LOG_INTERVAL:
+                    if self.stats.jobs_completed != last_logged_jobs:
+                        logger.info(f"[EmbeddingWorker] pid={os.getpid()} stats: {self.stats.as_dict()}")
+                        last_logged_jobs = self.stats.jobs_completed
+                    last_stats_log = time.monotonic()
+
+                if time.monotonic() - last_sweep >= self.SWEEP_INTERVAL:
+                    last_sweep = time.monotonic()
+                    self._run_sweep()
+
+                processed = 0
+                try:
+                    if self.batched:
+                        processed = self._process_pending_jobs_batched()
+                    else:
+                        processed = self._process_pending_jobs()
+                    if processed > 0:
+                        logger.debug(f"[EmbeddingWorker] Processed {processed} jobs")
+                except Exception as e:
+                    logger.error(f"[EmbeddingWorker] Error in worker loop: {e}")
 
-            time.sleep(self.POLL_INTERVAL)
+                if processed > 0:
+                    # Work was waiting: keep draining without sleeping
+                    idle_wait = self.IDLE_BACKOFF_MIN
+                    continue
+
+                if self._wait_for_jobs(idle_wait):
+                    idle_wait = self.IDLE_BACKOFF_MIN
+                else:
+                    idle_wait = min(idle_wait * 2, self.IDLE_BACKOFF_MAX)
+        finally:
+            self._close_listener()
+            if self._loop is not None and not self._loop.is_closed():
+                self._loop.close()
+            self._loop = None
 
-        logger.info("[EmbeddingWorker] Worker stopped")
+        logger.info(f"[EmbeddingWorker] pid={os.getpid()} worker stopped: {self.stats.as_dict()}")
 
     def stop(self):
         """Stop the background worker."""
         logger.info("[EmbeddingWorker] Stopping worker")
         self._running = False
+        self._stop_event.set()
+
+    # === LISTEN/NOTIFY wakeup ===
+
+    def _ensure_listener(self):
+        """Open the LISTEN connection if needed. Returns it, or None if unavailable."""
+        if self._listen_conn is not None and not self._listen_conn.closed:
+            return self._listen_conn
+        try:
+            import psycopg2
+            import psycopg2.extensions
+
+            dsn = make_url(settings.DATABASE_URL).set(drivername="postgresql")
+            conn = psycopg2.connect(dsn.render_as_string(hide_password=False), connect_timeout=3)
+            conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+            with conn.cursor() as cur:
+                cur.execute(f"LISTEN {EMBEDDING_JOBS_CHANNEL}")
+            self._listen_conn = conn
+            logger.info(f"[EmbeddingWorker] Listening on channel '{EMBEDDING_JOBS_CHANNEL}'")
+        except Exception as e:
+            logger.warning(f"[EmbeddingWorker] LISTEN unavailable, using backoff polling only: {e}")
+            self._listen_conn = None
+        return self._listen_conn
+
+    def _close_listener(self):
+        if self._listen_conn is not None:
+            try:
+                self._listen_conn.close()
+            except Exception:
+                pass
+            self._listen_conn = None
+
+    def _wait_for_jobs(self, timeout: float) -> bool:
+        """
+        Block until a job notification arrives, the timeout elapses or the
+        worker is stopped. Returns True when woken by a notification.
+        """
+        conn = self._ensure_listener()
+        if conn is None:
+            self._stop_event.wait(timeout)
+            return False
+
+        deadline = time.monotonic() + timeout
+        try:
+            while self._running:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                # Short select slices keep stop() responsive
+                readable, _, _ = select_module.select([conn], [], [], min(remaining, 1.0))
+                if not readable:
+                    continue
+                conn.poll()
+                if conn.notifies:
+                    conn.notifies.clear()
+                    return True
+        except Exception as e:
+            logger.warning(f"[EmbeddingWorker] LISTEN connection lost, will reconnect: {e}")
+            self._close_listener()
+        return False
+
+    def _run_async(self, coro):
+        """Run a coroutine on this worker's persistent event loop."""
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(coro)
 
     def _process_pending_jobs(self) -> int:
         """Process pending embedding jobs. Returns number of jobs processed."""
@@ -117,7 +315,61 @@ class EmbeddingWorker:
         finally:
             db.close()
 
-    def _claim_pending_jobs(self, db: Session) -> list[EmbeddingJob]:
+    def _process_pending_jobs_batched(self) -> int:
+        """Claim a batch of jobs and process them together. Returns jobs completed."""
+        db = SessionLocal()
+        try:
+            jobs = self._claim_pending_jobs(db, limit=self.batch_size)
+            if not jobs:
+                return 0
+            return self._process_jobs_batched(db, jobs)
+        finally:
+            db.close()
+
+    def _run_sweep(self) -> None:
+        db = SessionLocal()
+        try:
+            deleted = self._sweep_unlinked_embeddings(db)
+            if deleted:
+                logger.info(f"[EmbeddingWorker] Deleted {deleted} unlinked library embeddings")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"[EmbeddingWorker] Unlinked embedding sweep failed: {e}")
+        finally:
+            db.close()
+
+    def _sweep_unlinked_embeddings(self, db: Session) -> int:
+        """Delete library embeddings nothing links to and not written for
+        EMBEDDING_UNLINKED_TTL_DAYS, in batches. Returns rows deleted."""
+        cutoff = datetime.now(timezone.utc) - timedelta(days=settings.EMBEDDING_UNLINKED_TTL_DAYS)
+        linked = select(ProjectReference.id).where(
+            ProjectReference.paper_embedding_id == PaperEmbedding.id
+        ).exists()
+        deleted = 0
+        while True:
+            # SKIP LOCKED: rows another sweeper holds, or that a reference is
+            # being linked to (FK check lock), are left for later
+            batch = (
+                select(PaperEmbedding.id)
+                .where(
+                    PaperEmbedding.external_paper_id.is_(None),
+                    PaperEmbedding.updated_at < cutoff,
+                    ~linked,
+                )
+                .limit(self.SWEEP_BATCH_SIZE)
+                .with_for_update(of=PaperEmbedding, skip_locked=True)
+            )
+            result = db.execute(
+                delete(PaperEmbedding)
+                .where(PaperEmbedding.id.in_(batch.scalar_subquery()), ~linked)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+            deleted += result.rowcount
+            if result.rowcount < self.SWEEP_BATCH_SIZE:
+                return deleted
+
+    def _claim_pending_jobs(self, db: Session, limit: Optional[int] = None) -> list[EmbeddingJob]:
         """Atomically claim pending jobs and mark them as processing."""
         now = datetime.now(timezone.utc)
         stmt = text("""
@@ -134,7 +386,7 @@ class EmbeddingWorker:
             )
             RETURNING id
         """)
-        rows = db.execute(stmt, {"now": now, "limit": self.BATCH_SIZE}).fetchall()
+        rows = db.execute(stmt, {"now": now, "limit": limit or self.BATCH_SIZE}).fetchall()
         db.commit()
 
         if not rows:
@@ -147,6 +399,8 @@ class EmbeddingWorker:
         """Process a single embedding job. Returns True if completed successfully."""
         logger.debug(f"[EmbeddingWorker] Processing job {job.id} (type={job.job_type})")
 
+        started = time.monotonic()
+
         # Mark as processing and increment attempts unless already claimed
         if not already_processing:
             self._mark_job_processing(db, job)
@@ -160,31 +414,237 @@ class EmbeddingWorker:
                 raise ValueError(f"Unknown job type: {job.job_type}")
 
             self._mark_job_completed(db, job)
+            self.stats.jobs_completed += 1
+            self.stats.busy_seconds += time.monotonic() - started
             return True
 
         except Exception as e:
-            # Check attempts (already incremented when claimed/processing)
-            max_attempts = job.max_attempts or self.MAX_RETRIES
-            if job.attempts < max_attempts:
-                # Retry later - mark as pending, don't raise
-                logger.warning(f"[EmbeddingWorker] Job {job.id} failed (attempt {job.attempts}/{max_attempts}): {e}")
-                self._mark_job_pending(db, job)
-                return False
+            self._handle_job_failure(db, job, e)
+            return False
+
+    def _handle_job_failure(self, db: Session, job: EmbeddingJob, error: Exception):
+        """Requeue a failed job for retry, or mark it failed once attempts run out."""
+        # Check attempts (already incremented when claimed/processing)
+        max_attempts = job.max_attempts or self.MAX_RETRIES
+        if job.attempts < max_attempts:
+            # Retry later - mark as pending, don't raise
+            logger.warning(f"[EmbeddingWorker] Job {job.id} failed (attempt {job.attempts}/{max_attempts}): {error}")
+            self._mark_job_pending(db, job)
+        else:
+            # Max retries exceeded - mark as failed
+            logger.error(f"[EmbeddingWorker] Job {job.id} failed permanently after {job.attempts} attempts: {error}")
+            self._mark_job_failed(db, job, str(error))
+            self.stats.jobs_failed += 1
+
+    def _process_jobs_batched(self, db: Session, jobs: List[EmbeddingJob]) -> int:
+        """
+        Process claimed jobs as one unit: one reference query, one encode pass,
+        one bulk upsert, one status update. Returns number of jobs completed.
+        """
+        started = time.monotonic()
+
+        valid_jobs: List[EmbeddingJob] = []
+        for job in jobs:
+            if job.job_type == "library_paper" and job.target_id:
+                valid_jobs.append(job)
+            elif job.job_type == "bulk_reindex" and job.project_id:
+                valid_jobs.append(job)
+            elif job.job_type in ("library_paper", "bulk_reindex"):
+                self._handle_job_failure(db, job, ValueError(f"Job {job.id} has no target"))
             else:
-                # Max retries exceeded - mark as failed
-                logger.error(f"[EmbeddingWorker] Job {job.id} failed permanently after {job.attempts} attempts: {e}")
-                self._mark_job_failed(db, job, str(e))
-                return False
+                self._handle_job_failure(db, job, ValueError(f"Unknown job type: {job.job_type}"))
+
+        if not valid_jobs:
+            return 0
+
+        reference_ids = [j.target_id for j in valid_jobs if j.job_type == "library_paper"]
+        project_ids = [j.project_id for j in valid_jobs if j.job_type == "bulk_reindex"]
+
+        try:
+            embedded, skipped = self._embed_project_references(
+                db, reference_ids=reference_ids, project_ids=project_ids
+            )
+        except Exception as e:
+            db.rollback()
+            logger.error(f"[EmbeddingWorker] Batch of {len(valid_jobs)} jobs failed: {e}")
+            for job in valid_jobs:
+                self._handle_job_failure(db, job, e)
+            return 0
+
+        db.execute(
+            update(EmbeddingJob)
+            .where(EmbeddingJob.id.in_([j.id for j in valid_jobs]))
+            .values(status="completed", completed_at=datetime.now(timezone.utc))
+        )
+        db.commit()
+
+        elapsed = time.monotonic() - started
+        self.stats.jobs_completed += len(valid_jobs)
+        self.stats.busy_seconds += elapsed
+        rate = len(valid_jobs) / elapsed if elapsed > 0 else 0.0
+        logger.info(
+            f"[EmbeddingWorker] Batch complete: jobs={len(valid_jobs)} embedded={embedded} "
+            f"skipped={skipped} elapsed_ms={elapsed * 1000:.0f} rate={rate:.1f} jobs/s "
+            f"(lifetime {self.stats.jobs_per_second:.1f} jobs/s)"
+        )
+        return len(valid_jobs)
+
+    def _embed_project_references(
+        self,
+        db: Session,
+        *,
+        reference_ids: Optional[List[UUID]] = None,
+        project_ids: Optional[List[UUID]] = None,
+    ) -> tuple[int, int]:
+        """
+        Embed the given project references plus every reference in the given
+        projects, skipping unchanged content and linking content that already
+        has a stored embedding. Returns (embedded, skipped).
+        """
+        conditions = []
+        if reference_ids:
+            conditions.append(ProjectReference.id.in_(set(reference_ids)))
+        if project_ids:
+            conditions.append(ProjectReference.project_id.in_(set(project_ids)))
+        if not conditions:
+            return 0, 0
+
+        # Single round trip: reference text + currently linked embedding
+        stmt = (
+            select(
+                ProjectReference.id,
+                ProjectReference.paper_embedding_id,
+                Reference.title,
+                Reference.abstract,
+                PaperEmbedding.content_hash,
+            )
+            .join(Reference, ProjectReference.reference_id == Reference.id)
+            .outerjoin(PaperEmbedding, PaperEmbedding.id == ProjectReference.paper_embedding_id)
+            .where(or_(*conditions))
+        )
+        rows = db.execute(stmt).all()
+
+        pending: Dict[UUID, str] = {}  # project reference -> content hash
+        texts: Dict[str, str] = {}  # content hash -> text
+        replaced: set[UUID] = set()
+        skipped = 0
+        for project_ref_id, current_id, title, abstract, existing_hash in rows:
+            text_value = self.embedding_service.prepare_paper_text(title or "", abstract or "")
+            content_hash = self.embedding_service.content_hash(text_value)
+            if existing_hash == content_hash:
+                skipped += 1
+                continue
+            pending[project_ref_id] = content_hash
+            texts[content_hash] = text_value
+            if current_id:
+                replaced.add(current_id)
+
+        self.stats.papers_skipped += skipped
+        if not pending:
+            return 0, skipped
+
+        ids = self._shared_embedding_ids(db, list(texts))
+        missing = {h: t for h, t in texts.items() if h not in ids}
+        if missing:
+            embeddings = self._run_async(self._encode_texts(list(missing.values())))
+            ids.update(self._store_shared_embeddings(db, missing, embeddings))
+
+        self._link_project_references(db, {pr_id: ids[h] for pr_id, h in pending.items()}, replaced)
+        db.commit()
+
+        self.stats.papers_embedded += len(missing)
+        self.stats.papers_reused += sum(1 for h in pending.values() if h not in missing)
+        return len(missing), skipped
+
+    def _shared_embedding_ids(self, db: Session, content_hashes: List[str]) -> Dict[str, UUID]:
+        """{content_hash: id} of stored library embeddings for the current model."""
+        if not content_hashes:
+            return {}
+        rows = db.execute(
+            select(PaperEmbedding.content_hash, PaperEmbedding.id).where(
+                PaperEmbedding.content_hash.in_(content_hashes),
+                PaperEmbedding.model_name == self.embedding_service.model_name,
+                PaperEmbedding.external_paper_id.is_(None),
+            )
+        ).all()
+        return {content_hash: embedding_id for content_hash, embedding_id in rows}
+
+    def _store_shared_embeddings(
+        self, db: Session, texts: Dict[str, str], embeddings: np.ndarray
+    ) -> Dict[str, UUID]:
+        """Upsert one library embedding per content hash; returns {content_hash: id}."""
+        model_name = self.embedding_service.model_name
+        values = [
+            {
+                "content_hash": content_hash,
+                "embedded_text": text_value,
+                # pgvector boundary: write plain floats
+                "embedding": embedding.tolist(),
+                "model_name": model_name,
+            }
+            for (content_hash, text_value), embedding in zip(texts.items(), embeddings)
+        ]
+
+        insert_stmt = pg_insert(PaperEmbedding).values(values)
+        # DO UPDATE (not NOTHING) so RETURNING also yields rows another
+        # worker inserted concurrently
+        upsert_stmt = insert_stmt.on_conflict_do_update(
+            index_elements=[PaperEmbedding.content_hash, PaperEmbedding.model_name],
+            index_where=PaperEmbedding.external_paper_id.is_(None),
+            set_={"updated_at": func.now()},
+        ).returning(PaperEmbedding.content_hash, PaperEmbedding.id)
+        return {content_hash: embedding_id for content_hash, embedding_id in db.execute(upsert_stmt).all()}
+
+    @staticmethod
+    def _link_project_references(db: Session, links: Dict[UUID, UUID], replaced: set[UUID]) -> None:
+        """Point project references at their embeddings; drop replaced rows nothing links to."""
+        if links:
+            db.execute(
+                update(ProjectReference),
+                [{"id": pr_id, "paper_embedding_id": embedding_id} for pr_id, embedding_id in links.items()],
+            )
+        stale = replaced - set(links.values())
+        if stale:
+            still_linked = select(ProjectReference.id).where(
+                ProjectReference.paper_embedding_id == PaperEmbedding.id
+            ).exists()
+            db.execute(
+                delete(PaperEmbedding)
+                .where(PaperEmbedding.id.in_(stale), ~still_linked)
+                .execution_options(synchronize_session=False)
+            )
+
+    async def _encode_texts(self, texts: List[str]) -> np.ndarray:
+        """Encode texts in up to `concurrency` concurrent embed_batch_array calls.
+
+        The calls overlap only for remote providers. SentenceTransformerProvider
+        encodes under its lock, so the chunks run one after another there.
+        """
+        if self.concurrency <= 1 or len(texts) <= 1:
+            return await self.embedding_service.embed_batch_array(texts)
+
+        chunk_size = -(-len(texts) // self.concurrency)  # ceil division
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        parts = await asyncio.gather(
+            *(self.embedding_service.embed_batch_array(chunk) for chunk in chunks)
+        )
+        return np.concatenate(parts, axis=0)
 
     def _embed_library_paper(self, db: Session, reference_id: UUID):
         """Embed a single library paper."""
         if not reference_id:
             raise ValueError("No reference_id provided")
 
-        # Fetch the reference with its paper data
+        # Fetch the reference text and the embedding it links to, if any
         stmt = (
-            select(ProjectReference, Reference)
+            select(
+                ProjectReference.paper_embedding_id,
+                Reference.title,
+                Reference.abstract,
+                PaperEmbedding.content_hash,
+            )
             .join(Reference, ProjectReference.reference_id == Reference.id)
+            .outerjoin(PaperEmbedding, PaperEmbedding.id == ProjectReference.paper_embedding_id)
             .where(ProjectReference.id == reference_id)
         )
         row = db.execute(stmt).first()
@@ -193,51 +653,29 @@ class EmbeddingWorker:
             logger.warning(f"[EmbeddingWorker] Reference {reference_id} not found")
             return
 
-        project_ref, reference = row
-
-        # Check if embedding already exists
-        existing = db.query(PaperEmbedding).filter(
-            PaperEmbedding.project_reference_id == reference_id
-        ).first()
+        current_id, title, abstract, existing_hash = row
 
         # Prepare text for embedding
-        title = reference.title or ""
-        abstract = reference.abstract or ""
-        text = self.embedding_service.prepare_paper_text(title, abstract)
+        text = self.embedding_service.prepare_paper_text(title or "", abstract or "")
         content_hash = self.embedding_service.content_hash(text)
 
         # Skip if content unchanged
-        if existing and existing.content_hash == content_hash:
+        if existing_hash == content_hash:
             logger.debug(f"[EmbeddingWorker] Embedding unchanged for {reference_id}")
             return
 
-        # Generate embedding (run async in sync context)
-        import asyncio
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            embedding = loop.run_until_complete(self.embedding_service.embed(text))
-        finally:
-            loop.close()
-
-        if existing:
-            # Update existing
-            existing.embedding = embedding
-            existing.embedded_text = text
-            existing.content_hash = content_hash
-            existing.model_name = self.embedding_service.model_name
-            existing.updated_at = datetime.now(timezone.utc)
+        # Reuse the stored embedding of identical content, else generate one
+        ids = self._shared_embedding_ids(db, [content_hash])
+        if content_hash in ids:
+            self.stats.papers_reused += 1
         else:
-            # Create new
-            paper_embedding = PaperEmbedding(
-                project_reference_id=reference_id,
-                content_hash=content_hash,
-                embedded_text=text,
-                embedding=embedding,
-                model_name=self.embedding_service.model_name,
-            )
-            db.add(paper_embedding)
+            embedding_array = self._run_async(self.embedding_service.embed_array(text))
+            ids = self._store_shared_embeddings(db, {content_hash: text}, embedding_array[None, :])
+            self.stats.papers_embedded += 1
 
+        self._link_project_references(
+            db, {reference_id: ids[content_hash]}, {current_id} if current_id else set()
+        )
         db.commit()
         logger.info(f"[EmbeddingWorker] Embedded paper for reference {reference_id}")
 
@@ -246,24 +684,12 @@ class EmbeddingWorker:
         if not project_id:
             raise ValueError("No project_id provided")
 
-        # Fetch all references in the project
-        stmt = (
-            select(ProjectReference, Reference)
-            .join(Reference, ProjectReference.reference_id == Reference.id)
-            .where(ProjectReference.project_id == project_id)
-        )
-        rows = db.execute(stmt).all()
+        embedded, skipped = self._embed_project_references(db, project_ids=[project_id])
 
-        logger.info(f"[EmbeddingWorker] Bulk reindexing {len(rows)} papers for project {project_id}")
-
-        for project_ref, _ in rows:
-            try:
-                self._embed_library_paper(db, project_ref.id)
-            except Exception as e:
-                logger.error(f"[EmbeddingWorker] Failed to embed {project_ref.id}: {e}")
-                # Continue with other papers
-
-        logger.info(f"[EmbeddingWorker] Completed bulk reindex for project {project_id}")
+        logger.info(
+            f"[EmbeddingWorker] Completed bulk reindex for project {project_id} "
+            f"(embedded={embedded}, unchanged={skipped})"
+        )
 
     def _mark_job_processing(self, db: Session, job: EmbeddingJob):
         """Mark job as processing and increment attempts."""
@@ -353,16 +779,74 @@ def stop_embedding_worker():
 
 # === Helper functions for queueing jobs ===
 
+def _notify_job_queued(db: Session, job_type: str) -> None:
+    """NOTIFY listening workers; delivered when the enclosing transaction commits."""
+    db.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": EMBEDDING_JOBS_CHANNEL, "payload": job_type},
+    )
+
+
+def link_existing_library_embedding(
+    reference_id: UUID,
+    db: Session,
+    embedding_service: Optional[EmbeddingService] = None,
+) -> bool:
+    """
+    Link a project reference to the stored embedding of identical content.
+
+    Returns True when the reference now has an up-to-date embedding (linked
+    here or already), False when one still has to be generated. Flushes but
+    does not commit.
+    """
+    service = embedding_service or get_embedding_service_for_persistence()
+    row = db.execute(
+        select(ProjectReference.paper_embedding_id, Reference.title, Reference.abstract)
+        .join(Reference, ProjectReference.reference_id == Reference.id)
+        .where(ProjectReference.id == reference_id)
+    ).first()
+    if not row:
+        return False
+
+    current_id, title, abstract = row
+    content_hash = service.content_hash(service.prepare_paper_text(title or "", abstract or ""))
+    embedding_id = db.execute(
+        select(PaperEmbedding.id).where(
+            PaperEmbedding.content_hash == content_hash,
+            PaperEmbedding.model_name == service.model_name,
+            PaperEmbedding.external_paper_id.is_(None),
+        )
+    ).scalar()
+    if embedding_id is None:
+        return False
+    if current_id != embedding_id:
+        EmbeddingWorker._link_project_references(
+            db, {reference_id: embedding_id}, {current_id} if current_id else set()
+        )
+    return True
+
+
 def queue_library_paper_embedding_sync(
     reference_id: UUID,
     project_id: UUID,
     db: Session
-) -> EmbeddingJob:
+) -> Optional[EmbeddingJob]:
     """
     Queue an embedding job for a library paper.
 
-    Call this when a paper is added to a project library.
+    Call this when a paper is added to a project library. If the paper's
+    content is already embedded (for this or any other project), the
+    reference is linked to that embedding and no job is queued (returns None).
     """
+    try:
+        if link_existing_library_embedding(reference_id, db):
+            db.commit()
+            logger.debug(f"[EmbeddingWorker] Linked stored embedding for reference {reference_id}")
+            return None
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"[EmbeddingWorker] Embedding reuse lookup failed for {reference_id}: {e}")
+
     job = EmbeddingJob(
         job_type="library_paper",
         target_id=reference_id,
@@ -370,6 +854,7 @@ def queue_library_paper_embedding_sync(
         status="pending"
     )
     db.add(job)
+    _notify_job_queued(db, job.job_type)
     db.commit()
     db.refresh(job)
 
@@ -392,8 +877,187 @@ def queue_bulk_reindex_sync(
         status="pending"
     )
     db.add(job)
+    _notify_job_queued(db, job.job_type)
     db.commit()
     db.refresh(job)
 
     logger.info(f"[EmbeddingWorker] Queued bulk reindex for project {project_id}")
     return job
+
+
+# === Standalone multi-process pool ===
+
+def _run_pool_process(
+    index: int,
+    stop_event,
+    results,
+    batch_size: Optional[int],
+    concurrency: Optional[int],
+    torch_threads: int,
+) -> None:
+    """Entry point for one pool process. Each process loads its own model."""
+    # The parent coordinates shutdown; children only react to stop_event
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(processName)s %(levelname)s:%(name)s: %(message)s",
+    )
+
+    # Split cores between processes instead of every process using all of them
+    try:
+        import torch
+        torch.set_num_threads(torch_threads)
+    except ImportError:
+        pass
+
+    worker = EmbeddingWorker(batch_size=batch_size, concurrency=concurrency)
+
+    def _watch_stop():
+        stop_event.wait()
+        worker.stop()
+
+    threading.Thread(target=_watch_stop, daemon=True).start()
+    try:
+        worker.start()
+    finally:
+        results.put((index, os.getpid(), worker.stats.as_dict()))
+
+
+def run_worker_pool(
+    procs: int,
+    *,
+    batch_size: Optional[int] = None,
+    concurrency: Optional[int] = None,
+) -> Dict[int, Dict[str, float]]:
+    """
+    Run `procs` worker processes sharing the embedding_jobs queue until
+    SIGINT/SIGTERM. Jobs are distributed by the SKIP LOCKED claim, so no
+    coordination between processes is needed. Crashed processes are
+    restarted with exponential backoff (EMBEDDING_WORKER_RESTART_BACKOFF_*);
+    after EMBEDDING_WORKER_MAX_RESTARTS consecutive crashes of one process the
+    pool stops and raises RuntimeError. Returns final per-process stats keyed
+    by process index.
+    """
+    # spawn: no inherited DB connections, model state or torch thread pools
+    ctx = multiprocessing.get_context("spawn")
+    stop_event = ctx.Event()
+    results = ctx.Queue()
+    torch_threads = max(1, (os.cpu_count() or 1) // procs)
+
+    def _spawn(index: int):
+        process = ctx.Process(
+            target=_run_pool_process,
+            args=(index, stop_event, results, batch_size, concurrency, torch_threads),
+            name=f"embedding-worker-{index}",
+        )
+        process.start()
+        return process
+
+    # The handler only records the signal: setting the multiprocessing Event
+    # from inside a handler can deadlock on the lock the main thread holds.
+    received_signal: List[int] = []
+
+    def _request_stop(signum, _frame):
+        received_signal.append(signum)
+
+    signal.signal(signal.SIGINT, _request_stop)
+    signal.signal(signal.SIGTERM, _request_stop)
+
+    backoff = settings.EMBEDDING_WORKER_RESTART_BACKOFF_SECONDS
+    backoff_max = settings.EMBEDDING_WORKER_RESTART_BACKOFF_MAX_SECONDS
+    max_restarts = settings.EMBEDDING_WORKER_MAX_RESTARTS
+
+    processes = {i: _spawn(i) for i in range(procs)}
+    started_at = {i: time.monotonic() for i in processes}
+    # Consecutive crashes per process index, and when a crashed one is due back
+    crashes = {i: 0 for i in processes}
+    restart_at: Dict[int, float] = {}
+    failure: Optional[str] = None
+    logger.info(f"[EmbeddingWorkerPool] Started {procs} processes ({torch_threads} torch threads each)")
+
+    while not received_signal and failure is None:
+        time.sleep(1.0)
+        now = time.monotonic()
+        for index, process in list(processes.items()):
+            if received_signal:
+                break
+            if process.is_alive():
+                if crashes[index] and now - started_at[index] >= backoff_max:
+                    crashes[index] = 0
+                continue
+            if index not in restart_at:
+                if crashes[index] >= max_restarts:
+                    failure = (
+                        f"{process.name} exited with code {process.exitcode} "
+                        f"after {crashes[index]} consecutive restarts"
+                    )
+                    break
+                delay = min(backoff * 2 ** crashes[index], backoff_max)
+                restart_at[index] = now + delay
+                logger.error(
+                    f"[EmbeddingWorkerPool] {process.name} exited with code {process.exitcode}, "
+                    f"restarting in {delay:.0f}s"
+                )
+            elif now >= restart_at[index]:
+                del restart_at[index]
+                crashes[index] += 1
+                processes[index] = _spawn(index)
+                started_at[index] = now
+
+    if failure is not None:
+        logger.error(f"[EmbeddingWorkerPool] {failure}, stopping {procs} processes")
+    else:
+        logger.info(f"[EmbeddingWorkerPool] Received signal {received_signal[0]}, stopping {procs} processes")
+    stop_event.set()
+
+    # Drain results while waiting: a child blocks on exit until its queued
+    # stats have been consumed, so joining first could deadlock.
+    final_stats: Dict[int, Dict[str, float]] = {}
+    deadline = time.monotonic() + 30
+    while any(p.is_alive() for p in processes.values()) and time.monotonic() < deadline:
+        try:
+            index, pid, stats = results.get(timeout=0.5)
+        except queue.Empty:
+            continue
+        final_stats[index] = stats
+        logger.info(f"[EmbeddingWorkerPool] worker {index} (pid={pid}): {stats}")
+    for process in processes.values():
+        if process.is_alive():
+            logger.warning(f"[EmbeddingWorkerPool] {process.name} did not stop in time, terminating")
+            process.terminate()
+        process.join()
+    while True:
+        try:
+            index, pid, stats = results.get_nowait()
+        except queue.Empty:
+            break
+        final_stats[index] = stats
+        logger.info(f"[EmbeddingWorkerPool] worker {index} (pid={pid}): {stats}")
+
+    total_jobs = sum(s["jobs_completed"] for s in final_stats.values())
+    logger.info(f"[EmbeddingWorkerPool] Stopped; {total_jobs} jobs completed across {procs} processes")
+    if failure is not None:
+        raise RuntimeError(f"Embedding worker pool gave up: {failure}")
+    return final_stats
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run the standalone embedding worker pool.")
+    parser.add_argument(
+        "--procs", type=int, default=settings.EMBEDDING_WORKER_PROCS,
+        help="Number of model-owning worker processes (default: EMBEDDING_WORKER_PROCS)",
+    )
+    parser.add_argument("--batch-size", type=int, default=None, help="Jobs claimed per cycle")
+    parser.add_argument("--concurrency", type=int, default=None, help="Concurrent encode calls per cycle")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(processName)s %(levelname)s:%(name)s: %(message)s",
+    )
+    run_worker_pool(max(1, args.procs), batch_size=args.batch_size, concurrency=args.concurrency)
+
+
+if __name__ == "__main__":
+    main()
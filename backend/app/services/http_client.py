@@ -0,0 +1,200 @@
+"""Application-lifetime pooled aiohttp sessions for outbound API traffic.
+
+Discovery used to build a fresh `ClientSession` + `TCPConnector` per service
+instance, so every search paid new DNS lookups and TLS handshakes to the
+same handful of scholarly APIs. The registry is started once on the API's
+event loop (see `main.py` startup) and hands out long-lived sessions:
+
+  - one pool per provider, with a per-host connection limit matched to
+    that provider's rate limits (arXiv and NCBI are strict; OpenAlex and
+    Crossref are generous), plus a "default" pool for everything else
+  - keep-alive connections reused across requests
+  - DNS results cached per connector (and resolved with aiodns if installed)
+  - connection reuse / DNS cache counters, exposed via GET /metrics/http
+
+aiohttp speaks HTTP/1.1 only; keep-alive reuse is what removes the
+per-request handshake cost here.
+
+aiohttp sessions are bound to the loop that created them. Code running on
+another loop (e.g. discussion-AI tools, which use asyncio.run in a worker
+thread) gets None from `borrow_session` and must use its own session.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import aiohttp
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL = "default"
+
+# Per-host connection limits per provider pool, sized to each API's limits
+PROVIDER_CONNECTION_LIMITS: Dict[str, int] = {
+    "arxiv": 2,  # export.arxiv.org asks for one request every 3s
+    "semantic_scholar": 4,  # 1 req/s with a key; bursts are 429'd
+    "google_scholar": 2,  # SerpAPI, metered quota
+    "pubmed": 3,  # NCBI E-utilities: 3 req/s without an API key
+    "sciencedirect": 4,
+    "core": 4,
+    "europe_pmc": 6,
+    "crossref": 10,  # polite pool
+    "openalex": 10,
+    "unpaywall": 8,
+    DEFAULT_POOL: 10,
+}
+
+
+@dataclass
+class PoolStats:
+    """Cumulative counters for one pool (from aiohttp trace hooks)."""
+
+    requests: int = 0
+    request_errors: int = 0
+    connections_created: int = 0
+    connections_reused: int = 0
+    dns_cache_hits: int = 0
+    dns_cache_misses: int = 0
+
+    @property
+    def reuse_ratio(self) -> float:
+        total = self.connections_created + self.connections_reused
+        return self.connections_reused / total if total else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "request_errors": self.request_errors,
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+            "reuse_ratio": round(self.reuse_ratio, 4),
+            "dns_cache_hits": self.dns_cache_hits,
+            "dns_cache_misses": self.dns_cache_misses,
+        }
+
+
+def _make_resolver():
+    try:
+        import aiodns  # noqa: F401
+
+        return aiohttp.AsyncResolver()
+    except Exception:
+        return None  # aiohttp's default threaded resolver
+
+
+class HttpClientRegistry:
+    """Lazily created, loop-bound pooled sessions keyed by provider name."""
+
+    def __init__(self) -> None:
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._sessions: Dict[str, aiohttp.ClientSession] = {}
+        self.stats: Dict[str, PoolStats] = {}
+
+    @property
+    def started(self) -> bool:
+        return self._loop is not None
+
+    def start(self) -> None:
+        """Bind the registry to the running loop. Sessions are created on
+        first use. Call from the application's startup hook."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not None and self._loop is not loop:
+            raise RuntimeError("HttpClientRegistry already started on another event loop")
+        self._loop = loop
+        logger.info("[HttpClient] Pooled sessions enabled (dns_ttl=%ss)", settings.HTTP_DNS_CACHE_SECONDS)
+
+    async def close(self) -> None:
+        sessions, self._sessions = self._sessions, {}
+        for session in sessions.values():
+            if not session.closed:
+                await session.close()
+        self._loop = None
+
+    def available(self) -> bool:
+        """True when sessions may be borrowed from the current loop."""
+        if self._loop is None or self._loop.is_closed():
+            return False
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def session(self, provider: str = DEFAULT_POOL) -> aiohttp.ClientSession:
+        """Shared session for `provider` (unknown names use the default pool)."""
+        if self._loop is None:
+            raise RuntimeError("HttpClientRegistry not started")
+        pool = provider if provider in PROVIDER_CONNECTION_LIMITS else DEFAULT_POOL
+        session = self._sessions.get(pool)
+        if session is None or session.closed:
+            session = self._create_session(pool)
+            self._sessions[pool] = session
+        return session
+
+    def _create_session(self, pool: str) -> aiohttp.ClientSession:
+        stats = self.stats.setdefault(pool, PoolStats())
+        connector = aiohttp.TCPConnector(
+            limit=settings.HTTP_POOL_LIMIT,
+            limit_per_host=PROVIDER_CONNECTION_LIMITS[pool],
+            ttl_dns_cache=settings.HTTP_DNS_CACHE_SECONDS,
+            use_dns_cache=True,
+            keepalive_timeout=settings.HTTP_POOL_KEEPALIVE_SECONDS,
+            resolver=_make_resolver(),
+        )
+        return aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=120, connect=10),
+            connector=connector,
+            trace_configs=[self._trace_config(stats)],
+        )
+
+    @staticmethod
+    def _trace_config(stats: PoolStats) -> aiohttp.TraceConfig:
+        def counter(field_name: str):
+            async def _on_event(session, ctx, params) -> None:
+                setattr(stats, field_name, getattr(stats, field_name) + 1)
+
+            return _on_event
+
+        trace = aiohttp.TraceConfig()
+        trace.on_request_start.append(counter("requests"))
+        trace.on_request_exception.append(counter("request_errors"))
+        trace.on_connection_create_end.append(counter("connections_created"))
+        trace.on_connection_reuseconn.append(counter("connections_reused"))
+        trace.on_dns_cache_hit.append(counter("dns_cache_hits"))
+        trace.on_dns_cache_miss.append(counter("dns_cache_misses"))
+        return trace
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "started": self.started,
+            "pools": {name: stats.as_dict() for name, stats in sorted(self.stats.items())},
+        }
+
+
+_registry = HttpClientRegistry()
+
+
+def get_http_client_registry() -> HttpClientRegistry:
+    return _registry
+
+
+def borrow_session(provider: str = DEFAULT_POOL) -> Optional[aiohttp.ClientSession]:
+    """Pooled session for `provider`, or None when the registry is disabled,
+    not started, or bound to a different event loop than the caller's."""
+    if not settings.HTTP_POOL_ENABLED or not _registry.available():
+        return None
+    return _registry.session(provider)
+
+
+async def start_http_client_registry() -> None:
+    if settings.HTTP_POOL_ENABLED:
+        _registry.start()
+
+
+async def close_http_client_registry() -> None:
+    await _registry.close()
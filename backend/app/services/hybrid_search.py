@@ -0,0 +1,187 @@
+"""Hybrid (full-text + vector) chunk retrieval for reference and document chat.
+
+`hybrid_chunk_search` runs one statement with two candidate lists over
+`document_chunks`:
+
+  - vector: the `limit * CANDIDATE_FACTOR` nearest chunks by cosine distance
+    (HNSW index on `embedding`), when a query embedding is given
+  - text: as many chunks again, ranked by `ts_rank` over the generated
+    `search_vector` columns (GIN indexes). Any query term can match; a
+    reference's or document's title and abstract count for each of its chunks.
+
+The two lists are fused with reciprocal rank fusion, score = sum over lists
+of 1 / (RRF_K + rank), and the top `limit` come back. A chunk found by both
+lists beats one that is first in only one list. RRF only looks at ranks, so
+cosine similarities and ts_rank values never have to be put on one scale.
+
+If the vector query fails (e.g. pgvector is missing), the search runs again
+with text only. Either way it runs inside a savepoint, so the caller's
+transaction is unaffected.
+"""
+
+from __future__ import annotations
+
+import logging
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.services.vector_search import apply_hnsw_search_hints, to_pgvector_literal
+
+logger = logging.getLogger(__name__)
+
+# Standard RRF damping constant (Cormack et al.)
+RRF_K = 60
+# Each list contributes this many candidates per requested result
+CANDIDATE_FACTOR = 4
+
+# plainto_tsquery normalises and drops stop words; swapping its ANDs for ORs
+# lets any term match, as the old per-term keyword count did
+_TSQUERY = "replace(plainto_tsquery('english', :query_text)::text, '&', '|')::tsquery"
+
+
+@dataclass(frozen=True)
+class ChunkScope:
+    """Which chunks a search may return, as SQL fragments over `dc`."""
+
+    joins: str
+    where: str
+    # Text match and rank over the chunk plus its parent's metadata
+    match: str
+    rank: str
+    params: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def for_references(cls, *, paper_id: Optional[Any] = None, owner_id: Optional[Any] = None) -> "ChunkScope":
+        """Chunks of analyzed references attached to `paper_id`, else owned by `owner_id`."""
+        joins = 'JOIN "references" r ON r.id = dc.reference_id'
+        if paper_id:
+            joins += " JOIN paper_references pr ON pr.reference_id = r.id"
+            where = "pr.paper_id = :scope_id"
+            scope_id = str(paper_id)
+        else:
+            where = "r.owner_id = :scope_id"
+            scope_id = str(owner_id)
+        return cls(
+            joins=joins,
+            where=f"r.status = 'analyzed' AND {where}",
+            match="(dc.search_vector @@ q.tsq OR r.search_vector @@ q.tsq)",
+            rank="ts_rank(dc.search_vector, q.tsq) + ts_rank(r.search_vector, q.tsq)",
+            params={"scope_id": scope_id},
+        )
+
+    @classmethod
+    def for_documents(cls, *, owner_id: Any) -> "ChunkScope":
+        """Chunks of `owner_id`'s documents that were processed for AI."""
+        return cls(
+            joins="JOIN documents d ON d.id = dc.document_id",
+            where="d.owner_id = :scope_id AND d.is_processed_for_ai = true",
+            match="(dc.search_vector @@ q.tsq OR d.search_vector @@ q.tsq)",
+            rank="ts_rank(dc.search_vector, q.tsq) + ts_rank(d.search_vector, q.tsq)",
+            params={"scope_id": str(owner_id)},
+        )
+
+
+@dataclass
+class HybridHit:
+    chunk_id: uuid.UUID
+    score: float  # fused RRF score
+    similarity: Optional[float] = None  # cosine similarity, if the vector list found it
+    text_rank: Optional[float] = None  # ts_rank, if the text list found it
+
+
+def _build_sql(scope: ChunkScope, with_vector: bool) -> str:
+    if with_vector:
+        vector_cte = f"""
+            vec AS (
+                SELECT id, similarity, row_number() OVER (ORDER BY similarity DESC) AS rnk
+                FROM (
+                    SELECT dc.id, 1 - (dc.embedding <=> CAST(:query_embedding AS vector)) AS similarity
+                    FROM document_chunks dc {scope.joins}
+                    WHERE {scope.where} AND dc.embedding IS NOT NULL
+                    ORDER BY dc.embedding <=> CAST(:query_embedding AS vector)
+                    LIMIT :candidates
+                ) nearest
+            )"""
+    else:
+        vector_cte = """
+            vec AS (
+                SELECT NULL::uuid AS id, NULL::float8 AS similarity, NULL::bigint AS rnk
+                WHERE false
+            )"""
+    return f"""
+        WITH q AS (SELECT {_TSQUERY} AS tsq),
+        {vector_cte},
+        txt AS (
+            SELECT id, text_rank, row_number() OVER (ORDER BY text_rank DESC) AS rnk
+            FROM (
+                SELECT dc.id, {scope.rank} AS text_rank
+                FROM document_chunks dc {scope.joins} CROSS JOIN q
+                WHERE {scope.where} AND {scope.match}
+                ORDER BY text_rank DESC
+                LIMIT :candidates
+            ) matched
+        )
+        SELECT
+            coalesce(vec.id, txt.id) AS id,
+            coalesce(1.0 / (:rrf_k + vec.rnk), 0) + coalesce(1.0 / (:rrf_k + txt.rnk), 0) AS score,
+            vec.similarity,
+            txt.text_rank
+        FROM vec FULL OUTER JOIN txt ON vec.id = txt.id
+        ORDER BY score DESC
+        LIMIT :limit
+    """
+
+
+def _run(
+    db: Session,
+    scope: ChunkScope,
+    query_text: str,
+    query_embedding: Optional[Sequence[float]],
+    limit: int,
+) -> List[HybridHit]:
+    candidates = max(limit, limit * CANDIDATE_FACTOR)
+    params: Dict[str, Any] = {
+        **scope.params,
+        "query_text": query_text,
+        "candidates": candidates,
+        "rrf_k": RRF_K,
+        "limit": limit,
+    }
+    with db.begin_nested():
+        if query_embedding is not None:
+            apply_hnsw_search_hints(db, candidates)
+            params["query_embedding"] = to_pgvector_literal(query_embedding)
+        rows = db.execute(text(_build_sql(scope, query_embedding is not None)), params).fetchall()
+    return [
+        HybridHit(
+            chunk_id=uuid.UUID(str(row[0])),
+            score=float(row[1]),
+            similarity=float(row[2]) if row[2] is not None else None,
+            text_rank=float(row[3]) if row[3] is not None else None,
+        )
+        for row in rows
+    ]
+
+
+def hybrid_chunk_search(
+    db: Session,
+    scope: ChunkScope,
+    query_text: str,
+    query_embedding: Optional[Sequence[float]] = None,
+    limit: int = 8,
+) -> List[HybridHit]:
+    """Top-`limit` chunks in `scope` by RRF over full-text and vector rank.
+
+    Pass `query_embedding=None` for text-only search."""
+    if limit <= 0:
+        return []
+    if query_embedding is not None:
+        try:
+            return _run(db, scope, query_text, query_embedding, limit)
+        except Exception as exc:
+            logger.warning("Hybrid search: vector query failed, using full-text only: %s", exc)
+    return _run(db, scope, query_text, None, limit)
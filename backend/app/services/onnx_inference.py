@@ -0,0 +1,248 @@
+"""ONNX Runtime inference backend for the local transformer models.
+
+We serve on CPU only. Both local models are small BERT encoders:
+all-MiniLM-L6-v2 (bi-encoder) and ms-marco-MiniLM-L-6-v2 (cross-encoder).
+Running them as dynamically int8-quantized ONNX graphs under onnxruntime
+is typically 2-4x faster than full-precision PyTorch. The scores stay
+within the tolerances checked by tests/bench_inference_backends.py.
+
+Selected with INFERENCE_BACKEND=onnx. On first use each model is exported
+with torch.onnx (torch and transformers ship with sentence-transformers),
+quantized with onnxruntime.quantization, and written under
+INFERENCE_ONNX_CACHE_DIR. Later loads reuse the exported files.
+
+The wrappers mirror the slice of the sentence-transformers API the callers
+use (`SentenceTransformer.encode`, `CrossEncoder.predict`), so they are
+drop-in replacements for the objects returned by the existing lazy loaders.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, Union
+
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+BACKEND_TORCH = "torch"
+BACKEND_ONNX = "onnx"
+
+# Max sequence lengths used by the sentence-transformers configs of the two models
+EMBEDDER_MAX_LENGTH = 256
+CROSS_ENCODER_MAX_LENGTH = 512
+
+_sessions: Dict[Tuple[str, str], Any] = {}
+_sessions_lock = threading.Lock()
+
+# Models whose ONNX export/load failed in this process; they run on PyTorch
+_onnx_load_failures: Set[str] = set()
+
+
+def inference_backend() -> str:
+    """Configured backend name, normalized (unknown values mean torch)."""
+    backend = (settings.INFERENCE_BACKEND or BACKEND_TORCH).strip().lower()
+    return BACKEND_ONNX if backend == BACKEND_ONNX else BACKEND_TORCH
+
+
+def _model_dir(model_id: str) -> str:
+    safe = model_id.replace("/", "__")
+    return os.path.join(settings.INFERENCE_ONNX_CACHE_DIR, safe)
+
+
+def _hub_id(model_id: str) -> str:
+    # sentence-transformers resolves bare names like "all-MiniLM-L6-v2"
+    # under the sentence-transformers/ org; transformers needs the full id.
+    return model_id if "/" in model_id else f"sentence-transformers/{model_id}"
+
+
+def export_model(model_id: str, kind: str, *, quantize: bool = True) -> str:
+    """Export `model_id` to ONNX (and int8-quantize it) unless already on disk.
+
+    `kind` is "embedder" (AutoModel, last hidden state) or "cross_encoder"
+    (AutoModelForSequenceClassification, logits). Returns the model path.
+
+    Several workers may share INFERENCE_ONNX_CACHE_DIR, so everything is
+    written to a private staging directory and moved into place with
+    os.replace, the model file last: once the target exists, it and the
+    tokenizer files are complete.
+    """
+    model_dir = _model_dir(model_id)
+    target_name = "model.int8.onnx" if quantize else "model.onnx"
+    target = os.path.join(model_dir, target_name)
+    if os.path.exists(target):
+        return target
+
+    import torch
+    from transformers import AutoModel, AutoModelForSequenceClassification, AutoTokenizer
+
+    os.makedirs(model_dir, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".export-", dir=model_dir)
+    try:
+        fp32_path = os.path.join(staging, "model.onnx")
+        hub_id = _hub_id(model_id)
+        logger.info("[ONNX] Exporting %s (%s) to %s", hub_id, kind, model_dir)
+        tokenizer = AutoTokenizer.from_pretrained(hub_id)
+        tokenizer.save_pretrained(staging)
+        if kind == "cross_encoder":
+            model = AutoModelForSequenceClassification.from_pretrained(hub_id)
+            output_name = "logits"
+        else:
+            model = AutoModel.from_pretrained(hub_id)
+            output_name = "last_hidden_state"
+        model.eval()
+
+        sample = tokenizer(["warmup query"], ["warmup document"], return_tensors="pt")
+        input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+        dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+        dynamic_axes[output_name] = {0: "batch"} if kind == "cross_encoder" else {0: "batch", 1: "sequence"}
+        with torch.no_grad():
+            torch.onnx.export(
+                model,
+                tuple(sample[name] for name in input_names),
+                fp32_path,
+                input_names=input_names,
+                output_names=[output_name],
+                dynamic_axes=dynamic_axes,
+                opset_version=14,
+            )
+
+        if quantize:
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+
+            quantize_dynamic(fp32_path, os.path.join(staging, target_name), weight_type=QuantType.QInt8)
+            logger.info("[ONNX] Quantized %s to int8", model_id)
+
+        names = sorted(os.listdir(staging), key=lambda name: name == target_name)
+        for name in names:
+            os.replace(os.path.join(staging, name), os.path.join(model_dir, name))
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return target
+
+
+def _load_session(model_id: str, kind: str):
+    """(session, tokenizer) for `model_id`, cached per process."""
+    key = (model_id, kind)
+    with _sessions_lock:
+        cached = _sessions.get(key)
+        if cached is not None:
+            return cached
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        path = export_model(model_id, kind, quantize=settings.INFERENCE_ONNX_QUANTIZE)
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = settings.INFERENCE_ONNX_THREADS
+        options.inter_op_num_threads = 1
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        session = ort.InferenceSession(path, sess_options=options, providers=["CPUExecutionProvider"])
+        tokenizer = AutoTokenizer.from_pretrained(_model_dir(model_id))
+        logger.info(
+            "[ONNX] Loaded %s (%s, threads=%d)",
+            os.path.basename(path), model_id, settings.INFERENCE_ONNX_THREADS,
+        )
+        _sessions[key] = (session, tokenizer)
+        return session, tokenizer
+
+
+class _OnnxModel:
+    def __init__(self, session, tokenizer, max_length: int):
+        self.session = session
+        self.tokenizer = tokenizer
+        self.max_length = max_length
+        self._input_names = {i.name for i in session.get_inputs()}
+
+    def _run(self, *texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        encoded = self.tokenizer(
+            *texts,
+            padding=True,
+            truncation=True,
+            max_length=self.max_length,
+            return_tensors="np",
+        )
+        feeds = {k: np.asarray(v, dtype=np.int64) for k, v in encoded.items() if k in self._input_names}
+        output = self.session.run(None, feeds)[0]
+        return output, feeds["attention_mask"]
+
+
+class OnnxSentenceEmbedder(_OnnxModel):
+    """Mean-pooled sentence embeddings, API-compatible with SentenceTransformer.encode."""
+
+    def __init__(self, session, tokenizer, max_length: int = EMBEDDER_MAX_LENGTH):
+        super().__init__(session, tokenizer, max_length)
+
+    def encode(
+        self,
+        sentences: Union[str, List[str]],
+        *,
+        batch_size: int = 32,
+        normalize_embeddings: bool = False,
+        convert_to_numpy: bool = True,
+        **_: Any,
+    ) -> np.ndarray:
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        chunks = []
+        for start in range(0, len(texts), batch_size):
+            hidden, mask = self._run(texts[start:start + batch_size])
+            weights = mask[..., None].astype(np.float32)
+            pooled = (hidden * weights).sum(axis=1) / np.clip(weights.sum(axis=1), 1e-9, None)
+            chunks.append(pooled.astype(np.float32))
+        embeddings = np.concatenate(chunks) if chunks else np.empty((0, 0), dtype=np.float32)
+        if normalize_embeddings and len(embeddings):
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings = embeddings / np.clip(norms, 1e-12, None)
+        return embeddings[0] if single else embeddings
+
+
+class OnnxCrossEncoder(_OnnxModel):
+    """Raw relevance logits, API-compatible with CrossEncoder.predict."""
+
+    def __init__(self, session, tokenizer, max_length: int = CROSS_ENCODER_MAX_LENGTH):
+        super().__init__(session, tokenizer, max_length)
+
+    def predict(self, pairs: Sequence[Sequence[str]], *, batch_size: int = 32, **_: Any) -> np.ndarray:
+        scores = []
+        for start in range(0, len(pairs), batch_size):
+            chunk = pairs[start:start + batch_size]
+            logits, _ = self._run([p[0] for p in chunk], [p[1] for p in chunk])
+            scores.append(logits.reshape(len(chunk), -1)[:, 0])
+        return np.concatenate(scores).astype(np.float32) if scores else np.empty(0, dtype=np.float32)
+
+
+def load_onnx_embedder(model_id: str) -> OnnxSentenceEmbedder:
+    session, tokenizer = _load_session(model_id, "embedder")
+    return OnnxSentenceEmbedder(session, tokenizer)
+
+
+def load_onnx_cross_encoder(model_id: str) -> OnnxCrossEncoder:
+    session, tokenizer = _load_session(model_id, "cross_encoder")
+    return OnnxCrossEncoder(session, tokenizer)
+
+
+def mark_onnx_load_failed(model_id: str) -> None:
+    """Latch a failed ONNX load: the model is served by PyTorch from now on."""
+    _onnx_load_failures.add(model_id)
+
+
+def onnx_load_failed(model_id: str) -> bool:
+    return model_id in _onnx_load_failures
+
+
+def model_variant(model_id: str, backend: Optional[str] = None) -> str:
+    """Identifier of the outputs a backend produces, for score/embedding
+    caches and stored vectors: the quantized graph's outputs differ slightly
+    from the PyTorch model's. A model whose ONNX load failed is reported as
+    PyTorch, since that is what serves it."""
+    backend = backend or inference_backend()
+    if backend == BACKEND_ONNX and not onnx_load_failed(model_id):
+        suffix = "onnx-int8" if settings.INFERENCE_ONNX_QUANTIZE else "onnx"
+        return f"{model_id}@{suffix}"
+    return model_id
@@ -17,6 +17,9 @@ Sources tried, in order:
 Each source is tried in parallel (bounded). First non-empty wins. We write
 *everything* to the cache — even negative ("unavailable") entries — so we don't
 retry known-empty DOIs.
+
+Cache writes are one multi-row `unnest` upsert per batch. Concurrent searches
+that miss on the same DOI share a single in-flight fetch (`_SingleFlight`).
 """
 from __future__ import annotations
 
@@ -24,9 +27,11 @@ import asyncio
 import logging
 import os
 import re
+import threading
+import weakref
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
 
 import aiohttp
 from sqlalchemy import text
@@ -36,6 +41,8 @@ from app.services.paper_discovery.models import DiscoveredPaper
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 MIN_ABSTRACT_LEN = 50
 MAX_PARALLEL_PER_SOURCE = 6
 PER_FETCH_TIMEOUT = 5.0
@@ -87,34 +94,105 @@ def bulk_lookup(db: Session, dois: List[str]) -> Dict[str, CachedAbstract]:
     }
 
 
-def bulk_upsert(db: Session, records: List[CachedAbstract]) -> None:
-    """Insert or update cache rows. Increments attempts on conflict."""
-    if not records:
-        return
-    now = datetime.now(timezone.utc)
+def _dedupe_records(records: List[CachedAbstract]) -> List[CachedAbstract]:
+    """One record per DOI (a multi-row upsert can't touch a row twice);
+    a record carrying an abstract wins over a negative one."""
+    by_doi: Dict[str, CachedAbstract] = {}
     for rec in records:
-        db.execute(
-            text(
-                """
-                INSERT INTO paper_abstracts (doi, abstract, source, status, attempts, fetched_at)
-                VALUES (:doi, :abstract, :source, :status, 1, :fetched_at)
-                ON CONFLICT (doi) DO UPDATE SET
-                    abstract = COALESCE(EXCLUDED.abstract, paper_abstracts.abstract),
-                    source = COALESCE(EXCLUDED.source, paper_abstracts.source),
-                    status = EXCLUDED.status,
-                    attempts = paper_abstracts.attempts + 1,
-                    fetched_at = EXCLUDED.fetched_at
-                """
-            ),
-            {
-                "doi": rec.doi,
-                "abstract": rec.abstract,
-                "source": rec.source,
-                "status": rec.status,
-                "fetched_at": now,
-            },
-        )
+        current = by_doi.get(rec.doi)
+        if current is None or (rec.abstract and not current.abstract):
+            by_doi[rec.doi] = rec
+    return list(by_doi.values())
+
+
+def bulk_upsert(db: Session, records: List[CachedAbstract], *, overwrite_fresh: bool = True) -> int:
+    """Insert or update cache rows in one statement. Increments attempts on
+    conflict. With `overwrite_fresh=False`, rows already holding a fresh
+    abstract are left untouched. Returns the number of rows written."""
+    records = _dedupe_records(records)
+    if not records:
+        return 0
+    keep_fresh = (
+        ""
+        if overwrite_fresh
+        else "WHERE NOT (paper_abstracts.status = 'fresh' AND paper_abstracts.abstract IS NOT NULL)"
+    )
+    result = db.execute(
+        text(
+            f"""
+            INSERT INTO paper_abstracts (doi, abstract, source, status, attempts, fetched_at)
+            SELECT t.doi, t.abstract, t.source, t.status, 1, :fetched_at
+            FROM unnest(
+                CAST(:dois AS text[]),
+                CAST(:abstracts AS text[]),
+                CAST(:sources AS text[]),
+                CAST(:statuses AS text[])
+            ) AS t(doi, abstract, source, status)
+            ON CONFLICT (doi) DO UPDATE SET
+                abstract = COALESCE(EXCLUDED.abstract, paper_abstracts.abstract),
+                source = COALESCE(EXCLUDED.source, paper_abstracts.source),
+                status = EXCLUDED.status,
+                attempts = paper_abstracts.attempts + 1,
+                fetched_at = EXCLUDED.fetched_at
+            {keep_fresh}
+            """
+        ),
+        {
+            "dois": [r.doi for r in records],
+            "abstracts": [r.abstract for r in records],
+            "sources": [r.source for r in records],
+            "statuses": [r.status for r in records],
+            "fetched_at": datetime.now(timezone.utc),
+        },
+    )
     db.commit()
+    return result.rowcount if result.rowcount is not None and result.rowcount >= 0 else len(records)
+
+
+# ---------------------------------------------------------------------------
+# Single-flight: concurrent searches share one in-flight fetch per DOI
+# ---------------------------------------------------------------------------
+
+class _SingleFlight:
+    """Coalesces concurrent calls for the same key into one running task.
+
+    Keyed per event loop: discussion-AI tools run discovery on their own
+    loops in worker threads, and a task can only be awaited on its loop.
+    The shared task is shielded, so a cancelled caller doesn't cancel the
+    fetch other callers are waiting on.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._by_loop: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Task]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self.coalesced = 0
+
+    def _tasks(self) -> Dict[str, asyncio.Task]:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            tasks = self._by_loop.get(loop)
+            if tasks is None:
+                tasks = self._by_loop[loop] = {}
+            return tasks
+
+    async def run(self, key: str, factory: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """Returns `(result, shared)`; `shared` is True when the result came
+        from a fetch another caller started."""
+        tasks = self._tasks()
+        task = tasks.get(key)
+        shared = task is not None
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            tasks[key] = task
+            task.add_done_callback(lambda _t: tasks.pop(key, None))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task), shared
+
+
+_fetch_flights = _SingleFlight()
 
 
 # ---------------------------------------------------------------------------
@@ -353,28 +431,38 @@ async def fetch_missing(
     }
     sem = asyncio.Semaphore(MAX_PARALLEL_PER_SOURCE)
 
-    async def run_one(doi: str) -> tuple[str, Optional[str], Optional[str]]:
+    async def fetch_limited(doi: str) -> tuple[Optional[str], Optional[str]]:
         async with sem:
-            abstract, source = await fetch_one(session, doi, title_by_doi.get(doi))
-            return doi, abstract, source
+            return await fetch_one(session, doi, title_by_doi.get(doi))
+
+    async def run_one(doi: str) -> tuple[str, Optional[str], Optional[str], bool]:
+        # A DOI already being fetched by a concurrent search is awaited, not refetched
+        (abstract, source), shared = await _fetch_flights.run(doi, lambda: fetch_limited(doi))
+        return doi, abstract, source, shared
 
     results = await asyncio.gather(
         *[run_one(doi) for doi in to_fetch],
         return_exceptions=True,
     )
 
-    # 3. Apply results to papers + upsert to cache
+    # 3. Apply results to papers + upsert to cache (the search that started a
+    # shared fetch writes its result)
     records: List[CachedAbstract] = []
     hits = 0
+    coalesced = 0
     for r in results:
         if isinstance(r, Exception):
             continue
-        doi, abstract, source = r  # type: ignore[misc]
+        doi, abstract, source, shared = r  # type: ignore[misc]
+        coalesced += shared
         if abstract:
             for paper in by_doi.get(doi, []):
                 paper.abstract = abstract
-            records.append(CachedAbstract(doi=doi, abstract=abstract, source=source, status="fresh"))
             hits += 1
+        if shared:
+            continue
+        if abstract:
+            records.append(CachedAbstract(doi=doi, abstract=abstract, source=source, status="fresh"))
         else:
             records.append(CachedAbstract(doi=doi, abstract=None, source=None, status="unavailable"))
 
@@ -384,8 +472,8 @@ async def fetch_missing(
         logger.warning("AbstractCache: bulk_upsert failed: %s", e)
 
     logger.info(
-        "AbstractCache: fetched %d/%d abstracts (hit rate %.0f%%)",
-        hits, len(to_fetch), (hits / len(to_fetch) * 100) if to_fetch else 0,
+        "AbstractCache: fetched %d/%d abstracts (hit rate %.0f%%, %d shared with concurrent searches)",
+        hits, len(to_fetch), (hits / len(to_fetch) * 100) if to_fetch else 0, coalesced,
     )
 
 
@@ -404,11 +492,10 @@ def write_back(db: Session, papers: List[DiscoveredPaper], source_label: str = "
         return
     # Only write if there's no fresh record yet — don't overwrite a good cached value
     # with an enricher-extracted one (the fetch order already tried cache first).
+    # The upsert's conflict clause enforces that, so no lookup round trip.
     try:
-        existing = bulk_lookup(db, [r.doi for r in rows])
-        new_rows = [r for r in rows if existing.get(r.doi, CachedAbstract("", None, None, "none")).status != "fresh" or not existing[r.doi].abstract]
-        if new_rows:
-            bulk_upsert(db, new_rows)
-            logger.info("AbstractCache: wrote back %d extracted abstracts", len(new_rows))
+        written = bulk_upsert(db, rows, overwrite_fresh=False)
+        if written:
+            logger.info("AbstractCache: wrote back %d extracted abstracts", written)
     except Exception as e:
         logger.warning("AbstractCache.write_back failed: %s", e)
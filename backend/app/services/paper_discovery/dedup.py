@@ -27,7 +27,8 @@ Merge rules:
 from __future__ import annotations
 
 import logging
-from typing import Dict, List, Tuple
+import math
+from typing import Dict, FrozenSet, Iterator, List, Optional, Tuple
 
 from app.services.paper_discovery.models import (
     DiscoveredPaper,
@@ -169,9 +170,13 @@ def _merge_into(winner: DiscoveredPaper, loser: DiscoveredPaper) -> None:
 
 
 # ---------------------------------------------------------------------------
-# Public entry point
+# Fuzzy title matching
 # ---------------------------------------------------------------------------
 
+_FUZZY_THRESHOLD = 0.75
+_FUZZY_MIN_TITLE_CHARS = 15
+
+
 def _fuzzy_title_similarity(a: str, b: str) -> float:
     """Fast, dependency-free similarity score for two normalized titles.
 
@@ -183,15 +188,73 @@ def _fuzzy_title_similarity(a: str, b: str) -> float:
     """
     if not a or not b:
         return 0.0
-    wa = set(a.split())
-    wb = set(b.split())
+    return _jaccard(frozenset(a.split()), frozenset(b.split()))
+
+
+def _jaccard(wa: FrozenSet[str], wb: FrozenSet[str]) -> float:
     if not wa or not wb:
         return 0.0
-    inter = wa & wb
-    union = wa | wb
-    return len(inter) / len(union)
+    inter = len(wa & wb)
+    return inter / (len(wa) + len(wb) - inter)
+
+
+def _fuzzy_title_pairs(
+    titles: List[str],
+    years: List[Optional[int]],
+    threshold: float = _FUZZY_THRESHOLD,
+) -> Iterator[Tuple[int, int]]:
+    """Yield every `(j, i)` with `j < i` whose title word sets have Jaccard
+    >= `threshold` and whose years (when both known) differ by at most 1.
+
+    Exact, but avoids the all-pairs scan with prefix filtering: tokens of each
+    title are ordered rarest-first, and two sets with Jaccard >= t must share
+    a token within their first `|x| - ceil(t·|x|) + 1` tokens. Only titles
+    sharing a prefix token are compared, and only when their sizes are
+    compatible (`t·|x| <= |y| <= |x|/t`). Titles are word-tokenized once.
+    """
+    token_sets: List[FrozenSet[str]] = [
+        frozenset(t.split()) if t and len(t) >= _FUZZY_MIN_TITLE_CHARS else frozenset()
+        for t in titles
+    ]
+
+    frequency: Dict[str, int] = {}
+    for tokens in token_sets:
+        for token in tokens:
+            frequency[token] = frequency.get(token, 0) + 1
+
+    # Inverted index over prefix tokens only: token -> earlier title indices
+    index: Dict[str, List[int]] = {}
+    for i, tokens in enumerate(token_sets):
+        size = len(tokens)
+        if not size:
+            continue
+        ordered = sorted(tokens, key=lambda tok: (frequency[tok], tok))
+        min_overlap = math.ceil(threshold * size - 1e-9)
+        prefix = ordered[: size - min_overlap + 1]
+
+        yi = years[i]
+        seen = set()
+        for token in prefix:
+            for j in index.get(token, ()):
+                if j in seen:
+                    continue
+                seen.add(j)
+                other = len(token_sets[j])
+                if other < threshold * size - 1e-9 or size < threshold * other - 1e-9:
+                    continue
+                yj = years[j]
+                if yi and yj and abs(yi - yj) > 1:
+                    continue
+                if _jaccard(tokens, token_sets[j]) >= threshold:
+                    yield j, i
+        for token in prefix:
+            index.setdefault(token, []).append(i)
 
 
+# ---------------------------------------------------------------------------
+# Public entry point
+# ---------------------------------------------------------------------------
+
 def dedupe_papers(papers: List[DiscoveredPaper]) -> Tuple[List[DiscoveredPaper], int]:
     """Group duplicate papers, merge them, and return the deduped list.
 
@@ -219,32 +282,19 @@ def dedupe_papers(papers: List[DiscoveredPaper]) -> Tuple[List[DiscoveredPaper],
 
     # Fuzzy fallback — catches "same work, different venue" where titles have
     # been rephrased (e.g. preprint vs published) or doubled with a subtitle.
-    # Only apply to papers that still have unique match keys (didn't already
-    # unify via DOI/arxiv/title+year) and whose years agree within ±1. The
-    # O(n^2) scan is bounded at typical n ~ 200 results per search.
-    from app.services.paper_discovery.models import _normalize_title
-    _FUZZY_THRESHOLD = 0.75
-    normalized_titles: List[str] = [_normalize_title(p.title or "") for p in papers]
-    for i in range(n):
-        ti = normalized_titles[i]
-        if not ti or len(ti) < 15:
-            continue
-        yi = papers[i].year
-        for j in range(i + 1, n):
-            tj = normalized_titles[j]
-            if not tj or len(tj) < 15:
-                continue
-            if uf.find(i) == uf.find(j):
-                continue  # already unified
-            yj = papers[j].year
-            if yi and yj and abs(yi - yj) > 1:
-                continue
-            if _fuzzy_title_similarity(ti, tj) >= _FUZZY_THRESHOLD:
-                uf.union(i, j)
-                logger.debug(
-                    "dedup fuzzy-title union: '%s' == '%s'",
-                    (papers[i].title or "")[:60], (papers[j].title or "")[:60],
-                )
+    # Pairs must have word-set Jaccard >= 0.75 and years within ±1. Candidate
+    # pairs come from an inverted token index, so batch searches and project
+    # auto-discovery merging thousands of records stay well below O(n^2).
+    normalized_titles: List[str] = [p.normalized_title for p in papers]
+    years = [p.year for p in papers]
+    for j, i in _fuzzy_title_pairs(normalized_titles, years):
+        if uf.find(i) == uf.find(j):
+            continue  # already unified
+        uf.union(j, i)
+        logger.debug(
+            "dedup fuzzy-title union: '%s' == '%s'",
+            (papers[j].title or "")[:60], (papers[i].title or "")[:60],
+        )
 
     # Collect groups
     groups: Dict[int, List[int]] = {}
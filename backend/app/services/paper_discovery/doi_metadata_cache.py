@@ -0,0 +1,269 @@
+"""Persistent DOI metadata cache for the Crossref and Unpaywall enrichers.
+
+Both enrichers used to hit api.crossref.org/works/{doi} and
+api.unpaywall.org/v2/{doi} for every DOI on every search, even though most
+searches in a deployment keep returning the same few thousand DOIs. The
+`paper_doi_metadata` table stores what the enrichers extract, and each field
+group has its own freshness:
+
+  - journal, year, URL (Crossref): immutable, never refetched
+  - citation count (Crossref): refetched after DOI_METADATA_CITATIONS_TTL_DAYS
+  - OA status, best PDF URL, landing URL (Unpaywall): refetched after
+    DOI_METADATA_OA_TTL_DAYS (embargoes lift, repositories add copies)
+  - "not found" answers from either API: retried after
+    DOI_METADATA_MISSING_TTL_DAYS
+
+Enrichers bulk-read rows for all their DOIs in one query, apply fresh
+fields, fetch only the rest, and write the fetched records back in one
+statement. The sync DB work runs in a worker thread. Any DB failure leaves
+the enrichers fetching everything, as before.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services.paper_discovery import abstract_cache
+from app.services.paper_discovery.abstract_cache import CachedAbstract, _normalize_doi
+
+logger = logging.getLogger(__name__)
+
+STATUS_OK = "ok"
+STATUS_MISSING = "missing"
+
+
+@dataclass
+class CrossrefRecord:
+    doi: str
+    status: str
+    journal: Optional[str] = None
+    year: Optional[int] = None
+    url: Optional[str] = None
+    citations_count: Optional[int] = None
+
+
+@dataclass
+class UnpaywallRecord:
+    doi: str
+    status: str
+    is_open_access: Optional[bool] = None
+    pdf_url: Optional[str] = None
+    landing_url: Optional[str] = None
+
+
+@dataclass
+class DoiMetadata:
+    """One `paper_doi_metadata` row."""
+
+    doi: str
+    journal: Optional[str] = None
+    year: Optional[int] = None
+    url: Optional[str] = None
+    citations_count: Optional[int] = None
+    crossref_status: Optional[str] = None
+    crossref_fetched_at: Optional[datetime] = None
+    citations_fetched_at: Optional[datetime] = None
+    is_open_access: Optional[bool] = None
+    pdf_url: Optional[str] = None
+    landing_url: Optional[str] = None
+    unpaywall_status: Optional[str] = None
+    unpaywall_fetched_at: Optional[datetime] = None
+
+    # --- freshness (per field group) ---
+
+    def crossref_record(self, now: datetime) -> Optional[CrossrefRecord]:
+        """Cached Crossref answer, or None when it must be refetched.
+
+        The citation count is dropped (left None) once stale; callers then
+        refetch, but still get the immutable fields from here."""
+        if self.crossref_status == STATUS_MISSING:
+            if _age(self.crossref_fetched_at, now) < timedelta(days=settings.DOI_METADATA_MISSING_TTL_DAYS):
+                return CrossrefRecord(doi=self.doi, status=STATUS_MISSING)
+            return None
+        if self.crossref_status != STATUS_OK:
+            return None
+        return CrossrefRecord(
+            doi=self.doi,
+            status=STATUS_OK,
+            journal=self.journal,
+            year=self.year,
+            url=self.url,
+            citations_count=self.citations_count if self.citations_fresh(now) else None,
+        )
+
+    def citations_fresh(self, now: datetime) -> bool:
+        return _age(self.citations_fetched_at, now) < timedelta(days=settings.DOI_METADATA_CITATIONS_TTL_DAYS)
+
+    def unpaywall_record(self, now: datetime) -> Optional[UnpaywallRecord]:
+        """Cached Unpaywall answer, or None when stale/absent."""
+        if self.unpaywall_status not in (STATUS_OK, STATUS_MISSING):
+            return None
+        ttl_days = (
+            settings.DOI_METADATA_OA_TTL_DAYS
+            if self.unpaywall_status == STATUS_OK
+            else settings.DOI_METADATA_MISSING_TTL_DAYS
+        )
+        if _age(self.unpaywall_fetched_at, now) >= timedelta(days=ttl_days):
+            return None
+        return UnpaywallRecord(
+            doi=self.doi,
+            status=self.unpaywall_status,
+            is_open_access=self.is_open_access,
+            pdf_url=self.pdf_url,
+            landing_url=self.landing_url,
+        )
+
+
+def _age(fetched_at: Optional[datetime], now: datetime) -> timedelta:
+    if fetched_at is None:
+        return timedelta.max
+    if fetched_at.tzinfo is None:
+        fetched_at = fetched_at.replace(tzinfo=timezone.utc)
+    return now - fetched_at
+
+
+# ---------------------------------------------------------------------------
+# Cache I/O
+# ---------------------------------------------------------------------------
+
+_COLUMNS = (
+    "doi, journal, year, url, citations_count, crossref_status, crossref_fetched_at, "
+    "citations_fetched_at, is_open_access, pdf_url, landing_url, unpaywall_status, "
+    "unpaywall_fetched_at"
+)
+
+
+def bulk_lookup(db: Session, dois: Iterable[str]) -> Dict[str, DoiMetadata]:
+    """Return {doi_normalized: DoiMetadata} for every cached DOI."""
+    clean = [d for d in {_normalize_doi(x) for x in dois} if d]
+    if not clean:
+        return {}
+    rows = db.execute(
+        text(f"SELECT {_COLUMNS} FROM paper_doi_metadata WHERE doi = ANY(:dois)"),
+        {"dois": clean},
+    ).mappings().all()
+    return {row["doi"]: DoiMetadata(**row) for row in rows}
+
+
+def bulk_upsert_crossref(db: Session, records: List[CrossrefRecord]) -> None:
+    """Write Crossref answers. A missing answer never erases known fields."""
+    if not records:
+        return
+    now = datetime.now(timezone.utc)
+    db.execute(
+        text(
+            """
+            INSERT INTO paper_doi_metadata
+                (doi, journal, year, url, citations_count, crossref_status,
+                 crossref_fetched_at, citations_fetched_at)
+            VALUES (:doi, :journal, :year, :url, :citations_count, :status, :now,
+                    CASE WHEN :status = 'ok' THEN CAST(:now AS TIMESTAMPTZ) END)
+            ON CONFLICT (doi) DO UPDATE SET
+                journal = COALESCE(EXCLUDED.journal, paper_doi_metadata.journal),
+                year = COALESCE(EXCLUDED.year, paper_doi_metadata.year),
+                url = COALESCE(EXCLUDED.url, paper_doi_metadata.url),
+                citations_count = COALESCE(EXCLUDED.citations_count, paper_doi_metadata.citations_count),
+                crossref_status = CASE
+                    WHEN paper_doi_metadata.crossref_status = 'ok' THEN 'ok'
+                    ELSE EXCLUDED.crossref_status END,
+                crossref_fetched_at = EXCLUDED.crossref_fetched_at,
+                citations_fetched_at = COALESCE(EXCLUDED.citations_fetched_at, paper_doi_metadata.citations_fetched_at)
+            """
+        ),
+        [
+            {
+                "doi": r.doi,
+                "journal": r.journal,
+                "year": r.year,
+                "url": r.url,
+                "citations_count": r.citations_count,
+                "status": r.status,
+                "now": now,
+            }
+            for r in records
+        ],
+    )
+    db.commit()
+
+
+def bulk_upsert_unpaywall(db: Session, records: List[UnpaywallRecord]) -> None:
+    """Write Unpaywall answers; OA fields are replaced wholesale (they can change)."""
+    if not records:
+        return
+    now = datetime.now(timezone.utc)
+    db.execute(
+        text(
+            """
+            INSERT INTO paper_doi_metadata
+                (doi, is_open_access, pdf_url, landing_url, unpaywall_status, unpaywall_fetched_at)
+            VALUES (:doi, :is_open_access, :pdf_url, :landing_url, :status, :now)
+            ON CONFLICT (doi) DO UPDATE SET
+                is_open_access = EXCLUDED.is_open_access,
+                pdf_url = EXCLUDED.pdf_url,
+                landing_url = EXCLUDED.landing_url,
+                unpaywall_status = EXCLUDED.unpaywall_status,
+                unpaywall_fetched_at = EXCLUDED.unpaywall_fetched_at
+            """
+        ),
+        [
+            {
+                "doi": r.doi,
+                "is_open_access": r.is_open_access,
+                "pdf_url": r.pdf_url,
+                "landing_url": r.landing_url,
+                "status": r.status,
+                "now": now,
+            }
+            for r in records
+        ],
+    )
+    db.commit()
+
+
+class DoiMetadataStore:
+    """Async facade over the table; each call uses its own DB session in a thread."""
+
+    async def lookup(self, dois: Iterable[str]) -> Dict[str, DoiMetadata]:
+        dois = list(dois)
+        if not dois or not settings.DOI_METADATA_CACHE_ENABLED:
+            return {}
+        try:
+            return await asyncio.to_thread(self._run, bulk_lookup, dois)
+        except Exception as exc:
+            logger.warning("DoiMetadataCache: lookup failed: %s", exc)
+            return {}
+
+    async def store_crossref(self, records: List[CrossrefRecord]) -> None:
+        await self._store(bulk_upsert_crossref, records)
+
+    async def store_unpaywall(self, records: List[UnpaywallRecord]) -> None:
+        await self._store(bulk_upsert_unpaywall, records)
+
+    async def store_abstracts(self, records: List[CachedAbstract]) -> None:
+        await self._store(abstract_cache.bulk_upsert, records)
+
+    async def _store(self, writer, records) -> None:
+        if not records or not settings.DOI_METADATA_CACHE_ENABLED:
+            return
+        try:
+            await asyncio.to_thread(self._run, writer, records)
+        except Exception as exc:
+            logger.warning("DoiMetadataCache: upsert failed: %s", exc)
+
+    @staticmethod
+    def _run(fn, arg):
+        from app.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            return fn(db, arg)
+        finally:
+            db.close()
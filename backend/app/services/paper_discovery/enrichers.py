@@ -6,142 +6,243 @@ import asyncio
 import io
 import logging
 import re
+from datetime import datetime, timezone
 from typing import List, Optional
 from urllib.parse import urlparse
 
 import aiohttp
 
+from app.services.paper_discovery.abstract_cache import CachedAbstract, _normalize_doi
 from app.services.paper_discovery.config import DiscoveryConfig
+from app.services.paper_discovery.doi_metadata_cache import (
+    STATUS_MISSING,
+    STATUS_OK,
+    CrossrefRecord,
+    DoiMetadataStore,
+    UnpaywallRecord,
+)
 from app.services.paper_discovery.interfaces import PaperEnricher
 from app.services.paper_discovery.models import DiscoveredPaper
 
 logger = logging.getLogger(__name__)
 
+def _apply_crossref(paper: DiscoveredPaper, record: CrossrefRecord) -> None:
+    """Fill fields the paper is still missing from a Crossref record."""
+    if not paper.journal and record.journal:
+        paper.journal = record.journal
+    if not paper.year and record.year:
+        paper.year = record.year
+    if paper.citations_count is None and record.citations_count is not None:
+        paper.citations_count = record.citations_count
+    if not paper.url and record.url:
+        paper.url = record.url
+
+
+def _apply_unpaywall(paper: DiscoveredPaper, record: UnpaywallRecord) -> None:
+    if record.is_open_access:
+        paper.is_open_access = True
+    if record.pdf_url:
+        paper.pdf_url = record.pdf_url
+    if record.landing_url:
+        paper.open_access_url = record.landing_url
+
+
 class CrossrefEnricher(PaperEnricher):
-    """Enrich papers using Crossref API"""
+    """Enrich papers using Crossref API.
+
+    DOIs with a fresh row in the DOI metadata cache are filled from it; only
+    the rest (or those whose citation count is stale) hit the API.
+    """
     
-    def __init__(self, session: aiohttp.ClientSession, config: DiscoveryConfig):
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        config: DiscoveryConfig,
+        metadata_cache: Optional[DoiMetadataStore] = None,
+    ):
         self.session = session
         self.config = config
+        self.metadata_cache = metadata_cache if metadata_cache is not None else DoiMetadataStore()
     
     async def enrich(self, papers: List[DiscoveredPaper]) -> None:
         """Enrich papers with Crossref metadata"""
-        if not papers:
+        candidates = [p for p in papers if p.doi]
+        if not candidates:
             return
-        
+
+        now = datetime.now(timezone.utc)
+        cached = await self.metadata_cache.lookup(p.doi for p in candidates)
+        to_fetch: List[DiscoveredPaper] = []
+        for paper in candidates:
+            row = cached.get(_normalize_doi(paper.doi))
+            record = row.crossref_record(now) if row else None
+            if record is not None:
+                _apply_crossref(paper, record)
+            if record is None or (record.status == STATUS_OK and not row.citations_fresh(now)):
+                to_fetch.append(paper)
+        if not to_fetch:
+            logger.info("DoiMetadataCache: crossref %d/%d cached", len(candidates), len(candidates))
+            return
+
         sem = asyncio.Semaphore(self.config.max_concurrent_enrichments)
+        records: List[CrossrefRecord] = []
+        abstracts: List[CachedAbstract] = []
         
         async def enrich_single(paper: DiscoveredPaper):
             async with sem:
                 try:
-                    if not paper.doi:
-                        return
-                    
                     url = f"https://api.crossref.org/works/{paper.doi}"
                     async with self.session.get(url) as resp:
+                        if resp.status == 404:
+                            records.append(CrossrefRecord(doi=_normalize_doi(paper.doi), status=STATUS_MISSING))
+                            return
                         if resp.status != 200:
                             return
                         
                         data = await resp.json()
                         item = data.get('message', {})
-                        
-                        # Update missing fields
-                        if not paper.journal and item.get('container-title'):
-                            paper.journal = item['container-title'][0]
-                        
-                        if not paper.year and item.get('published-print'):
-                            try:
-                                paper.year = item['published-print']['date-parts'][0][0]
-                            except (KeyError, IndexError):
-                                pass
-                        
-                        if paper.citations_count is None:
-                            paper.citations_count = item.get('is-referenced-by-count')
-                        
-                        if not paper.url and item.get('URL'):
-                            paper.url = item['URL']
-
-                        # Crossref sometimes has a JATS-wrapped abstract that
-                        # OpenAlex/ScienceDirect don't surface. Use it when ours is
-                        # missing — the ranker needs abstract tokens to score well.
-                        if (not paper.abstract or len(paper.abstract) < 50) and item.get('abstract'):
-                            cleaned = re.sub(r'<[^>]+>', ' ', item['abstract'])
-                            cleaned = re.sub(r'\s+', ' ', cleaned).strip()
-                            if len(cleaned) >= 50:
+
+                    record = CrossrefRecord(
+                        doi=_normalize_doi(paper.doi),
+                        status=STATUS_OK,
+                        journal=(item.get('container-title') or [None])[0],
+                        citations_count=item.get('is-referenced-by-count'),
+                        url=item.get('URL'),
+                    )
+                    try:
+                        record.year = item['published-print']['date-parts'][0][0]
+                    except (KeyError, IndexError, TypeError):
+                        pass
+                    records.append(record)
+                    _apply_crossref(paper, record)
+
+                    # Crossref sometimes has a JATS-wrapped abstract that
+                    # OpenAlex/ScienceDirect don't surface. Use it when ours is
+                    # missing — the ranker needs abstract tokens to score well.
+                    if item.get('abstract'):
+                        cleaned = re.sub(r'<[^>]+>', ' ', item['abstract'])
+                        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+                        if len(cleaned) >= 50:
+                            abstracts.append(
+                                CachedAbstract(doi=record.doi, abstract=cleaned, source="crossref", status="fresh")
+                            )
+                            if not paper.abstract or len(paper.abstract) < 50:
                                 paper.abstract = cleaned
 
                 except Exception as e:
                     logger.debug(f"Crossref enrichment failed for {paper.doi}: {e}")
         
         await asyncio.gather(
-            *[enrich_single(p) for p in papers],
+            *[enrich_single(p) for p in to_fetch],
             return_exceptions=True
         )
+        logger.info(
+            "DoiMetadataCache: crossref %d/%d cached, fetched %d",
+            len(candidates) - len(to_fetch), len(candidates), len(records),
+        )
+        await self.metadata_cache.store_crossref(records)
+        # Abstracts live in the abstract cache, where CacheAbstractEnricher reads them
+        await self.metadata_cache.store_abstracts(abstracts)
 
 
 class UnpaywallEnricher(PaperEnricher):
-    """Enrich papers with Open Access information"""
+    """Enrich papers with Open Access information.
+
+    Served from the DOI metadata cache while the OA fields are fresh.
+    """
     
-    def __init__(self, session: aiohttp.ClientSession, config: DiscoveryConfig, email: str):
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        config: DiscoveryConfig,
+        email: str,
+        metadata_cache: Optional[DoiMetadataStore] = None,
+    ):
         self.session = session
         self.config = config
         self.email = email
+        self.metadata_cache = metadata_cache if metadata_cache is not None else DoiMetadataStore()
     
     async def enrich(self, papers: List[DiscoveredPaper]) -> None:
         """Enrich papers with Unpaywall OA data"""
         if not papers or not self.email:
             return
-        
+        candidates = [p for p in papers if p.doi]
+        if not candidates:
+            return
+
+        now = datetime.now(timezone.utc)
+        cached = await self.metadata_cache.lookup(p.doi for p in candidates)
+        to_fetch: List[DiscoveredPaper] = []
+        for paper in candidates:
+            row = cached.get(_normalize_doi(paper.doi))
+            record = row.unpaywall_record(now) if row else None
+            if record is None:
+                to_fetch.append(paper)
+            else:
+                _apply_unpaywall(paper, record)
+        if not to_fetch:
+            logger.info("DoiMetadataCache: unpaywall %d/%d cached", len(candidates), len(candidates))
+            return
+
         sem = asyncio.Semaphore(self.config.max_concurrent_enrichments)
+        records: List[UnpaywallRecord] = []
         
         async def enrich_single(paper: DiscoveredPaper):
-            if not paper.doi:
-                return
-                
             async with sem:
                 try:
                     url = f"https://api.unpaywall.org/v2/{paper.doi}"
                     params = {'email': self.email}
                     
                     async with self.session.get(url, params=params) as resp:
+                        if resp.status == 404:
+                            records.append(UnpaywallRecord(doi=_normalize_doi(paper.doi), status=STATUS_MISSING))
+                            return
                         if resp.status != 200:
                             return
                         
                         data = await resp.json()
-                        
-                        if data.get('is_oa'):
-                            paper.is_open_access = True
-                        
-                        best_location = data.get('best_oa_location', {})
-                        if best_location:
-                            candidate_pdf = best_location.get('url_for_pdf')
-                            if candidate_pdf:
-                                try:
-                                    host = urlparse(candidate_pdf).netloc.lower()
-                                except Exception:
-                                    host = ''
-                                if host.endswith('nature.com'):
-                                    candidate_pdf = None
-                            if candidate_pdf:
-                                paper.pdf_url = candidate_pdf
-                            candidate_landing = best_location.get('url')
-                            if candidate_landing:
-                                try:
-                                    host = urlparse(candidate_landing).netloc.lower()
-                                except Exception:
-                                    host = ''
-                                if host.endswith('nature.com') and not candidate_pdf:
-                                    candidate_landing = None
-                            if candidate_landing:
-                                paper.open_access_url = candidate_landing
+
+                    record = UnpaywallRecord(
+                        doi=_normalize_doi(paper.doi),
+                        status=STATUS_OK,
+                        is_open_access=bool(data.get('is_oa')),
+                    )
+                    best_location = data.get('best_oa_location', {})
+                    if best_location:
+                        candidate_pdf = best_location.get('url_for_pdf')
+                        if candidate_pdf:
+                            try:
+                                host = urlparse(candidate_pdf).netloc.lower()
+                            except Exception:
+                                host = ''
+                            if host.endswith('nature.com'):
+                                candidate_pdf = None
+                        record.pdf_url = candidate_pdf or None
+                        candidate_landing = best_location.get('url')
+                        if candidate_landing:
+                            try:
+                                host = urlparse(candidate_landing).netloc.lower()
+                            except Exception:
+                                host = ''
+                            if host.endswith('nature.com') and not candidate_pdf:
+                                candidate_landing = None
+                        record.landing_url = candidate_landing or None
+                    records.append(record)
+                    _apply_unpaywall(paper, record)
                                 
                 except Exception as e:
                     logger.debug(f"Unpaywall enrichment failed for {paper.doi}: {e}")
 
         await asyncio.gather(
-            *[enrich_single(p) for p in papers],
+            *[enrich_single(p) for p in to_fetch],
             return_exceptions=True
         )
+        logger.info(
+            "DoiMetadataCache: unpaywall %d/%d cached, fetched %d",
+            len(candidates) - len(to_fetch), len(candidates), len(records),
+        )
+        await self.metadata_cache.store_unpaywall(records)
 
 
 class CacheAbstractEnricher(PaperEnricher):
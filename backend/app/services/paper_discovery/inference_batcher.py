@@ -0,0 +1,208 @@
+"""Cross-request dynamic batching for cross-encoder inference.
+
+Each discovery request scores ~50 (query, document) pairs. Scoring them one
+request at a time behind a lock makes concurrent searches queue up, and every
+request pays the fixed per-call overhead of a small batch. The batcher
+collects pairs from every in-flight request and runs one `predict` for all
+of them. It flushes as soon as `max_batch_pairs` are pending, or once the
+oldest pending request has waited `max_wait_seconds`. Each caller awaits a
+future that resolves to the scores for its own pairs.
+
+Only one `predict` runs at a time, the same guarantee the old lock gave.
+Requests arriving while a batch is on the CPU are coalesced into the next
+batch, so batch size grows with load instead of latency.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+Pair = Tuple[str, str]
+
+# Upper bounds (inclusive) for the batch-size and queue-depth histograms
+PAIR_BUCKETS: Tuple[int, ...] = (1, 16, 32, 64, 128, 256, 512, 1024)
+REQUEST_BUCKETS: Tuple[int, ...] = (1, 2, 4, 8, 16, 32)
+
+
+class Histogram:
+    """Fixed-bucket histogram: a count per bucket plus an overflow bucket."""
+
+    def __init__(self, bounds: Sequence[int]):
+        self.bounds = tuple(bounds)
+        self._counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def observe(self, value: int) -> None:
+        self._counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def as_dict(self) -> Dict[str, Any]:
+        buckets = {f"le_{b}": c for b, c in zip(self.bounds, self._counts)}
+        buckets["overflow"] = self._counts[-1]
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 2) if self.count else 0.0,
+            "max": self.max,
+            "buckets": buckets,
+        }
+
+
+@dataclass
+class _PendingRequest:
+    pairs: List[Pair]
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class CrossEncoderBatcher:
+    """Coalesces concurrent `score(pairs)` calls into batched `predict` calls.
+
+    `predict` is a blocking callable taking a list of pairs and returning one
+    score per pair; it runs in a worker thread.
+    """
+
+    def __init__(
+        self,
+        predict: Callable[[List[Pair]], Sequence[float]],
+        *,
+        max_batch_pairs: int = 256,
+        max_wait_seconds: float = 0.010,
+    ) -> None:
+        self._predict = predict
+        self.max_batch_pairs = max(1, max_batch_pairs)
+        self.max_wait_seconds = max(0.0, max_wait_seconds)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: List[_PendingRequest] = []
+        self._pending_pairs = 0
+        self._full: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._stats_lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        with self._stats_lock:
+            self.batch_pairs = Histogram(PAIR_BUCKETS)
+            self.batch_requests = Histogram(REQUEST_BUCKETS)
+            self.queue_depth = Histogram(PAIR_BUCKETS)
+            self.batches = 0
+            self.failures = 0
+            self.predict_seconds = 0.0
+
+    def _bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        # The API runs one loop per process, but scripts and tests may call
+        # asyncio.run() repeatedly; queue state never crosses loops.
+        if self._loop is not loop:
+            self._loop = loop
+            self._pending = []
+            self._pending_pairs = 0
+            self._full = asyncio.Event()
+            self._worker = None
+
+    async def score(self, pairs: Sequence[Pair]) -> List[float]:
+        """Scores for `pairs`, in order, computed in a shared batch."""
+        if not pairs:
+            return []
+        loop = asyncio.get_running_loop()
+        self._bind(loop)
+        request = _PendingRequest(pairs=list(pairs), future=loop.create_future())
+        self._pending.append(request)
+        self._pending_pairs += len(request.pairs)
+        with self._stats_lock:
+            self.queue_depth.observe(self._pending_pairs)
+
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._run())
+        elif self._pending_pairs >= self.max_batch_pairs:
+            self._full.set()
+        return await request.future
+
+    async def _run(self) -> None:
+        while self._pending:
+            if self._pending_pairs < self.max_batch_pairs:
+                waited = time.monotonic() - self._pending[0].enqueued_at
+                remaining = self.max_wait_seconds - waited
+                if remaining > 0:
+                    self._full.clear()
+                    try:
+                        await asyncio.wait_for(self._full.wait(), timeout=remaining)
+                    except asyncio.TimeoutError:
+                        pass
+            batch = self._take_batch()
+            if batch:
+                await self._execute(batch)
+
+    def _take_batch(self) -> List[_PendingRequest]:
+        """Pop whole requests up to `max_batch_pairs` (a single oversized
+        request is taken on its own). Cancelled callers are dropped."""
+        batch: List[_PendingRequest] = []
+        size = 0
+        while self._pending:
+            request = self._pending[0]
+            if request.future.done():
+                self._pending.pop(0)
+                self._pending_pairs -= len(request.pairs)
+                continue
+            if batch and size + len(request.pairs) > self.max_batch_pairs:
+                break
+            self._pending.pop(0)
+            self._pending_pairs -= len(request.pairs)
+            batch.append(request)
+            size += len(request.pairs)
+        return batch
+
+    async def _execute(self, batch: List[_PendingRequest]) -> None:
+        flat = [pair for request in batch for pair in request.pairs]
+        started = time.perf_counter()
+        try:
+            scores = await asyncio.to_thread(self._predict, flat)
+        except Exception as exc:
+            with self._stats_lock:
+                self.failures += 1
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(exc)
+            return
+        elapsed = time.perf_counter() - started
+
+        with self._stats_lock:
+            self.batches += 1
+            self.predict_seconds += elapsed
+            self.batch_pairs.observe(len(flat))
+            self.batch_requests.observe(len(batch))
+        logger.debug(
+            "[Reranker] batch pairs=%d requests=%d predict=%.0fms",
+            len(flat), len(batch), elapsed * 1000,
+        )
+
+        offset = 0
+        for request in batch:
+            n = len(request.pairs)
+            if not request.future.done():
+                request.future.set_result([float(s) for s in scores[offset:offset + n]])
+            offset += n
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "max_batch_pairs": self.max_batch_pairs,
+                "max_wait_ms": round(self.max_wait_seconds * 1000, 2),
+                "batches": self.batches,
+                "failures": self.failures,
+                "predict_seconds": round(self.predict_seconds, 3),
+                "pending_pairs": self._pending_pairs,
+                "batch_pairs": self.batch_pairs.as_dict(),
+                "batch_requests": self.batch_requests.as_dict(),
+                "queue_depth_pairs": self.queue_depth.as_dict(),
+            }
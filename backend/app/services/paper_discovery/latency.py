@@ -0,0 +1,297 @@
+"""Per-source latency tracking, adaptive timeouts, circuit breaking and hedging.
+
+Every discovery call races up to nine external sources, so its tail latency is
+set by the slowest provider of the day. This module keeps a rolling window of
+observed latencies per source and uses it to:
+
+  - derive each source's timeout from its own p95 instead of one global value
+  - order sources in fast mode by observed p50
+  - open a circuit breaker after repeated timeouts / 429s, so a failing
+    source is skipped outright until a cooldown elapses (then one half-open
+    probe decides whether it closes again)
+  - hedge a slow request: if no answer arrives by the source's p95, issue a
+    duplicate and take whichever finishes first
+
+State is process-wide (see `get_latency_tracker`) because orchestrators are
+built per request.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Sources whose requests spend a paid or tightly metered quota are never hedged
+NO_HEDGE_SOURCES = frozenset({"google_scholar", "sciencedirect"})
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+@dataclass
+class _SourceState:
+    samples: Deque[float]
+    consecutive_failures: int = 0
+    circuit: str = CLOSED
+    opened_at: float = 0.0
+    cooldown: float = 0.0
+    probe_in_flight: bool = False
+    last_rate_limited_at: float = 0.0
+    hedges: int = 0
+    hedge_wins: int = 0
+
+
+@dataclass
+class LatencySnapshot:
+    """Point-in-time view of one source, for telemetry."""
+
+    source: str
+    samples: int
+    p50: Optional[float]
+    p95: Optional[float]
+    circuit: str
+    consecutive_failures: int
+    hedges: int
+    hedge_wins: int
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "samples": self.samples,
+            "p50_s": round(self.p50, 3) if self.p50 is not None else None,
+            "p95_s": round(self.p95, 3) if self.p95 is not None else None,
+            "circuit": self.circuit,
+            "consecutive_failures": self.consecutive_failures,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+        }
+
+
+@dataclass
+class SourceLatencyTracker:
+    """Rolling latency window + circuit breaker per source name."""
+
+    window: int = 50
+    min_samples: int = 5
+    timeout_multiplier: float = 1.5
+    min_timeout: float = 2.0
+    failure_threshold: int = 3
+    cooldown_seconds: float = 60.0
+    max_cooldown_seconds: float = 600.0
+    _states: Dict[str, _SourceState] = field(default_factory=dict, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def _state(self, source: str) -> _SourceState:
+        state = self._states.get(source)
+        if state is None:
+            state = _SourceState(samples=deque(maxlen=self.window))
+            self._states[source] = state
+        return state
+
+    # --- observations ---
+
+    def record(self, source: str, elapsed: float, status: str) -> None:
+        """Record one request outcome. `status` uses SourceStats vocabulary:
+        success, timeout, rate_limited or error."""
+        now = time.monotonic()
+        with self._lock:
+            state = self._state(source)
+            # Timeouts are censored samples (true latency >= elapsed) but still
+            # belong in the window, or a source that keeps timing out would
+            # keep its optimistic p95.
+            if status in ("success", "timeout"):
+                state.samples.append(elapsed)
+            if status == "rate_limited":
+                state.last_rate_limited_at = now
+
+            if status in ("timeout", "rate_limited"):
+                state.consecutive_failures += 1
+                if state.circuit == HALF_OPEN:
+                    self._open(state, now, source, doubled=True)
+                elif state.circuit == CLOSED and state.consecutive_failures >= self.failure_threshold:
+                    self._open(state, now, source, doubled=False)
+            elif status == "success":
+                if state.circuit != CLOSED:
+                    logger.info("[Latency] %s circuit closed after successful probe", source)
+                state.consecutive_failures = 0
+                state.circuit = CLOSED
+                state.cooldown = 0.0
+            state.probe_in_flight = False
+
+    def release_probe(self, source: str) -> None:
+        """Give back a half-open probe that ended without an outcome (the
+        request was cancelled), so the next request can probe instead."""
+        with self._lock:
+            state = self._states.get(source)
+            if state is not None:
+                state.probe_in_flight = False
+
+    def _open(self, state: _SourceState, now: float, source: str, *, doubled: bool) -> None:
+        if doubled and state.cooldown:
+            state.cooldown = min(state.cooldown * 2, self.max_cooldown_seconds)
+        else:
+            state.cooldown = self.cooldown_seconds
+        state.circuit = OPEN
+        state.opened_at = now
+        logger.warning(
+            "[Latency] %s circuit open for %.0fs after %d consecutive timeouts/429s",
+            source, state.cooldown, state.consecutive_failures,
+        )
+
+    # --- decisions ---
+
+    def allow_request(self, source: str) -> bool:
+        """False while the source's circuit is open. After the cooldown a
+        single half-open probe is let through; its outcome closes or re-opens
+        the circuit."""
+        with self._lock:
+            state = self._state(source)
+            if state.circuit == CLOSED:
+                return True
+            if state.circuit == OPEN and time.monotonic() - state.opened_at >= state.cooldown:
+                state.circuit = HALF_OPEN
+            if state.circuit == HALF_OPEN and not state.probe_in_flight:
+                state.probe_in_flight = True
+                return True
+            return False
+
+    def percentiles(self, source: str) -> Tuple[Optional[float], Optional[float]]:
+        """(p50, p95) in seconds, or (None, None) with too few samples."""
+        with self._lock:
+            state = self._states.get(source)
+            if state is None or len(state.samples) < self.min_samples:
+                return None, None
+            ordered = sorted(state.samples)
+        return _percentile(ordered, 0.50), _percentile(ordered, 0.95)
+
+    def timeout_for(self, source: str, ceiling: float) -> float:
+        """Timeout derived from the source's own p95, capped by `ceiling`."""
+        _, p95 = self.percentiles(source)
+        if p95 is None:
+            return ceiling
+        return max(self.min_timeout, min(ceiling, p95 * self.timeout_multiplier))
+
+    def hedge_delay(self, source: str, timeout: float) -> Optional[float]:
+        """Seconds after which to send a duplicate request, or None to not hedge."""
+        if source in NO_HEDGE_SOURCES:
+            return None
+        with self._lock:
+            state = self._states.get(source)
+            # A recent 429 means the source is metering us; don't double the load
+            if state is not None and state.last_rate_limited_at:
+                if time.monotonic() - state.last_rate_limited_at < self.max_cooldown_seconds:
+                    return None
+        _, p95 = self.percentiles(source)
+        if p95 is None or p95 >= timeout:
+            return None
+        return p95
+
+    def expected_latency(self, source: str) -> Optional[float]:
+        p50, _ = self.percentiles(source)
+        return p50
+
+    def record_hedge(self, source: str, *, won: bool) -> None:
+        with self._lock:
+            state = self._state(source)
+            state.hedges += 1
+            if won:
+                state.hedge_wins += 1
+
+    def snapshot(self) -> Dict[str, LatencySnapshot]:
+        result: Dict[str, LatencySnapshot] = {}
+        for source in list(self._states):
+            p50, p95 = self.percentiles(source)
+            with self._lock:
+                state = self._states[source]
+                result[source] = LatencySnapshot(
+                    source=source,
+                    samples=len(state.samples),
+                    p50=p50,
+                    p95=p95,
+                    circuit=state.circuit,
+                    consecutive_failures=state.consecutive_failures,
+                    hedges=state.hedges,
+                    hedge_wins=state.hedge_wins,
+                )
+        return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._states.clear()
+
+
+async def run_hedged(
+    call: Callable[[], Awaitable[Any]],
+    *,
+    timeout: float,
+    hedge_after: Optional[float],
+) -> Tuple[Any, bool, bool]:
+    """Run `call()` with a timeout, hedged by a duplicate after `hedge_after`
+    seconds. Returns `(result, hedged, hedge_won)`. Raises asyncio.TimeoutError
+    when no attempt finishes in time, or the first error when all attempts
+    fail. Whichever attempt loses is cancelled."""
+    primary = asyncio.ensure_future(call())
+    if hedge_after is None or hedge_after >= timeout:
+        return await asyncio.wait_for(primary, timeout=timeout), False, False
+
+    attempts = [primary]
+    try:
+        done, _ = await asyncio.wait(attempts, timeout=hedge_after)
+        if not done:
+            attempts.append(asyncio.ensure_future(call()))
+        deadline = time.monotonic() + timeout - hedge_after
+        pending = set(attempts)
+        first_error: Optional[BaseException] = None
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+            for attempt in done:
+                if attempt.exception() is None:
+                    return attempt.result(), len(attempts) > 1, attempt is not primary
+                first_error = first_error or attempt.exception()
+        if first_error is not None and not pending:
+            raise first_error
+        raise asyncio.TimeoutError()
+    finally:
+        for attempt in attempts:
+            if not attempt.done():
+                attempt.cancel()
+
+
+_tracker: Optional[SourceLatencyTracker] = None
+_tracker_lock = threading.Lock()
+
+
+def get_latency_tracker() -> SourceLatencyTracker:
+    """Process-wide latency tracker, configured from settings."""
+    global _tracker
+    if _tracker is None:
+        with _tracker_lock:
+            if _tracker is None:
+                _tracker = SourceLatencyTracker(
+                    failure_threshold=settings.DISCOVERY_CIRCUIT_FAILURE_THRESHOLD,
+                    cooldown_seconds=settings.DISCOVERY_CIRCUIT_COOLDOWN_SECONDS,
+                )
+    return _tracker
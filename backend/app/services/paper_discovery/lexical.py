@@ -0,0 +1,232 @@
+"""Batch lexical scoring for `LexicalRanker` and `SimpleRanker`.
+
+Both rankers used to score candidates one paper at a time with Python set
+intersections. Project auto-discovery reranks pools of thousands of papers,
+so the candidates are now turned into a sparse term matrix once (one row per
+paper, one column per token, separate title and abstract fields, stored as
+COO row/column arrays) and every score component is a NumPy vector op:
+
+  - query / keyword overlap: per-row sums of a 0/1 term mask
+  - BM25 over title + abstract (binary term frequency, since the rankers'
+    token sets carry no counts)
+  - recency and citation bonuses from year / citation arrays
+
+Token sets come from the memoized `DiscoveredPaper.title_tokens` /
+`abstract_tokens`, so building the matrix doesn't re-tokenize. The
+formulas mirror the previous per-paper loops exactly (see
+tests/test_lexical_scoring.py); scipy isn't a dependency, and bincount over
+COO arrays is all the sparse algebra these scores need.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional
+
+import numpy as np
+
+from app.services.paper_discovery.models import DiscoveredPaper
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+@dataclass
+class _Field:
+    rows: np.ndarray  # paper index of each (paper, token) entry
+    cols: np.ndarray  # vocabulary id of each entry
+    lengths: np.ndarray  # distinct tokens per paper
+
+
+def _build_field(token_sets: List[FrozenSet[str]], vocab: Dict[str, int]) -> _Field:
+    lengths = np.fromiter((len(t) for t in token_sets), dtype=np.int64, count=len(token_sets))
+    cols = np.fromiter(
+        (vocab.setdefault(tok, len(vocab)) for tokens in token_sets for tok in tokens),
+        dtype=np.int64,
+        count=int(lengths.sum()),
+    )
+    rows = np.repeat(np.arange(len(token_sets), dtype=np.int64), lengths)
+    return _Field(rows=rows, cols=cols, lengths=lengths)
+
+
+class TermMatrix:
+    """Title/abstract term incidence for a batch of papers, plus the numeric
+    columns (year, citations, PDF/OA flags) the bonuses need."""
+
+    def __init__(self, papers: List[DiscoveredPaper]):
+        self.n = len(papers)
+        self.vocab: Dict[str, int] = {}
+        self.title = _build_field([p.title_tokens for p in papers], self.vocab)
+        self.abstract = _build_field([p.abstract_tokens for p in papers], self.vocab)
+        # Falsy years count as unknown, like the old `if paper.year:` checks
+        self.year = np.array([float(p.year) if p.year else np.nan for p in papers], dtype=np.float64)
+        self.citations = np.array([float(p.citations_count or 0) for p in papers], dtype=np.float64)
+        self.has_pdf = np.array([bool(p.pdf_url) for p in papers], dtype=bool)
+        self.is_open_access = np.array([bool(p.is_open_access) for p in papers], dtype=bool)
+
+    def _mask(self, terms: Iterable[str]) -> np.ndarray:
+        mask = np.zeros(len(self.vocab), dtype=np.float64)
+        ids = [self.vocab[t] for t in terms if t in self.vocab]
+        mask[ids] = 1.0
+        return mask
+
+    def hits(self, field: _Field, terms: Iterable[str]) -> np.ndarray:
+        """Number of distinct `terms` present in each paper's field."""
+        if not len(field.cols):
+            return np.zeros(self.n, dtype=np.float64)
+        return np.bincount(field.rows, weights=self._mask(terms)[field.cols], minlength=self.n)
+
+    def bm25(self, terms: Iterable[str], k1: float = BM25_K1, b: float = BM25_B) -> np.ndarray:
+        """BM25 of title + abstract against `terms`, with binary term frequency."""
+        if not self.n or not self.vocab:
+            return np.zeros(self.n, dtype=np.float64)
+        width = len(self.vocab)
+        # Union of the two fields per paper: unique (row, col) pairs
+        keys = np.unique(np.concatenate([
+            self.title.rows * width + self.title.cols,
+            self.abstract.rows * width + self.abstract.cols,
+        ]))
+        rows, cols = keys // width, keys % width
+        doc_len = np.bincount(rows, minlength=self.n).astype(np.float64)
+        avg_len = doc_len.mean() or 1.0
+        df = np.bincount(cols, minlength=width).astype(np.float64)
+        idf = np.log1p((self.n - df + 0.5) / (df + 0.5))
+        weight = self._mask(terms)[cols] * idf[cols] * (k1 + 1.0)
+        weight /= 1.0 + k1 * (1.0 - b + b * doc_len[rows] / avg_len)
+        return np.bincount(rows, weights=weight, minlength=self.n)
+
+
+def _substring_hits(texts: List[str], terms: List[str]) -> np.ndarray:
+    """How many of `terms` occur as substrings of each text. (np.char would
+    copy every abstract into a fixed-width array; `in` on str is C already.)"""
+    return np.fromiter(
+        (sum(1 for t in terms if t in text) for text in texts),
+        dtype=np.float64,
+        count=len(texts),
+    )
+
+
+def min_max_normalize(scores: np.ndarray) -> np.ndarray:
+    """Scale to 0..1; a constant vector maps to all 1.0 (or all 0.0 if <= 0)."""
+    if not len(scores):
+        return scores
+    max_s, min_s = scores.max(), scores.min()
+    span = max_s - min_s
+    if span <= 0:
+        return np.full(len(scores), 1.0 if max_s > 0 else 0.0)
+    return (scores - min_s) / span
+
+
+def lexical_scores(
+    matrix: TermMatrix,
+    query_tokens: FrozenSet[str],
+    keyword_set: FrozenSet[str],
+    weights: Mapping[str, float],
+    current_year: Optional[int] = None,
+) -> np.ndarray:
+    """`LexicalRanker` scores: weighted title/abstract/keyword overlap plus
+    recency, citation and PDF/OA bonuses, min-max normalized.
+
+    An optional `bm25` weight adds max-normalized BM25 of title + abstract;
+    it isn't in the default weights."""
+    current_year = current_year or datetime.now().year
+    title_len = np.maximum(1, matrix.title.lengths)
+    abstract_len = np.maximum(1, matrix.abstract.lengths)
+
+    score = (
+        weights['title_overlap'] * (matrix.hits(matrix.title, query_tokens) / title_len)
+        + weights['abstract_overlap'] * (matrix.hits(matrix.abstract, query_tokens) / abstract_len)
+    )
+    if keyword_set:
+        n_keywords = len(keyword_set)
+        score = score + (
+            weights['keyword_title'] * (matrix.hits(matrix.title, keyword_set) / n_keywords)
+            + weights['keyword_body'] * (matrix.hits(matrix.abstract, keyword_set) / n_keywords)
+        )
+
+    known_year = ~np.isnan(matrix.year)
+    recency = np.maximum(0.0, 1.0 - (current_year - matrix.year) / 10.0)  # Decay over 10 years
+    score = score + np.where(known_year, weights['recency_max'] * recency, 0.0)
+
+    cited = matrix.citations > 0
+    citation = np.minimum(1.0, np.log1p(matrix.citations) / 10.0)
+    score = score + np.where(cited, weights['citations_max'] * citation, 0.0)
+
+    score = score + np.where(
+        matrix.has_pdf,
+        weights['pdf_bonus'],
+        np.where(matrix.is_open_access, weights['oa_bonus'], 0.0),
+    )
+
+    bm25_weight = weights.get('bm25', 0.0)
+    if bm25_weight:
+        bm25 = matrix.bm25(query_tokens)
+        top = bm25.max() if len(bm25) else 0.0
+        if top > 0:
+            score = score + bm25_weight * (bm25 / top)
+
+    raw = np.maximum(0.0, score)
+    if not len(raw) or raw.max() <= 0:
+        return np.zeros(len(raw))
+    return np.clip(min_max_normalize(raw), 0.0, 1.0)
+
+
+def simple_scores(
+    matrix: TermMatrix,
+    papers: List[DiscoveredPaper],
+    query_tokens: FrozenSet[str],
+    core_terms: Iterable[str],
+    weights: Mapping[str, float],
+    current_year: Optional[int] = None,
+) -> np.ndarray:
+    """`SimpleRanker` scores: 55% relevance (title overlap + core term
+    boosts), 15% recency-adjusted citations, 30% recency, each component
+    min-max normalized. Papers with no title tokens score 0 on all three."""
+    current_year = current_year or datetime.now().year
+    has_title = matrix.title.lengths > 0
+    known_year = ~np.isnan(matrix.year)
+
+    # --- Relevance (title overlap + core term boosts) ---
+    hits = matrix.hits(matrix.title, query_tokens)
+    title_ratio = hits / np.maximum(1, matrix.title.lengths)
+    if query_tokens:
+        relevance = 0.6 * title_ratio + 0.4 * (hits / len(query_tokens))
+    else:
+        relevance = title_ratio
+
+    core_terms = list(core_terms)
+    if core_terms:
+        n_terms = len(core_terms)
+        titles = [p.title_lower for p in papers]
+        abstracts = [p.abstract_lower for p in papers]
+        relevance = (
+            relevance
+            + weights.get('core_term_title_boost', 0.20) * (_substring_hits(titles, core_terms) / n_terms)
+            + weights.get('core_term_abstract_boost', 0.10) * (_substring_hits(abstracts, core_terms) / n_terms)
+        )
+    relevance = np.where(has_title, np.maximum(0.0, relevance), 0.0)
+
+    # --- Citations (log-scaled; divided by log(age + 1) when the year is known) ---
+    with np.errstate(invalid="ignore"):
+        years_since = np.maximum(1.0, current_year - matrix.year + 1.0)
+        adjusted = np.where(known_year, matrix.citations / np.log(years_since + 1.0), matrix.citations)
+    citation = np.where(matrix.citations > 0, np.log10(1.0 + adjusted) / 4.0, 0.0)
+    citation = np.where(has_title, np.minimum(1.0, citation), 0.0)
+
+    # --- Recency (papers from the last 5 years get a bonus) ---
+    years_old = current_year - matrix.year
+    recency = np.select(
+        [years_old <= 0, years_old <= 5],
+        [1.0, 1.0 - (years_old / 5.0) * 0.5],
+        0.5 - np.minimum(0.5, (years_old - 5.0) / 20.0),
+    )
+    recency = np.where(known_year, recency, 0.3)  # Unknown year gets a neutral score
+    recency = np.where(has_title, np.maximum(0.0, recency), 0.0)
+
+    combined = (
+        0.55 * min_max_normalize(relevance)
+        + 0.15 * min_max_normalize(citation)
+        + 0.30 * min_max_normalize(recency)
+    )
+    return np.clip(combined, 0.0, 1.0)
@@ -7,7 +7,9 @@ import re
 import unicodedata
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, TypeVar
+
+T = TypeVar("T")
 
 
 class PaperSource(Enum):
@@ -65,9 +67,28 @@ def _normalize_title(title: str) -> str:
     return title
 
 
-@dataclass
+_NON_ALNUM_RE = re.compile(r'[^a-z0-9\s]')
+
+
+def tokenize_text(text: Optional[str]) -> FrozenSet[str]:
+    """Lowercased alphanumeric words longer than 2 chars (lexical ranking tokens)."""
+    text = _NON_ALNUM_RE.sub(' ', (text or '').lower())
+    return frozenset(w for w in text.split() if len(w) > 2)
+
+
+# Fields the memoized values on DiscoveredPaper are derived from; assigning
+# any of them (enrichers fill abstracts, dedup merges DOIs) drops the memo.
+_MEMO_INPUTS = frozenset({"title", "abstract", "doi", "arxiv_id", "year"})
+
+
+@dataclass(slots=True)
 class DiscoveredPaper:
-    """Representation of a paper returned by any discovery source."""
+    """Representation of a paper returned by any discovery source.
+
+    Normalized title/DOI, token sets and dedup keys are computed on first
+    use and memoized, so dedup, the rankers and the orchestrator's gates
+    share one normalization pass per paper.
+    """
 
     title: str
     authors: List[str]
@@ -89,19 +110,74 @@ class DiscoveredPaper:
     arxiv_id: Optional[str] = None
     # Populated by the dedup step; records every source that returned this work.
     merged_sources: List[str] = field(default_factory=list)
+    _memo: Dict[str, Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name in _MEMO_INPUTS:
+            memo = getattr(self, "_memo", None)  # unset while __init__ runs
+            if memo:
+                memo.clear()
+
+    def _memoized(self, key: str, compute: Callable[[], T]) -> T:
+        memo = self._memo
+        try:
+            return memo[key]
+        except KeyError:
+            value = memo[key] = compute()
+            return value
+
+    # --- derived fields (memoized) ---
+
+    @property
+    def normalized_doi(self) -> Optional[str]:
+        return self._memoized("doi", lambda: _normalize_doi(self.doi))
+
+    @property
+    def normalized_title(self) -> str:
+        return self._memoized("title", lambda: _normalize_title(self.title))
+
+    @property
+    def title_words(self) -> FrozenSet[str]:
+        """Word set of the normalized title (fuzzy dedup)."""
+        return self._memoized("title_words", lambda: frozenset(self.normalized_title.split()))
+
+    @property
+    def title_tokens(self) -> FrozenSet[str]:
+        return self._memoized("title_tokens", lambda: tokenize_text(self.title))
+
+    @property
+    def abstract_tokens(self) -> FrozenSet[str]:
+        return self._memoized("abstract_tokens", lambda: tokenize_text(self.abstract))
+
+    @property
+    def title_lower(self) -> str:
+        return self._memoized("title_lower", lambda: (self.title or '').lower())
+
+    @property
+    def abstract_lower(self) -> str:
+        return self._memoized("abstract_lower", lambda: (self.abstract or '').lower())
+
+    @property
+    def search_text(self) -> str:
+        """Lowercased "title abstract", for substring checks of query terms."""
+        return self._memoized("search_text", lambda: f"{self.title_lower} {self.abstract_lower}")
 
     def get_unique_key(self) -> str:
         """Return a key used to deduplicate entries across sources.
 
         Uses normalized DOI as primary key, falls back to normalized title hash.
         """
+        return self._memoized("unique_key", self._compute_unique_key)
+
+    def _compute_unique_key(self) -> str:
         # Try DOI first (normalized)
-        normalized_doi = _normalize_doi(self.doi)
+        normalized_doi = self.normalized_doi
         if normalized_doi:
             return f"doi:{normalized_doi}"
 
         # Fall back to normalized title hash
-        normalized_title = _normalize_title(self.title)
+        normalized_title = self.normalized_title
         if normalized_title:
             digest = hashlib.md5(normalized_title.encode()).hexdigest()
             return f"title:{digest}"
@@ -116,13 +192,16 @@ class DiscoveredPaper:
         A paper is considered the same as another if they share ANY match key.
         Order isn't meaningful; uniqueness across keys is.
         """
+        return list(self._memoized("match_keys", self._compute_match_keys))
+
+    def _compute_match_keys(self) -> tuple:
         keys: List[str] = []
-        nd = _normalize_doi(self.doi)
+        nd = self.normalized_doi
         if nd:
             keys.append(f"doi:{nd}")
         if self.arxiv_id:
             keys.append(f"arxiv:{self.arxiv_id.lower()}")
-        nt = _normalize_title(self.title)
+        nt = self.normalized_title
         if nt and self.year:
             # Title + year is stronger than title alone: distinct papers sometimes
             # share a title but almost never a title+year.
@@ -133,4 +212,4 @@ class DiscoveredPaper:
             # for sources that don't return a year).
             digest = hashlib.md5(nt.encode()).hexdigest()
             keys.append(f"t:{digest}")
-        return keys or [f"title:{hashlib.md5(self.title.encode()).hexdigest()}"]
+        return tuple(keys or [f"title:{hashlib.md5(self.title.encode()).hexdigest()}"])
@@ -0,0 +1,260 @@
+"""Persistent PDF link cache and probe budgets for PDF augmentation.
+
+`PaperDiscoveryService._augment_pdf_links` turns landing pages and
+open-access URLs into direct PDF links with HEAD/ranged-GET probes and page
+scrapes. Most searches return the same papers again, so the same dead links
+used to be probed again on every search. The `pdf_link_cache` table stores
+the outcome of each top-level probe, keyed by (URL, kind):
+
+  - kind "check": does this URL serve (or link straight to) a PDF?
+  - kind "scrape": which PDF does this landing page link to?
+
+A positive outcome is reused for PDF_LINK_CACHE_OK_TTL_DAYS. A negative one
+("dead") is retried with exponential backoff: PDF_LINK_CACHE_DEAD_BACKOFF_HOURS
+after the first failure, doubling each time, capped at
+PDF_LINK_CACHE_DEAD_MAX_DAYS. A success resets the failure count.
+
+Only definitive misses are cached as dead: a 404/410, or a response that is
+confirmed not to be (or link to) a PDF. Timeouts, connection errors, 429s,
+5xx and other refusals are transient; they count as a miss for the current
+pass but are not written, so a rate-limited burst can't hide live PDFs.
+
+Rows for a whole augmentation pass are read in one query before probing and
+written back in one statement afterwards. `HostBudget` caps concurrent probes
+per host, so one slow publisher can't take every slot.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+KIND_CHECK = "check"
+KIND_SCRAPE = "scrape"
+
+STATUS_OK = "ok"
+STATUS_DEAD = "dead"
+
+# HTTP statuses that say a link is gone rather than temporarily unavailable
+DEFINITIVE_MISS_STATUSES = frozenset({404, 410})
+
+LinkKey = Tuple[str, str]  # (kind, url)
+
+
+def url_hash(url: str) -> str:
+    return hashlib.sha1(url.encode("utf-8", errors="ignore")).hexdigest()
+
+
+def dead_backoff(failures: int) -> timedelta:
+    """How long a link that failed `failures` times in a row stays dead."""
+    hours = settings.PDF_LINK_CACHE_DEAD_BACKOFF_HOURS * (2 ** max(0, failures - 1))
+    return min(timedelta(hours=hours), timedelta(days=settings.PDF_LINK_CACHE_DEAD_MAX_DAYS))
+
+
+@dataclass
+class PdfLinkEntry:
+    """One `pdf_link_cache` row."""
+
+    url: str
+    kind: str
+    status: str
+    resolved_url: Optional[str] = None
+    failures: int = 0
+    checked_at: Optional[datetime] = None
+
+    def is_fresh(self, now: datetime) -> bool:
+        if self.checked_at is None:
+            return False
+        checked_at = self.checked_at
+        if checked_at.tzinfo is None:
+            checked_at = checked_at.replace(tzinfo=timezone.utc)
+        if self.status == STATUS_OK:
+            return now - checked_at < timedelta(days=settings.PDF_LINK_CACHE_OK_TTL_DAYS)
+        return now - checked_at < dead_backoff(self.failures)
+
+
+# ---------------------------------------------------------------------------
+# Cache I/O
+# ---------------------------------------------------------------------------
+
+def bulk_lookup(db: Session, keys: Iterable[LinkKey]) -> Dict[LinkKey, PdfLinkEntry]:
+    """Return {(kind, url): PdfLinkEntry} for every cached key."""
+    wanted = set(keys)
+    if not wanted:
+        return {}
+    rows = db.execute(
+        text(
+            "SELECT url, kind, status, resolved_url, failures, checked_at "
+            "FROM pdf_link_cache WHERE url_hash = ANY(:hashes)"
+        ),
+        {"hashes": list({url_hash(url) for _, url in wanted})},
+    ).mappings().all()
+    found: Dict[LinkKey, PdfLinkEntry] = {}
+    for row in rows:
+        key = (row["kind"], row["url"])
+        if key in wanted:
+            found[key] = PdfLinkEntry(**row)
+    return found
+
+
+def bulk_upsert(db: Session, outcomes: Dict[LinkKey, Optional[str]]) -> None:
+    """Write probe outcomes (resolved PDF URL, or None for a dead link).
+
+    A dead outcome increments the failure count; a live one resets it."""
+    if not outcomes:
+        return
+    now = datetime.now(timezone.utc)
+    db.execute(
+        text(
+            """
+            INSERT INTO pdf_link_cache
+                (url_hash, kind, url, status, resolved_url, failures, checked_at)
+            VALUES (:url_hash, :kind, :url, :status, :resolved_url,
+                    CASE WHEN :status = 'dead' THEN 1 ELSE 0 END, :now)
+            ON CONFLICT (url_hash, kind) DO UPDATE SET
+                url = EXCLUDED.url,
+                status = EXCLUDED.status,
+                resolved_url = EXCLUDED.resolved_url,
+                failures = CASE
+                    WHEN EXCLUDED.status = 'dead' THEN pdf_link_cache.failures + 1
+                    ELSE 0 END,
+                checked_at = EXCLUDED.checked_at
+            """
+        ),
+        [
+            {
+                "url_hash": url_hash(url),
+                "kind": kind,
+                "url": url,
+                "status": STATUS_OK if resolved else STATUS_DEAD,
+                "resolved_url": resolved,
+                "now": now,
+            }
+            for (kind, url), resolved in outcomes.items()
+        ],
+    )
+    db.commit()
+
+
+class PdfLinkStore:
+    """Async facade over the table; each call uses its own DB session in a thread."""
+
+    async def lookup(self, keys: Iterable[LinkKey]) -> Dict[LinkKey, PdfLinkEntry]:
+        keys = list(keys)
+        if not keys or not settings.PDF_LINK_CACHE_ENABLED:
+            return {}
+        try:
+            return await asyncio.to_thread(self._run, bulk_lookup, keys)
+        except Exception as exc:
+            logger.warning("PdfLinkCache: lookup failed: %s", exc)
+            return {}
+
+    async def store(self, outcomes: Dict[LinkKey, Optional[str]]) -> None:
+        if not outcomes or not settings.PDF_LINK_CACHE_ENABLED:
+            return
+        try:
+            await asyncio.to_thread(self._run, bulk_upsert, outcomes)
+        except Exception as exc:
+            logger.warning("PdfLinkCache: upsert failed: %s", exc)
+
+    @staticmethod
+    def _run(fn, arg):
+        from app.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            return fn(db, arg)
+        finally:
+            db.close()
+
+
+# ---------------------------------------------------------------------------
+# Per-pass state
+# ---------------------------------------------------------------------------
+
+class HostBudget:
+    """Caps concurrent probes overall and per host."""
+
+    def __init__(self, total: int, per_host: int):
+        self._total = asyncio.Semaphore(total)
+        self._per_host = per_host
+        self._hosts: Dict[str, asyncio.Semaphore] = {}
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        try:
+            host = (urlparse(url).netloc or "").lower()
+        except Exception:
+            host = ""
+        host_sem = self._hosts.setdefault(host, asyncio.Semaphore(self._per_host))
+        async with host_sem:
+            async with self._total:
+                yield
+
+
+@dataclass
+class PdfProbeRun:
+    """One augmentation pass: probe budget, cached outcomes and new ones."""
+
+    budget: HostBudget
+    cached: Dict[LinkKey, PdfLinkEntry] = field(default_factory=dict)
+    outcomes: Dict[LinkKey, Optional[str]] = field(default_factory=dict)
+    # Keys whose miss was transient (timeout, 429, 5xx, ...): not cached
+    transient: Set[LinkKey] = field(default_factory=set)
+    cache_hits: int = 0
+    now: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    def lookup(self, kind: str, url: str) -> Tuple[bool, Optional[str]]:
+        """(hit, resolved URL). A hit with None means a known-dead link."""
+        key = (kind, url)
+        if key in self.outcomes:
+            return True, self.outcomes[key]
+        entry = self.cached.get(key)
+        if entry is not None and entry.is_fresh(self.now):
+            self.cache_hits += 1
+            return True, entry.resolved_url
+        return False, None
+
+    def record(self, kind: str, url: str, resolved: Optional[str]) -> None:
+        self.outcomes[(kind, url)] = resolved
+
+    def mark_transient(self, kind: str, url: str) -> None:
+        self.transient.add((kind, url))
+
+    def is_transient(self, kind: str, url: str) -> bool:
+        return (kind, url) in self.transient
+
+    def cacheable_outcomes(self) -> Dict[LinkKey, Optional[str]]:
+        """Outcomes to write back: hits, and misses that were definitive."""
+        return {
+            key: resolved
+            for key, resolved in self.outcomes.items()
+            if resolved or key not in self.transient
+        }
+
+    @property
+    def probes(self) -> int:
+        return len(self.outcomes)
+
+
+def preload_keys(
+    existing: Iterable[Optional[str]],
+    candidates: Iterable[Optional[str]],
+    landings: Iterable[Optional[str]],
+) -> List[LinkKey]:
+    keys = {(KIND_CHECK, u) for u in list(existing) + list(candidates) if u}
+    keys.update((KIND_SCRAPE, u) for u in landings if u)
+    return list(keys)
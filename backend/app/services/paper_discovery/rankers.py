@@ -6,15 +6,27 @@ import asyncio
 import io
 import json
 import logging
+import math
 import os
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
 from datetime import datetime
-from typing import List, Optional, Set
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
 
 import aiohttp
 
 from app.services.paper_discovery.config import DiscoveryConfig
 from app.services.paper_discovery.interfaces import PaperRanker
-from app.services.paper_discovery.models import DiscoveredPaper
+from app.services.paper_discovery.lexical import TermMatrix, lexical_scores, simple_scores
+from app.services.paper_discovery.models import DiscoveredPaper, tokenize_text
+from app.services.paper_discovery.score_cache import (
+    CrossEncoderScoreCache,
+    get_gpt_score_cache,
+    make_score_key,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -34,69 +46,13 @@ class LexicalRanker(PaperRanker):
     ) -> List[DiscoveredPaper]:
         """Rank papers using lexical similarity"""
         
-        def tokenize(text: str) -> Set[str]:
-            import re
-            text = (text or '').lower()
-            text = re.sub(r'[^a-z0-9\s]', ' ', text)
-            return set(w for w in text.split() if len(w) > 2)
-        
-        query_tokens = tokenize(target_text or query)
-        keyword_set = set((kw or '').lower() for kw in (target_keywords or []))
-        
-        weights = self.config.ranking_weights
-
-        raw_scores: List[float] = []
-
-        for paper in papers:
-            title_tokens = tokenize(paper.title)
-            abstract_tokens = tokenize(paper.abstract)
-            
-            # Calculate overlaps
-            title_overlap = len(title_tokens & query_tokens) / max(1, len(title_tokens))
-            abstract_overlap = len(abstract_tokens & query_tokens) / max(1, len(abstract_tokens))
-            kw_title_overlap = len(title_tokens & keyword_set) / max(1, len(keyword_set)) if keyword_set else 0
-            kw_abstract_overlap = len(abstract_tokens & keyword_set) / max(1, len(keyword_set)) if keyword_set else 0
-            
-            # Base score
-            score = (
-                weights['title_overlap'] * title_overlap +
-                weights['abstract_overlap'] * abstract_overlap +
-                weights['keyword_title'] * kw_title_overlap +
-                weights['keyword_body'] * kw_abstract_overlap
-            )
-            
-            # Bonuses
-            if paper.year:
-                age = datetime.now().year - paper.year
-                recency_score = max(0, 1 - age / 10)  # Decay over 10 years
-                score += weights['recency_max'] * recency_score
-            
-            if paper.citations_count and paper.citations_count > 0:
-                import math
-                citation_score = min(1, math.log(1 + paper.citations_count) / 10)
-                score += weights['citations_max'] * citation_score
-            
-            if paper.pdf_url:
-                score += weights['pdf_bonus']
-            elif paper.is_open_access:
-                score += weights['oa_bonus']
-            
-            raw_scores.append(max(0.0, score))
-
-        max_score = max(raw_scores, default=0.0)
-        min_score = min(raw_scores, default=0.0)
-        span = max_score - min_score
-
-        for paper, raw in zip(papers, raw_scores):
-            if max_score <= 0:
-                paper.relevance_score = 0.0
-                continue
-            if span > 0:
-                normalized = (raw - min_score) / span
-            else:
-                normalized = 1.0
-            paper.relevance_score = float(min(1.0, max(0.0, normalized)))
-        
+        query_tokens = tokenize_text(target_text or query)
+        keyword_set = frozenset((kw or '').lower() for kw in (target_keywords or []))
+
+        scores = lexical_scores(TermMatrix(papers), query_tokens, keyword_set, self.config.ranking_weights)
+        for paper, score in zip(papers, scores.tolist()):
+            paper.relevance_score = score
+
         return sorted(papers, key=lambda p: p.relevance_score, reverse=True)
 
 
@@ -120,117 +76,142 @@ class SimpleRanker(PaperRanker):
         target_keywords: Optional[List[str]] = None,
         **kwargs
     ) -> List[DiscoveredPaper]:
-        import math
-
         # Extract core_terms from kwargs (passed from orchestrator)
         core_terms: Set[str] = kwargs.get('core_terms', set())
-        current_year = datetime.now().year
+        query_tokens = tokenize_text(target_text or query)
 
-        def tokenize(text: str) -> Set[str]:
-            import re
-            text = (text or '').lower()
-            text = re.sub(r'[^a-z0-9\s]', ' ', text)
-            return set(w for w in text.split() if len(w) > 2)
-
-        query_tokens = tokenize(target_text or query)
-        weights = self.config.ranking_weights
-
-        # Collect scores for normalization
-        relevance_scores: List[float] = []
-        citation_scores: List[float] = []
-        recency_scores: List[float] = []
-
-        for paper in papers:
-            title_tokens = tokenize(paper.title)
-            abstract_tokens = tokenize(paper.abstract) if paper.abstract else set()
-
-            # --- Relevance score (title overlap + core term boosts) ---
-            if not title_tokens:
-                relevance_scores.append(0.0)
-                citation_scores.append(0.0)
-                recency_scores.append(0.0)
-                continue
-
-            hits = len(title_tokens & query_tokens)
-            title_ratio = hits / max(1, len(title_tokens))
-            query_ratio = hits / max(1, len(query_tokens)) if query_tokens else 0.0
-            relevance = 0.6 * title_ratio + 0.4 * query_ratio if query_tokens else title_ratio
-
-            # Apply core term boosts (Phase 1.3) — proportional to match ratio
-            core_boost = 0.0
-            if core_terms:
-                title_text = (paper.title or '').lower()
-                abstract_text = (paper.abstract or '').lower()
-                n_terms = len(core_terms)
-
-                title_hits = sum(1 for t in core_terms if t in title_text)
-                abstract_hits = sum(1 for t in core_terms if t in abstract_text)
-
-                if title_hits > 0:
-                    core_boost += weights.get('core_term_title_boost', 0.20) * (title_hits / n_terms)
-                if abstract_hits > 0:
-                    core_boost += weights.get('core_term_abstract_boost', 0.10) * (abstract_hits / n_terms)
-
-            relevance_scores.append(max(0.0, relevance + core_boost))
-
-            # --- Citation score (log-scaled, recency-adjusted) ---
-            citations = paper.citations_count or 0
-            if citations > 0 and paper.year:
-                years_since = max(1, current_year - paper.year + 1)
-                # Recency-adjusted: citations / log(years + 1)
-                # This prevents old highly-cited papers from dominating
-                adjusted_citations = citations / math.log(years_since + 1)
-                # Log scale to prevent mega-papers from dominating
-                citation_score = math.log10(1 + adjusted_citations) / 4  # ~10000 adjusted = 1.0
-            elif citations > 0:
-                citation_score = math.log10(1 + citations) / 4
-            else:
-                citation_score = 0.0
-            citation_scores.append(min(1.0, citation_score))
-
-            # --- Recency score (papers from last 5 years get bonus) ---
-            if paper.year:
-                years_old = current_year - paper.year
-                if years_old <= 0:
-                    recency = 1.0  # Current year
-                elif years_old <= 5:
-                    recency = 1.0 - (years_old / 5) * 0.5  # 50% decay over 5 years
-                else:
-                    recency = 0.5 - min(0.5, (years_old - 5) / 20)  # Slower decay after 5 years
-            else:
-                recency = 0.3  # Unknown year gets neutral score
-            recency_scores.append(max(0.0, recency))
-
-        # Normalize each component to 0-1 range
-        def normalize_scores(scores: List[float]) -> List[float]:
-            if not scores:
-                return []
-            max_s = max(scores, default=0.0)
-            min_s = min(scores, default=0.0)
-            span = max_s - min_s
-            if span <= 0:
-                return [1.0 if max_s > 0 else 0.0] * len(scores)
-            return [(s - min_s) / span for s in scores]
-
-        norm_relevance = normalize_scores(relevance_scores)
-        norm_citations = normalize_scores(citation_scores)
-        norm_recency = normalize_scores(recency_scores)
-
-        # Combine with weights: 55% relevance, 15% citations, 30% recency
+        # Combined 55% relevance, 15% citations, 30% recency (see simple_scores).
         # Citation weight kept low because many sources (arXiv, OpenAlex, PubMed)
         # don't reliably provide citation counts, which would bias toward
         # sources like Semantic Scholar that do.
-        for i, paper in enumerate(papers):
-            combined = (
-                0.55 * norm_relevance[i] +
-                0.15 * norm_citations[i] +
-                0.30 * norm_recency[i]
-            )
-            paper.relevance_score = float(min(1.0, max(0.0, combined)))
+        scores = simple_scores(
+            TermMatrix(papers), papers, query_tokens, core_terms, self.config.ranking_weights,
+        )
+        for paper, score in zip(papers, scores.tolist()):
+            paper.relevance_score = score
 
         return sorted(papers, key=lambda p: p.relevance_score, reverse=True)
 
 
+@dataclass
+class GptRankingUsage:
+    """Cost and latency of one `GptRanker.rank` call."""
+
+    model: str
+    candidates: int = 0
+    cache_hits: int = 0
+    shards: int = 0
+    shard_timeouts: int = 0
+    shard_failures: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    wall_ms: float = 0.0
+
+
+class GptRankerStats:
+    """Cumulative GptRanker usage, exposed at GET /metrics/reranker."""
+
+    def __init__(self, recent: int = 50):
+        self._lock = threading.Lock()
+        self.rankings = 0
+        self.candidates = 0
+        self.cache_hits = 0
+        self.shards = 0
+        self.shard_timeouts = 0
+        self.shard_failures = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.wall_seconds = 0.0
+        self._recent: Deque[GptRankingUsage] = deque(maxlen=recent)
+
+    def record(self, usage: GptRankingUsage) -> None:
+        with self._lock:
+            self.rankings += 1
+            self.candidates += usage.candidates
+            self.cache_hits += usage.cache_hits
+            self.shards += usage.shards
+            self.shard_timeouts += usage.shard_timeouts
+            self.shard_failures += usage.shard_failures
+            self.prompt_tokens += usage.prompt_tokens
+            self.completion_tokens += usage.completion_tokens
+            self.wall_seconds += usage.wall_ms / 1000.0
+            self._recent.append(usage)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "rankings": self.rankings,
+                "candidates": self.candidates,
+                "cache_hits": self.cache_hits,
+                "cache_hit_ratio": round(self.cache_hits / self.candidates, 3) if self.candidates else 0.0,
+                "shards": self.shards,
+                "shard_timeouts": self.shard_timeouts,
+                "shard_failures": self.shard_failures,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "mean_wall_ms": round(self.wall_seconds * 1000.0 / self.rankings, 1) if self.rankings else 0.0,
+                "recent": [asdict(u) for u in self._recent],
+            }
+
+
+_gpt_ranker_stats = GptRankerStats()
+
+
+def get_gpt_ranker_stats() -> GptRankerStats:
+    return _gpt_ranker_stats
+
+
+_GPT_SYSTEM_PROMPT = (
+    "You are an expert academic research assistant. Score each paper's relevance "
+    "to the research project (0.0 to 1.0).\n\n"
+    "Scoring guide:\n"
+    "- 0.9-1.0: Directly addresses the specific research question; matches the core intersection of ALL key concepts\n"
+    "- 0.7-0.8: Strongly related; covers most key concepts with relevant methodology\n"
+    "- 0.5-0.6: Moderately relevant; useful background or addresses a subset of the topic\n"
+    "- 0.3-0.4: Tangentially related; shares some terminology but different focus\n"
+    "- 0.0-0.2: Not relevant; different domain or only superficial keyword overlap\n\n"
+    "CRITICAL rules — be strict:\n"
+    "- When a 'Research Topic' is provided, use it as your PRIMARY basis for scoring.\n"
+    "- A paper matching only ONE keyword from a multi-concept query scores 0.2 or below.\n"
+    "- Score based on the INTERSECTION of ALL key concepts, not any single keyword.\n"
+    "- Sharing only a language (e.g. 'Arabic') or broad field (e.g. 'NLP') is NOT relevance.\n"
+    "- Be harsh: most papers should score below 0.5. Reserve 0.7+ for genuinely on-topic work.\n"
+    "- Read the abstract — a paper's actual contribution may differ from its title.\n\n"
+    "Return ONLY a compact JSON array: [{\"id\":0,\"score\":0.8},...]"
+)
+
+
+def _parse_gpt_scores(content: str) -> Dict[int, float]:
+    """Parse `[{"id":..,"score":..}]`, recovering what it can from truncated output."""
+    # Handle potential markdown code blocks
+    if content.startswith("```"):
+        lines = content.split("\n")
+        content = "\n".join(lines[1:-1] if lines[-1] == "```" else lines[1:])
+
+    scores_map: Dict[int, float] = {}
+    try:
+        data = json.loads(content)
+        if isinstance(data, list):
+            scores_map = {
+                int(obj.get("id", -1)): float(obj.get("score", 0.0))
+                for obj in data if isinstance(obj, dict)
+            }
+        else:
+            logger.warning("GPT Ranker: expected JSON array, got %s", type(data).__name__)
+    except json.JSONDecodeError:
+        # Truncated JSON — extract individual score objects via regex
+        for m in re.finditer(r'\{"id"\s*:\s*(\d+)\s*,\s*"score"\s*:\s*([\d.]+)\s*\}', content):
+            try:
+                scores_map[int(m.group(1))] = float(m.group(2))
+            except (ValueError, IndexError):
+                continue
+        if scores_map:
+            logger.info("GPT Ranker: recovered %d scores from truncated response", len(scores_map))
+        else:
+            logger.warning("GPT Ranker: failed to parse response: %s", content[:300])
+    return scores_map
+
+
 class GptRanker(PaperRanker):
     """Rank papers using an OpenAI Chat model by scoring relevance 0..1.
 
@@ -238,19 +219,44 @@ class GptRanker(PaperRanker):
     - Project context (query, scope, keywords)
     - Paper metadata (title, abstract, year, citations)
     - Recency and citation bonuses
+
+    Candidates are scored in parallel, size-balanced shards so latency is
+    bounded by the slowest shard rather than one long JSON answer. A shard
+    that times out keeps its lexical scores. Scores are cached per (model,
+    project context, paper), so repeated and refreshed searches skip the LLM.
     """
 
-    def __init__(self, config: DiscoveryConfig):
+    def __init__(
+        self,
+        config: DiscoveryConfig,
+        score_cache: Optional[CrossEncoderScoreCache] = None,
+        use_score_cache: bool = True,
+    ):
         self.config = config
         # gpt-4o-mini is 3-5x faster than gpt-5-mini for structured JSON ranking,
         # and quality is sufficient for a 0-1 relevance score. Override via env.
         self.model_name = os.getenv("OPENROUTER_RERANK_MODEL", "openai/gpt-4o-mini")
+        if use_score_cache and score_cache is None:
+            score_cache = get_gpt_score_cache()
+        self._score_cache = score_cache if use_score_cache else None
 
         # Scoring weights for post-processing bonuses
         self.recency_weight = 0.05  # Max 5% bonus for recent papers
         self.citation_weight = 0.05  # Max 5% bonus for highly cited papers
         self.pdf_bonus = 0.02  # 2% bonus for PDF availability
 
+    def _create_client(self, api_key: str):
+        from openai import AsyncOpenAI  # type: ignore
+
+        return AsyncOpenAI(
+            api_key=api_key,
+            base_url="https://openrouter.ai/api/v1",
+            default_headers={
+                "HTTP-Referer": "https://scholarhub.space",
+                "X-Title": "ScholarHub",
+            },
+        )
+
     async def rank(
         self,
         papers: List[DiscoveredPaper],
@@ -265,202 +271,254 @@ class GptRanker(PaperRanker):
             logger.info("No OPENROUTER_API_KEY, falling back to SimpleRanker")
             return await SimpleRanker(self.config).rank(papers, query, target_text, target_keywords, **kwargs)
 
-        # Pre-rank with SimpleRanker when there are many papers — keeps GPT latency bounded
-        # and focuses AI attention on the top candidates. Bottom candidates keep their
-        # lexical scores and get sorted in after the GPT-scored ones.
+        started = time.perf_counter()
+        usage = GptRankingUsage(model=self.model_name)
+
+        # Pre-rank with SimpleRanker — keeps GPT latency bounded and focuses AI
+        # attention on the top candidates. The lexical scores are also what
+        # deferred papers and papers in timed-out shards end up with.
         TOP_K_FOR_GPT = 80
-        deferred: List[DiscoveredPaper] = []
-        if len(papers) > TOP_K_FOR_GPT:
-            try:
-                pre_ranked = await SimpleRanker(self.config).rank(
-                    list(papers), query, target_text, target_keywords, **kwargs
-                )
-                candidates = pre_ranked[:TOP_K_FOR_GPT]
-                deferred = pre_ranked[TOP_K_FOR_GPT:]
-                logger.info(
-                    "GPT Ranker: pre-ranked %d papers, scoring top %d with GPT",
-                    len(papers), len(candidates),
-                )
-            except Exception as exc:
-                logger.warning("GPT Ranker: pre-rank failed, scoring all papers: %s", exc)
-                candidates = list(papers)
-        else:
+        try:
+            pre_ranked = await SimpleRanker(self.config).rank(
+                list(papers), query, target_text, target_keywords, **kwargs
+            )
+            candidates = pre_ranked[:TOP_K_FOR_GPT]
+            deferred = pre_ranked[TOP_K_FOR_GPT:]
+        except Exception as exc:
+            logger.warning("GPT Ranker: pre-rank failed, scoring all papers: %s", exc)
+            pre_ranked = list(papers)
             candidates = list(papers)
+            deferred = []
+        usage.candidates = len(candidates)
 
         try:
-            # Prepare concise items for scoring
-            items = []
-            current_year = datetime.now().year
-
-            for idx, p in enumerate(candidates):
-                item = {
-                    "id": idx,
-                    "title": (p.title or "")[:200],
-                    "abstract": (p.abstract or "")[:500],
-                }
-                # Include year and citations if available (helps GPT assess quality)
-                if p.year:
-                    item["year"] = p.year
-                if p.citations_count and p.citations_count > 0:
-                    item["citations"] = p.citations_count
-                items.append(item)
+            ranked = await self._rank_candidates(
+                api_key, candidates, deferred, pre_ranked, usage,
+                query, target_text, target_keywords, kwargs.get("semantic_context"),
+            )
+        except Exception as exc:
+            logger.warning(f"GPT ranking failed, falling back to SimpleRanker: {exc}")
+            ranked = await SimpleRanker(self.config).rank(papers, query, target_text, target_keywords, **kwargs)
+
+        usage.wall_ms = round((time.perf_counter() - started) * 1000.0, 1)
+        get_gpt_ranker_stats().record(usage)
+        logger.info(
+            "GPT Ranker: usage model=%s candidates=%d cache_hits=%d shards=%d timeouts=%d "
+            "failures=%d prompt_tokens=%d completion_tokens=%d wall_ms=%.0f",
+            usage.model, usage.candidates, usage.cache_hits, usage.shards, usage.shard_timeouts,
+            usage.shard_failures, usage.prompt_tokens, usage.completion_tokens, usage.wall_ms,
+        )
+        return ranked
+
+    async def _rank_candidates(
+        self,
+        api_key: str,
+        candidates: List[DiscoveredPaper],
+        deferred: List[DiscoveredPaper],
+        pre_ranked: List[DiscoveredPaper],
+        usage: GptRankingUsage,
+        query: str,
+        target_text: Optional[str],
+        target_keywords: Optional[List[str]],
+        semantic_context: Optional[str],
+    ) -> List[DiscoveredPaper]:
+        # Prepare concise items for scoring
+        items: List[Dict[str, Any]] = []
+        current_year = datetime.now().year
 
+        for p in candidates:
+            item: Dict[str, Any] = {
+                "title": (p.title or "")[:200],
+                "abstract": (p.abstract or "")[:500],
+            }
+            # Include year and citations if available (helps GPT assess quality)
+            if p.year:
+                item["year"] = p.year
+            if p.citations_count and p.citations_count > 0:
+                item["citations"] = p.citations_count
+            items.append(item)
+
+        # Build rich project context — interpreted query is the primary signal
+        project_context_parts = []
+        if semantic_context:
+            project_context_parts.append(f"Research Topic: {semantic_context}")
+            project_context_parts.append(f"Original Search Query: {query}")
+        elif query:
+            project_context_parts.append(f"Research Query: {query}")
+        if target_text:
+            project_context_parts.append(f"Project Scope: {target_text[:500]}")
+        if target_keywords:
+            project_context_parts.append(f"Keywords: {', '.join(target_keywords[:10])}")
+
+        project_context = "\n".join(project_context_parts) if project_context_parts else query
+
+        scores_map: Dict[int, float] = {}
+        keys: List[str] = []
+        if self._score_cache is not None:
+            # Citation counts drift between sources and refreshes; they don't
+            # change what the paper is about, so they stay out of the key
+            keys = [
+                make_score_key(
+                    self.model_name, project_context, p.get_unique_key(),
+                    f"{item['title']}\x1f{item['abstract']}\x1f{item.get('year', '')}",
+                )
+                for p, item in zip(candidates, items)
+            ]
+            cached = await self._score_cache.get_many(keys)
+            scores_map = {i: cached[k] for i, k in enumerate(keys) if k in cached}
+        usage.cache_hits = len(scores_map)
+
+        pending = [i for i in range(len(candidates)) if i not in scores_map]
+        unscored: Set[int] = set()
+        if pending:
             try:
-                from openai import AsyncOpenAI  # type: ignore
+                client = self._create_client(api_key)
             except Exception as exc:
                 logger.info("OpenAI SDK unavailable: %s", exc)
-                return await SimpleRanker(self.config).rank(papers, query, target_text, target_keywords, **kwargs)
-
-            client = AsyncOpenAI(
-                api_key=api_key,
-                base_url="https://openrouter.ai/api/v1",
-                default_headers={
-                    "HTTP-Referer": "https://scholarhub.space",
-                    "X-Title": "ScholarHub",
-                },
-            )
+                return pre_ranked
 
-            # Build rich project context — interpreted query is the primary signal
-            project_context_parts = []
-            semantic_context = kwargs.get("semantic_context")
-            if semantic_context:
-                project_context_parts.append(f"Research Topic: {semantic_context}")
-                project_context_parts.append(f"Original Search Query: {query}")
-            elif query:
-                project_context_parts.append(f"Research Query: {query}")
-            if target_text:
-                project_context_parts.append(f"Project Scope: {target_text[:500]}")
-            if target_keywords:
-                project_context_parts.append(f"Keywords: {', '.join(target_keywords[:10])}")
-
-            project_context = "\n".join(project_context_parts) if project_context_parts else query
-
-            system = (
-                "You are an expert academic research assistant. Score each paper's relevance "
-                "to the research project (0.0 to 1.0).\n\n"
-                "Scoring guide:\n"
-                "- 0.9-1.0: Directly addresses the specific research question; matches the core intersection of ALL key concepts\n"
-                "- 0.7-0.8: Strongly related; covers most key concepts with relevant methodology\n"
-                "- 0.5-0.6: Moderately relevant; useful background or addresses a subset of the topic\n"
-                "- 0.3-0.4: Tangentially related; shares some terminology but different focus\n"
-                "- 0.0-0.2: Not relevant; different domain or only superficial keyword overlap\n\n"
-                "CRITICAL rules — be strict:\n"
-                "- When a 'Research Topic' is provided, use it as your PRIMARY basis for scoring.\n"
-                "- A paper matching only ONE keyword from a multi-concept query scores 0.2 or below.\n"
-                "- Score based on the INTERSECTION of ALL key concepts, not any single keyword.\n"
-                "- Sharing only a language (e.g. 'Arabic') or broad field (e.g. 'NLP') is NOT relevance.\n"
-                "- Be harsh: most papers should score below 0.5. Reserve 0.7+ for genuinely on-topic work.\n"
-                "- Read the abstract — a paper's actual contribution may differ from its title.\n\n"
-                "Return ONLY a compact JSON array: [{\"id\":0,\"score\":0.8},...]"
+            logger.info(
+                "GPT Ranker: scoring %d papers with %s (%d cached)",
+                len(pending), self.model_name, usage.cache_hits,
             )
+            fresh, unscored = await self._score_shards(client, project_context, items, pending, usage)
+            if not fresh and not scores_map:
+                logger.warning("GPT Ranker: no shard returned scores, keeping SimpleRanker order")
+                return pre_ranked
+            scores_map.update(fresh)
+            if self._score_cache is not None and fresh:
+                await self._score_cache.put_many({keys[i]: score for i, score in fresh.items()})
+
+        logger.info("GPT Ranker: %d scores, sample: %s",
+                    len(scores_map), dict(list(scores_map.items())[:3]))
+
+        # Apply GPT scores + bonuses to candidates that GPT scored
+        for idx, p in enumerate(candidates):
+            if idx in unscored:
+                # Shard timed out or failed: keep the lexical score, scaled
+                # like the deferred papers below
+                p.relevance_score = float(p.relevance_score) * 0.5
+                continue
 
-            user_payload = {
-                "project": project_context,
-                "papers": items,
-            }
+            base_score = scores_map.get(idx, 0.0)
 
-            logger.info(f"GPT Ranker: scoring {len(items)} papers with {self.model_name}")
+            if base_score > 0:
+                bonus = 0.0
 
-            # Timeout scales with paper count. gpt-5-mini needs ~0.5-1s per item;
-            # 45s accommodates 80 items with buffer. Endpoint budget is 180s.
-            gpt_timeout = 45
-            try:
-                resp = await asyncio.wait_for(
-                    client.chat.completions.create(
-                        model=self.model_name,
-                        messages=[
-                            {"role": "system", "content": system},
-                            {"role": "user", "content": json.dumps(user_payload, ensure_ascii=False)},
-                        ],
-                        max_completion_tokens=8000,
-                        temperature=0.0,
-                    ),
-                    timeout=gpt_timeout,
-                )
-            except asyncio.TimeoutError:
-                logger.warning("GPT Ranker timed out after %ds, falling back to SimpleRanker", gpt_timeout)
-                return await SimpleRanker(self.config).rank(papers, query, target_text, target_keywords, **kwargs)
-            finish_reason = resp.choices[0].finish_reason
-            content = (resp.choices[0].message.content or "[]").strip()
-            logger.info("GPT Ranker response (%d chars, finish=%s): %s", len(content), finish_reason, content[:300])
-
-            # Handle potential markdown code blocks
-            if content.startswith("```"):
-                lines = content.split("\n")
-                content = "\n".join(lines[1:-1] if lines[-1] == "```" else lines[1:])
-
-            # Parse JSON — with partial recovery for truncated responses
-            scores_map = {}
-            try:
-                data = json.loads(content)
-                if isinstance(data, list):
-                    scores_map = {
-                        int(obj.get("id", -1)): float(obj.get("score", 0.0))
-                        for obj in data if isinstance(obj, dict)
-                    }
-                else:
-                    logger.warning("GPT Ranker: expected JSON array, got %s", type(data).__name__)
-            except json.JSONDecodeError:
-                # Truncated JSON — extract individual score objects via regex
-                import re
-                for m in re.finditer(r'\{"id"\s*:\s*(\d+)\s*,\s*"score"\s*:\s*([\d.]+)\s*\}', content):
-                    try:
-                        scores_map[int(m.group(1))] = float(m.group(2))
-                    except (ValueError, IndexError):
-                        continue
-                if scores_map:
-                    logger.info("GPT Ranker: recovered %d scores from truncated response", len(scores_map))
-                else:
-                    logger.warning("GPT Ranker: failed to parse response: %s", content[:300])
-
-            logger.info("GPT Ranker: parsed %d scores, sample: %s",
-                        len(scores_map), dict(list(scores_map.items())[:3]))
-
-            # Apply GPT scores + bonuses to candidates that GPT scored
-            for idx, p in enumerate(candidates):
-                base_score = scores_map.get(idx, 0.0)
-
-                if base_score > 0:
-                    bonus = 0.0
-
-                    # Recency bonus: papers from last 3 years get up to 5% bonus
-                    if p.year and p.year >= current_year - 3:
-                        years_old = current_year - p.year
-                        recency_factor = 1 - (years_old / 3)
-                        bonus += self.recency_weight * recency_factor
-
-                    # Citation bonus: log-scaled, capped at 5%
-                    if p.citations_count and p.citations_count > 0:
-                        import math
-                        citation_factor = min(1.0, math.log10(1 + p.citations_count) / 3)
-                        bonus += self.citation_weight * citation_factor
-
-                    # PDF availability bonus
-                    if p.pdf_url:
-                        bonus += self.pdf_bonus
-
-                    base_score = min(1.0, base_score + bonus)
-
-                p.relevance_score = max(0.0, min(1.0, float(base_score)))
-
-            # Deferred papers (not sent to GPT) keep their SimpleRanker scores.
-            # Scale down so they rank below GPT-scored papers that had any real signal.
-            for p in deferred:
-                p.relevance_score = float(p.relevance_score) * 0.5
+                # Recency bonus: papers from last 3 years get up to 5% bonus
+                if p.year and p.year >= current_year - 3:
+                    years_old = current_year - p.year
+                    recency_factor = 1 - (years_old / 3)
+                    bonus += self.recency_weight * recency_factor
 
-            all_ranked = candidates + deferred
-            ranked = sorted(all_ranked, key=lambda p: p.relevance_score, reverse=True)
-            logger.info(
-                f"GPT Ranker: ranked {len(candidates)} (GPT) + {len(deferred)} (deferred), "
-                f"top score: {ranked[0].relevance_score if ranked else 0}"
-            )
-            return ranked
+                # Citation bonus: log-scaled, capped at 5%
+                if p.citations_count and p.citations_count > 0:
+                    citation_factor = min(1.0, math.log10(1 + p.citations_count) / 3)
+                    bonus += self.citation_weight * citation_factor
 
-        except Exception as exc:
-            logger.warning(f"GPT ranking failed, falling back to SimpleRanker: {exc}")
-            return await SimpleRanker(self.config).rank(papers, query, target_text, target_keywords, **kwargs)
+                # PDF availability bonus
+                if p.pdf_url:
+                    bonus += self.pdf_bonus
 
-    
+                base_score = min(1.0, base_score + bonus)
+
+            p.relevance_score = max(0.0, min(1.0, float(base_score)))
+
+        # Deferred papers (not sent to GPT) keep their SimpleRanker scores.
+        # Scale down so they rank below GPT-scored papers that had any real signal.
+        for p in deferred:
+            p.relevance_score = float(p.relevance_score) * 0.5
+
+        all_ranked = candidates + deferred
+        ranked = sorted(all_ranked, key=lambda p: p.relevance_score, reverse=True)
+        logger.info(
+            f"GPT Ranker: ranked {len(candidates) - len(unscored)} (GPT) + "
+            f"{len(deferred) + len(unscored)} (lexical), "
+            f"top score: {ranked[0].relevance_score if ranked else 0}"
+        )
+        return ranked
+
+    async def _score_shards(
+        self,
+        client,
+        project_context: str,
+        items: List[Dict[str, Any]],
+        pending: List[int],
+        usage: GptRankingUsage,
+    ) -> Tuple[Dict[int, float], Set[int]]:
+        """Score `items[pending]` in parallel shards.
+
+        Returns the scores by candidate index and the indices whose shard
+        timed out or failed."""
+        from app.core.config import settings
+
+        n_shards = math.ceil(len(pending) / settings.GPT_RANKER_SHARD_SIZE)
+        # Round-robin over the pre-ranked order: shard sizes differ by at most
+        # one and every shard spans the same range of lexical scores
+        shards = [pending[s::n_shards] for s in range(n_shards)]
+        usage.shards = len(shards)
+        semaphore = asyncio.Semaphore(settings.GPT_RANKER_MAX_PARALLEL)
+        timeout = settings.GPT_RANKER_SHARD_TIMEOUT_SECONDS
+
+        async def run(shard: List[int]):
+            async with semaphore:
+                payload = [{"id": local, **items[i]} for local, i in enumerate(shard)]
+                return await asyncio.wait_for(
+                    self._score_shard(client, project_context, payload), timeout=timeout,
+                )
+
+        results = await asyncio.gather(*(run(shard) for shard in shards), return_exceptions=True)
+
+        scores: Dict[int, float] = {}
+        unscored: Set[int] = set()
+        for shard, result in zip(shards, results):
+            if isinstance(result, asyncio.TimeoutError):
+                usage.shard_timeouts += 1
+                unscored.update(shard)
+                logger.warning("GPT Ranker: shard of %d timed out after %.0fs", len(shard), timeout)
+                continue
+            if isinstance(result, BaseException):
+                usage.shard_failures += 1
+                unscored.update(shard)
+                logger.warning("GPT Ranker: shard of %d failed: %s", len(shard), result)
+                continue
+            shard_scores, prompt_tokens, completion_tokens = result
+            usage.prompt_tokens += prompt_tokens
+            usage.completion_tokens += completion_tokens
+            for local, i in enumerate(shard):
+                if local in shard_scores:
+                    scores[i] = shard_scores[local]
+        return scores, unscored
+
+    async def _score_shard(
+        self,
+        client,
+        project_context: str,
+        payload: List[Dict[str, Any]],
+    ) -> Tuple[Dict[int, float], int, int]:
+        """One chat call. Returns (scores by shard-local id, prompt tokens, completion tokens)."""
+        user_payload = {
+            "project": project_context,
+            "papers": payload,
+        }
+        resp = await client.chat.completions.create(
+            model=self.model_name,
+            messages=[
+                {"role": "system", "content": _GPT_SYSTEM_PROMPT},
+                {"role": "user", "content": json.dumps(user_payload, ensure_ascii=False)},
+            ],
+            # ~100 tokens per item leaves room for reasoning models' preamble
+            max_completion_tokens=min(8000, max(1000, 100 * len(payload))),
+            temperature=0.0,
+        )
+        finish_reason = resp.choices[0].finish_reason
+        content = (resp.choices[0].message.content or "[]").strip()
+        logger.debug("GPT Ranker shard response (%d chars, finish=%s): %s", len(content), finish_reason, content[:300])
+
+        resp_usage = getattr(resp, "usage", None)
+        prompt_tokens = int(getattr(resp_usage, "prompt_tokens", 0) or 0)
+        completion_tokens = int(getattr(resp_usage, "completion_tokens", 0) or 0)
+        return _parse_gpt_scores(content), prompt_tokens, completion_tokens
 
     async def _fetch_pdf_snippets(self, session: aiohttp.ClientSession, papers: List[DiscoveredPaper]) -> List[str]:
         async def fetch_and_extract(paper: DiscoveredPaper) -> str:
@@ -9,11 +9,27 @@ This achieves the best relevance quality while keeping latency reasonable.
 
 from __future__ import annotations
 
-import asyncio
 import logging
 import math
+import threading
 from dataclasses import dataclass
-from typing import List, Dict, Any, TYPE_CHECKING
+from typing import List, Dict, Any, Optional, Tuple, TYPE_CHECKING
+
+from app.core.config import settings
+from app.services.onnx_inference import (
+    BACKEND_ONNX,
+    inference_backend,
+    load_onnx_cross_encoder,
+    mark_onnx_load_failed,
+    model_variant,
+    onnx_load_failed,
+)
+from app.services.paper_discovery.inference_batcher import CrossEncoderBatcher
+from app.services.paper_discovery.score_cache import (
+    CrossEncoderScoreCache,
+    get_score_cache,
+    make_score_key,
+)
 
 if TYPE_CHECKING:
     from app.services.embedding_service import EmbeddingService
@@ -25,6 +41,51 @@ logger = logging.getLogger(__name__)
 _CROSS_ENCODER_CACHE: Dict[str, Any] = {}
 
 
+def _load_cross_encoder_model(model_name: str):
+    """Load (or fetch from the module cache) the cross-encoder for the
+    configured INFERENCE_BACKEND: a sentence-transformers CrossEncoder, or an
+    int8 ONNX graph with the same `predict` API. A failed ONNX load is
+    latched, and the PyTorch model is cached under the variant then looked up."""
+    cache_key = model_variant(model_name)
+    cached = _CROSS_ENCODER_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+    if inference_backend() == BACKEND_ONNX and not onnx_load_failed(model_name):
+        try:
+            model = load_onnx_cross_encoder(model_name)
+            _CROSS_ENCODER_CACHE[cache_key] = model
+            return model
+        except Exception as exc:
+            logger.warning(f"[Reranker] ONNX backend unavailable, falling back to PyTorch: {exc}")
+            mark_onnx_load_failed(model_name)
+            cache_key = model_variant(model_name)
+    from sentence_transformers import CrossEncoder
+    logger.info(f"[Reranker] Loading cross-encoder: {model_name}")
+    model = CrossEncoder(model_name)
+    _CROSS_ENCODER_CACHE[cache_key] = model
+    logger.info("[Reranker] Cross-encoder loaded and cached")
+    return model
+
+
+_batcher: Optional[CrossEncoderBatcher] = None
+_batcher_lock = threading.Lock()
+
+
+def get_cross_encoder_batcher() -> CrossEncoderBatcher:
+    """Process-wide batcher shared by every CrossEncoderReranker instance."""
+    global _batcher
+    if _batcher is None:
+        with _batcher_lock:
+            if _batcher is None:
+                model_name = CrossEncoderReranker.CROSS_ENCODER_MODEL
+                _batcher = CrossEncoderBatcher(
+                    lambda pairs: _load_cross_encoder_model(model_name).predict(pairs),
+                    max_batch_pairs=settings.CROSS_ENCODER_BATCH_MAX_PAIRS,
+                    max_wait_seconds=settings.CROSS_ENCODER_BATCH_WAIT_MS / 1000.0,
+                )
+    return _batcher
+
+
 @dataclass
 class RerankedResult:
     """Result from two-stage reranking."""
@@ -40,7 +101,7 @@ class CrossEncoderReranker:
 
     Stage 1 (Bi-encoder):
     - Embed query and paper titles/abstracts
-    - Compute cosine similarity
+    - Compute cosine similarity (one matmul over all candidates)
     - Keep top K candidates (fast filtering)
 
     Stage 2 (Cross-encoder):
@@ -64,32 +125,36 @@ class CrossEncoderReranker:
     # - "BAAI/bge-reranker-large" (best quality, slowest)
     CROSS_ENCODER_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
 
-    def __init__(self, embedding_service: "EmbeddingService"):
+    def __init__(
+        self,
+        embedding_service: "EmbeddingService",
+        batcher: Optional[CrossEncoderBatcher] = None,
+        score_cache: Optional[CrossEncoderScoreCache] = None,
+        use_score_cache: bool = True,
+    ):
         """
         Initialize the reranker.
 
         Args:
             embedding_service: EmbeddingService instance for bi-encoder embeddings
+            batcher: Cross-encoder batcher (defaults to the process-wide one,
+                so pairs from concurrent requests share one predict call)
+            score_cache: Cross-encoder score cache (defaults to the
+                process-wide one)
+            use_score_cache: Set False to always recompute scores
         """
         self.embedding_service = embedding_service
         self._cross_encoder = None
-        self._lock = asyncio.Lock()
+        self._batcher = batcher
+        if use_score_cache and score_cache is None:
+            score_cache = get_score_cache()
+        self._score_cache = score_cache if use_score_cache else None
 
     def _load_cross_encoder(self):
         """Lazy load the cross-encoder model (module-level cached across requests)."""
-        if self._cross_encoder is not None:
-            return self._cross_encoder
-        cached = _CROSS_ENCODER_CACHE.get(self.CROSS_ENCODER_MODEL)
-        if cached is not None:
-            self._cross_encoder = cached
-            return cached
-        from sentence_transformers import CrossEncoder
-        logger.info(f"[Reranker] Loading cross-encoder: {self.CROSS_ENCODER_MODEL}")
-        model = CrossEncoder(self.CROSS_ENCODER_MODEL)
-        _CROSS_ENCODER_CACHE[self.CROSS_ENCODER_MODEL] = model
-        self._cross_encoder = model
-        logger.info("[Reranker] Cross-encoder loaded and cached")
-        return model
+        if self._cross_encoder is None:
+            self._cross_encoder = _load_cross_encoder_model(self.CROSS_ENCODER_MODEL)
+        return self._cross_encoder
 
     async def rerank(
         self,
@@ -142,18 +207,25 @@ class CrossEncoderReranker:
             return []
 
         # Stage 2: Cross-encoder reranking
-        final_results = await self._cross_encoder_stage(
+        final_results, cache_hits = await self._cross_encoder_stage(
             query=query,
             candidates=bi_encoder_results,
             top_k=top_k_final,
             title_key=title_key,
-            abstract_key=abstract_key
+            abstract_key=abstract_key,
+            id_key=id_key,
         )
 
         top_score = final_results[0].final_score if final_results else 0
+        cache_note = ""
+        if self._score_cache is not None:
+            cache_note = (
+                f" score_cache={cache_hits}/{len(bi_encoder_results)}"
+                f" (cumulative_hit_ratio={self._score_cache.stats.hit_ratio:.2f})"
+            )
         logger.info(
             f"[Reranker] COMPLETE results={len(final_results)} "
-            f"top_score={top_score:.3f}"
+            f"top_score={top_score:.3f}{cache_note}"
         )
 
         return final_results
@@ -172,33 +244,18 @@ class CrossEncoderReranker:
         Returns list of (paper, bi_score) tuples sorted by score descending.
         """
         # Embed query
-        query_embedding = await self.embedding_service.embed(query)
+        query_embedding = await self.embedding_service.embed_array(query)
 
-        # Embed papers
-        paper_embeddings = await self.embedding_service.embed_papers(
+        # Embed papers (rows follow `papers` order)
+        paper_embeddings = await self.embedding_service.embed_papers_array(
             papers,
             title_key=title_key,
             abstract_key=abstract_key
         )
 
-        # Compute similarities
-        # Key must match embed_papers logic: doi > id > paper_id
-        scored_papers = []
-        for paper in papers:
-            paper_id = paper.get("doi") or paper.get("id") or paper.get("paper_id")
-            paper_id = str(paper_id) if paper_id else paper.get(title_key, "")
-            embedding = paper_embeddings.get(paper_id)
-
-            if embedding:
-                similarity = self.embedding_service.cosine_similarity(query_embedding, embedding)
-            else:
-                similarity = 0.0
-
-            scored_papers.append((paper, similarity))
-
-        # Sort by similarity and keep top K
-        scored_papers.sort(key=lambda x: x[1], reverse=True)
-        return scored_papers[:top_k]
+        # One normalized matmul + argpartition; results sorted by similarity
+        indices, scores = self.embedding_service.top_k(query_embedding, paper_embeddings, top_k)
+        return [(papers[i], float(score)) for i, score in zip(indices, scores)]
 
     async def _cross_encoder_stage(
         self,
@@ -206,33 +263,55 @@ class CrossEncoderReranker:
         candidates: List[tuple],
         top_k: int,
         title_key: str,
-        abstract_key: str
-    ) -> List[RerankedResult]:
+        abstract_key: str,
+        id_key: str = "id",
+    ) -> Tuple[List[RerankedResult], int]:
         """
         Stage 2: Cross-encoder reranking.
 
         Takes candidates from bi-encoder stage and scores with cross-encoder.
+        Scores already in the score cache are reused. Returns the results
+        and the number of cache hits.
         """
         if not candidates:
-            return []
+            return [], 0
 
-        # Prepare query-document pairs for cross-encoder
-        pairs = []
+        doc_texts = []
         for paper, _ in candidates:
             title = paper.get(title_key, "")
             abstract = paper.get(abstract_key, "") or ""
             # Truncate to avoid token limits
-            doc_text = f"{title}. {abstract[:500]}"
-            pairs.append([query, doc_text])
-
-        # Score with cross-encoder (run in thread pool)
-        async with self._lock:
-            cross_encoder = self._load_cross_encoder()
-            loop = asyncio.get_event_loop()
-            cross_scores = await loop.run_in_executor(
-                None,
-                lambda: cross_encoder.predict(pairs)
-            )
+            doc_texts.append(f"{title}. {abstract[:500]}")
+
+        cached: Dict[str, float] = {}
+        keys: List[str] = []
+        if self._score_cache is not None:
+            # Quantized ONNX scores differ slightly from PyTorch ones; keep them apart
+            model_id = model_variant(self.CROSS_ENCODER_MODEL)
+            keys = [
+                make_score_key(model_id, query, str(paper.get(id_key) or ""), doc_text)
+                for (paper, _), doc_text in zip(candidates, doc_texts)
+            ]
+            cached = await self._score_cache.get_many(keys)
+
+        # Prepare query-document pairs for the papers without a cached score
+        uncached = [i for i in range(len(candidates)) if not keys or keys[i] not in cached]
+        pairs = [(query, doc_texts[i]) for i in uncached]
+
+        # Score with cross-encoder, batched with pairs from concurrent requests
+        batcher = self._batcher or get_cross_encoder_batcher()
+        fresh_scores = await batcher.score(pairs)
+
+        cross_scores: List[float] = [0.0] * len(candidates)
+        for i, key in enumerate(keys):
+            if key in cached:
+                cross_scores[i] = cached[key]
+        for i, score in zip(uncached, fresh_scores):
+            cross_scores[i] = float(score)
+        # Skip caching if the model that scored differs from the keyed variant
+        # (first load fell back from ONNX to PyTorch)
+        if self._score_cache is not None and uncached and model_variant(self.CROSS_ENCODER_MODEL) == model_id:
+            await self._score_cache.put_many({keys[i]: cross_scores[i] for i in uncached})
 
         # Combine scores and create results
         results = []
@@ -253,7 +332,7 @@ class CrossEncoderReranker:
 
         # Sort by final score
         results.sort(key=lambda r: r.final_score, reverse=True)
-        return results[:top_k]
+        return results[:top_k], len(candidates) - len(uncached)
 
     @staticmethod
     def _sigmoid(x: float) -> float:
@@ -291,32 +370,23 @@ class BiEncoderOnlyReranker:
             return []
 
         # Embed query
-        query_embedding = await self.embedding_service.embed(query)
+        query_embedding = await self.embedding_service.embed_array(query)
 
-        # Embed papers
-        paper_embeddings = await self.embedding_service.embed_papers(
+        # Embed papers (rows follow `papers` order)
+        paper_embeddings = await self.embedding_service.embed_papers_array(
             papers,
             title_key=title_key,
             abstract_key=abstract_key
         )
 
         # Score and rank
-        results = []
-        for paper in papers:
-            paper_id = str(paper.get("doi") or paper.get(title_key, ""))
-            embedding = paper_embeddings.get(paper_id)
-
-            if embedding:
-                score = self.embedding_service.cosine_similarity(query_embedding, embedding)
-            else:
-                score = 0.0
-
-            results.append(RerankedResult(
-                paper=paper,
-                bi_encoder_score=score,
+        indices, scores = self.embedding_service.top_k(query_embedding, paper_embeddings, top_k)
+        return [
+            RerankedResult(
+                paper=papers[i],
+                bi_encoder_score=float(score),
                 cross_encoder_score=0.0,
-                final_score=score
-            ))
-
-        results.sort(key=lambda r: r.final_score, reverse=True)
-        return results[:top_k]
+                final_score=float(score)
+            )
+            for i, score in zip(indices, scores)
+        ]
@@ -0,0 +1,254 @@
+"""Cross-request cache of per-source search results.
+
+Every discovery call fans out to up to nine external APIs. Results are cached
+per source, keyed by (source, normalized query, filters, max_results), so
+repeated and near-identical queries from different users, channels and
+project auto-discovery skip the network.
+
+Tier 1 is an in-process LRU. Tier 2 is an optional Redis tier shared by every
+uvicorn worker. Entries are *fresh* for `fresh_seconds`. After that they are
+*stale* until `stale_seconds`: a stale entry is served immediately and the
+caller schedules a background refresh (stale-while-revalidate).
+
+Papers are stored as plain dicts and rebuilt on every read. The discovery
+pipeline mutates papers in place (dedup merge, enrichment, scoring), so a
+cached entry must never share objects with a caller.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, fields
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.paper_discovery.models import DiscoveredPaper
+from app.services.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# Redis key prefix (source and query digest are appended)
+RESULT_CACHE_PREFIX = "discovery:results:v1:"
+
+FRESH = "fresh"
+STALE = "stale"
+MISS = "miss"
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a query, used in cache keys."""
+    return " ".join((query or "").lower().split())
+
+
+def make_cache_key(
+    source: str,
+    query: str,
+    max_results: int,
+    *,
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+    open_access_only: bool = False,
+) -> str:
+    payload = json.dumps(
+        [normalize_query(query), year_from, year_to, bool(open_access_only), max_results]
+    )
+    digest = hashlib.sha1(payload.encode()).hexdigest()
+    return f"{source}:{digest}"
+
+
+# Constructor fields only; the memo of derived values isn't cached state
+_PAPER_FIELDS = tuple(f.name for f in fields(DiscoveredPaper) if f.init)
+
+
+def _paper_to_dict(paper: DiscoveredPaper) -> Dict[str, Any]:
+    data = {name: copy.deepcopy(getattr(paper, name)) for name in _PAPER_FIELDS}
+    # Scores and merge provenance are per-request pipeline state
+    data["relevance_score"] = 0.0
+    data["merged_sources"] = []
+    return data
+
+
+def _paper_from_dict(data: Dict[str, Any]) -> DiscoveredPaper:
+    return DiscoveredPaper(**{k: v for k, v in data.items() if k in _PAPER_FIELDS})
+
+
+@dataclass
+class ResultCacheStats:
+    """Cumulative lookup counters, reported in the `[Search] COMPLETE` log."""
+
+    fresh_hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    refreshes: int = 0
+    redis_errors: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.fresh_hits + self.stale_hits + self.misses
+        return (self.fresh_hits + self.stale_hits) / total if total else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "fresh_hits": self.fresh_hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "redis_errors": self.redis_errors,
+            "hit_ratio": round(self.hit_ratio, 4),
+        }
+
+
+class SourceResultCache:
+    """Memory LRU in front of an optional Redis tier, with stale-while-revalidate."""
+
+    def __init__(
+        self,
+        *,
+        max_entries: int,
+        fresh_seconds: float,
+        stale_seconds: float,
+        use_redis: bool = True,
+    ) -> None:
+        self._entries: OrderedDict[str, Tuple[float, List[Dict[str, Any]]]] = OrderedDict()
+        self._max_entries = max_entries
+        self.fresh_seconds = fresh_seconds
+        self.stale_seconds = max(stale_seconds, fresh_seconds)
+        self._use_redis = use_redis
+        self._lock = threading.Lock()
+        self._refreshing: set[str] = set()
+        self._background: set[asyncio.Task] = set()
+        self.stats = ResultCacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # --- memory tier ---
+
+    def _memory_get(self, key: str) -> Optional[Tuple[float, List[Dict[str, Any]]]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _memory_put(self, key: str, stored_at: float, payload: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._entries[key] = (stored_at, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    # --- redis tier ---
+
+    def _redis_get(self, key: str) -> Optional[Tuple[float, List[Dict[str, Any]]]]:
+        client = get_redis_client() if self._use_redis else None
+        if client is None:
+            return None
+        raw = client.get(f"{RESULT_CACHE_PREFIX}{key}")
+        if not raw:
+            return None
+        data = json.loads(raw)
+        return float(data["stored_at"]), data["papers"]
+
+    def _redis_put(self, key: str, stored_at: float, payload: List[Dict[str, Any]]) -> None:
+        client = get_redis_client() if self._use_redis else None
+        if client is None:
+            return
+        body = json.dumps({"stored_at": stored_at, "papers": payload}, default=str)
+        client.setex(f"{RESULT_CACHE_PREFIX}{key}", int(self.stale_seconds), body)
+
+    # --- public API ---
+
+    async def get(self, key: str) -> Tuple[str, Optional[List[DiscoveredPaper]]]:
+        """Return `(state, papers)` where state is FRESH, STALE or MISS."""
+        entry = self._memory_get(key)
+        if entry is None and self._use_redis:
+            try:
+                entry = await asyncio.to_thread(self._redis_get, key)
+            except Exception as exc:
+                self.stats.redis_errors += 1
+                logger.debug("[ResultCache] Redis lookup failed: %s", exc)
+                entry = None
+            if entry is not None:
+                self._memory_put(key, *entry)
+
+        if entry is not None:
+            stored_at, payload = entry
+            age = time.time() - stored_at
+            if age <= self.fresh_seconds:
+                self.stats.fresh_hits += 1
+                return FRESH, [_paper_from_dict(d) for d in payload]
+            if age <= self.stale_seconds:
+                self.stats.stale_hits += 1
+                return STALE, [_paper_from_dict(d) for d in payload]
+
+        self.stats.misses += 1
+        return MISS, None
+
+    async def set(self, key: str, papers: List[DiscoveredPaper]) -> None:
+        stored_at = time.time()
+        payload = [_paper_to_dict(p) for p in papers]
+        self._memory_put(key, stored_at, payload)
+        if self._use_redis:
+            try:
+                await asyncio.to_thread(self._redis_put, key, stored_at, payload)
+            except Exception as exc:
+                self.stats.redis_errors += 1
+                logger.debug("[ResultCache] Redis write failed: %s", exc)
+
+    def schedule_refresh(self, key: str, fetch) -> bool:
+        """Refresh `key` in the background with `fetch()` (a coroutine factory
+        returning papers). At most one refresh per key runs at a time.
+        Returns False when a refresh for the key is already in flight."""
+        if key in self._refreshing:
+            return False
+        self._refreshing.add(key)
+
+        async def _refresh() -> None:
+            try:
+                papers = await fetch()
+                if papers:
+                    await self.set(key, papers)
+                    self.stats.refreshes += 1
+            except Exception as exc:
+                logger.debug("[ResultCache] Background refresh of %s failed: %s", key, exc)
+            finally:
+                self._refreshing.discard(key)
+
+        task = asyncio.create_task(_refresh())
+        # Keep a strong reference until done so the task isn't garbage collected
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        return True
+
+    def clear(self) -> None:
+        """Clear the in-process tier. The shared Redis tier expires by TTL."""
+        with self._lock:
+            self._entries.clear()
+
+
+_shared_cache: Optional[SourceResultCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_source_result_cache() -> Optional[SourceResultCache]:
+    """Process-wide result cache, or None when disabled in settings."""
+    global _shared_cache
+    if not settings.DISCOVERY_RESULT_CACHE_ENABLED:
+        return None
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                _shared_cache = SourceResultCache(
+                    max_entries=settings.DISCOVERY_RESULT_CACHE_MAX_ENTRIES,
+                    fresh_seconds=settings.DISCOVERY_RESULT_CACHE_FRESH_SECONDS,
+                    stale_seconds=settings.DISCOVERY_RESULT_CACHE_STALE_SECONDS,
+                    use_redis=settings.DISCOVERY_RESULT_CACHE_REDIS_ENABLED,
+                )
+    return _shared_cache
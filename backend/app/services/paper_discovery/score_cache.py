@@ -0,0 +1,204 @@
+"""Persistent cache of cross-encoder (query, paper) scores.
+
+`SemanticRanker` scores every candidate with the cross-encoder, and the same
+query is often re-ranked against largely the same papers (batch searches,
+retries, auto-discovery refreshes). A cross-encoder score depends only on
+the model, the query and the document text, so it can be reused verbatim.
+
+Keys are (model, normalized query, paper unique key, document-text hash), so
+a paper whose abstract was enriched since the last run is scored again.
+Tier 1 is an in-process LRU with per-entry expiry. Tier 2 is an optional
+Redis tier shared across uvicorn workers, with the same TTL.
+
+`GptRanker` keeps its LLM relevance scores in a second instance under its own
+Redis prefix; there the "query" is the whole project context sent to the model.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.paper_discovery.result_cache import normalize_query
+from app.services.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+SCORE_CACHE_PREFIX = "reranker:score:v1:"
+GPT_SCORE_CACHE_PREFIX = "ranker:gpt:v1:"
+
+
+def make_score_key(model: str, query: str, paper_key: str, doc_text: str) -> str:
+    query_digest = hashlib.sha1(normalize_query(query).encode()).hexdigest()[:16]
+    doc_digest = hashlib.sha1(doc_text.encode()).hexdigest()[:16]
+    raw = f"{model}\x1f{query_digest}\x1f{paper_key}\x1f{doc_digest}"
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+@dataclass
+class ScoreCacheStats:
+    """Cumulative lookup counters, reported in the `[Reranker] COMPLETE` log."""
+
+    memory_hits: int = 0
+    redis_hits: int = 0
+    misses: int = 0
+    redis_errors: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        hits = self.memory_hits + self.redis_hits
+        total = hits + self.misses
+        return hits / total if total else 0.0
+
+
+class CrossEncoderScoreCache:
+    """Memory LRU with TTL in front of an optional Redis tier."""
+
+    def __init__(
+        self,
+        *,
+        max_entries: int,
+        ttl_seconds: float,
+        use_redis: bool = True,
+        redis_prefix: str = SCORE_CACHE_PREFIX,
+    ) -> None:
+        self._entries: OrderedDict[str, Tuple[float, float]] = OrderedDict()
+        self._max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._use_redis = use_redis
+        self._redis_prefix = redis_prefix
+        self._lock = threading.Lock()
+        self.stats = ScoreCacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # --- memory tier ---
+
+    def _memory_get_many(self, keys: Iterable[str]) -> Dict[str, float]:
+        now = time.time()
+        found: Dict[str, float] = {}
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                expires_at, score = entry
+                if expires_at < now:
+                    del self._entries[key]
+                    continue
+                self._entries.move_to_end(key)
+                found[key] = score
+        return found
+
+    def _memory_put_many(self, scores: Dict[str, float]) -> None:
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            for key, score in scores.items():
+                self._entries[key] = (expires_at, score)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    # --- redis tier ---
+
+    def _redis_get_many(self, keys: List[str]) -> Dict[str, float]:
+        client = get_redis_client()
+        if client is None or not keys:
+            return {}
+        values = client.mget([f"{self._redis_prefix}{k}" for k in keys])
+        return {k: float(v) for k, v in zip(keys, values) if v is not None}
+
+    def _redis_put_many(self, scores: Dict[str, float]) -> None:
+        client = get_redis_client()
+        if client is None or not scores:
+            return
+        ttl = max(1, int(self.ttl_seconds))
+        pipe = client.pipeline(transaction=False)
+        for key, score in scores.items():
+            pipe.setex(f"{self._redis_prefix}{key}", ttl, repr(float(score)))
+        pipe.execute()
+
+    # --- public API ---
+
+    async def get_many(self, keys: List[str]) -> Dict[str, float]:
+        """Cached scores for the subset of `keys` that is present."""
+        found = self._memory_get_many(keys)
+        self.stats.memory_hits += len(found)
+        missing = [k for k in keys if k not in found]
+        if missing and self._use_redis:
+            try:
+                from_redis = await asyncio.to_thread(self._redis_get_many, missing)
+            except Exception as exc:
+                self.stats.redis_errors += 1
+                logger.debug("[ScoreCache] Redis lookup failed: %s", exc)
+                from_redis = {}
+            if from_redis:
+                self._memory_put_many(from_redis)
+                found.update(from_redis)
+                self.stats.redis_hits += len(from_redis)
+        self.stats.misses += len(keys) - len(found)
+        return found
+
+    async def put_many(self, scores: Dict[str, float]) -> None:
+        if not scores:
+            return
+        self._memory_put_many(scores)
+        if self._use_redis:
+            try:
+                await asyncio.to_thread(self._redis_put_many, scores)
+            except Exception as exc:
+                self.stats.redis_errors += 1
+                logger.debug("[ScoreCache] Redis write failed: %s", exc)
+
+    def clear(self) -> None:
+        """Clear the in-process tier. The shared Redis tier expires by TTL."""
+        with self._lock:
+            self._entries.clear()
+
+
+_shared_cache: Optional[CrossEncoderScoreCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_score_cache() -> Optional[CrossEncoderScoreCache]:
+    """Process-wide score cache, or None when disabled in settings."""
+    global _shared_cache
+    if not settings.CROSS_ENCODER_SCORE_CACHE_ENABLED:
+        return None
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                _shared_cache = CrossEncoderScoreCache(
+                    max_entries=settings.CROSS_ENCODER_SCORE_CACHE_MAX_ENTRIES,
+                    ttl_seconds=settings.CROSS_ENCODER_SCORE_CACHE_TTL_SECONDS,
+                    use_redis=settings.CROSS_ENCODER_SCORE_CACHE_REDIS_ENABLED,
+                )
+    return _shared_cache
+
+
+_gpt_cache: Optional[CrossEncoderScoreCache] = None
+
+
+def get_gpt_score_cache() -> Optional[CrossEncoderScoreCache]:
+    """Process-wide GptRanker score cache, or None when disabled in settings."""
+    global _gpt_cache
+    if not settings.GPT_RANKER_SCORE_CACHE_ENABLED:
+        return None
+    if _gpt_cache is None:
+        with _shared_cache_lock:
+            if _gpt_cache is None:
+                _gpt_cache = CrossEncoderScoreCache(
+                    max_entries=settings.GPT_RANKER_SCORE_CACHE_MAX_ENTRIES,
+                    ttl_seconds=settings.GPT_RANKER_SCORE_CACHE_TTL_SECONDS,
+                    use_redis=settings.GPT_RANKER_SCORE_CACHE_REDIS_ENABLED,
+                    redis_prefix=GPT_SCORE_CACHE_PREFIX,
+                )
+    return _gpt_cache
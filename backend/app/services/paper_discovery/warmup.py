@@ -7,7 +7,9 @@ full cold-start cost:
     - ms-marco-MiniLM-L-6-v2 cross-encoder ~10-15s
 
 Both models are already module-level cached after first load, so we just
-need to trigger that first load ourselves, off the request path.
+need to trigger that first load ourselves, off the request path. With
+INFERENCE_BACKEND=onnx the loaders return the ONNX Runtime sessions instead,
+and the first load also pays the one-time export + int8 quantization.
 """
 from __future__ import annotations
 
@@ -27,7 +29,7 @@ def _warmup_bi_encoder() -> None:
         model = provider._load_model()
         # One tiny encode so the inference graph is compiled too.
         model.encode("warmup", normalize_embeddings=True)
-        logger.info("[SemanticWarmup] Bi-encoder ready")
+        logger.info(f"[SemanticWarmup] Bi-encoder ready ({type(model).__name__})")
     except Exception as exc:
         logger.warning(f"[SemanticWarmup] Bi-encoder warmup failed: {exc}")
 
@@ -41,7 +43,7 @@ def _warmup_cross_encoder() -> None:
         model = reranker._load_cross_encoder()
         # Force a single predict so the model is JIT-compiled.
         model.predict([("warmup query", "warmup document")])
-        logger.info("[SemanticWarmup] Cross-encoder ready")
+        logger.info(f"[SemanticWarmup] Cross-encoder ready ({type(model).__name__})")
     except Exception as exc:
         logger.warning(f"[SemanticWarmup] Cross-encoder warmup failed: {exc}")
 
@@ -91,7 +93,8 @@ def _check_semantic_scholar_key() -> None:
 async def warmup_semantic_models() -> None:
     """Load bi-encoder + cross-encoder in a worker thread so we don't block the event loop."""
     t0 = time.monotonic()
-    logger.info("[SemanticWarmup] Preloading bi-encoder and cross-encoder…")
+    from app.services.onnx_inference import inference_backend
+    logger.info(f"[SemanticWarmup] Preloading bi-encoder and cross-encoder (backend={inference_backend()})…")
     # Run all three in threads so startup stays responsive. The S2 key check
     # is piggy-backed here so everything that warms the search path lives
     # in one spot.
@@ -8,7 +8,7 @@ import hashlib
 import logging
 import os
 import time
-from typing import Callable, List, Dict, Any, Optional, Set
+from typing import AsyncIterator, Awaitable, Callable, List, Dict, Any, Optional, Set
 from datetime import datetime
 from urllib.parse import urlencode, urljoin, urlparse, quote, parse_qs
 import json
@@ -18,6 +18,7 @@ import re
 import inspect
 
 from app.core.config import settings
+from app.services.http_client import borrow_session, get_http_client_registry
 from app.services.paper_discovery.config import DiscoveryConfig
 from app.services.paper_discovery.interfaces import (
     PaperEnricher,
@@ -25,7 +26,24 @@ from app.services.paper_discovery.interfaces import (
     PaperSearcher,
 )
 from app.services.paper_discovery.models import DiscoveredPaper, PaperSource, _normalize_title
+from app.services.paper_discovery.pdf_links import (
+    DEFINITIVE_MISS_STATUSES,
+    KIND_CHECK,
+    KIND_SCRAPE,
+    HostBudget,
+    PdfLinkStore,
+    PdfProbeRun,
+    preload_keys,
+)
 from app.services.paper_discovery.query import QueryIntent, extract_core_terms, understand_query
+from app.services.paper_discovery.latency import SourceLatencyTracker, get_latency_tracker, run_hedged
+from app.services.paper_discovery.result_cache import (
+    MISS,
+    STALE,
+    SourceResultCache,
+    get_source_result_cache,
+    make_cache_key,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -60,7 +78,7 @@ from app.services.paper_discovery.rankers import (
     SimpleRanker,
 )
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 
 
 def _build_default_searchers(
@@ -72,29 +90,73 @@ def _build_default_searchers(
     sciencedirect_api_key: Optional[str] = None,
     serpapi_key: Optional[str] = None,
     is_manual: bool = False,
+    session_for: Optional[Callable[[str], aiohttp.ClientSession]] = None,
 ) -> List[PaperSearcher]:
-    """Build the default searcher set for the requested discovery mode."""
+    """Build the default searcher set for the requested discovery mode.
+
+    `session_for(source)` picks a per-provider pooled session; without it
+    every searcher shares `session`.
+    """
+    pick = session_for or (lambda _source: session)
 
     core_api_key = os.getenv("CORE_API_KEY")
     searchers: List[PaperSearcher] = [
-        ArxivSearcher(session, config),
-        SemanticScholarSearcher(session, config, semantic_scholar_api_key),
+        ArxivSearcher(pick(PaperSource.ARXIV.value), config),
+        SemanticScholarSearcher(pick(PaperSource.SEMANTIC_SCHOLAR.value), config, semantic_scholar_api_key),
     ]
     if is_manual:
-        searchers.append(GoogleScholarSearcher(session, config, api_key=serpapi_key))
+        searchers.append(
+            GoogleScholarSearcher(pick(PaperSource.GOOGLE_SCHOLAR.value), config, api_key=serpapi_key)
+        )
     searchers.extend(
         [
-            CrossrefSearcher(session, config),
-            PubMedSearcher(session, config, email=ncbi_email),
-            ScienceDirectSearcher(session, config, api_key=sciencedirect_api_key),
-            OpenAlexSearcher(session, config),
-            CoreSearcher(session, config, api_key=core_api_key),
-            EuropePmcSearcher(session, config),
+            CrossrefSearcher(pick(PaperSource.CROSSREF.value), config),
+            PubMedSearcher(pick(PaperSource.PUBMED.value), config, email=ncbi_email),
+            ScienceDirectSearcher(pick(PaperSource.SCIENCEDIRECT.value), config, api_key=sciencedirect_api_key),
+            OpenAlexSearcher(pick(PaperSource.OPENALEX.value), config),
+            CoreSearcher(pick(PaperSource.CORE.value), config, api_key=core_api_key),
+            EuropePmcSearcher(pick(PaperSource.EUROPE_PMC.value), config),
         ]
     )
     return searchers
 
 
+def _build_default_enrichers(
+    session: aiohttp.ClientSession,
+    config: DiscoveryConfig,
+    *,
+    unpaywall_email: Optional[str] = None,
+    session_for: Optional[Callable[[str], aiohttp.ClientSession]] = None,
+) -> List[PaperEnricher]:
+    """Build the enricher chain. Order of fallback enrichers (run after
+    Crossref/Unpaywall in Phase 2b) is: cache (instant) → landing
+    (Springer, ~1s) → PDF (slow)."""
+    pick = session_for or (lambda _provider: session)
+    enrichers: List[PaperEnricher] = [
+        CrossrefEnricher(pick("crossref"), config),
+    ]
+    if unpaywall_email:
+        enrichers.append(UnpaywallEnricher(pick("unpaywall"), config, unpaywall_email))
+    enrichers.append(CacheAbstractEnricher(session, config))
+    enrichers.append(LandingAbstractEnricher(session, config))
+    enrichers.append(PdfAbstractEnricher(session, config))
+    return enrichers
+
+
+def _open_discovery_session() -> tuple[aiohttp.ClientSession, Optional[Callable[[str], aiohttp.ClientSession]], bool]:
+    """(session, session_for, owns_session) for a new discovery service.
+
+    Borrows the process-wide pooled sessions when running on the app loop;
+    otherwise (other loops, scripts) opens a private session as before.
+    """
+    shared = borrow_session()
+    if shared is not None:
+        return shared, get_http_client_registry().session, False
+    timeout = aiohttp.ClientTimeout(total=120, connect=10)
+    connector = aiohttp.TCPConnector(limit=50, limit_per_host=10)
+    return aiohttp.ClientSession(timeout=timeout, connector=connector), None, True
+
+
 @dataclass
 class SourceStats:
     """Per-source statistics from a discovery run."""
@@ -107,9 +169,102 @@ class SourceStats:
 
 @dataclass
 class DiscoveryResult:
-    """Result of a discovery run including papers and per-source stats."""
+    """Result of a discovery run including papers and per-source stats.
+
+    `pdf_task` is set when PDF links are still being resolved in the
+    background; it resolves to the "pdf_links" `DiscoveryBatch`.
+    """
     papers: List[DiscoveredPaper] = field(default_factory=list)
     source_stats: List[SourceStats] = field(default_factory=list)
+    pdf_task: Optional["asyncio.Task[DiscoveryBatch]"] = field(default=None, repr=False, compare=False)
+
+
+@dataclass
+class DiscoveryBatch:
+    """Incremental result emitted by `discover_papers_stream`.
+
+    Stages, in order:
+      - "provisional": after each source completes — deduped and lexically
+        ranked from whatever has arrived so far (pre-enrichment)
+      - "enriched": after metadata/abstract enrichment, still lexical
+      - "final": the fully ranked result `discover_papers` would return
+      - "pdf_links": the final papers again once PDF links are resolved, when
+        they are resolved in the background (`background_pdf_links`)
+
+    Non-final batches hold copies, so consumers may keep or mutate them.
+    """
+    stage: str
+    papers: List[DiscoveredPaper] = field(default_factory=list)
+    source_stats: List[SourceStats] = field(default_factory=list)
+    sources_completed: int = 0
+    sources_total: int = 0
+
+    @property
+    def is_final(self) -> bool:
+        return self.stage == "final"
+
+
+async def _stream_batches(
+    run: Callable[[Callable[[DiscoveryBatch], None]], Awaitable[DiscoveryResult]],
+) -> AsyncIterator[DiscoveryBatch]:
+    """Drive `run(batch_callback)` in a task and yield its batches as they
+    arrive, followed by a "final" batch built from the returned result and,
+    if PDF links are resolving in the background, the "pdf_links" batch.
+    Closing the generator early cancels the discovery run."""
+    queue: asyncio.Queue[DiscoveryBatch] = asyncio.Queue()
+    task = asyncio.create_task(run(queue.put_nowait))
+    pdf_task: Optional[asyncio.Task] = None
+    try:
+        while True:
+            getter = asyncio.ensure_future(queue.get())
+            done, _ = await asyncio.wait({getter, task}, return_when=asyncio.FIRST_COMPLETED)
+            if getter in done:
+                yield getter.result()
+                continue
+            getter.cancel()
+            break
+        while not queue.empty():
+            yield queue.get_nowait()
+        result = task.result()
+        yield DiscoveryBatch(
+            stage="final",
+            papers=result.papers,
+            source_stats=result.source_stats,
+            sources_completed=sum(1 for s in result.source_stats if s.status != "pending"),
+            sources_total=len(result.source_stats),
+        )
+        pdf_task = result.pdf_task
+        if pdf_task is not None:
+            try:
+                pdf_batch = await pdf_task
+            except Exception as exc:
+                logger.warning("[PDF] Background augmentation failed: %s", exc)
+            else:
+                yield pdf_batch
+    finally:
+        for pending in (task, pdf_task):
+            if pending is not None and not pending.done():
+                pending.cancel()
+                try:
+                    await pending
+                except (asyncio.CancelledError, Exception):
+                    pass
+
+
+def _mark_open_access(papers: List[DiscoveredPaper]) -> None:
+    """After PDF augmentation, a paper counts as open access iff it has a PDF link."""
+    for paper in papers:
+        paper.is_open_access = bool(getattr(paper, 'pdf_url', None))
+
+
+def _snapshot_paper(paper: DiscoveredPaper) -> DiscoveredPaper:
+    """Copy a paper so later pipeline stages and consumers can't change each other's objects."""
+    return replace(
+        paper,
+        authors=list(paper.authors or []),
+        keywords=list(paper.keywords or []),
+        merged_sources=list(paper.merged_sources or []),
+    )
 
 class SearchOrchestrator:
     """Orchestrates the paper discovery process"""
@@ -119,12 +274,26 @@ class SearchOrchestrator:
         searchers: List[PaperSearcher],
         enrichers: List[PaperEnricher],
         ranker: PaperRanker,
-        config: DiscoveryConfig
+        config: DiscoveryConfig,
+        *,
+        result_cache: Optional[SourceResultCache] = None,
+        use_result_cache: bool = True,
+        latency_tracker: Optional[SourceLatencyTracker] = None,
+        background_refresh: bool = True,
     ):
         self.searchers = searchers
         self.enrichers = enrichers
         self.ranker = ranker
         self.config = config
+        # Per-source result cache shared across requests (None = disabled)
+        if use_result_cache and result_cache is None:
+            result_cache = get_source_result_cache()
+        self.result_cache = result_cache if use_result_cache else None
+        # Per-source latency / circuit-breaker state, shared process-wide by default
+        self.latency = latency_tracker if latency_tracker is not None else get_latency_tracker()
+        # Stale cache entries are refreshed in the background with the
+        # searchers' sessions; only safe when those outlive the request
+        self.background_refresh = background_refresh
     
     async def discover_papers(
         self,
@@ -141,8 +310,14 @@ class SearchOrchestrator:
         open_access_only: bool = False,
         query_intent: Optional[QueryIntent] = None,
         progress_callback: Optional[Callable[..., Any]] = None,
+        batch_callback: Optional[Callable[[DiscoveryBatch], Any]] = None,
     ) -> DiscoveryResult:
-        """Orchestrate paper discovery and return results with per-source stats."""
+        """Orchestrate paper discovery and return results with per-source stats.
+
+        When `batch_callback` is given it receives provisional `DiscoveryBatch`
+        snapshots as sources complete and after enrichment (see
+        `discover_papers_stream`).
+        """
         search_start_time = time.time()
         logger.info(f"[Search] START query='{query}' | max_results={max_results} | sources={sources} | fast_mode={fast_mode} | core_terms={core_terms or 'none'}")
 
@@ -156,6 +331,29 @@ class SearchOrchestrator:
                 except Exception:
                     pass  # Never let callback errors break the pipeline
 
+        async def _emit_batch(stage: str, papers: List[DiscoveredPaper]) -> None:
+            """Dedup + lexically rank a snapshot of `papers` for batch_callback."""
+            if batch_callback is None:
+                return
+            try:
+                batch = await self._provisional_batch(
+                    stage,
+                    papers,
+                    query,
+                    max_results,
+                    target_text=target_text,
+                    target_keywords=target_keywords,
+                    year_from=year_from,
+                    year_to=year_to,
+                    open_access_only=open_access_only,
+                    source_stats=list(source_stats_map.values()),
+                )
+                result = batch_callback(batch)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as exc:
+                logger.debug("[Search] %s batch failed: %s", stage, exc)
+
         active_searchers = self.searchers
         if sources is not None and len(sources) > 0:
             wanted = {s.lower() for s in sources}
@@ -169,7 +367,12 @@ class SearchOrchestrator:
         else:
             logger.info(f"Using all {len(active_searchers)} searchers: {[s.get_source_name() for s in active_searchers]}")
 
+        latency = self.latency
+        adaptive_timeouts = settings.DISCOVERY_ADAPTIVE_TIMEOUTS_ENABLED
+        hedging = settings.DISCOVERY_HEDGING_ENABLED
+
         if fast_mode:
+            # Fastest observed sources first; static order until we have data
             priority_order = {
                 'semantic_scholar': 0,
                 'google_scholar': 1,
@@ -183,7 +386,10 @@ class SearchOrchestrator:
             }
             active_searchers = sorted(
                 active_searchers,
-                key=lambda s: priority_order.get(s.get_source_name(), len(priority_order))
+                key=lambda s: (
+                    latency.expected_latency(s.get_source_name()) or float("inf"),
+                    priority_order.get(s.get_source_name(), len(priority_order)),
+                )
             )
         # Initialize per-source stats tracking
         source_stats_map: Dict[str, SourceStats] = {
@@ -193,6 +399,11 @@ class SearchOrchestrator:
 
         # Phase 1: Concurrent search with stats tracking
         sem = asyncio.Semaphore(self.config.max_concurrent_searches)
+        result_cache = self.result_cache
+        cache_states: Dict[str, str] = {}
+        source_timeouts: Dict[str, float] = {}
+        hedged_sources: List[str] = []
+        circuit_open: List[str] = []
 
         async def limited_search(searcher: PaperSearcher) -> tuple[str, List[DiscoveredPaper], str, Optional[str], int]:
             """Returns (source_name, papers, status, error, elapsed_ms)"""
@@ -205,6 +416,10 @@ class SearchOrchestrator:
                         timeout = min(timeout, 8.0)  # Quick timeout for small searches
                     else:
                         timeout = min(timeout, 15.0)  # Moderate timeout for larger searches
+                if adaptive_timeouts:
+                    timeout = latency.timeout_for(source_name, ceiling=timeout)
+                source_timeouts[source_name] = round(timeout, 1)
+                fetch_started: Optional[float] = None
                 try:
                     # Pass native filters only to searchers that support them.
                     filter_kwargs: Dict[str, Any] = {}
@@ -221,22 +436,94 @@ class SearchOrchestrator:
                     except Exception:
                         filter_kwargs = {}
 
-                    papers = await asyncio.wait_for(
-                        searcher.search(query, max_results, **filter_kwargs),
-                        timeout=timeout
-                    )
+                    async def _fetch() -> List[DiscoveredPaper]:
+                        hedge_after = latency.hedge_delay(source_name, timeout) if hedging else None
+                        papers, hedged, hedge_won = await run_hedged(
+                            lambda: searcher.search(query, max_results, **filter_kwargs),
+                            timeout=timeout,
+                            hedge_after=hedge_after,
+                        )
+                        if hedged:
+                            hedged_sources.append(source_name)
+                            latency.record_hedge(source_name, won=hedge_won)
+                        return papers
+
+                    async def _refresh() -> List[DiscoveredPaper]:
+                        # Background refreshes obey the circuit breaker too
+                        if not latency.allow_request(source_name):
+                            return []
+                        started = time.monotonic()
+                        status = "error"
+                        try:
+                            papers = await _fetch()
+                            status = "success"
+                            return papers
+                        except asyncio.TimeoutError:
+                            status = "timeout"
+                            raise
+                        except RateLimitError:
+                            status = "rate_limited"
+                            raise
+                        except asyncio.CancelledError:
+                            status = None
+                            latency.release_probe(source_name)
+                            raise
+                        finally:
+                            if status is not None:
+                                latency.record(source_name, time.monotonic() - started, status)
+
+                    cache_key = None
+                    if result_cache is not None:
+                        cache_key = make_cache_key(
+                            source_name, query, max_results,
+                            year_from=year_from, year_to=year_to, open_access_only=open_access_only,
+                        )
+                        state, cached = await result_cache.get(cache_key)
+                        cache_states[source_name] = state
+                        if cached is not None:
+                            if state == STALE and self.background_refresh:
+                                result_cache.schedule_refresh(cache_key, _refresh)
+                            elapsed_ms = int((time.time() - source_start) * 1000)
+                            return (source_name, cached, "success", None, elapsed_ms)
+
+                    if not latency.allow_request(source_name):
+                        # Reported like the Google Scholar kill-switch: a
+                        # short-circuited source shows up as rate limited.
+                        circuit_open.append(source_name)
+                        logger.info(f"{source_name} skipped: circuit open after repeated timeouts/429s")
+                        return (source_name, [], "rate_limited", "Circuit open (repeated timeouts/429s)", 0)
+
+                    fetch_started = time.monotonic()
+                    papers = await _fetch()
+                    latency.record(source_name, time.monotonic() - fetch_started, "success")
+                    # Empty lists are not cached: several searchers swallow
+                    # errors and return [], which must not stick for minutes.
+                    if cache_key is not None and papers:
+                        await result_cache.set(cache_key, papers)
                     elapsed_ms = int((time.time() - source_start) * 1000)
                     return (source_name, papers, "success", None, elapsed_ms)
+                except asyncio.CancelledError:
+                    # No outcome to record, but a half-open probe must not
+                    # stay claimed or the source is never tried again
+                    if fetch_started is not None:
+                        latency.release_probe(source_name)
+                    raise
                 except asyncio.TimeoutError:
                     elapsed_ms = int((time.time() - source_start) * 1000)
-                    logger.warning(f"{source_name} timed out after {elapsed_ms}ms")
+                    if fetch_started is not None:
+                        latency.record(source_name, time.monotonic() - fetch_started, "timeout")
+                    logger.warning(f"{source_name} timed out after {elapsed_ms}ms (timeout {timeout:.1f}s)")
                     return (source_name, [], "timeout", "Request timed out", elapsed_ms)
                 except RateLimitError as e:
                     elapsed_ms = int((time.time() - source_start) * 1000)
+                    if fetch_started is not None:
+                        latency.record(source_name, time.monotonic() - fetch_started, "rate_limited")
                     logger.warning(f"{source_name} rate limited after {elapsed_ms}ms: {e}")
                     return (source_name, [], "rate_limited", "API rate limited", elapsed_ms)
                 except Exception as e:  # pragma: no cover - network variability
                     elapsed_ms = int((time.time() - source_start) * 1000)
+                    if fetch_started is not None:
+                        latency.record(source_name, time.monotonic() - fetch_started, "error")
                     error_msg = str(e)[:100]
                     logger.error(f"{source_name} failed after {elapsed_ms}ms: {e}")
                     return (source_name, [], "error", error_msg, elapsed_ms)
@@ -270,6 +557,9 @@ class SearchOrchestrator:
                         "elapsed_ms": elapsed_ms,
                     })
                 except asyncio.CancelledError:
+                    current = asyncio.current_task()
+                    if current is not None and current.cancelling():
+                        raise  # discovery itself was cancelled (e.g. stream closed)
                     continue
                 except Exception as exc:  # pragma: no cover - defensive
                     logger.error("Discovery task failed: %s", exc)
@@ -278,6 +568,7 @@ class SearchOrchestrator:
                 if isinstance(papers, list) and len(papers) > 0:
                     sources_with_papers += 1
                     collected.extend(papers)
+                    await _emit_batch("provisional", collected)
 
                 # Early exit for fast_mode: enough raw hits from >=3 sources
                 # after 3s. Dedup happens at the end regardless.
@@ -292,6 +583,10 @@ class SearchOrchestrator:
                     )
                     break
         finally:
+            current = asyncio.current_task()
+            if current is not None and current.cancelling():
+                for task in tasks:
+                    task.cancel()
             # Collect results from any tasks that completed during the gather
             remaining = await asyncio.gather(*tasks, return_exceptions=True)
             for result in remaining:
@@ -398,6 +693,8 @@ class SearchOrchestrator:
                 len(all_papers),
             )
 
+        await _emit_batch("enriched", filtered_papers)
+
         # Phase 3: Ranking
         await _notify({"type": "phase", "phase": "ranking", "message": "AI-ranking papers by relevance..."})
         # (pass core_terms for boost + semantic context from query understanding)
@@ -421,7 +718,7 @@ class SearchOrchestrator:
         # Phase 3.1: Concept overlap gate — penalize papers matching too few query concepts
         if core_terms and len(core_terms) >= 3:
             for paper in ranked_papers:
-                text = f"{paper.title} {paper.abstract or ''}".lower()
+                text = paper.search_text
                 hits = sum(1 for t in core_terms if t in text)
                 ratio = hits / len(core_terms)
                 if ratio < 0.3:
@@ -451,6 +748,14 @@ class SearchOrchestrator:
         source_times = {s.source: s.elapsed_ms for s in source_stats_map.values()}
         rate_limited = [s.source for s in source_stats_map.values() if s.status == "rate_limited"]
         degraded = [s.source for s in source_stats_map.values() if s.status in ("timeout", "rate_limited", "error")]
+        cache_summary = "off"
+        if result_cache is not None:
+            hits = sum(1 for state in cache_states.values() if state != MISS)
+            stale = sum(1 for state in cache_states.values() if state == STALE)
+            cache_summary = (
+                f"{hits}/{len(cache_states)} (stale={stale}, "
+                f"cumulative_hit_ratio={result_cache.stats.hit_ratio:.2f})"
+            )
 
         logger.info(
             f"[Search] COMPLETE query='{query}' | "
@@ -459,6 +764,10 @@ class SearchOrchestrator:
             f"times_ms={source_times} | "
             f"rate_limited={rate_limited or 'none'} | "
             f"degraded={degraded or 'none'} | "
+            f"result_cache={cache_summary} | "
+            f"timeouts_s={source_timeouts} | "
+            f"circuit_open={circuit_open or 'none'} | "
+            f"hedged={hedged_sources or 'none'} | "
             f"total_elapsed={search_elapsed:.2f}s"
         )
 
@@ -467,6 +776,59 @@ class SearchOrchestrator:
             source_stats=list(source_stats_map.values())
         )
 
+    def discover_papers_stream(
+        self,
+        query: str,
+        max_results: int = 20,
+        **kwargs: Any,
+    ) -> AsyncIterator[DiscoveryBatch]:
+        """Stream `discover_papers` as `DiscoveryBatch`es: provisional batches
+        as each source completes, an "enriched" batch, then the "final" one.
+        Accepts the same keyword arguments as `discover_papers`."""
+        return _stream_batches(
+            lambda callback: self.discover_papers(query, max_results, batch_callback=callback, **kwargs)
+        )
+
+    async def _provisional_batch(
+        self,
+        stage: str,
+        papers: List[DiscoveredPaper],
+        query: str,
+        max_results: int,
+        *,
+        target_text: Optional[str],
+        target_keywords: Optional[List[str]],
+        year_from: Optional[int],
+        year_to: Optional[int],
+        open_access_only: bool,
+        source_stats: List[SourceStats],
+    ) -> DiscoveryBatch:
+        """Cheap stand-in for the full pipeline: dedup, hard filters and
+        lexical ranking over copies of the papers seen so far."""
+        from app.services.paper_discovery.dedup import dedupe_papers
+
+        deduped, _ = dedupe_papers([_snapshot_paper(p) for p in papers])
+        filtered, _, _ = self._apply_hard_filters(
+            deduped,
+            year_from=year_from,
+            year_to=year_to,
+            open_access_only=open_access_only,
+        )
+        ranked = await LexicalRanker(self.config).rank(
+            filtered,
+            query,
+            target_text=target_text,
+            target_keywords=target_keywords,
+        )
+        ranked = self._apply_source_diversity(ranked, max_results)
+        return DiscoveryBatch(
+            stage=stage,
+            papers=ranked[:max_results],
+            source_stats=[replace(s) for s in source_stats],
+            sources_completed=sum(1 for s in source_stats if s.status != "pending"),
+            sources_total=len(source_stats),
+        )
+
     def _apply_hard_filters(
         self,
         papers: List[DiscoveredPaper],
@@ -570,11 +932,9 @@ class PaperDiscoveryServiceFactory:
         if config.ncbi_email is None and ncbi_email is not None:
             config.ncbi_email = ncbi_email
 
-        # Create HTTP session
-        timeout = aiohttp.ClientTimeout(total=120, connect=10)
-        connector = aiohttp.TCPConnector(limit=50, limit_per_host=10)
-        session = aiohttp.ClientSession(timeout=timeout, connector=connector)
-        
+        # Pooled process-wide sessions when available, else a private one
+        session, session_for, owns_session = _open_discovery_session()
+
         # Create searchers
         resolved_ncbi_email = (
             config.ncbi_email
@@ -607,20 +967,14 @@ class PaperDiscoveryServiceFactory:
             sciencedirect_api_key=sciencedirect_api_key,
             serpapi_key=serpapi_key,
             is_manual=is_manual,
+            session_for=session_for,
         )
         
         # Purged advanced ranking flags: no-op
 
-        # Create enrichers. Order of fallback enrichers (run after Crossref/Unpaywall
-        # in Phase 2b) is: cache (instant) → landing (Springer, ~1s) → PDF (slow).
-        enrichers: List[PaperEnricher] = [
-            CrossrefEnricher(session, config),
-        ]
-        if unpaywall_email:
-            enrichers.append(UnpaywallEnricher(session, config, unpaywall_email))
-        enrichers.append(CacheAbstractEnricher(session, config))
-        enrichers.append(LandingAbstractEnricher(session, config))
-        enrichers.append(PdfAbstractEnricher(session, config))
+        enrichers = _build_default_enrichers(
+            session, config, unpaywall_email=unpaywall_email, session_for=session_for
+        )
 
         # Create ranker based on environment configuration
         # Priority: SemanticRanker (if enabled) > GptRanker (if API key) > SimpleRanker
@@ -643,7 +997,7 @@ class PaperDiscoveryServiceFactory:
             config=config,
             ncbi_email=resolved_ncbi_email,
             unpaywall_email=unpaywall_email,
-            owns_session=True,
+            owns_session=owns_session,
             is_manual=is_manual,
         )
 
@@ -675,15 +1029,16 @@ class PaperDiscoveryService:
         self.config = config or DiscoveryConfig()
         self.unpaywall_email = unpaywall_email or os.getenv('UNPAYWALL_EMAIL')
         self._unpaywall_cache: Dict[str, Optional[str]] = {}
+        self._pdf_link_store = PdfLinkStore()
+        self._pdf_tasks: Set[asyncio.Task] = set()
         self.is_manual = is_manual
 
-        # HTTP session management
+        # HTTP session management. Pooled sessions are never closed here, so
+        # background work (e.g. stale result-cache refreshes) can outlive us.
         self._owns_session = owns_session if owns_session is not None else session is None
+        session_for: Optional[Callable[[str], aiohttp.ClientSession]] = None
         if session is None:
-            timeout = aiohttp.ClientTimeout(total=120, connect=10)
-            connector = aiohttp.TCPConnector(limit=50, limit_per_host=10)
-            session = aiohttp.ClientSession(timeout=timeout, connector=connector)
-            self._owns_session = True
+            session, session_for, self._owns_session = _open_discovery_session()
         self.session = session
 
         resolved_ncbi_email = (
@@ -722,17 +1077,15 @@ class PaperDiscoveryService:
                 sciencedirect_api_key=sciencedirect_api_key,
                 serpapi_key=serpapi_key,
                 is_manual=self.is_manual,
+                session_for=session_for,
             )
 
-            enrichers: List[PaperEnricher] = [
-                CrossrefEnricher(self.session, self.config),
-            ]
-            email = unpaywall_email or os.getenv("UNPAYWALL_EMAIL")
-            if email:
-                enrichers.append(UnpaywallEnricher(self.session, self.config, email))
-            enrichers.append(CacheAbstractEnricher(self.session, self.config))
-            enrichers.append(LandingAbstractEnricher(self.session, self.config))
-            enrichers.append(PdfAbstractEnricher(self.session, self.config))
+            enrichers = _build_default_enrichers(
+                self.session,
+                self.config,
+                unpaywall_email=unpaywall_email or os.getenv("UNPAYWALL_EMAIL"),
+                session_for=session_for,
+            )
 
             # Create ranker per env
             # Priority: SemanticRanker (if enabled) > GptRanker (if API key) > SimpleRanker
@@ -746,6 +1099,10 @@ class PaperDiscoveryService:
                 ranker_for_env = SimpleRanker(self.config)
             orchestrator = SearchOrchestrator(searchers, enrichers, ranker_for_env, self.config)
         self.orchestrator = orchestrator
+        if self._owns_session:
+            # A private session is closed with this service (or torn down with
+            # its event loop), which a background refresh could outlive
+            self.orchestrator.background_refresh = False
 
         self._metrics: Dict[str, Any] = {}
     
@@ -762,8 +1119,15 @@ class PaperDiscoveryService:
         year_to: Optional[int] = None,
         open_access_only: bool = False,
         progress_callback: Optional[Callable[..., Any]] = None,
+        batch_callback: Optional[Callable[[DiscoveryBatch], Any]] = None,
+        background_pdf_links: bool = False,
     ) -> DiscoveryResult:
-        """Main discovery method with clean orchestration"""
+        """Main discovery method with clean orchestration
+
+        With `background_pdf_links`, the result is returned before PDF links
+        are resolved; `result.pdf_task` then resolves to a "pdf_links"
+        `DiscoveryBatch` once they are filled in.
+        """
 
         start_time = time.time()
         timings = {}
@@ -815,19 +1179,26 @@ class PaperDiscoveryService:
                 open_access_only=open_access_only,
                 query_intent=intent,
                 progress_callback=progress_callback,
+                batch_callback=batch_callback,
             )
             papers = result.papers
             if fast_mode:
                 logger.info("[PDF] Skipping PDF augmentation in fast mode (%d papers)", len(papers))
+                _mark_open_access(papers)
+            elif background_pdf_links and papers:
+                # The background pass works on copies: `papers` is handed out
+                # as the final result and must not change underneath its holders
+                pdf_task = asyncio.create_task(self._augment_pdf_links_background(
+                    [_snapshot_paper(p) for p in papers], result.source_stats,
+                ))
+                self._pdf_tasks.add(pdf_task)
+                pdf_task.add_done_callback(self._pdf_tasks.discard)
+                result.pdf_task = pdf_task
             else:
                 pdf_start = time.time()
                 await self._augment_pdf_links(papers, fast_mode=fast_mode)
                 logger.info("[PDF] Augmentation took %.1fs for %d papers", time.time() - pdf_start, len(papers))
-            for paper in papers:
-                if getattr(paper, 'pdf_url', None):
-                    paper.is_open_access = True
-                else:
-                    paper.is_open_access = False
+                _mark_open_access(papers)
             timings['discovery'] = time.time() - phase_start
 
             timings['total'] = time.time() - start_time
@@ -876,8 +1247,32 @@ class PaperDiscoveryService:
             logger.error(f"Discovery failed: {e}")
             return DiscoveryResult(papers=[], source_stats=[])
     
+    def discover_papers_stream(
+        self,
+        query: str,
+        max_results: int = 20,
+        **kwargs: Any,
+    ) -> AsyncIterator[DiscoveryBatch]:
+        """Streaming variant of `discover_papers`.
+
+        Yields provisional batches (deduped, lexically ranked) as each source
+        completes, an "enriched" batch once abstracts/metadata are filled in,
+        and finally the fully ranked, PDF-augmented result. Lets the UI and
+        the search tool show first results long before the slowest source
+        and the reranker finish. PDF links are resolved after the final batch
+        and arrive as a "pdf_links" batch, unless `background_pdf_links=False`
+        is passed. Accepts the keyword arguments of `discover_papers`.
+        """
+        kwargs.setdefault("background_pdf_links", True)
+        return _stream_batches(
+            lambda callback: self.discover_papers(query, max_results, batch_callback=callback, **kwargs)
+        )
+
     async def close(self):
         """Clean up resources"""
+        # Background PDF resolution uses our session; don't let it outlive us
+        for task in list(self._pdf_tasks):
+            task.cancel()
         if self._owns_session and not self.session.closed:
             await self.session.close()
 
@@ -887,53 +1282,127 @@ class PaperDiscoveryService:
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         await self.close()
 
-    async def _augment_pdf_links(self, papers: List[DiscoveredPaper], *, fast_mode: bool = False) -> None:
-        """Best-effort augmentation to ensure open-access papers expose direct PDF URLs."""
-        if not papers:
-            return
+    def _new_probe_run(self) -> PdfProbeRun:
+        return PdfProbeRun(
+            HostBudget(
+                total=self.config.max_concurrent_pdf_checks,
+                per_host=settings.PDF_LINK_PER_HOST_CONCURRENCY,
+            )
+        )
+
+    async def _augment_pdf_links(
+        self,
+        papers: List[DiscoveredPaper],
+        *,
+        fast_mode: bool = False,
+        deadline: Optional[float] = None,
+    ) -> List[DiscoveredPaper]:
+        """Best-effort augmentation to ensure open-access papers expose direct PDF URLs.
 
-        sem = asyncio.Semaphore(self.config.max_concurrent_pdf_checks)
+        Papers are worked through in rank order by `max_concurrent_pdf_checks`
+        workers, with probes capped per host. Probe outcomes, including dead
+        links, come from and go back to the persistent PDF link cache. With a
+        `deadline` (seconds), papers not finished by then are left as they are.
+        Returns the papers that were processed.
+        """
+        if not papers:
+            return []
 
         if fast_mode:
-            fast_verify_tasks = [
-                self._verify_existing_pdf_link(paper, sem)
-                for paper in papers
+            work = [
+                paper for paper in papers
                 if paper.source == PaperSource.OPENALEX.value and paper.pdf_url
             ]
-            if fast_verify_tasks:
-                await asyncio.gather(*fast_verify_tasks, return_exceptions=True)
-            return
+        else:
+            work = list(papers)
+        if not work:
+            return []
+
+        run = self._new_probe_run()
+        run.cached = await self._pdf_link_store.lookup(
+            preload_keys(
+                (p.pdf_url for p in work),
+                (url for p in work if not fast_mode for url in self._candidate_pdf_urls(p)),
+                (url for p in work if not fast_mode for url in (p.open_access_url, p.url)),
+            )
+        )
 
-        verify_tasks = [
-            self._verify_existing_pdf_link(paper, sem)
-            for paper in papers
-            if paper.pdf_url
-        ]
-        if verify_tasks:
-            await asyncio.gather(*verify_tasks, return_exceptions=True)
+        queue: asyncio.Queue[DiscoveredPaper] = asyncio.Queue()
+        for paper in work:
+            queue.put_nowait(paper)
+        processed: List[DiscoveredPaper] = []
 
-        tasks = []
-        for paper in papers:
-            if paper.pdf_url:
-                continue
-            candidates = self._candidate_pdf_urls(paper)
-            if not candidates:
-                continue
-            tasks.append(self._resolve_pdf_for_paper(paper, candidates, sem))
+        async def worker() -> None:
+            while True:
+                try:
+                    paper = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    if paper.pdf_url:
+                        await self._verify_existing_pdf_link(paper, run)
+                    if not fast_mode and not paper.pdf_url:
+                        candidates = self._candidate_pdf_urls(paper)
+                        if candidates:
+                            await self._resolve_pdf_for_paper(paper, candidates, run)
+                except Exception as exc:
+                    logger.debug("[PDF] Resolution failed for '%s': %s", paper.title, exc)
+                # Not reached when the deadline cancels the worker mid-paper
+                processed.append(paper)
+
+        workers = asyncio.gather(
+            *(worker() for _ in range(min(self.config.max_concurrent_pdf_checks, len(work))))
+        )
+        try:
+            if deadline is not None:
+                await asyncio.wait_for(workers, timeout=deadline)
+            else:
+                await workers
+        except asyncio.TimeoutError:
+            logger.info("[PDF] Deadline of %.0fs reached with %d papers unresolved", deadline, queue.qsize())
+        finally:
+            logger.info("[PDF] %d link cache hits, %d probes", run.cache_hits, run.probes)
+            outcomes = run.cacheable_outcomes()
+            if outcomes:
+                await self._pdf_link_store.store(outcomes)
+        return processed
+
+    async def _augment_pdf_links_background(
+        self,
+        papers: List[DiscoveredPaper],
+        source_stats: List[SourceStats],
+    ) -> DiscoveryBatch:
+        """Resolve PDF links after `discover_papers` has returned, as the
+        "pdf_links" follow-up batch.
 
-        if tasks:
-            await asyncio.gather(*tasks, return_exceptions=True)
+        `papers` must be copies owned by this task; they become the batch's
+        papers. Papers the deadline cut off keep their open-access flag.
+        """
+        pdf_start = time.time()
+        processed = await self._augment_pdf_links(papers, deadline=settings.PDF_LINK_BACKGROUND_DEADLINE_SECONDS)
+        _mark_open_access(processed)
+        logger.info(
+            "[PDF] Background augmentation took %.1fs for %d/%d papers",
+            time.time() - pdf_start, len(processed), len(papers),
+        )
+        return DiscoveryBatch(
+            stage="pdf_links",
+            papers=papers,
+            source_stats=source_stats,
+            sources_completed=sum(1 for st in source_stats if st.status != "pending"),
+            sources_total=len(source_stats),
+        )
 
     async def _verify_existing_pdf_link(
         self,
         paper: DiscoveredPaper,
-        sem: asyncio.Semaphore,
+        run: PdfProbeRun,
     ) -> None:
         original = getattr(paper, 'pdf_url', None)
         if not original:
             return
 
-        resolved = await self._check_pdf_candidate(original, sem)
+        resolved = await self._check_pdf_candidate(original, run)
         if resolved:
             paper.pdf_url = resolved
             if not getattr(paper, 'open_access_url', None):
@@ -1055,13 +1524,13 @@ class PaperDiscoveryService:
         self,
         paper: DiscoveredPaper,
         candidates: List[str],
-        sem: asyncio.Semaphore,
+        run: PdfProbeRun,
     ) -> None:
         if paper.pdf_url:
             return
 
         if paper.doi and self.unpaywall_email:
-            pdf_from_unpaywall = await self._fetch_unpaywall_pdf(paper.doi, sem)
+            pdf_from_unpaywall = await self._fetch_unpaywall_pdf(paper.doi, run)
             if pdf_from_unpaywall:
                 paper.pdf_url = pdf_from_unpaywall
                 if not paper.open_access_url:
@@ -1069,7 +1538,7 @@ class PaperDiscoveryService:
                 return
 
         for candidate in candidates:
-            pdf_url = await self._check_pdf_candidate(candidate, sem)
+            pdf_url = await self._check_pdf_candidate(candidate, run)
             if pdf_url:
                 paper.pdf_url = pdf_url
                 if not paper.open_access_url:
@@ -1098,7 +1567,7 @@ class PaperDiscoveryService:
 
         # As a final fallback, scrape the landing/open-access page for embedded PDF links.
         for landing in filter(None, [paper.open_access_url, paper.url]):
-            pdf_url = await self._scrape_pdf_from_page(landing, sem)
+            pdf_url = await self._scrape_pdf_from_page(landing, run)
             if pdf_url:
                 paper.pdf_url = pdf_url
                 if not paper.open_access_url:
@@ -1109,8 +1578,25 @@ class PaperDiscoveryService:
     async def _check_pdf_candidate(
         self,
         url: str,
-        sem: asyncio.Semaphore,
+        run: PdfProbeRun,
         depth: int = 0,
+    ) -> Optional[str]:
+        """Return the PDF URL `url` serves or links to. Top-level outcomes go
+        through the PDF link cache; nested ones belong to their parent's."""
+        if depth > 0:
+            return await self._probe_pdf_candidate(url, run, depth)
+        hit, resolved = run.lookup(KIND_CHECK, url)
+        if hit:
+            return resolved
+        resolved = await self._probe_pdf_candidate(url, run, depth)
+        run.record(KIND_CHECK, url, resolved)
+        return resolved
+
+    async def _probe_pdf_candidate(
+        self,
+        url: str,
+        run: PdfProbeRun,
+        depth: int,
     ) -> Optional[str]:
         if depth > 2:
             return None
@@ -1126,7 +1612,7 @@ class PaperDiscoveryService:
         is_nature_pdf = host.endswith('nature.com') and path.endswith('.pdf')
 
         try:
-            async with sem:
+            async with run.budget.slot(url):
                 async with self.session.head(url, allow_redirects=True, timeout=timeout, headers=headers) as resp:
                     if resp.status < 400:
                         content_type = (resp.headers.get('content-type') or '').lower()
@@ -1135,8 +1621,11 @@ class PaperDiscoveryService:
         except Exception:
             pass
 
+        # Links found on an HTML response are followed after its slot is
+        # released, so a page can't wait on its own host's budget
+        nested_links: List[str] = []
         try:
-            async with sem:
+            async with run.budget.slot(url):
                 range_headers = {
                     **headers,
                     'Range': 'bytes=0-2048',
@@ -1144,6 +1633,8 @@ class PaperDiscoveryService:
                 }
                 async with self.session.get(url, allow_redirects=True, timeout=timeout, headers=range_headers) as resp:
                     if resp.status >= 400:
+                        if resp.status not in DEFINITIVE_MISS_STATUSES:
+                            run.mark_transient(KIND_CHECK, url)
                         return None
                     content_type = (resp.headers.get('content-type') or '').lower()
                     disposition = (resp.headers.get('content-disposition') or '').lower()
@@ -1159,26 +1650,44 @@ class PaperDiscoveryService:
                         snippet = snippet_bytes.decode('utf-8', errors='ignore')
                         if snippet.lstrip().startswith('%PDF'):
                             return str(resp.url)
-                        for link in self._extract_pdf_links(snippet, str(resp.url)):
-                            resolved = await self._check_pdf_candidate(link, sem, depth + 1)
-                            if resolved:
-                                return resolved
+                        nested_links = self._extract_pdf_links(snippet, str(resp.url))
                     else:
                         # Unknown content type; check magic number for PDF
                         snippet_bytes = await resp.content.read(8)
                         if snippet_bytes.startswith(b'%PDF'):
                             return str(resp.url)
         except Exception:
-            pass
+            # Timeout / connection error: no verdict on this link
+            run.mark_transient(KIND_CHECK, url)
+            return None
 
+        for link in nested_links:
+            resolved = await self._check_pdf_candidate(link, run, depth + 1)
+            if resolved:
+                return resolved
+        if any(run.is_transient(KIND_CHECK, link) for link in nested_links):
+            run.mark_transient(KIND_CHECK, url)
         return None
 
     async def _scrape_pdf_from_page(
         self,
         url: str,
-        sem: asyncio.Semaphore,
+        run: PdfProbeRun,
+    ) -> Optional[str]:
+        """Fetch the HTML for a landing page and extract the first PDF link.
+        Outcomes go through the PDF link cache."""
+        hit, resolved = run.lookup(KIND_SCRAPE, url)
+        if hit:
+            return resolved
+        resolved = await self._scrape_landing_page(url, run)
+        run.record(KIND_SCRAPE, url, resolved)
+        return resolved
+
+    async def _scrape_landing_page(
+        self,
+        url: str,
+        run: PdfProbeRun,
     ) -> Optional[str]:
-        """Fetch the HTML for a landing page and extract the first PDF link."""
         timeout = aiohttp.ClientTimeout(total=max(self.config.pdf_check_timeout * 2, 10))
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120 Safari/537.36',
@@ -1186,18 +1695,21 @@ class PaperDiscoveryService:
         }
 
         try:
-            async with sem:
+            async with run.budget.slot(url):
                 async with self.session.get(url, allow_redirects=True, timeout=timeout, headers=headers) as resp:
                     if resp.status >= 400:
+                        if resp.status not in DEFINITIVE_MISS_STATUSES:
+                            run.mark_transient(KIND_SCRAPE, url)
                         return None
                     html = await resp.text()
                     links = self._extract_pdf_links(html, str(resp.url))
         except Exception:
+            run.mark_transient(KIND_SCRAPE, url)
             return None
 
         for link in links[:6]:
             try:
-                verified = await self._check_pdf_candidate(link, sem, depth=1)
+                verified = await self._check_pdf_candidate(link, run, depth=1)
             except Exception:
                 verified = None
             if verified:
@@ -1213,6 +1725,8 @@ class PaperDiscoveryService:
                     continue
                 return link
 
+        if any(run.is_transient(KIND_CHECK, link) for link in links[:6]):
+            run.mark_transient(KIND_SCRAPE, url)
         return None
 
     def _extract_pdf_links(self, html: str, base_url: str) -> List[str]:
@@ -1230,7 +1744,7 @@ class PaperDiscoveryService:
     async def _fetch_unpaywall_pdf(
         self,
         doi: str,
-        sem: Optional[asyncio.Semaphore] = None,
+        run: Optional[PdfProbeRun] = None,
     ) -> Optional[str]:
         if not self.unpaywall_email:
             return None
@@ -1272,9 +1786,9 @@ class PaperDiscoveryService:
                 self._unpaywall_cache[key] = candidate
                 return candidate
 
-        if sem is None:
-            sem = asyncio.Semaphore(self.config.max_concurrent_pdf_checks)
-        resolved = await self._check_pdf_candidate(candidate, sem)
+        if run is None:
+            run = self._new_probe_run()
+        resolved = await self._check_pdf_candidate(candidate, run)
         self._unpaywall_cache[key] = resolved
         return resolved
 
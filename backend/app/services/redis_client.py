@@ -0,0 +1,50 @@
+"""
+Process-wide Redis client for the shared cache tiers.
+
+The embedding, discovery result and score caches all treat Redis as an
+optional second tier. They share one lazily connected client here. A failed
+connection is retried after REDIS_RETRY_SECONDS, so a Redis blip at startup
+doesn't turn the shared tiers into per-process caches for the life of the
+process.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Seconds before an unreachable Redis is tried again
+REDIS_RETRY_SECONDS = 30.0
+
+_redis_client = None
+_redis_retry_at = 0.0
+_redis_lock = threading.Lock()
+
+
+def get_redis_client():
+    """Get the Redis client, connecting lazily. Returns None when unavailable."""
+    global _redis_client, _redis_retry_at
+    if _redis_client is not None or time.monotonic() < _redis_retry_at:
+        return _redis_client
+    with _redis_lock:
+        if _redis_client is not None or time.monotonic() < _redis_retry_at:
+            return _redis_client
+        try:
+            import redis as redis_lib
+
+            client = redis_lib.Redis.from_url(
+                settings.REDIS_URL,
+                socket_connect_timeout=1,
+                socket_timeout=1,
+            )
+            client.ping()
+            _redis_client = client
+        except Exception as exc:
+            logger.info("[Redis] Shared cache tier unavailable, retrying in %.0fs: %s", REDIS_RETRY_SECONDS, exc)
+            _redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+    return _redis_client
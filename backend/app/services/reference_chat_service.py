@@ -3,8 +3,9 @@ import re
 import time
 from typing import List, Dict, Any, Optional, Tuple
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, defer
 
+from app.services.hybrid_search import ChunkScope, hybrid_chunk_search
 from app.services.reference_summary_service import summarize_paper_references
 
 logger = logging.getLogger(__name__)
@@ -260,8 +261,6 @@ class ReferenceChatMixin:
         from app.models.paper_reference import PaperReference
 
         try:
-            import math as _math
-            import json as _json
             import uuid as _uuid
 
             if not isinstance(query, str):
@@ -277,7 +276,10 @@ class ReferenceChatMixin:
                 logger.warning(f"Could not parse user_id as UUID: {user_id}")
                 user_uuid = user_id
 
-            query_base = db.query(DocumentChunk, Reference).join(
+            # Embeddings are never needed in Python: ranking runs in SQL
+            query_base = db.query(DocumentChunk, Reference).options(
+                defer(DocumentChunk.embedding)
+            ).join(
                 Reference, DocumentChunk.reference_id == Reference.id
             ).filter(
                 Reference.status == 'analyzed',
@@ -291,83 +293,52 @@ class ReferenceChatMixin:
             else:
                 query_base = query_base.filter(Reference.owner_id == user_uuid)
 
-            chunk_results = query_base.all()
-            if not chunk_results:
+            # One chunk per reference in scope (the first), for references
+            # that nothing else matched
+            first_chunks = query_base.distinct(DocumentChunk.reference_id).order_by(
+                DocumentChunk.reference_id, DocumentChunk.chunk_index
+            ).all()
+            if not first_chunks:
                 return []
 
-            used_embedding = False
-            scored_chunks: List[Dict[str, Any]] = []
+            top_k = max(1, min(limit, 20))
+            qemb = None
             if self.openai_client and not fast_mode:
                 try:
                     qemb = self.openai_client.embeddings.create(
                         model=self.embedding_model,
                         input=query
                     ).data[0].embedding
-
-                    def _cos(a, b):
-                        try:
-                            sa = sum(x*y for x, y in zip(a, b))
-                            na = _math.sqrt(sum(x*x for x in a))
-                            nb = _math.sqrt(sum(y*y for y in b))
-                            return (sa / (na * nb)) if na and nb else 0.0
-                        except Exception:
-                            return 0.0
-
-                    have_any_emb = False
-                    for chunk, reference in chunk_results:
-                        emb = getattr(chunk, 'embedding', None)
-                        if emb is None:
-                            continue
-                        if isinstance(emb, str):
-                            try:
-                                emb = _json.loads(emb)
-                            except Exception:
-                                emb = None
-                        if not emb:
-                            continue
-                        have_any_emb = True
-                        score = float(_cos(qemb, emb))
-                        if score > 0:
-                            scored_chunks.append({'chunk': chunk, 'reference': reference, 'score': score})
-                    if have_any_emb:
-                        used_embedding = True
                 except Exception as e:
-                    logger.warning(f"Embedding-based retrieval failed, falling back to keywords: {e}")
+                    logger.warning(f"Query embedding failed, using full-text search only: {e}")
 
-            if not scored_chunks:
-                query_terms = [term.lower() for term in query.split() if len(term) > 2]
-                for chunk, reference in chunk_results:
-                    text = (chunk.chunk_text or '').lower()
-                    score = sum(text.count(term) for term in query_terms)
-                    if reference.title:
-                        title_text = reference.title.lower()
-                        score += 2 * sum(title_text.count(term) for term in query_terms)
-                    if reference.abstract:
-                        abstract_text = reference.abstract.lower()
-                        score += 1.5 * sum(abstract_text.count(term) for term in query_terms)
-                    if score > 0:
-                        scored_chunks.append({'chunk': chunk, 'reference': reference, 'score': float(score)})
+            scope = ChunkScope.for_references(paper_id=paper_id, owner_id=user_uuid)
+            try:
+                hits = {hit.chunk_id: hit.score for hit in hybrid_chunk_search(db, scope, query, qemb, limit=top_k)}
+            except Exception as e:
+                logger.warning(f"Hybrid chunk search failed: {e}")
+                hits = {}
+            scored_chunks: List[Dict[str, Any]] = []
+            if hits:
+                scored_chunks = [
+                    {'chunk': chunk, 'reference': reference, 'score': hits[chunk.id]}
+                    for chunk, reference in query_base.filter(DocumentChunk.id.in_(list(hits))).all()
+                ]
 
             if not scored_chunks:
-                logger.info("No matches from embeddings/keywords; falling back to first chunk per reference")
-                seen_refs = set()
-                for chunk, reference in chunk_results:
-                    if reference.id in seen_refs:
-                        continue
-                    seen_refs.add(reference.id)
-                    scored_chunks.append({'chunk': chunk, 'reference': reference, 'score': 0.0})
+                logger.info("No full-text or vector matches; falling back to first chunk per reference")
+                scored_chunks = [
+                    {'chunk': chunk, 'reference': reference, 'score': 0.0}
+                    for chunk, reference in first_chunks
+                ]
 
             scored_chunks.sort(key=lambda x: x['score'], reverse=True)
-            top_items = scored_chunks[:max(1, min(limit, 20))]
+            top_items = scored_chunks[:top_k]
 
             seen_refs = {item['reference'].id for item in top_items}
-            if len(seen_refs) < len({ref.id for _, ref in chunk_results}):
-                missing: Dict[str, Any] = {}
-                for chunk, reference in chunk_results:
-                    if reference.id in seen_refs or reference.id in missing:
-                        continue
-                    missing[reference.id] = {'chunk': chunk, 'reference': reference, 'score': -1.0}
-                top_items.extend(missing.values())
+            for chunk, reference in first_chunks:
+                if reference.id not in seen_refs:
+                    top_items.append({'chunk': chunk, 'reference': reference, 'score': -1.0})
 
             results: List[Dict[str, Any]] = []
             for item in top_items:
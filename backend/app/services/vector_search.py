@@ -0,0 +1,73 @@
+"""Helpers for pgvector nearest-neighbour queries.
+
+Filtered ANN queries (`WHERE owner = ... ORDER BY embedding <=> :q LIMIT k`)
+can come back short with an HNSW index: the index scan yields `ef_search`
+candidates, and the filter runs afterwards. `apply_hnsw_search_hints` widens
+`hnsw.ef_search` for the current transaction and, on pgvector >= 0.8,
+turns on iterative index scans so the scan keeps going until LIMIT rows pass
+the filter.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# The GUC accepts 1..1000
+MAX_EF_SEARCH = 1000
+
+_pgvector_version: Optional[Tuple[int, ...]] = None
+
+
+def to_pgvector_literal(embedding: Sequence[float]) -> str:
+    """Text form of a vector ('[0.1,0.2,...]'), bindable where a vector is expected."""
+    return "[" + ",".join(str(float(x)) for x in embedding) + "]"
+
+
+def _parse_version(raw: str) -> Tuple[int, ...]:
+    parts = []
+    for piece in raw.split("."):
+        digits = "".join(ch for ch in piece if ch.isdigit())
+        parts.append(int(digits) if digits else 0)
+    return tuple(parts)
+
+
+def pgvector_version(db: Session) -> Tuple[int, ...]:
+    """Installed pgvector extension version, (0,) when unknown. Cached per process."""
+    global _pgvector_version
+    if _pgvector_version is None:
+        try:
+            # Savepoint: a failed lookup must not abort the caller's transaction
+            with db.begin_nested():
+                raw = db.execute(
+                    text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+                ).scalar()
+            _pgvector_version = _parse_version(raw) if raw else (0,)
+        except Exception as exc:
+            logger.debug("pgvector version lookup failed: %s", exc)
+            return (0,)
+    return _pgvector_version
+
+
+def apply_hnsw_search_hints(db: Session, limit: int) -> None:
+    """SET LOCAL the HNSW search knobs for a filtered top-`limit` query.
+
+    Only lasts until the current transaction ends. The SETs run in a
+    savepoint, so a failure leaves the caller's transaction usable."""
+    if pgvector_version(db) < (0, 5):
+        return  # no HNSW before 0.5
+    ef_search = min(MAX_EF_SEARCH, max(settings.VECTOR_SEARCH_EF_SEARCH, limit * 4))
+    try:
+        with db.begin_nested():
+            db.execute(text(f"SET LOCAL hnsw.ef_search = {int(ef_search)}"))
+            if pgvector_version(db) >= (0, 8):
+                db.execute(text("SET LOCAL hnsw.iterative_scan = relaxed_order"))
+    except Exception as exc:
+        logger.debug("Could not apply HNSW search hints: %s", exc)
@@ -0,0 +1,93 @@
+"""Micro-benchmark: per-pair cosine_similarity loop vs. vectorized top_k.
+
+Mirrors the bi-encoder stage of the reranker: one query scored against N
+candidate papers (384-dim, unit-norm, as returned by all-MiniLM-L6-v2).
+No model download needed; vectors are random.
+
+Usage:
+    python tests/bench_embedding_similarity.py [--candidates 500] [--repeat 200]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.embedding_service import EmbeddingProvider, EmbeddingService
+
+DIMS = 384
+
+
+class _NullProvider(EmbeddingProvider):
+    """Provider stub; the benchmark never encodes text."""
+
+    returns_normalized = True
+
+    @property
+    def model_name(self) -> str:
+        return "bench"
+
+    @property
+    def dimensions(self) -> int:
+        return DIMS
+
+    async def embed(self, text):  # pragma: no cover - unused
+        raise NotImplementedError
+
+    async def embed_batch(self, texts):  # pragma: no cover - unused
+        raise NotImplementedError
+
+
+def _random_unit(n: int, rng: np.random.Generator) -> np.ndarray:
+    matrix = rng.standard_normal((n, DIMS)).astype(np.float32)
+    return matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+
+
+def _loop_scores(service: EmbeddingService, query: list, docs: list) -> list:
+    """Previous implementation: Python loop over list-of-floats pairs, then sort."""
+    scored = [(i, service.cosine_similarity(query, doc)) for i, doc in enumerate(docs)]
+    scored.sort(key=lambda x: x[1], reverse=True)
+    return scored
+
+
+def _time(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--candidates", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--k", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    service = EmbeddingService(provider=_NullProvider(), use_cache=False)
+    query = _random_unit(1, rng)[0]
+    docs = _random_unit(args.candidates, rng)
+    query_list, docs_list = query.tolist(), docs.tolist()
+
+    loop_ranked = _loop_scores(service, query_list, docs_list)
+    indices, scores = service.top_k(query, docs, args.candidates)
+    assert [i for i, _ in loop_ranked[:10]] == indices[:10].tolist()
+    assert np.allclose([s for _, s in loop_ranked], scores, atol=1e-5)
+
+    loop_ms = _time(lambda: _loop_scores(service, query_list, docs_list), args.repeat)
+    full_ms = _time(lambda: service.top_k(query, docs, args.candidates), args.repeat)
+    k_ms = _time(lambda: service.top_k(query, docs, args.k), args.repeat)
+
+    print(f"candidates={args.candidates} dims={DIMS} repeat={args.repeat}")
+    print(f"  {'per-pair loop (before)':<28}{loop_ms:8.3f} ms")
+    print(f"  {'top_k all (after)':<28}{full_ms:8.3f} ms  ({loop_ms / full_ms:6.1f}x)")
+    print(f"  {f'top_k k={args.k} (after)':<28}{k_ms:8.3f} ms  ({loop_ms / k_ms:6.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Regression harness: PyTorch vs. ONNX Runtime (int8) inference backends.
+
+Scores the fixed query/paper fixture in tests/fixtures/inference_regression
+with both backends and checks that the ONNX path stays within tolerance:
+
+  - bi-encoder: cosine(torch, onnx) per text embedding
+  - cross-encoder: per-query Spearman rank correlation and top-k overlap of
+    the paper ordering, plus max absolute logit difference (reported only)
+
+and reports median latency of each backend for the whole fixture.
+Exits non-zero when a tolerance is violated. Needs the real models
+(sentence-transformers + onnxruntime); the first run exports and quantizes
+them into INFERENCE_ONNX_CACHE_DIR.
+
+Usage:
+    python tests/bench_inference_backends.py [--repeat 5] [--min-cosine 0.98]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.embedding_service import SentenceTransformerProvider
+from app.services.onnx_inference import load_onnx_cross_encoder, load_onnx_embedder
+from app.services.paper_discovery.reranker import CrossEncoderReranker
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "inference_regression", "queries.json")
+
+
+def _doc_text(paper: dict) -> str:
+    # Same document text the reranker's cross-encoder stage builds
+    return f"{paper.get('title', '')}. {(paper.get('abstract') or '')[:500]}"
+
+
+def _ranks(values: np.ndarray) -> np.ndarray:
+    order = np.argsort(values, kind="stable")
+    ranks = np.empty(len(values), dtype=np.float64)
+    ranks[order] = np.arange(len(values))
+    return ranks
+
+
+def _spearman(a: np.ndarray, b: np.ndarray) -> float:
+    ra, rb = _ranks(a), _ranks(b)
+    ra -= ra.mean()
+    rb -= rb.mean()
+    denom = np.sqrt((ra * ra).sum() * (rb * rb).sum())
+    return float((ra * rb).sum() / denom) if denom else 1.0
+
+
+def _median_ms(fn, repeat: int) -> float:
+    fn()  # exclude first-call graph setup
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return statistics.median(samples)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--min-cosine", type=float, default=0.98)
+    parser.add_argument("--min-spearman", type=float, default=0.95)
+    parser.add_argument("--min-topk-overlap", type=float, default=0.8)
+    args = parser.parse_args()
+
+    with open(FIXTURE) as fh:
+        fixture = json.load(fh)
+    queries = fixture["queries"]
+    docs = [_doc_text(p) for p in fixture["papers"]]
+    pairs = [(q, d) for q in queries for d in docs]
+
+    from sentence_transformers import CrossEncoder, SentenceTransformer
+
+    torch_embedder = SentenceTransformer(SentenceTransformerProvider.MODEL)
+    torch_cross = CrossEncoder(CrossEncoderReranker.CROSS_ENCODER_MODEL)
+    onnx_embedder = load_onnx_embedder(SentenceTransformerProvider.MODEL)
+    onnx_cross = load_onnx_cross_encoder(CrossEncoderReranker.CROSS_ENCODER_MODEL)
+
+    texts = queries + docs
+    emb_torch = np.asarray(torch_embedder.encode(texts, normalize_embeddings=True, convert_to_numpy=True))
+    emb_onnx = onnx_embedder.encode(texts, normalize_embeddings=True)
+    cosines = (emb_torch * emb_onnx).sum(axis=1)
+
+    logits_torch = np.asarray(torch_cross.predict(pairs), dtype=np.float32).reshape(len(queries), len(docs))
+    logits_onnx = onnx_cross.predict(pairs).reshape(len(queries), len(docs))
+    spearman = [_spearman(logits_torch[i], logits_onnx[i]) for i in range(len(queries))]
+    k = min(args.top_k, len(docs))
+    overlap = [
+        len(set(np.argsort(-logits_torch[i])[:k]) & set(np.argsort(-logits_onnx[i])[:k])) / k
+        for i in range(len(queries))
+    ]
+
+    print(f"Fixture: {len(queries)} queries x {len(docs)} papers ({len(pairs)} pairs)\n")
+    print(f"Bi-encoder cosine(torch, onnx):  min={cosines.min():.4f}  mean={cosines.mean():.4f}")
+    print(f"Cross-encoder max |logit diff|:  {np.abs(logits_torch - logits_onnx).max():.3f}")
+    print(f"Cross-encoder Spearman:          min={min(spearman):.4f}  mean={statistics.mean(spearman):.4f}")
+    print(f"Cross-encoder top-{k} overlap:    min={min(overlap):.2f}  mean={statistics.mean(overlap):.2f}\n")
+
+    print(f"{'stage':<16}{'torch ms':>12}{'onnx ms':>12}{'speedup':>10}")
+    for label, torch_fn, onnx_fn in (
+        ("bi-encoder", lambda: torch_embedder.encode(texts, normalize_embeddings=True),
+         lambda: onnx_embedder.encode(texts, normalize_embeddings=True)),
+        ("cross-encoder", lambda: torch_cross.predict(pairs), lambda: onnx_cross.predict(pairs)),
+    ):
+        t_ms = _median_ms(torch_fn, args.repeat)
+        o_ms = _median_ms(onnx_fn, args.repeat)
+        print(f"{label:<16}{t_ms:>12.1f}{o_ms:>12.1f}{t_ms / o_ms:>9.2f}x")
+
+    failures = []
+    if cosines.min() < args.min_cosine:
+        failures.append(f"bi-encoder min cosine {cosines.min():.4f} < {args.min_cosine}")
+    if min(spearman) < args.min_spearman:
+        failures.append(f"cross-encoder min Spearman {min(spearman):.4f} < {args.min_spearman}")
+    if min(overlap) < args.min_topk_overlap:
+        failures.append(f"cross-encoder min top-{k} overlap {min(overlap):.2f} < {args.min_topk_overlap}")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("\nOK: ONNX backend within tolerance")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""Benchmark: per-paper lexical ranking loops vs. the vectorized term matrix.
+
+Synthetic candidates (random titles/abstracts over a small vocabulary, mixed
+years, citation counts and OA flags) are scored by the previous
+LexicalRanker / SimpleRanker loops (`_reference_*` in
+tests/test_lexical_scoring.py) and by `app.services.paper_discovery.lexical`.
+Fresh paper objects are used for every timed run, so the vectorized timings
+include tokenizing each paper once. Scores are checked for parity.
+
+Usage:
+    python tests/bench_lexical_ranking.py [--sizes 100,1000,10000] [--repeat 3]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime
+
+import numpy as np
+
+from app.services.paper_discovery.config import DiscoveryConfig
+from app.services.paper_discovery.lexical import TermMatrix, lexical_scores, simple_scores
+from app.services.paper_discovery.models import tokenize_text
+from tests import test_lexical_scoring as reference
+
+QUERY = "Graph neural networks for protein folding with attention"
+KEYWORDS = frozenset({"graph", "protein", "diffusion"})
+CORE_TERMS = {"graph neural", "protein", "folding"}
+
+
+def _median_ms(make_papers, fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        papers = make_papers()
+        start = time.perf_counter()
+        fn(papers)
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="100,1000,10000")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    reference.CURRENT_YEAR = datetime.now().year
+    weights = DiscoveryConfig().ranking_weights
+    query_tokens = tokenize_text(QUERY)
+
+    print(f"{'papers':>8} {'ranker':<8} {'loop ms':>10} {'vector ms':>10} {'speedup':>9}")
+    for n in (int(s) for s in args.sizes.split(",")):
+        make = lambda: reference._random_papers(n, seed=n)  # noqa: E731
+
+        papers = make()
+        assert np.allclose(
+            lexical_scores(TermMatrix(papers), query_tokens, KEYWORDS, weights),
+            reference._reference_lexical(papers, query_tokens, KEYWORDS, weights),
+            atol=1e-9,
+        ), "lexical scores differ from the loop implementation"
+        assert np.allclose(
+            simple_scores(TermMatrix(papers), papers, query_tokens, CORE_TERMS, weights),
+            reference._reference_simple(papers, query_tokens, CORE_TERMS, weights),
+            atol=1e-9,
+        ), "simple scores differ from the loop implementation"
+
+        for label, loop_fn, vector_fn in (
+            (
+                "lexical",
+                lambda ps: reference._reference_lexical(ps, query_tokens, KEYWORDS, weights),
+                lambda ps: lexical_scores(TermMatrix(ps), query_tokens, KEYWORDS, weights),
+            ),
+            (
+                "simple",
+                lambda ps: reference._reference_simple(ps, query_tokens, CORE_TERMS, weights),
+                lambda ps: simple_scores(TermMatrix(ps), ps, query_tokens, CORE_TERMS, weights),
+            ),
+        ):
+            loop_ms = _median_ms(make, loop_fn, args.repeat)
+            vector_ms = _median_ms(make, vector_fn, args.repeat)
+            print(f"{n:>8} {label:<8} {loop_ms:>10.1f} {vector_ms:>10.1f} {loop_ms / vector_ms:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Benchmark: fuzzy title dedup, all-pairs scan vs. indexed candidate pairs.
+
+Synthetic records: titles drawn from a Zipf-distributed vocabulary, ~30% of
+them near-duplicates (rephrased / subtitle added) of earlier records with a
+year within ±1. The all-pairs baseline is skipped above --baseline-max since
+it grows quadratically (20k records is ~2e8 comparisons).
+
+Usage:
+    python tests/bench_paper_dedup.py [--sizes 200,2000,20000] [--baseline-max 2000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.paper_discovery.dedup import (
+    _FUZZY_THRESHOLD,
+    _fuzzy_title_pairs,
+    _fuzzy_title_similarity,
+    dedupe_papers,
+)
+from app.services.paper_discovery.models import DiscoveredPaper, _normalize_title
+
+
+def _make_papers(n: int, rng: random.Random) -> list:
+    vocab = [f"term{i}" for i in range(5000)]
+    weights = [1.0 / (rank + 1) for rank in range(len(vocab))]
+    papers = []
+    for i in range(n):
+        if papers and rng.random() < 0.3:
+            base = rng.choice(papers)
+            words = base.title.split()
+            if rng.random() < 0.5:
+                words.pop(rng.randrange(len(words)))
+            else:
+                words.append(rng.choice(vocab))
+            year = base.year + rng.choice([-1, 0, 1])
+        else:
+            words = rng.choices(vocab, weights=weights, k=rng.randint(6, 14))
+            year = rng.randint(2000, 2025)
+        papers.append(
+            DiscoveredPaper(
+                title=" ".join(words), authors=[], abstract="", year=year,
+                doi=None, url=None, source=rng.choice(["arxiv", "crossref", "openalex"]),
+            )
+        )
+    return papers
+
+
+def _pairwise_scan(titles, years) -> set:
+    """Previous implementation: every pair, word sets rebuilt per comparison."""
+    pairs = set()
+    for i in range(len(titles)):
+        if len(titles[i]) < 15:
+            continue
+        for j in range(i + 1, len(titles)):
+            if len(titles[j]) < 15:
+                continue
+            yi, yj = years[i], years[j]
+            if yi and yj and abs(yi - yj) > 1:
+                continue
+            if _fuzzy_title_similarity(titles[i], titles[j]) >= _FUZZY_THRESHOLD:
+                pairs.add((i, j))
+    return pairs
+
+
+def _time(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="200,2000,20000")
+    parser.add_argument("--baseline-max", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'records':>8} {'pairs':>8} {'all-pairs':>12} {'indexed':>10} {'dedupe_papers':>14}")
+    for n in (int(s) for s in args.sizes.split(",")):
+        papers = _make_papers(n, random.Random(n))
+        titles = [_normalize_title(p.title) for p in papers]
+        years = [p.year for p in papers]
+
+        indexed, indexed_ms = _time(lambda: set(_fuzzy_title_pairs(titles, years)))
+        baseline = "skipped"
+        if n <= args.baseline_max:
+            reference, baseline_ms = _time(lambda: _pairwise_scan(titles, years))
+            assert reference == indexed, "indexed pairs differ from all-pairs scan"
+            baseline = f"{baseline_ms:9.1f} ms"
+        (_, collapsed), total_ms = _time(lambda: dedupe_papers(papers))
+
+        print(
+            f"{n:>8} {len(indexed):>8} {baseline:>12} {indexed_ms:7.1f} ms {total_ms:11.1f} ms"
+            f"  (collapsed {collapsed})"
+        )
+
+
+if __name__ == "__main__":
+    main()
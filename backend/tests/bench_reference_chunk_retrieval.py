@@ -0,0 +1,168 @@
+"""Benchmark: reference-chunk retrieval in Python vs. pgvector ORDER BY <=>.
+
+Needs a PostgreSQL with the pgvector extension (settings.DATABASE_URL, or
+--database-url). Everything is created in a scratch schema that is dropped
+afterwards. One owner gets N chunks of 1536-dim random embeddings spread
+over N/50 references; other owners get as many again, as noise.
+
+  - python: the previous get_relevant_reference_chunks path — load every
+    in-scope chunk with its embedding as text, json-decode, cosine in Python
+  - pgvector: the owner-scoped `ORDER BY embedding <=> :q LIMIT k` query used
+    now, with the HNSW index and iterative scans where available
+
+Usage:
+    python tests/bench_reference_chunk_retrieval.py [--sizes 10000,100000] [--repeat 5]
+"""
+
+import argparse
+import json
+import math
+import os
+import statistics
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services.vector_search import apply_hnsw_search_hints, to_pgvector_literal
+
+DIMS = 1536
+SCHEMA = "bench_reference_chunks"
+CHUNKS_PER_REFERENCE = 50
+TOP_K = 8
+
+
+def _setup(db: Session) -> None:
+    db.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    db.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    db.execute(text(f"SET search_path TO {SCHEMA}, public"))
+    db.execute(text(
+        'CREATE TABLE "references" (id uuid PRIMARY KEY, owner_id uuid NOT NULL, status text NOT NULL)'
+    ))
+    db.execute(text(
+        f"CREATE TABLE document_chunks (id uuid PRIMARY KEY, reference_id uuid, "
+        f"chunk_text text NOT NULL, chunk_index int NOT NULL, embedding vector({DIMS}))"
+    ))
+    db.commit()
+
+
+def _seed(db: Session, owner: uuid.UUID, n_chunks: int, rng: np.random.Generator) -> None:
+    refs = [uuid.uuid4() for _ in range(max(1, n_chunks // CHUNKS_PER_REFERENCE))]
+    db.execute(
+        text("INSERT INTO \"references\" (id, owner_id, status) VALUES (:id, :owner, 'analyzed')"),
+        [{"id": r, "owner": owner} for r in refs],
+    )
+    for start in range(0, n_chunks, 2000):
+        size = min(2000, n_chunks - start)
+        vectors = rng.standard_normal((size, DIMS)).astype(np.float32)
+        db.execute(
+            text(
+                "INSERT INTO document_chunks (id, reference_id, chunk_text, chunk_index, embedding) "
+                "VALUES (:id, :ref, 'chunk', :idx, :emb)"
+            ),
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "ref": refs[(start + i) % len(refs)],
+                    "idx": start + i,
+                    "emb": to_pgvector_literal(vec),
+                }
+                for i, vec in enumerate(vectors)
+            ],
+        )
+    db.commit()
+
+
+def _python_path(db: Session, owner: uuid.UUID, query: list) -> list:
+    rows = db.execute(
+        text(
+            "SELECT dc.id, dc.embedding::text FROM document_chunks dc "
+            "JOIN \"references\" r ON r.id = dc.reference_id "
+            "WHERE r.owner_id = :owner AND r.status = 'analyzed'"
+        ),
+        {"owner": owner},
+    ).fetchall()
+    qn = math.sqrt(sum(x * x for x in query))
+    scored = []
+    for chunk_id, raw in rows:
+        emb = json.loads(raw)
+        dot = sum(x * y for x, y in zip(query, emb))
+        norm = math.sqrt(sum(y * y for y in emb))
+        scored.append((dot / (qn * norm) if qn and norm else 0.0, chunk_id))
+    scored.sort(reverse=True)
+    return [chunk_id for _, chunk_id in scored[:TOP_K]]
+
+
+def _pgvector_path(db: Session, owner: uuid.UUID, query: list) -> list:
+    apply_hnsw_search_hints(db, TOP_K)
+    rows = db.execute(
+        text(
+            "SELECT dc.id FROM document_chunks dc "
+            "JOIN \"references\" r ON r.id = dc.reference_id "
+            "WHERE r.owner_id = :owner AND r.status = 'analyzed' AND dc.embedding IS NOT NULL "
+            "ORDER BY dc.embedding <=> :q LIMIT :k"
+        ),
+        {"owner": owner, "q": to_pgvector_literal(query), "k": TOP_K},
+    ).fetchall()
+    db.commit()  # end the transaction so SET LOCAL hints don't accumulate
+    return [row[0] for row in rows]
+
+
+def _median_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,100000")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    rng = np.random.default_rng(0)
+    print(f"{'chunks':>8} {'python ms':>10} {'pgvector ms':>12} {'speedup':>9} {'recall@k':>9}")
+    with Session(engine) as db:
+        try:
+            for n in (int(s) for s in args.sizes.split(",")):
+                _setup(db)
+                owner = uuid.uuid4()
+                _seed(db, owner, n, rng)
+                _seed(db, uuid.uuid4(), n, rng)  # other owners' chunks
+                db.execute(text(f"SET search_path TO {SCHEMA}, public"))
+                db.execute(text(
+                    "CREATE INDEX ON document_chunks USING hnsw (embedding vector_cosine_ops) "
+                    "WITH (m = 16, ef_construction = 64)"
+                ))
+                db.execute(text("CREATE INDEX ON document_chunks (reference_id)"))
+                db.execute(text('ANALYZE document_chunks; ANALYZE "references"'))
+                db.commit()
+
+                query = rng.standard_normal(DIMS).astype(np.float32).tolist()
+                exact = set(_python_path(db, owner, query))
+                approx = set(_pgvector_path(db, owner, query))
+                python_ms = _median_ms(lambda: _python_path(db, owner, query), args.repeat)
+                pgvector_ms = _median_ms(lambda: _pgvector_path(db, owner, query), args.repeat)
+                print(
+                    f"{n:>8} {python_ms:>10.1f} {pgvector_ms:>12.1f} "
+                    f"{python_ms / pgvector_ms:>8.1f}x {len(exact & approx) / TOP_K:>9.2f}"
+                )
+        finally:
+            db.rollback()
+            db.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+            db.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Tests for the abstract cache's set-based upsert and single-flight fetching.
+
+A fake DB session records executed statements; `fetch_one` is patched so no
+HTTP is made.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import List
+
+import pytest
+
+from app.services.paper_discovery import abstract_cache
+from app.services.paper_discovery.abstract_cache import CachedAbstract
+from app.services.paper_discovery.models import DiscoveredPaper
+
+ABSTRACT = "A sufficiently long abstract about transformers for scientific text. " * 2
+
+
+class _Result:
+    def __init__(self, rowcount: int = 0):
+        self.rowcount = rowcount
+
+    def fetchall(self):
+        return []
+
+
+class FakeDb:
+    def __init__(self):
+        self.statements: List[tuple] = []
+        self.commits = 0
+
+    def execute(self, stmt, params=None):
+        self.statements.append((str(stmt), params))
+        rowcount = len(params["dois"]) if params and "dois" in params and "INSERT" in str(stmt) else 0
+        return _Result(rowcount)
+
+    def commit(self):
+        self.commits += 1
+
+    @property
+    def upserts(self):
+        return [(sql, params) for sql, params in self.statements if "INSERT INTO paper_abstracts" in sql]
+
+
+def _paper(doi: str, abstract: str = "") -> DiscoveredPaper:
+    return DiscoveredPaper(
+        title=f"Paper {doi}", authors=[], abstract=abstract, year=2024, doi=doi, url=None, source="test",
+    )
+
+
+def test_bulk_upsert_is_one_statement_and_dedupes_dois():
+    db = FakeDb()
+    records = [
+        CachedAbstract(doi="10.1/a", abstract=None, source=None, status="unavailable"),
+        CachedAbstract(doi="10.1/b", abstract=ABSTRACT, source="core", status="fresh"),
+        CachedAbstract(doi="10.1/a", abstract=ABSTRACT, source="elsevier", status="fresh"),
+    ]
+
+    written = abstract_cache.bulk_upsert(db, records)
+
+    assert len(db.upserts) == 1
+    sql, params = db.upserts[0]
+    assert "unnest" in sql
+    assert sorted(params["dois"]) == ["10.1/a", "10.1/b"]
+    # The record carrying an abstract wins for a duplicated DOI
+    assert params["sources"][params["dois"].index("10.1/a")] == "elsevier"
+    assert written == 2
+    assert db.commits == 1
+
+
+def test_write_back_skips_lookup_and_guards_fresh_rows_in_sql():
+    db = FakeDb()
+    papers = [_paper("10.1/A", ABSTRACT), _paper("10.1/b", "short")]
+
+    abstract_cache.write_back(db, papers, source_label="openalex")
+
+    assert not any(sql.lstrip().startswith("SELECT") for sql, _ in db.statements)
+    assert len(db.upserts) == 1
+    sql, params = db.upserts[0]
+    assert "paper_abstracts.status = 'fresh'" in sql
+    assert params["dois"] == ["10.1/a"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_fetch_missing_shares_one_fetch_per_doi(monkeypatch):
+    calls: List[str] = []
+    release = asyncio.Event()
+
+    async def fake_fetch_one(session, doi, title=None):
+        calls.append(doi)
+        await release.wait()
+        return ABSTRACT, "core"
+
+    monkeypatch.setattr(abstract_cache, "fetch_one", fake_fetch_one)
+    db_a, db_b = FakeDb(), FakeDb()
+    papers_a = [_paper("10.1/shared"), _paper("10.1/only-a")]
+    papers_b = [_paper("https://doi.org/10.1/SHARED")]
+
+    task_a = asyncio.create_task(abstract_cache.fetch_missing(None, db_a, papers_a))
+    task_b = asyncio.create_task(abstract_cache.fetch_missing(None, db_b, papers_b))
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(task_a, task_b)
+
+    assert sorted(calls) == ["10.1/only-a", "10.1/shared"]
+    assert all(p.abstract == ABSTRACT for p in papers_a + papers_b)
+    # Only the search that started the fetch writes it to the cache
+    written = [doi for db in (db_a, db_b) for _, params in db.upserts for doi in params["dois"]]
+    assert sorted(written) == ["10.1/only-a", "10.1/shared"]
+    assert abstract_cache._fetch_flights._tasks() == {}
+
+
+@pytest.mark.asyncio
+async def test_single_flight_survives_cancelled_caller():
+    flights = abstract_cache._SingleFlight()
+    started = asyncio.Event()
+    release = asyncio.Event()
+    runs = 0
+
+    async def work():
+        nonlocal runs
+        runs += 1
+        started.set()
+        await release.wait()
+        return "done"
+
+    first = asyncio.create_task(flights.run("k", work))
+    await started.wait()
+    second = asyncio.create_task(flights.run("k", work))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    assert await second == ("done", True)
+    assert runs == 1
+    assert flights.coalesced == 1
@@ -127,6 +127,15 @@ class MockMessage:
         })
 
 
+@pytest.fixture(autouse=True)
+def _history_window_mode(monkeypatch):
+    """These tests cover the sliding window and summarization, used when
+    retrieval from project_discussion_embeddings is off."""
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "DISCUSSION_RETRIEVAL_ENABLED", False)
+
+
 # ============================================================
 # Test Cases
 # ============================================================
@@ -0,0 +1,123 @@
+"""
+Tests for cross-request dynamic batching of cross-encoder inference.
+
+A fake predict function records every batch; no model download required.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import List
+
+import pytest
+
+from app.services.paper_discovery.inference_batcher import CrossEncoderBatcher
+
+
+class RecordingPredict:
+    """Scores a pair by its document length; records each batch it receives."""
+
+    def __init__(self, delay: float = 0.0):
+        self.batches: List[list] = []
+        self.delay = delay
+        self._lock = threading.Lock()
+
+    def __call__(self, pairs):
+        with self._lock:
+            self.batches.append(list(pairs))
+        if self.delay:
+            threading.Event().wait(self.delay)
+        return [float(len(doc)) for _, doc in pairs]
+
+
+def _pairs(tag: str, n: int):
+    return [(f"query {tag}", f"{tag}-doc-" + "x" * i) for i in range(n)]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_predict_call():
+    predict = RecordingPredict()
+    batcher = CrossEncoderBatcher(predict, max_batch_pairs=256, max_wait_seconds=0.05)
+    requests = {tag: _pairs(tag, 20) for tag in "abcde"}
+
+    results = await asyncio.gather(*(batcher.score(p) for p in requests.values()))
+
+    assert len(predict.batches) == 1
+    assert len(predict.batches[0]) == 100
+    for pairs, scores in zip(requests.values(), results):
+        assert scores == [float(len(doc)) for _, doc in pairs]
+    stats = batcher.stats()
+    assert stats["batches"] == 1
+    assert stats["batch_requests"]["max"] == 5
+    assert stats["queue_depth_pairs"]["max"] == 100
+
+
+@pytest.mark.asyncio
+async def test_batch_flushes_at_max_pairs_without_waiting():
+    predict = RecordingPredict()
+    batcher = CrossEncoderBatcher(predict, max_batch_pairs=40, max_wait_seconds=10.0)
+
+    results = await asyncio.wait_for(
+        asyncio.gather(*(batcher.score(_pairs(tag, 20)) for tag in "abcd")),
+        timeout=2.0,
+    )
+
+    assert [len(b) for b in predict.batches] == [40, 40]
+    assert all(len(r) == 20 for r in results)
+
+
+@pytest.mark.asyncio
+async def test_requests_arriving_during_predict_join_next_batch():
+    predict = RecordingPredict(delay=0.1)
+    batcher = CrossEncoderBatcher(predict, max_batch_pairs=256, max_wait_seconds=0.0)
+
+    first = asyncio.create_task(batcher.score(_pairs("a", 10)))
+    await asyncio.sleep(0.02)  # first batch is now on the CPU
+    late = [asyncio.create_task(batcher.score(_pairs(tag, 10))) for tag in "bcd"]
+    await asyncio.gather(first, *late)
+
+    assert [len(b) for b in predict.batches] == [10, 30]
+
+
+@pytest.mark.asyncio
+async def test_oversized_request_runs_alone_and_errors_reach_every_caller():
+    predict = RecordingPredict()
+    batcher = CrossEncoderBatcher(predict, max_batch_pairs=8, max_wait_seconds=0.0)
+
+    scores = await batcher.score(_pairs("big", 30))
+    assert len(scores) == 30
+    assert [len(b) for b in predict.batches] == [30]
+
+    def failing(pairs):
+        raise RuntimeError("model unavailable")
+
+    broken = CrossEncoderBatcher(failing, max_batch_pairs=64, max_wait_seconds=0.01)
+    outcomes = await asyncio.gather(
+        broken.score(_pairs("a", 3)), broken.score(_pairs("b", 3)), return_exceptions=True
+    )
+    assert all(isinstance(o, RuntimeError) for o in outcomes)
+    assert broken.stats()["failures"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_is_dropped_from_batch():
+    predict = RecordingPredict()
+    batcher = CrossEncoderBatcher(predict, max_batch_pairs=256, max_wait_seconds=0.05)
+
+    cancelled = asyncio.create_task(batcher.score(_pairs("gone", 5)))
+    kept = asyncio.create_task(batcher.score(_pairs("kept", 5)))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+
+    assert len(await kept) == 5
+    assert [len(b) for b in predict.batches] == [5]
+
+
+def test_batcher_survives_separate_event_loops():
+    predict = RecordingPredict()
+    batcher = CrossEncoderBatcher(predict, max_wait_seconds=0.0)
+
+    assert asyncio.run(batcher.score(_pairs("a", 2))) == [6.0, 7.0]
+    assert asyncio.run(batcher.score(_pairs("b", 2))) == [6.0, 7.0]
+    assert batcher.stats()["batches"] == 2
@@ -0,0 +1,150 @@
+"""
+Tests for the persistent cross-encoder score cache and its use by
+CrossEncoderReranker's cross-encoder stage.
+
+A recording predict function stands in for the model and a dict-backed fake
+stands in for Redis.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List
+
+import pytest
+
+from app.services.paper_discovery import score_cache as score_cache_module
+from app.services.paper_discovery.inference_batcher import CrossEncoderBatcher
+from app.services.paper_discovery.reranker import CrossEncoderReranker
+from app.services.paper_discovery.score_cache import CrossEncoderScoreCache
+
+
+class RecordingPredict:
+    def __init__(self):
+        self.scored: List[str] = []
+
+    def __call__(self, pairs):
+        self.scored.extend(doc for _, doc in pairs)
+        return [float(len(doc)) / 10.0 for _, doc in pairs]
+
+
+class FakeRedis:
+    def __init__(self):
+        self.store: Dict[str, str] = {}
+
+    def mget(self, keys):
+        return [self.store.get(k) for k in keys]
+
+    def pipeline(self, transaction=False):
+        return self
+
+    def setex(self, key, ttl, value):
+        self.store[key] = value
+
+    def execute(self):
+        return []
+
+
+def _reranker(cache: CrossEncoderScoreCache):
+    predict = RecordingPredict()
+    reranker = CrossEncoderReranker(
+        embedding_service=None,
+        batcher=CrossEncoderBatcher(predict, max_wait_seconds=0.0),
+        score_cache=cache,
+    )
+    return reranker, predict
+
+
+def _candidates(abstracts: Dict[str, str]):
+    return [({"id": pid, "title": f"Title {pid}", "abstract": text}, 0.5) for pid, text in abstracts.items()]
+
+
+async def _stage(reranker, query, candidates):
+    return await reranker._cross_encoder_stage(
+        query=query,
+        candidates=candidates,
+        top_k=len(candidates),
+        title_key="title",
+        abstract_key="abstract",
+        id_key="id",
+    )
+
+
+@pytest.mark.asyncio
+async def test_repeat_query_reuses_scores_without_predict():
+    cache = CrossEncoderScoreCache(max_entries=100, ttl_seconds=3600, use_redis=False)
+    reranker, predict = _reranker(cache)
+    candidates = _candidates({"a": "graph networks", "b": "protein folding", "c": "x"})
+
+    first, first_hits = await _stage(reranker, "Graph Neural  Networks", candidates)
+    second, second_hits = await _stage(reranker, "graph neural networks", candidates)
+
+    assert first_hits == 0 and second_hits == 3
+    assert len(predict.scored) == 3
+    assert [(r.paper["id"], r.cross_encoder_score) for r in first] == [
+        (r.paper["id"], r.cross_encoder_score) for r in second
+    ]
+    assert cache.stats.hit_ratio == pytest.approx(0.5)
+
+
+@pytest.mark.asyncio
+async def test_changed_document_text_or_query_is_rescored():
+    cache = CrossEncoderScoreCache(max_entries=100, ttl_seconds=3600, use_redis=False)
+    reranker, predict = _reranker(cache)
+
+    await _stage(reranker, "query", _candidates({"a": "short", "b": "unchanged"}))
+    predict.scored.clear()
+    _, hits = await _stage(reranker, "query", _candidates({"a": "enriched abstract", "b": "unchanged"}))
+    assert hits == 1
+    assert predict.scored == ["Title a. enriched abstract"]
+
+    _, hits = await _stage(reranker, "another query", _candidates({"b": "unchanged"}))
+    assert hits == 0
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_and_lru_is_bounded():
+    expired = CrossEncoderScoreCache(max_entries=100, ttl_seconds=-1, use_redis=False)
+    await expired.put_many({"k": 1.0})
+    assert await expired.get_many(["k"]) == {}
+    assert len(expired) == 0
+
+    bounded = CrossEncoderScoreCache(max_entries=2, ttl_seconds=3600, use_redis=False)
+    await bounded.put_many({"a": 1.0, "b": 2.0})
+    await bounded.get_many(["a"])
+    await bounded.put_many({"c": 3.0})
+    assert await bounded.get_many(["a", "b", "c"]) == {"a": 1.0, "c": 3.0}
+
+
+@pytest.mark.asyncio
+async def test_redis_tier_shared_between_processes(monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(score_cache_module, "get_redis_client", lambda: fake)
+    candidates = _candidates({"a": "alpha", "b": "beta"})
+
+    first, _ = _reranker(CrossEncoderScoreCache(max_entries=10, ttl_seconds=60))
+    await _stage(first, "query", candidates)
+    second_cache = CrossEncoderScoreCache(max_entries=10, ttl_seconds=60)
+    second, predict = _reranker(second_cache)
+    _, hits = await _stage(second, "query", candidates)
+
+    assert hits == 2
+    assert predict.scored == []
+    assert second_cache.stats.redis_hits == 2
+    assert all(k.startswith("reranker:score:v1:") for k in fake.store)
+
+
+@pytest.mark.asyncio
+async def test_disabled_cache_always_scores():
+    predict = RecordingPredict()
+    reranker = CrossEncoderReranker(
+        embedding_service=None,
+        batcher=CrossEncoderBatcher(predict, max_wait_seconds=0.0),
+        use_score_cache=False,
+    )
+    candidates = _candidates({"a": "alpha"})
+
+    await _stage(reranker, "query", candidates)
+    _, hits = await _stage(reranker, "query", candidates)
+
+    assert hits == 0
+    assert len(predict.scored) == 2
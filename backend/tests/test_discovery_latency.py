@@ -0,0 +1,181 @@
+"""
+Tests for per-source adaptive timeouts, circuit breaking and hedging.
+
+Uses fake searchers with controlled delays; no network required.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.services.paper_discovery.config import DiscoveryConfig
+from app.services.paper_discovery.interfaces import PaperRanker, PaperSearcher
+from app.services.paper_discovery.latency import (
+    CLOSED,
+    OPEN,
+    SourceLatencyTracker,
+    run_hedged,
+)
+from app.services.paper_discovery.models import DiscoveredPaper
+from app.services.paper_discovery_service import SearchOrchestrator
+
+
+class _IdentityRanker(PaperRanker):
+    async def rank(self, papers: list[DiscoveredPaper], query: str, **kwargs) -> list[DiscoveredPaper]:
+        return list(papers)
+
+
+class _HangingSearcher(PaperSearcher):
+    def __init__(self, name: str):
+        self._name = name
+        self.calls = 0
+
+    def get_source_name(self) -> str:
+        return self._name
+
+    async def search(self, query: str, max_results: int, **kwargs) -> list[DiscoveredPaper]:
+        self.calls += 1
+        await asyncio.sleep(10)
+        return []
+
+
+def test_timeout_follows_source_p95_within_bounds():
+    tracker = SourceLatencyTracker(min_samples=5, timeout_multiplier=1.5, min_timeout=2.0)
+    assert tracker.timeout_for("arxiv", ceiling=15.0) == 15.0  # no data yet
+
+    for elapsed in (1.0, 1.2, 1.1, 1.3, 4.0):
+        tracker.record("arxiv", elapsed, "success")
+    for elapsed in (0.1, 0.2, 0.1, 0.2, 0.3):
+        tracker.record("openalex", elapsed, "success")
+
+    assert tracker.percentiles("arxiv") == (1.2, 4.0)
+    assert tracker.timeout_for("arxiv", ceiling=15.0) == pytest.approx(6.0)
+    assert tracker.timeout_for("arxiv", ceiling=5.0) == 5.0
+    assert tracker.timeout_for("openalex", ceiling=15.0) == 2.0
+    assert tracker.expected_latency("openalex") < tracker.expected_latency("arxiv")
+
+
+def test_circuit_opens_after_repeated_failures_and_closes_on_probe():
+    tracker = SourceLatencyTracker(failure_threshold=3, cooldown_seconds=0.0)
+
+    tracker.record("crossref", 8.0, "timeout")
+    tracker.record("crossref", 0.1, "rate_limited")
+    assert tracker.allow_request("crossref")
+    tracker.record("crossref", 8.0, "timeout")
+    assert tracker.snapshot()["crossref"].circuit == OPEN
+
+    # Cooldown elapsed: exactly one half-open probe goes through
+    assert tracker.allow_request("crossref")
+    assert not tracker.allow_request("crossref")
+    tracker.record("crossref", 0.5, "success")
+
+    assert tracker.snapshot()["crossref"].circuit == CLOSED
+    assert tracker.allow_request("crossref")
+
+
+def test_failed_probe_reopens_with_longer_cooldown():
+    tracker = SourceLatencyTracker(failure_threshold=1, cooldown_seconds=30.0)
+    tracker.record("core", 8.0, "timeout")
+    state = tracker._states["core"]
+    state.opened_at -= 31.0
+
+    assert tracker.allow_request("core")
+    tracker.record("core", 8.0, "timeout")
+
+    assert state.circuit == OPEN
+    assert state.cooldown == 60.0
+    assert not tracker.allow_request("core")
+
+
+def test_no_hedging_for_quota_sources_or_after_rate_limit():
+    tracker = SourceLatencyTracker(min_samples=1)
+    for source in ("google_scholar", "pubmed", "arxiv"):
+        tracker.record(source, 1.0, "success")
+    tracker.record("pubmed", 0.1, "rate_limited")
+
+    assert tracker.hedge_delay("google_scholar", timeout=10.0) is None
+    assert tracker.hedge_delay("pubmed", timeout=10.0) is None
+    assert tracker.hedge_delay("arxiv", timeout=10.0) == 1.0
+    assert tracker.hedge_delay("arxiv", timeout=0.5) is None
+
+
+@pytest.mark.asyncio
+async def test_run_hedged_duplicate_wins_and_primary_is_cancelled():
+    delays = [1.0, 0.01]
+    started = []
+
+    async def call():
+        delay = delays[len(started)]
+        started.append(asyncio.current_task())
+        await asyncio.sleep(delay)
+        return delay
+
+    result, hedged, hedge_won = await run_hedged(call, timeout=2.0, hedge_after=0.05)
+
+    assert (result, hedged, hedge_won) == (0.01, True, True)
+    await asyncio.sleep(0)
+    assert started[0].cancelled()
+
+
+@pytest.mark.asyncio
+async def test_run_hedged_times_out_when_both_attempts_are_slow():
+    async def call():
+        await asyncio.sleep(1.0)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await run_hedged(call, timeout=0.1, hedge_after=0.05)
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_skips_source_with_open_circuit():
+    tracker = SourceLatencyTracker(failure_threshold=2, cooldown_seconds=600.0)
+    searcher = _HangingSearcher("flaky")
+    config = DiscoveryConfig(search_timeout=0.05)
+
+    def _orchestrator():
+        return SearchOrchestrator(
+            searchers=[searcher],
+            enrichers=[],
+            ranker=_IdentityRanker(),
+            config=config,
+            use_result_cache=False,
+            latency_tracker=tracker,
+        )
+
+    for _ in range(2):
+        result = await _orchestrator().discover_papers("query", max_results=5)
+        assert result.source_stats[0].status == "timeout"
+
+    result = await _orchestrator().discover_papers("query", max_results=5)
+
+    assert searcher.calls == 2
+    assert result.source_stats[0].status == "rate_limited"
+    assert "Circuit open" in result.source_stats[0].error
+
+
+@pytest.mark.asyncio
+async def test_cancelled_half_open_probe_is_released():
+    tracker = SourceLatencyTracker(failure_threshold=1, cooldown_seconds=0.0)
+    tracker.record("flaky", 8.0, "timeout")
+    searcher = _HangingSearcher("flaky")
+    orchestrator = SearchOrchestrator(
+        searchers=[searcher],
+        enrichers=[],
+        ranker=_IdentityRanker(),
+        config=DiscoveryConfig(search_timeout=5.0),
+        use_result_cache=False,
+        latency_tracker=tracker,
+    )
+
+    # The probe is in flight when the caller goes away (stream closed)
+    task = asyncio.create_task(orchestrator.discover_papers("query", max_results=5))
+    await asyncio.sleep(0.05)
+    assert searcher.calls == 1
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert tracker.snapshot()["flaky"].circuit != CLOSED
+    assert tracker.allow_request("flaky")
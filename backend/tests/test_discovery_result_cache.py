@@ -0,0 +1,177 @@
+"""
+Tests for the cross-request per-source discovery result cache.
+
+No network, Redis or DB: searchers are fakes that count calls and the cache
+runs with its Redis tier disabled.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.services.paper_discovery.config import DiscoveryConfig
+from app.services.paper_discovery.interfaces import PaperRanker, PaperSearcher
+from app.services.paper_discovery.latency import SourceLatencyTracker
+from app.services.paper_discovery.models import DiscoveredPaper
+from app.services.paper_discovery.result_cache import (
+    FRESH,
+    MISS,
+    STALE,
+    SourceResultCache,
+    make_cache_key,
+)
+from app.services.paper_discovery_service import PaperDiscoveryService, SearchOrchestrator
+
+
+def _paper(title: str, doi: str) -> DiscoveredPaper:
+    return DiscoveredPaper(
+        title=title,
+        authors=["A. Author"],
+        abstract="Test abstract",
+        year=2024,
+        doi=doi,
+        url=None,
+        source="fake",
+    )
+
+
+class _CountingSearcher(PaperSearcher):
+    def __init__(self, name: str, papers: list[DiscoveredPaper]):
+        self._name = name
+        self.papers = papers
+        self.calls = 0
+
+    def get_source_name(self) -> str:
+        return self._name
+
+    async def search(self, query: str, max_results: int, **kwargs) -> list[DiscoveredPaper]:
+        self.calls += 1
+        return [_paper(p.title, p.doi) for p in self.papers]
+
+
+class _ConstantRanker(PaperRanker):
+    async def rank(self, papers: list[DiscoveredPaper], query: str, **kwargs) -> list[DiscoveredPaper]:
+        for paper in papers:
+            paper.relevance_score = 1.0
+        return list(papers)
+
+
+def _cache(fresh: float = 60.0, stale: float = 3600.0) -> SourceResultCache:
+    return SourceResultCache(max_entries=100, fresh_seconds=fresh, stale_seconds=stale, use_redis=False)
+
+
+def _orchestrator(searchers, cache, latency_tracker=None) -> SearchOrchestrator:
+    return SearchOrchestrator(
+        searchers=searchers,
+        enrichers=[],
+        ranker=_ConstantRanker(),
+        config=DiscoveryConfig(),
+        result_cache=cache,
+        latency_tracker=latency_tracker,
+    )
+
+
+def test_cache_key_normalizes_query_and_separates_filters():
+    base = make_cache_key("arxiv", "Graph  Neural Networks", 20)
+
+    assert base == make_cache_key("arxiv", " graph neural networks ", 20)
+    assert base != make_cache_key("openalex", "graph neural networks", 20)
+    assert base != make_cache_key("arxiv", "graph neural networks", 50)
+    assert base != make_cache_key("arxiv", "graph neural networks", 20, year_from=2020)
+    assert base != make_cache_key("arxiv", "graph neural networks", 20, open_access_only=True)
+
+
+@pytest.mark.asyncio
+async def test_cached_papers_are_isolated_from_caller_mutation():
+    cache = _cache()
+    await cache.set("k", [_paper("Original title", "10.1/a")])
+
+    state, first = await cache.get("k")
+    first[0].title = "Mutated by enrichment"
+    first[0].relevance_score = 0.9
+    _, second = await cache.get("k")
+
+    assert state == FRESH
+    assert second[0].title == "Original title"
+    assert second[0].relevance_score == 0.0
+
+
+@pytest.mark.asyncio
+async def test_repeated_query_skips_network_and_reports_hit_ratio():
+    cache = _cache()
+    searchers = [
+        _CountingSearcher("alpha", [_paper("Paper one about caching", "10.1/one")]),
+        _CountingSearcher("beta", [_paper("Paper two about caching", "10.1/two")]),
+    ]
+
+    first = await _orchestrator(searchers, cache).discover_papers(query="Result caching", max_results=10)
+    second = await _orchestrator(searchers, cache).discover_papers(query="result  caching", max_results=10)
+
+    assert [s.calls for s in searchers] == [1, 1]
+    assert sorted(p.title for p in second.papers) == sorted(p.title for p in first.papers)
+    assert cache.stats.misses == 2
+    assert cache.stats.fresh_hits == 2
+    assert cache.stats.hit_ratio == pytest.approx(0.5)
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_served_then_refreshed_in_background():
+    cache = _cache(fresh=0.0, stale=3600.0)
+    searcher = _CountingSearcher("alpha", [_paper("Old result title here", "10.1/old")])
+    key = make_cache_key("alpha", "stale query", 10)
+    await cache.set(key, searcher.papers)
+    searcher.papers = [_paper("New result title here", "10.1/new")]
+
+    result = await _orchestrator([searcher], cache).discover_papers(query="stale query", max_results=10)
+    assert [p.title for p in result.papers] == ["Old result title here"]
+
+    await asyncio.gather(*list(cache._background))
+    cache.fresh_seconds = 60.0
+    state, refreshed = await cache.get(key)
+
+    assert searcher.calls == 1
+    assert state == FRESH
+    assert [p.title for p in refreshed] == ["New result title here"]
+    assert cache.stats.refreshes == 1
+
+
+@pytest.mark.asyncio
+async def test_background_refresh_respects_open_circuit():
+    cache = _cache(fresh=0.0, stale=3600.0)
+    searcher = _CountingSearcher("alpha", [_paper("Old result title here", "10.1/old")])
+    key = make_cache_key("alpha", "stale query", 10)
+    await cache.set(key, searcher.papers)
+    tracker = SourceLatencyTracker(failure_threshold=1, cooldown_seconds=600.0)
+    tracker.record("alpha", 8.0, "timeout")
+
+    result = await _orchestrator([searcher], cache, tracker).discover_papers(query="stale query", max_results=10)
+    await asyncio.gather(*list(cache._background))
+
+    assert [p.title for p in result.papers] == ["Old result title here"]
+    assert searcher.calls == 0
+    assert cache.stats.refreshes == 0
+    assert (await cache.get(key))[0] == STALE
+
+
+def test_no_background_refresh_with_private_session():
+    pooled = _orchestrator([], _cache())
+    private = _orchestrator([], _cache())
+
+    PaperDiscoveryService(orchestrator=pooled, session=object(), owns_session=False)
+    PaperDiscoveryService(orchestrator=private, session=object(), owns_session=True)
+
+    assert pooled.background_refresh is True
+    assert private.background_refresh is False
+
+
+@pytest.mark.asyncio
+async def test_empty_results_are_not_cached():
+    cache = _cache()
+    searcher = _CountingSearcher("alpha", [])
+
+    await _orchestrator([searcher], cache).discover_papers(query="nothing", max_results=10)
+    state, _ = await cache.get(make_cache_key("alpha", "nothing", 10))
+
+    assert state == MISS
@@ -0,0 +1,129 @@
+"""
+Tests for streaming discovery (`discover_papers_stream`).
+
+Fake searchers with staggered delays stand in for external sources; no
+network, DB or models required.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from app.services.paper_discovery.config import DiscoveryConfig
+from app.services.paper_discovery.interfaces import PaperEnricher, PaperRanker, PaperSearcher
+from app.services.paper_discovery.models import DiscoveredPaper
+from app.services.paper_discovery_service import SearchOrchestrator
+
+
+def _paper(title: str, doi: str, source: str) -> DiscoveredPaper:
+    return DiscoveredPaper(
+        title=title,
+        authors=["A. Author"],
+        abstract="",
+        year=2024,
+        doi=doi,
+        url=None,
+        source=source,
+    )
+
+
+class _DelayedSearcher(PaperSearcher):
+    def __init__(self, name: str, delay: float, papers: list[DiscoveredPaper]):
+        self._name = name
+        self._delay = delay
+        self._papers = papers
+
+    def get_source_name(self) -> str:
+        return self._name
+
+    async def search(self, query: str, max_results: int, **kwargs) -> list[DiscoveredPaper]:
+        await asyncio.sleep(self._delay)
+        return list(self._papers)
+
+
+class _AbstractEnricher(PaperEnricher):
+    async def enrich(self, papers: list[DiscoveredPaper]) -> None:
+        for paper in papers:
+            paper.abstract = f"Enriched abstract on streaming search for {paper.title}"
+
+
+class _ReverseTitleRanker(PaperRanker):
+    """Deliberately disagrees with lexical order so the final batch is distinguishable."""
+
+    async def rank(self, papers: list[DiscoveredPaper], query: str, **kwargs) -> list[DiscoveredPaper]:
+        for paper in papers:
+            paper.relevance_score = 1.0
+        return sorted(papers, key=lambda p: p.title, reverse=True)
+
+
+def _orchestrator() -> SearchOrchestrator:
+    searchers = [
+        _DelayedSearcher("fast", 0.01, [_paper("Streaming search results early", "10.1/a", "fast")]),
+        _DelayedSearcher("slow", 0.3, [
+            _paper("Streaming search results early", "10.1/a", "slow"),
+            _paper("Another streaming search paper", "10.1/b", "slow"),
+        ]),
+    ]
+    return SearchOrchestrator(
+        searchers=searchers,
+        enrichers=[_AbstractEnricher()],
+        ranker=_ReverseTitleRanker(),
+        config=DiscoveryConfig(),
+        use_result_cache=False,
+    )
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_provisional_before_slow_source_then_final():
+    start = time.monotonic()
+    batches = []
+    async for batch in _orchestrator().discover_papers_stream("streaming search", max_results=10):
+        batches.append((time.monotonic() - start, batch))
+
+    stages = [b.stage for _, b in batches]
+    assert stages == ["provisional", "provisional", "enriched", "final"]
+
+    first_at, first = batches[0]
+    assert first_at < 0.25
+    assert [p.title for p in first.papers] == ["Streaming search results early"]
+    assert (first.sources_completed, first.sources_total) == (1, 2)
+
+    # The second provisional batch already has the cross-source duplicate merged
+    second = batches[1][1]
+    assert len(second.papers) == 2
+    assert sorted(second.papers[0].merged_sources + second.papers[1].merged_sources) == ["fast", "slow", "slow"]
+
+    enriched = batches[2][1]
+    assert all(p.abstract.startswith("Enriched") for p in enriched.papers)
+
+    final = batches[-1][1]
+    assert final.is_final
+    assert [p.title for p in final.papers] == [
+        "Streaming search results early",
+        "Another streaming search paper",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stream_final_matches_discover_papers_and_snapshots_are_copies():
+    streamed = [b async for b in _orchestrator().discover_papers_stream("streaming search", max_results=10)]
+    direct = await _orchestrator().discover_papers("streaming search", max_results=10)
+
+    assert [p.title for p in streamed[-1].papers] == [p.title for p in direct.papers]
+    final_ids = {id(p) for p in streamed[-1].papers}
+    assert not any(id(p) in final_ids for b in streamed[:-1] for p in b.papers)
+
+
+@pytest.mark.asyncio
+async def test_closing_stream_early_cancels_discovery():
+    orchestrator = _orchestrator()
+    stream = orchestrator.discover_papers_stream("streaming search", max_results=10)
+
+    first = await stream.__anext__()
+    await stream.aclose()
+
+    assert first.stage == "provisional"
+    assert not [t for t in asyncio.all_tasks() if t is not asyncio.current_task() and not t.done()]
@@ -0,0 +1,243 @@
+"""
+Tests for retrieval-based discussion context (project_discussion_embeddings).
+
+The database side is replaced by monkeypatched context_retrieval functions
+and a fake session; the embeddings client records what it was asked to embed.
+"""
+
+from __future__ import annotations
+
+import threading
+import uuid
+from types import SimpleNamespace
+from typing import List
+from unittest.mock import patch
+
+import pytest
+
+from app.core.config import settings
+from app.models.project_discussion_embedding import DiscussionEmbeddingOrigin
+from app.services.discussion_ai import context_retrieval
+from app.services.discussion_ai.context_retrieval import (
+    MAX_PROMPT_ITEM_CHARS,
+    DiscussionItem,
+    RetrievedItem,
+    exchange_text,
+    fit_items_in_budget,
+    resource_text,
+)
+
+
+class FakeEmbeddings:
+    def __init__(self):
+        self.inputs: List[List[str]] = []
+
+    def create(self, model, input):
+        self.inputs.append(list(input))
+        # Out of order on purpose: callers must sort by index
+        data = [SimpleNamespace(index=i, embedding=[float(i)]) for i in range(len(input))]
+        return SimpleNamespace(data=list(reversed(data)))
+
+
+class FakeClient:
+    def __init__(self):
+        self.embeddings = FakeEmbeddings()
+
+
+class FakeSession:
+    def __init__(self):
+        self.committed = False
+        self.closed = False
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+class MockProject:
+    id = "project-1"
+    title = "Test Project"
+    idea = ""
+    scope = ""
+    keywords = ""
+
+
+class MockChannel:
+    def __init__(self):
+        self.id = uuid.uuid4()
+        self.project_id = uuid.uuid4()
+        self.name = "General"
+        self.ai_memory = {}
+
+
+def _orchestrator(client=None):
+    from app.services.discussion_ai.tool_orchestrator import ToolOrchestrator
+
+    ai_service = SimpleNamespace(default_model="gpt-5-mini", openai_client=client)
+    return ToolOrchestrator(ai_service, db=None)
+
+
+def _item(text: str, similarity: float = 0.9) -> RetrievedItem:
+    return RetrievedItem("MESSAGE", uuid.uuid4(), text, similarity)
+
+
+def test_item_texts():
+    assert exchange_text(" What is X? ", {"message": "X is Y."}) == "User: What is X?\nAssistant: X is Y."
+    text = resource_text("paper", {"title": "Graph nets", "authors": ["A", "B"], "year": 2020}, tag="gnn")
+    assert text == "Channel resource (paper): title: Graph nets; authors: A, B; year: 2020; tag: gnn"
+
+    item = DiscussionItem(DiscussionEmbeddingOrigin.MESSAGE, uuid.uuid4(), uuid.uuid4(), "hello")
+    assert len(item.signature) == 64
+
+
+def test_fit_skips_recent_questions_and_respects_budget():
+    recent = _item("User: Which dataset?\nAssistant: Use CIFAR.")
+    older = _item("User: Which model?\nAssistant: A ResNet.")
+    long_item = _item("Channel message: " + "word " * 2000)
+
+    fitted = fit_items_in_budget([recent, older, long_item], budget=10_000, model="gpt-4",
+                                 recent_user_messages=["Which dataset?"])
+
+    assert [i.origin_id for i in fitted] == [older.origin_id, long_item.origin_id]
+    assert len(fitted[1].text) <= MAX_PROMPT_ITEM_CHARS + 1
+
+    assert fit_items_in_budget([older], budget=1, model="gpt-4") == []
+
+
+def test_query_and_pending_items_share_one_embeddings_call(monkeypatch):
+    client = FakeClient()
+    orchestrator = _orchestrator(client)
+    channel = MockChannel()
+    session = FakeSession()
+    pending = [
+        DiscussionItem(DiscussionEmbeddingOrigin.MESSAGE, uuid.uuid4(), channel.project_id, "User: a\nAssistant: b"),
+        DiscussionItem(DiscussionEmbeddingOrigin.RESOURCE, uuid.uuid4(), channel.project_id, "Channel resource (paper): c"),
+    ]
+    stored = {}
+    searched = {}
+
+    monkeypatch.setattr("app.database.SessionLocal", lambda: session)
+    monkeypatch.setattr(context_retrieval, "pending_items", lambda db, channel_id, project_id: pending)
+    monkeypatch.setattr(context_retrieval, "mark_deleted_messages_stale", lambda db, channel_id: None)
+    monkeypatch.setattr(
+        context_retrieval, "store_items",
+        lambda db, channel_id, items, embeddings: stored.update(items=items, embeddings=embeddings),
+    )
+
+    def fake_nearest(db, channel_id, query_embedding, limit, min_similarity):
+        searched.update(query=query_embedding, limit=limit)
+        return [_item("User: earlier question\nAssistant: earlier answer")]
+
+    monkeypatch.setattr(context_retrieval, "nearest_items", fake_nearest)
+
+    context = orchestrator._retrieve_discussion_context(channel, "new question", [])
+
+    assert client.embeddings.inputs == [["new question", pending[0].text, pending[1].text]]
+    assert stored["embeddings"] == [[1.0], [2.0]]
+    assert searched == {"query": [0.0], "limit": settings.DISCUSSION_RETRIEVAL_TOP_K}
+    assert session.committed and session.closed
+    assert "RELEVANT EARLIER DISCUSSION" in context and "earlier answer" in context
+
+
+def test_build_messages_uses_short_window_with_retrieval():
+    orchestrator = _orchestrator(FakeClient())
+    history = [{"role": "user", "content": f"Message {i}"} for i in range(30)]
+
+    with patch.object(orchestrator, "_retrieve_discussion_context", return_value="## RELEVANT EARLIER DISCUSSION\nold"):
+        messages = orchestrator._build_messages(MockProject(), MockChannel(), "Current", None, history)
+
+    history_messages = [m["content"] for m in messages if m["role"] == "user"][:-1]
+    assert history_messages == [f"Message {i}" for i in range(30 - settings.DISCUSSION_RETRIEVAL_RECENT_MESSAGES, 30)]
+    assert any(m["role"] == "system" and m["content"].startswith("## RELEVANT EARLIER") for m in messages)
+
+    # Retrieval unavailable: the full sliding window is used
+    with patch.object(orchestrator, "_retrieve_discussion_context", return_value=None):
+        messages = orchestrator._build_messages(MockProject(), MockChannel(), "Current", None, history)
+    assert len([m for m in messages if m["role"] == "user"]) == orchestrator.SLIDING_WINDOW_SIZE + 1
+
+
+def test_build_messages_uses_prefetched_context():
+    orchestrator = _orchestrator(FakeClient())
+    history = [{"role": "user", "content": f"Message {i}"} for i in range(30)]
+    ctx = {"retrieved_context": "## RELEVANT EARLIER DISCUSSION\nprefetched"}
+
+    with patch.object(orchestrator, "_retrieve_discussion_context") as retrieve:
+        messages = orchestrator._build_messages(MockProject(), MockChannel(), "Current", None, history, ctx=ctx)
+
+    retrieve.assert_not_called()
+    assert any(m["role"] == "system" and m["content"].endswith("prefetched") for m in messages)
+    assert ctx["retrieval_context_used"] is True
+
+
+@pytest.mark.asyncio
+async def test_streaming_retrieves_context_off_the_event_loop():
+    orchestrator = _orchestrator(FakeClient())
+    retrieval_threads = []
+    built = {}
+
+    def fake_retrieve(channel, message, history):
+        retrieval_threads.append(threading.current_thread())
+        return "## RELEVANT EARLIER DISCUSSION\nold"
+
+    def fake_build(project, channel, message, results, history, ctx=None):
+        built.update(ctx)
+        return []
+
+    async def no_events(messages, ctx):
+        return
+        yield
+
+    with patch.object(orchestrator, "_build_request_context", return_value={}), \
+         patch.object(orchestrator, "_retrieve_turn_context", side_effect=fake_retrieve), \
+         patch.object(orchestrator, "_build_messages", side_effect=fake_build), \
+         patch.object(orchestrator, "_execute_with_tools_streaming", side_effect=no_events), \
+         patch("app.services.discussion_ai.route_classifier.classify_route",
+               return_value=SimpleNamespace(route="full", reason="test")):
+        events = [e async for e in orchestrator.handle_message_streaming(MockProject(), MockChannel(), "Hi")]
+
+    assert events[0]["type"] == "status"
+    assert retrieval_threads and retrieval_threads[0] is not threading.main_thread()
+    assert built["retrieved_context"].endswith("old")
+
+
+def test_build_messages_records_whether_retrieval_succeeded():
+    orchestrator = _orchestrator(FakeClient())
+    history = [{"role": "user", "content": f"Message {i}"} for i in range(30)]
+
+    ctx = {}
+    with patch.object(orchestrator, "_retrieve_discussion_context", return_value=""):
+        orchestrator._build_messages(MockProject(), MockChannel(), "Current", None, history, ctx=ctx)
+    assert ctx["retrieval_context_used"] is True
+
+    with patch.object(orchestrator, "_retrieve_discussion_context", return_value=None):
+        orchestrator._build_messages(MockProject(), MockChannel(), "Current", None, history, ctx=ctx)
+    assert ctx["retrieval_context_used"] is False
+
+
+@pytest.mark.parametrize("retrieval_used", [True, False])
+def test_summarization_only_when_retrieval_was_not_used(retrieval_used):
+    orchestrator = _orchestrator(FakeClient())
+    history = [{"role": "user", "content": f"Message {i} about the topic"} for i in range(8)]
+
+    with patch.object(orchestrator, "_summarize_old_messages", return_value="summary") as summarize, \
+         patch.object(orchestrator, "_save_ai_memory"), \
+         patch.object(orchestrator, "_extract_research_facts", side_effect=lambda u, a, facts, **kw: facts), \
+         patch("app.services.discussion_ai.token_utils.should_summarize", return_value=True):
+        orchestrator.update_memory_after_exchange(
+            MockChannel(), "Next message", "Reply", history, retrieval_used=retrieval_used,
+        )
+
+    # A turn whose retrieval failed fell back to the sliding window: keep the summary current
+    assert summarize.called is not retrieval_used
+
+
+def test_retrieval_can_be_disabled(monkeypatch):
+    monkeypatch.setattr(settings, "DISCUSSION_RETRIEVAL_ENABLED", False)
+    assert not _orchestrator(FakeClient())._uses_retrieval_context()
+    monkeypatch.setattr(settings, "DISCUSSION_RETRIEVAL_ENABLED", True)
+    assert not _orchestrator(None)._uses_retrieval_context()
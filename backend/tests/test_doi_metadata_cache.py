@@ -0,0 +1,180 @@
+"""
+Tests for the DOI metadata cache used by the Crossref and Unpaywall enrichers.
+
+A fake aiohttp session serves canned API responses and an in-memory store
+replaces the Postgres table.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+
+import pytest
+
+from app.services.paper_discovery.config import DiscoveryConfig
+from app.services.paper_discovery.doi_metadata_cache import (
+    STATUS_MISSING,
+    STATUS_OK,
+    DoiMetadata,
+)
+from app.services.paper_discovery.enrichers import CrossrefEnricher, UnpaywallEnricher
+from app.services.paper_discovery.models import DiscoveredPaper
+
+
+class _Response:
+    def __init__(self, status: int, payload: dict):
+        self.status = status
+        self._payload = payload
+
+    async def json(self):
+        return self._payload
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeSession:
+    def __init__(self, responses: Dict[str, tuple]):
+        self.responses = responses
+        self.requested: List[str] = []
+
+    def get(self, url, params=None, **kwargs):
+        self.requested.append(url)
+        doi = url.split("/works/")[-1] if "/works/" in url else url.split("/v2/")[-1]
+        status, payload = self.responses.get(doi, (404, {}))
+        return _Response(status, payload)
+
+
+class MemoryStore:
+    def __init__(self, rows: Dict[str, DoiMetadata] | None = None):
+        self.rows = rows or {}
+        self.crossref: list = []
+        self.unpaywall: list = []
+        self.abstracts: list = []
+
+    async def lookup(self, dois):
+        return {d.lower(): self.rows[d.lower()] for d in dois if d.lower() in self.rows}
+
+    async def store_crossref(self, records):
+        self.crossref.extend(records)
+
+    async def store_unpaywall(self, records):
+        self.unpaywall.extend(records)
+
+    async def store_abstracts(self, records):
+        self.abstracts.extend(records)
+
+
+def _paper(doi: str, **kwargs) -> DiscoveredPaper:
+    return DiscoveredPaper(
+        title=f"Paper {doi}", authors=[], abstract=kwargs.pop("abstract", ""), year=None,
+        doi=doi, url=None, source="openalex", **kwargs,
+    )
+
+
+NOW = datetime.now(timezone.utc)
+CROSSREF_ITEM = {
+    "message": {
+        "container-title": ["Nature"],
+        "published-print": {"date-parts": [[2021, 5]]},
+        "is-referenced-by-count": 42,
+        "URL": "https://doi.org/10.1/fetched",
+        "abstract": "<jats:p>" + "An abstract long enough to be worth caching. " * 2 + "</jats:p>",
+    }
+}
+
+
+@pytest.mark.asyncio
+async def test_crossref_serves_fresh_rows_and_fetches_only_misses():
+    store = MemoryStore({
+        "10.1/cached": DoiMetadata(
+            doi="10.1/cached", journal="Science", year=2019, url="https://doi.org/10.1/cached",
+            citations_count=7, crossref_status=STATUS_OK,
+            crossref_fetched_at=NOW - timedelta(days=400), citations_fetched_at=NOW - timedelta(days=1),
+        ),
+        "10.1/gone": DoiMetadata(doi="10.1/gone", crossref_status=STATUS_MISSING, crossref_fetched_at=NOW),
+    })
+    session = FakeSession({"10.1/fetched": (200, CROSSREF_ITEM)})
+    enricher = CrossrefEnricher(session, DiscoveryConfig(), metadata_cache=store)
+    cached, fetched, gone = _paper("10.1/CACHED"), _paper("10.1/fetched"), _paper("10.1/gone")
+
+    await enricher.enrich([cached, fetched, gone])
+
+    assert session.requested == ["https://api.crossref.org/works/10.1/fetched"]
+    assert (cached.journal, cached.year, cached.citations_count) == ("Science", 2019, 7)
+    assert (fetched.journal, fetched.year, fetched.citations_count) == ("Nature", 2021, 42)
+    assert fetched.abstract.startswith("An abstract long enough")
+    assert [(r.doi, r.status) for r in store.crossref] == [("10.1/fetched", STATUS_OK)]
+    assert store.abstracts[0].source == "crossref"
+
+
+@pytest.mark.asyncio
+async def test_stale_citation_count_is_refetched_but_immutable_fields_kept():
+    store = MemoryStore({
+        "10.1/old": DoiMetadata(
+            doi="10.1/old", journal="Cell", year=2010, citations_count=3, crossref_status=STATUS_OK,
+            crossref_fetched_at=NOW - timedelta(days=30), citations_fetched_at=NOW - timedelta(days=30),
+        ),
+    })
+    item = {"message": {"is-referenced-by-count": 99}}
+    session = FakeSession({"10.1/old": (200, item)})
+    paper = _paper("10.1/old")
+
+    await CrossrefEnricher(session, DiscoveryConfig(), metadata_cache=store).enrich([paper])
+
+    assert len(session.requested) == 1
+    assert (paper.journal, paper.year, paper.citations_count) == ("Cell", 2010, 99)
+
+
+@pytest.mark.asyncio
+async def test_crossref_404_is_recorded_as_missing():
+    store = MemoryStore()
+    paper = _paper("10.1/unknown")
+
+    await CrossrefEnricher(FakeSession({}), DiscoveryConfig(), metadata_cache=store).enrich([paper])
+
+    assert [(r.doi, r.status) for r in store.crossref] == [("10.1/unknown", STATUS_MISSING)]
+
+
+@pytest.mark.asyncio
+async def test_unpaywall_uses_cache_until_oa_ttl_expires():
+    store = MemoryStore({
+        "10.2/fresh": DoiMetadata(
+            doi="10.2/fresh", is_open_access=True, pdf_url="https://repo.org/a.pdf",
+            landing_url="https://repo.org/a", unpaywall_status=STATUS_OK, unpaywall_fetched_at=NOW,
+        ),
+        "10.2/stale": DoiMetadata(
+            doi="10.2/stale", is_open_access=False, unpaywall_status=STATUS_OK,
+            unpaywall_fetched_at=NOW - timedelta(days=90),
+        ),
+    })
+    payload = {"is_oa": True, "best_oa_location": {"url_for_pdf": "https://x.org/b.pdf", "url": "https://x.org/b"}}
+    session = FakeSession({"10.2/stale": (200, payload)})
+    fresh, stale = _paper("10.2/fresh"), _paper("10.2/stale")
+
+    await UnpaywallEnricher(session, DiscoveryConfig(), "me@example.org", metadata_cache=store).enrich([fresh, stale])
+
+    assert session.requested == ["https://api.unpaywall.org/v2/10.2/stale"]
+    assert (fresh.is_open_access, fresh.pdf_url, fresh.open_access_url) == (
+        True, "https://repo.org/a.pdf", "https://repo.org/a",
+    )
+    assert (stale.is_open_access, stale.pdf_url) == (True, "https://x.org/b.pdf")
+    assert store.unpaywall[0].landing_url == "https://x.org/b"
+
+
+def test_row_freshness_per_field_group():
+    row = DoiMetadata(
+        doi="10.3/x", journal="J", crossref_status=STATUS_OK, citations_count=5,
+        crossref_fetched_at=NOW - timedelta(days=1000), citations_fetched_at=NOW - timedelta(days=8),
+        unpaywall_status=STATUS_MISSING, unpaywall_fetched_at=NOW - timedelta(days=31),
+    )
+
+    record = row.crossref_record(NOW)
+    assert record.journal == "J" and record.citations_count is None
+    assert not row.citations_fresh(NOW)
+    assert row.unpaywall_record(NOW) is None
+    assert DoiMetadata(doi="10.3/y").crossref_record(NOW) is None
@@ -0,0 +1,158 @@
+"""
+Tests for the two-tier embedding cache and its use by EmbeddingService.
+
+No DB, Redis or model download required: a fake provider counts calls and
+the Redis tier is replaced by an in-memory stand-in.
+"""
+
+import asyncio
+from typing import Dict, List
+
+import numpy as np
+import pytest
+
+from app.services.embedding_cache import (
+    EmbeddingCache,
+    MemoryEmbeddingCache,
+)
+from app.services.embedding_service import EmbeddingProvider, EmbeddingService
+
+
+class CountingProvider(EmbeddingProvider):
+    """Deterministic 4-dim provider that records every text it encodes."""
+
+    def __init__(self):
+        self.encoded: List[str] = []
+
+    @property
+    def model_name(self) -> str:
+        return "fake-model"
+
+    @property
+    def dimensions(self) -> int:
+        return 4
+
+    async def embed(self, text: str) -> List[float]:
+        return (await self.embed_batch([text]))[0]
+
+    async def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        self.encoded.extend(texts)
+        return [[float(len(t)), 1.0, 0.0, 0.0] for t in texts]
+
+
+class FakeRedisTier:
+    """Dict-backed stand-in for RedisEmbeddingCache."""
+
+    def __init__(self):
+        self.store: Dict[str, List[float]] = {}
+
+    def get_many(self, keys):
+        return {k: self.store[k] for k in keys if k in self.store}
+
+    def put_many(self, items):
+        self.store.update({k: list(v) for k, v in items.items()})
+
+
+def _service(max_bytes: int = 1 << 20, redis=None) -> EmbeddingService:
+    cache = EmbeddingCache(memory=MemoryEmbeddingCache(max_bytes), redis=redis)
+    return EmbeddingService(provider=CountingProvider(), cache=cache)
+
+
+def test_batch_path_caches_beyond_old_entry_limit():
+    service = _service()
+    texts = [f"paper {i}" for i in range(1500)]
+
+    asyncio.run(service.embed_batch(texts))
+    asyncio.run(service.embed_batch(texts))
+
+    assert len(service.provider.encoded) == 1500
+    assert service.cache_stats.hits == 1500
+    assert service.cache_stats.misses == 1500
+
+
+def test_single_and_batch_share_cache_entries():
+    service = _service()
+
+    asyncio.run(service.embed("graph neural networks"))
+    asyncio.run(service.embed_batch(["graph neural networks", "transformers"]))
+
+    assert service.provider.encoded == ["graph neural networks", "transformers"]
+
+
+def test_duplicate_texts_in_batch_encoded_once():
+    service = _service()
+
+    result = asyncio.run(service.embed_batch(["a text", "a text", "", "b text"]))
+
+    assert service.provider.encoded == ["a text", "b text"]
+    assert result[0] == result[1]
+    assert result[2] == [0.0, 0.0, 0.0, 0.0]
+
+
+def test_lru_evicts_least_recently_used_by_memory_budget():
+    memory = MemoryEmbeddingCache(max_bytes=3 * 16)
+    vectors = {k: np.zeros(4, dtype=np.float32) for k in ("a", "b", "c")}
+    memory.put_many(vectors)
+
+    memory.get_many(["a"])  # refresh "a" so "b" is now the oldest
+    memory.put_many({"d": vectors["a"]})
+
+    assert set(memory.get_many(["a", "b", "c", "d"])) == {"a", "c", "d"}
+    assert memory.evictions == 1
+    assert memory.current_bytes == 3 * 16
+
+
+def test_redis_tier_shared_between_services():
+    shared = FakeRedisTier()
+    first = _service(redis=shared)
+    second = _service(redis=shared)
+
+    asyncio.run(first.embed("attention is all you need"))
+    asyncio.run(second.embed("attention is all you need"))
+
+    assert second.provider.encoded == []
+    assert second.cache_stats.redis_hits == 1
+    assert any(k.startswith("fake-model:") for k in shared.store)
+
+
+def test_batch_array_is_contiguous_float32_matrix():
+    service = _service()
+
+    matrix = asyncio.run(service.embed_batch_array(["abc", "", "abcdef"]))
+
+    assert matrix.dtype == np.float32
+    assert matrix.shape == (3, 4)
+    assert matrix.flags["C_CONTIGUOUS"]
+    assert not matrix[1].any()
+    assert asyncio.run(service.embed_batch(["abc"])) == [matrix[0].tolist()]
+
+
+def test_float16_memory_tier_halves_footprint():
+    cache = EmbeddingCache(memory=MemoryEmbeddingCache(1 << 20), dtype=np.dtype(np.float16))
+    service = EmbeddingService(provider=CountingProvider(), cache=cache)
+
+    first = asyncio.run(service.embed_array("float16 text"))
+    second = asyncio.run(service.embed_array("float16 text"))
+
+    assert cache.memory.current_bytes == 4 * 2
+    assert second.dtype == np.float32
+    np.testing.assert_allclose(first, second, rtol=1e-3)
+
+
+def test_top_k_matches_pairwise_cosine_ranking():
+    service = _service()
+    rng = np.random.default_rng(7)
+    docs = rng.standard_normal((50, 4)).astype(np.float32)
+    docs[3] = 0.0
+    query = rng.standard_normal(4).astype(np.float32)
+
+    indices, scores = service.top_k(query, docs, k=5, assume_normalized=False)
+
+    expected = sorted(
+        range(len(docs)),
+        key=lambda i: service.cosine_similarity(query, docs[i]),
+        reverse=True,
+    )[:5]
+    assert indices.tolist() == expected
+    assert scores[0] == pytest.approx(service.cosine_similarity(query, docs[expected[0]]), abs=1e-6)
+    assert service.similarity_matrix(query, docs, assume_normalized=False)[0, 3] == 0.0
@@ -8,16 +8,23 @@ Tests the full pipeline:
 4. Semantic search returns relevant papers
 """
 
+import queue
+import threading
 import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import numpy as np
 import pytest
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.models.paper_embedding import EmbeddingJob, PaperEmbedding
 from app.models.project_reference import ProjectReference
 from app.models.reference import Reference
+from app.services import embedding_worker
 from app.services.embedding_worker import (
     EmbeddingWorker,
     queue_library_paper_embedding_sync,
@@ -55,14 +62,15 @@ def test_reference(db: Session, test_project, test_user):
 
     # Cleanup
     try:
-        db.query(PaperEmbedding).filter(
-            PaperEmbedding.project_reference_id == project_ref.id
-        ).delete()
+        db.refresh(project_ref)
+        embedding_id = project_ref.paper_embedding_id
         db.query(EmbeddingJob).filter(
             EmbeddingJob.target_id == project_ref.id
         ).delete()
         db.delete(project_ref)
         db.delete(ref)
+        if embedding_id:
+            db.query(PaperEmbedding).filter(PaperEmbedding.id == embedding_id).delete()
         db.commit()
     except Exception:
         db.rollback()
@@ -101,9 +109,29 @@ def mock_embedding_service():
 
     service.embed = AsyncMock(side_effect=mock_embed)
 
+    async def mock_embed_array(text):
+        return np.asarray(await mock_embed(text), dtype=np.float32)
+
+    service.embed_array = AsyncMock(side_effect=mock_embed_array)
+
+    async def mock_embed_batch_array(texts):
+        return np.stack([await mock_embed_array(t) for t in texts])
+
+    service.embed_batch_array = AsyncMock(side_effect=mock_embed_batch_array)
+
     return service
 
 
+def _linked_embedding(db: Session, project_ref: ProjectReference) -> PaperEmbedding:
+    """The library embedding a project reference links to."""
+    return (
+        db.query(PaperEmbedding)
+        .join(ProjectReference, ProjectReference.paper_embedding_id == PaperEmbedding.id)
+        .filter(ProjectReference.id == project_ref.id)
+        .one_or_none()
+    )
+
+
 # --- Test: Job Queueing ---
 
 class TestJobQueueing:
@@ -149,6 +177,38 @@ class TestJobQueueing:
         assert job1.status == "pending"
         assert job2.status == "pending"
 
+    def test_queue_notifies_listening_workers(self, db: Session, test_reference, test_project):
+        """Queueing a job issues NOTIFY on the embedding jobs channel."""
+        import select
+
+        from app.database import engine
+        from app.services.embedding_worker import EMBEDDING_JOBS_CHANNEL
+
+        project_ref, _ = test_reference
+        raw = engine.raw_connection()
+        try:
+            listen_conn = raw.driver_connection
+            listen_conn.autocommit = True
+            with listen_conn.cursor() as cur:
+                cur.execute(f"LISTEN {EMBEDDING_JOBS_CHANNEL}")
+
+            queue_library_paper_embedding_sync(project_ref.id, test_project.id, db)
+
+            select.select([listen_conn], [], [], 5)
+            listen_conn.poll()
+            payloads = [n.payload for n in listen_conn.notifies]
+            assert "library_paper" in payloads
+        finally:
+            raw.close()
+
+    def test_idle_wait_without_listener_returns_false(self, mock_embedding_service):
+        """Without a LISTEN connection the worker falls back to a timed wait."""
+        worker = EmbeddingWorker(embedding_service=mock_embedding_service)
+        worker._running = True
+
+        with patch.object(worker, "_ensure_listener", return_value=None):
+            assert worker._wait_for_jobs(0.01) is False
+
 
 # --- Test: Worker Processing ---
 
@@ -192,9 +252,7 @@ class TestWorkerProcessing:
         assert success is True
 
         # Check embedding was created
-        embedding = db.query(PaperEmbedding).filter(
-            PaperEmbedding.project_reference_id == project_ref.id
-        ).first()
+        embedding = _linked_embedding(db, project_ref)
 
         assert embedding is not None
         assert embedding.model_name == "all-MiniLM-L6-v2"
@@ -281,6 +339,63 @@ class TestWorkerProcessing:
         assert job.status == "failed"
 
 
+# --- Test: Batched Mode ---
+
+class TestBatchedWorker:
+    """Tests for the batched worker mode (one query, one encode, one upsert)."""
+
+    def test_batched_mode_embeds_all_jobs_with_one_encode_call(
+        self, db: Session, test_reference, test_project, mock_embedding_service
+    ):
+        """Library and bulk jobs in one batch share a single embed_batch_array call."""
+        project_ref, _ = test_reference
+
+        job1 = queue_library_paper_embedding_sync(project_ref.id, test_project.id, db)
+        job2 = queue_bulk_reindex_sync(test_project.id, db)
+        for job in (job1, job2):
+            job.status = "processing"
+            job.attempts = 1
+        db.commit()
+
+        worker = EmbeddingWorker(embedding_service=mock_embedding_service, batched=True)
+        completed = worker._process_jobs_batched(db, [job1, job2])
+
+        assert completed == 2
+        assert mock_embedding_service.embed_batch_array.call_count == 1
+        assert worker.stats.jobs_completed == 2
+        assert worker.stats.papers_embedded >= 1
+
+        db.refresh(job1)
+        db.refresh(job2)
+        assert job1.status == "completed"
+        assert job2.status == "completed"
+
+        embedding = _linked_embedding(db, project_ref)
+        assert "Deep Learning" in embedding.embedded_text
+
+    def test_batched_mode_skips_unchanged_content(
+        self, db: Session, test_reference, test_project, mock_embedding_service
+    ):
+        """A second batch over unchanged references performs no encode."""
+        project_ref, _ = test_reference
+        worker = EmbeddingWorker(embedding_service=mock_embedding_service, batched=True)
+
+        # Library jobs for already-embedded content aren't queued at all, so
+        # the second pass is a reindex
+        for queue in (
+            lambda: queue_library_paper_embedding_sync(project_ref.id, test_project.id, db),
+            lambda: queue_bulk_reindex_sync(test_project.id, db),
+        ):
+            job = queue()
+            job.status = "processing"
+            job.attempts = 1
+            db.commit()
+            worker._process_jobs_batched(db, [job])
+
+        assert mock_embedding_service.embed_batch_array.call_count == 1
+        assert worker.stats.papers_skipped == 1
+
+
 # --- Test: Embedding Storage ---
 
 class TestEmbeddingStorage:
@@ -300,9 +415,10 @@ class TestEmbeddingStorage:
         # Check dimensions using pgvector function
         result = db.execute(
             text("""
-                SELECT vector_dims(embedding)
-                FROM paper_embeddings
-                WHERE project_reference_id = :ref_id
+                SELECT vector_dims(pe.embedding)
+                FROM paper_embeddings pe
+                JOIN project_references pr ON pr.paper_embedding_id = pe.id
+                WHERE pr.id = :ref_id
             """),
             {"ref_id": str(project_ref.id)}
         ).fetchone()
@@ -321,9 +437,8 @@ class TestEmbeddingStorage:
         worker = EmbeddingWorker(embedding_service=mock_embedding_service)
         worker._process_job(db, job1, already_processing=False)
 
-        embedding1 = db.query(PaperEmbedding).filter(
-            PaperEmbedding.project_reference_id == project_ref.id
-        ).first()
+        embedding1 = _linked_embedding(db, project_ref)
+        original_id = embedding1.id
         original_hash = embedding1.content_hash
 
         # Update paper content
@@ -334,9 +449,11 @@ class TestEmbeddingStorage:
         job2 = queue_library_paper_embedding_sync(project_ref.id, test_project.id, db)
         worker._process_job(db, job2, already_processing=False)
 
-        db.refresh(embedding1)
+        embedding2 = _linked_embedding(db, project_ref)
         # Hash should change with new content
-        assert embedding1.content_hash != original_hash
+        assert embedding2.content_hash != original_hash
+        # The old row lost its only link and is gone
+        assert db.query(PaperEmbedding).filter(PaperEmbedding.id == original_id).first() is None
 
     def test_embedding_skipped_if_content_unchanged(
         self, db: Session, test_reference, test_project, mock_embedding_service
@@ -349,14 +466,97 @@ class TestEmbeddingStorage:
         worker = EmbeddingWorker(embedding_service=mock_embedding_service)
         worker._process_job(db, job1, already_processing=False)
 
-        call_count_before = mock_embedding_service.embed.call_count
+        call_count_before = mock_embedding_service.embed_array.call_count
+        assert call_count_before == 1
 
-        # Second job with same content
+        # Same content: nothing to queue
         job2 = queue_library_paper_embedding_sync(project_ref.id, test_project.id, db)
-        worker._process_job(db, job2, already_processing=False)
+        assert job2 is None
+
+        # Even a job for it finds the content unchanged
+        worker._embed_library_paper(db, project_ref.id)
+
+        # embed_array() should not be called again
+        assert mock_embedding_service.embed_array.call_count == call_count_before
+
+    def test_identical_content_shares_one_embedding(
+        self, db: Session, test_reference, test_project, test_user, mock_embedding_service
+    ):
+        """A second reference with the same content links the stored vector without a job."""
+        project_ref, ref = test_reference
+        job = queue_library_paper_embedding_sync(project_ref.id, test_project.id, db)
+        EmbeddingWorker(embedding_service=mock_embedding_service)._process_job(db, job)
+
+        twin = Reference(
+            id=uuid.uuid4(),
+            title=ref.title,
+            abstract=ref.abstract,
+            source="test",
+            owner_id=test_user.id,
+        )
+        db.add(twin)
+        db.flush()
+        twin_pr = ProjectReference(
+            id=uuid.uuid4(),
+            project_id=test_project.id,
+            reference_id=twin.id,
+            status="approved",
+        )
+        db.add(twin_pr)
+        db.commit()
 
-        # embed() should not be called again
-        assert mock_embedding_service.embed.call_count == call_count_before
+        try:
+            assert queue_library_paper_embedding_sync(twin_pr.id, test_project.id, db) is None
+            assert db.query(EmbeddingJob).filter(EmbeddingJob.target_id == twin_pr.id).count() == 0
+            assert _linked_embedding(db, twin_pr).id == _linked_embedding(db, project_ref).id
+        finally:
+            db.delete(twin_pr)
+            db.delete(twin)
+            db.commit()
+
+
+    def test_sweep_deletes_only_old_unlinked_library_embeddings(
+        self, db: Session, test_reference, test_project, mock_embedding_service
+    ):
+        """Unlinked library rows past the TTL are deleted; linked, recent and search-cache rows stay."""
+        project_ref, _ = test_reference
+        job = queue_library_paper_embedding_sync(project_ref.id, test_project.id, db)
+        worker = EmbeddingWorker(embedding_service=mock_embedding_service)
+        worker._process_job(db, job)
+        linked = _linked_embedding(db, project_ref)
+
+        old = datetime.now(timezone.utc) - timedelta(days=settings.EMBEDDING_UNLINKED_TTL_DAYS + 1)
+        rows = {
+            name: PaperEmbedding(
+                content_hash=uuid.uuid4().hex * 2,
+                embedded_text=name,
+                embedding=[0.0] * 384,
+                model_name="all-MiniLM-L6-v2",
+                external_paper_id=external_id,
+            )
+            for name, external_id in (("old", None), ("recent", None), ("search", f"W{uuid.uuid4().hex[:12]}"))
+        }
+        db.add_all(rows.values())
+        db.flush()
+        db.query(PaperEmbedding).filter(
+            PaperEmbedding.id.in_([rows["old"].id, rows["search"].id, linked.id])
+        ).update({"updated_at": old}, synchronize_session=False)
+        db.commit()
+        ids = {name: row.id for name, row in rows.items()}
+
+        try:
+            assert worker._sweep_unlinked_embeddings(db) >= 1
+            remaining = {
+                row_id for (row_id,) in db.query(PaperEmbedding.id).filter(
+                    PaperEmbedding.id.in_([*ids.values(), linked.id])
+                )
+            }
+            assert remaining == {ids["recent"], ids["search"], linked.id}
+        finally:
+            db.query(PaperEmbedding).filter(
+                PaperEmbedding.id.in_([ids["recent"], ids["search"]])
+            ).delete(synchronize_session=False)
+            db.commit()
 
 
 # --- Test: Semantic Search ---
@@ -388,10 +588,10 @@ class TestSemanticSearch:
         # pgvector cosine similarity search
         result = db.execute(
             text("""
-                SELECT pe.project_reference_id,
+                SELECT pr.id,
                        1 - (pe.embedding <=> cast(:query_vec as vector)) as similarity
                 FROM paper_embeddings pe
-                JOIN project_references pr ON pe.project_reference_id = pr.id
+                JOIN project_references pr ON pr.paper_embedding_id = pe.id
                 WHERE pr.project_id = :project_id
                 ORDER BY pe.embedding <=> cast(:query_vec as vector)
                 LIMIT 5
@@ -464,10 +664,10 @@ class TestSemanticSearch:
 
         result = db.execute(
             text("""
-                SELECT pe.project_reference_id,
+                SELECT pr.id,
                        1 - (pe.embedding <=> cast(:query_vec as vector)) as similarity
                 FROM paper_embeddings pe
-                JOIN project_references pr ON pe.project_reference_id = pr.id
+                JOIN project_references pr ON pr.paper_embedding_id = pe.id
                 WHERE pr.project_id = :project_id
                 ORDER BY pe.embedding <=> cast(:query_vec as vector)
                 LIMIT 5
@@ -489,9 +689,7 @@ class TestSemanticSearch:
 
         # Cleanup
         try:
-            db.query(PaperEmbedding).filter(
-                PaperEmbedding.project_reference_id.in_([pr1.id, pr2.id])
-            ).delete(synchronize_session=False)
+            embedding_ids = [pr1.paper_embedding_id, pr2.paper_embedding_id]
             db.query(EmbeddingJob).filter(
                 EmbeddingJob.target_id.in_([pr1.id, pr2.id])
             ).delete(synchronize_session=False)
@@ -499,6 +697,9 @@ class TestSemanticSearch:
             db.delete(pr2)
             db.delete(ref1)
             db.delete(ref2)
+            db.query(PaperEmbedding).filter(
+                PaperEmbedding.id.in_(embedding_ids)
+            ).delete(synchronize_session=False)
             db.commit()
         except Exception:
             db.rollback()
@@ -538,3 +739,104 @@ class TestThreadSafety:
         # Only one worker should get the job
         claimed_job_ids = [j.id for j in jobs1] + [j.id for j in jobs2]
         assert claimed_job_ids.count(job_id) == 1
+
+
+# --- Test: Standalone Worker Pool ---
+
+class FakePoolContext:
+    """Stand-in for the spawn context: processes live for scripted durations
+    on a fake clock and exit as soon as the pool's stop event is set."""
+
+    def __init__(self, clock, lifetimes):
+        self.clock = clock
+        self.lifetimes = list(lifetimes)
+        self.spawned = []
+        self.stop_event = threading.Event()
+
+    def Event(self):
+        return self.stop_event
+
+    def Queue(self):
+        return queue.Queue()
+
+    def Process(self, target, args, name):
+        return FakeProcess(self, name)
+
+
+class FakeProcess:
+    exitcode = 1
+
+    def __init__(self, ctx, name):
+        self.ctx = ctx
+        self.name = name
+
+    def start(self):
+        self.started = self.ctx.clock.now
+        # None: runs until stopped
+        self.lifetime = self.ctx.lifetimes.pop(0) if self.ctx.lifetimes else None
+        self.ctx.spawned.append(self.started)
+
+    def is_alive(self):
+        if self.ctx.stop_event.is_set():
+            return False
+        return self.lifetime is None or self.ctx.clock.now - self.started < self.lifetime
+
+    def terminate(self):
+        pass
+
+    def join(self):
+        pass
+
+
+def _run_fake_pool(monkeypatch, lifetimes, stop_at=None):
+    clock = SimpleNamespace(now=0.0)
+    ctx = FakePoolContext(clock, lifetimes)
+    handlers = {}
+
+    def sleep(seconds):
+        clock.now += seconds
+        if stop_at is not None and clock.now >= stop_at:
+            handlers[15](15, None)
+
+    monkeypatch.setattr(embedding_worker, "multiprocessing", SimpleNamespace(get_context=lambda method: ctx))
+    monkeypatch.setattr(embedding_worker, "time", SimpleNamespace(sleep=sleep, monotonic=lambda: clock.now))
+    monkeypatch.setattr(embedding_worker, "signal", SimpleNamespace(
+        SIGINT=2, SIGTERM=15, signal=lambda signum, handler: handlers.__setitem__(signum, handler),
+    ))
+    monkeypatch.setattr(settings, "EMBEDDING_WORKER_RESTART_BACKOFF_SECONDS", 1.0)
+    monkeypatch.setattr(settings, "EMBEDDING_WORKER_RESTART_BACKOFF_MAX_SECONDS", 4.0)
+    monkeypatch.setattr(settings, "EMBEDDING_WORKER_MAX_RESTARTS", 3)
+    return ctx, lambda: embedding_worker.run_worker_pool(1)
+
+
+class TestWorkerPool:
+    """Tests for run_worker_pool supervision and the CLI entry point."""
+
+    def test_crash_loop_backs_off_then_gives_up(self, monkeypatch):
+        ctx, run = _run_fake_pool(monkeypatch, lifetimes=[0.5] * 10)
+
+        with pytest.raises(RuntimeError, match="3 consecutive restarts"):
+            run()
+
+        # Restarted after 1s, 2s, then 4s of backoff
+        assert ctx.spawned == [0.0, 2.0, 5.0, 10.0]
+        assert ctx.stop_event.is_set()
+
+    def test_healthy_process_resets_backoff(self, monkeypatch):
+        ctx, run = _run_fake_pool(monkeypatch, lifetimes=[0.5, 10.0, None], stop_at=20.0)
+
+        assert run() == {}
+
+        # The second process stayed up past the max backoff, so its crash
+        # is restarted after the base delay again
+        assert ctx.spawned == [0.0, 2.0, 13.0]
+
+    def test_main_parses_arguments(self):
+        with patch.object(embedding_worker, "run_worker_pool") as run_pool, \
+             patch.object(embedding_worker.logging, "basicConfig"):
+            embedding_worker.main(["--procs", "0", "--batch-size", "20", "--concurrency", "2"])
+            run_pool.assert_called_once_with(1, batch_size=20, concurrency=2)
+
+            run_pool.reset_mock()
+            embedding_worker.main([])
+            run_pool.assert_called_once_with(settings.EMBEDDING_WORKER_PROCS, batch_size=None, concurrency=None)
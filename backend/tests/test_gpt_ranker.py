@@ -0,0 +1,120 @@
+"""
+Tests for GptRanker's sharded scoring, shard timeouts and score cache.
+
+A fake chat client stands in for OpenRouter; it scores each paper by a
+number embedded in its title and can be told to stall on some papers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from types import SimpleNamespace
+from typing import List, Set
+
+import pytest
+
+from app.core.config import settings
+from app.services.paper_discovery.config import DiscoveryConfig
+from app.services.paper_discovery.models import DiscoveredPaper
+from app.services.paper_discovery.rankers import GptRanker, SimpleRanker
+from app.services.paper_discovery.score_cache import CrossEncoderScoreCache
+
+
+class FakeChatClient:
+    def __init__(self, stall_titles: Set[str] = frozenset()):
+        self.calls: List[List[dict]] = []
+        self.stall_titles = set(stall_titles)
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, **kwargs):
+        papers = json.loads(kwargs["messages"][1]["content"])["papers"]
+        self.calls.append(papers)
+        if any(p["title"] in self.stall_titles for p in papers):
+            await asyncio.sleep(10)
+        content = json.dumps([
+            {"id": p["id"], "score": int(p["title"].split()[-1]) / 100} for p in papers
+        ])
+        return SimpleNamespace(
+            choices=[SimpleNamespace(finish_reason="stop", message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(prompt_tokens=10 * len(papers), completion_tokens=5 * len(papers)),
+        )
+
+
+def _papers(n: int) -> List[DiscoveredPaper]:
+    return [
+        DiscoveredPaper(
+            title=f"Graph paper {i}", authors=[], abstract="graph networks", year=None,
+            doi=f"10.1/{i}", url=None, source="test",
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.fixture
+def ranker_factory(monkeypatch):
+    monkeypatch.setattr(settings, "OPENROUTER_API_KEY", "test-key")
+    monkeypatch.setattr(settings, "GPT_RANKER_SHARD_SIZE", 4)
+    monkeypatch.setattr(settings, "GPT_RANKER_MAX_PARALLEL", 8)
+    monkeypatch.setattr(settings, "GPT_RANKER_SHARD_TIMEOUT_SECONDS", 0.2)
+
+    def make(client: FakeChatClient, cache=None):
+        ranker = GptRanker(DiscoveryConfig(), score_cache=cache, use_score_cache=cache is not None)
+        monkeypatch.setattr(ranker, "_create_client", lambda api_key: client)
+        return ranker
+
+    return make
+
+
+@pytest.mark.asyncio
+async def test_candidates_are_scored_in_balanced_parallel_shards(ranker_factory):
+    client = FakeChatClient()
+    ranker = ranker_factory(client)
+
+    ranked = await ranker.rank(_papers(10), "graph networks")
+
+    assert sorted(len(call) for call in client.calls) == [3, 3, 4]
+    assert [p.title for p in ranked[:2]] == ["Graph paper 9", "Graph paper 8"]
+    assert ranked[0].relevance_score == pytest.approx(0.09)
+
+
+@pytest.mark.asyncio
+async def test_timed_out_shard_keeps_lexical_scores(ranker_factory):
+    client = FakeChatClient(stall_titles={"Graph paper 0"})
+    ranker = ranker_factory(client)
+    papers = _papers(8)
+
+    lexical = {
+        p.title: p.relevance_score
+        for p in await SimpleRanker(DiscoveryConfig()).rank(_papers(8), "graph networks")
+    }
+    ranked = await ranker.rank(papers, "graph networks")
+
+    stalled_shard = next(call for call in client.calls if any(p["title"] == "Graph paper 0" for p in call))
+    stalled_titles = {p["title"] for p in stalled_shard}
+    by_title = {p.title: p.relevance_score for p in ranked}
+    assert all(by_title[t] == pytest.approx(0.5 * lexical[t]) for t in stalled_titles)
+    assert all(
+        by_title[p.title] == pytest.approx(int(p.title.split()[-1]) / 100)
+        for p in papers if p.title not in stalled_titles
+    )
+
+
+@pytest.mark.asyncio
+async def test_repeat_ranking_is_served_from_cache(ranker_factory):
+    cache = CrossEncoderScoreCache(max_entries=100, ttl_seconds=3600, use_redis=False)
+    client = FakeChatClient()
+    ranker = ranker_factory(client, cache=cache)
+
+    first = await ranker.rank(_papers(6), "graph networks")
+    calls_after_first = len(client.calls)
+    second = await ranker.rank(_papers(6), "graph networks")
+
+    assert calls_after_first == 2
+    assert len(client.calls) == calls_after_first
+    assert [p.title for p in second] == [p.title for p in first]
+    assert cache.stats.memory_hits == 6
+
+    # A different project context is a different cache entry
+    await ranker.rank(_papers(6), "protein folding")
+    assert len(client.calls) == calls_after_first + 2
@@ -0,0 +1,105 @@
+"""
+Tests for the process-wide pooled HTTP session registry.
+
+Uses a local aiohttp test server; no external network required.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from app.services import http_client
+from app.services.http_client import HttpClientRegistry, borrow_session
+from app.services.paper_discovery_service import PaperDiscoveryService
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    fresh = HttpClientRegistry()
+    monkeypatch.setattr(http_client, "_registry", fresh)
+    yield fresh
+
+
+async def _serve():
+    async def ok(request):
+        return web.json_response({"ok": True})
+
+    app = web.Application()
+    app.router.add_get("/", ok)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/"
+
+
+@pytest.mark.asyncio
+async def test_connections_are_reused_across_discovery_services(registry):
+    runner, url = await _serve()
+    registry.start()
+    try:
+        for _ in range(3):
+            service = PaperDiscoveryService()
+            assert not service._owns_session
+            async with service.session.get(url) as resp:
+                assert resp.status == 200
+                await resp.read()
+            await service.close()
+            assert not service.session.closed
+
+        stats = registry.snapshot()["pools"]["default"]
+        assert stats["requests"] == 3
+        assert stats["connections_created"] == 1
+        assert stats["connections_reused"] == 2
+    finally:
+        await registry.close()
+        await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_searchers_get_per_provider_pools(registry):
+    registry.start()
+    try:
+        service = PaperDiscoveryService()
+        by_source = {s.get_source_name(): s.session for s in service.orchestrator.searchers}
+
+        assert by_source["arxiv"] is registry.session("arxiv")
+        assert by_source["openalex"] is registry.session("openalex")
+        assert by_source["arxiv"] is not by_source["openalex"]
+        assert by_source["arxiv"].connector.limit_per_host == 2
+        assert service.session is registry.session("default")
+    finally:
+        await registry.close()
+
+
+def test_other_event_loops_fall_back_to_private_sessions(registry):
+    started = asyncio.new_event_loop()
+    try:
+        started.run_until_complete(_start(registry))
+
+        async def _elsewhere():
+            assert borrow_session() is None
+            service = PaperDiscoveryService()
+            owned = service._owns_session
+            await service.close()
+            return owned, service.session.closed
+
+        assert asyncio.run(_elsewhere()) == (True, True)
+    finally:
+        started.run_until_complete(registry.close())
+        started.close()
+
+
+async def _start(registry):
+    registry.start()
+
+
+def test_borrow_returns_none_when_not_started(registry):
+    async def _check():
+        return borrow_session("crossref")
+
+    assert asyncio.run(_check()) is None
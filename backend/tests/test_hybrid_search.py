@@ -0,0 +1,96 @@
+"""
+Tests for hybrid (full-text + vector) chunk retrieval.
+
+A fake session records statements and parameters; it can be told to fail
+any statement that uses the vector operator, as a database without
+pgvector would.
+"""
+
+from __future__ import annotations
+
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from app.services import vector_search
+from app.services.hybrid_search import RRF_K, ChunkScope, hybrid_chunk_search
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def fetchall(self):
+        return self.rows
+
+    def scalar(self):
+        return None
+
+
+class FakeSession:
+    def __init__(self, rows=(), fail_vector: bool = False):
+        self.rows = list(rows)
+        self.fail_vector = fail_vector
+        self.queries: List[Tuple[str, Dict[str, Any]]] = []
+        self.savepoints = 0
+
+    @contextmanager
+    def begin_nested(self):
+        self.savepoints += 1
+        yield
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        if "<=>" in sql and self.fail_vector:
+            raise RuntimeError('operator does not exist: text <=> unknown')
+        self.queries.append((sql, params or {}))
+        return FakeResult(self.rows if "WITH q AS" in sql else [])
+
+
+@pytest.fixture(autouse=True)
+def _no_pgvector_version(monkeypatch):
+    monkeypatch.setattr(vector_search, "_pgvector_version", (0,))
+
+
+def test_text_only_search_skips_vector_list():
+    chunk_id = uuid.uuid4()
+    db = FakeSession(rows=[(str(chunk_id), 1.0 / (RRF_K + 1), None, 0.3)])
+
+    hits = hybrid_chunk_search(db, ChunkScope.for_documents(owner_id="u1"), "graph networks", None, limit=3)
+
+    assert [h.chunk_id for h in hits] == [chunk_id]
+    assert hits[0].similarity is None and hits[0].text_rank == pytest.approx(0.3)
+    sql, params = db.queries[-1]
+    assert "<=>" not in sql
+    assert params["candidates"] == 12 and params["limit"] == 3
+    assert params["scope_id"] == "u1"
+
+
+def test_vector_query_casts_embedding_bind():
+    db = FakeSession(rows=[])
+
+    hybrid_chunk_search(db, ChunkScope.for_documents(owner_id="u1"), "graph", [0.1, 0.2], limit=2)
+
+    sql, params = db.queries[-1]
+    assert sql.count("<=> CAST(:query_embedding AS vector)") == 2
+    assert params["query_embedding"] == "[0.1,0.2]"
+
+
+def test_vector_failure_falls_back_to_full_text():
+    db = FakeSession(fail_vector=True)
+
+    hits = hybrid_chunk_search(db, ChunkScope.for_references(owner_id="u1"), "graph", [0.1, 0.2], limit=2)
+
+    assert hits == []
+    assert db.savepoints == 2
+    assert all("<=>" not in sql for sql, _ in db.queries)
+
+
+def test_reference_scope_prefers_paper_over_owner():
+    by_paper = ChunkScope.for_references(paper_id="p1", owner_id="u1")
+    by_owner = ChunkScope.for_references(owner_id="u1")
+
+    assert "paper_references" in by_paper.joins and by_paper.params == {"scope_id": "p1"}
+    assert "paper_references" not in by_owner.joins and "r.owner_id" in by_owner.where
@@ -0,0 +1,208 @@
+"""
+Parity of the vectorized lexical scoring with the per-paper ranker loops.
+
+`_reference_lexical` / `_reference_simple` are the previous LexicalRanker /
+SimpleRanker implementations, kept as the ground truth.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import random
+from typing import List, Optional, Set
+
+import pytest
+
+from app.services.paper_discovery.config import DiscoveryConfig
+from app.services.paper_discovery.lexical import TermMatrix, lexical_scores
+from app.services.paper_discovery.models import DiscoveredPaper, tokenize_text
+from app.services.paper_discovery.rankers import LexicalRanker, SimpleRanker
+
+CURRENT_YEAR = 2026
+VOCAB = [
+    "transformer", "attention", "graph", "neural", "network", "protein", "folding",
+    "language", "model", "retrieval", "sparse", "dense", "vision", "robot", "policy",
+    "reinforcement", "learning", "molecule", "diffusion", "cheque", "arabic", "ocr",
+]
+
+
+def _random_papers(n: int, seed: int = 7) -> List[DiscoveredPaper]:
+    rng = random.Random(seed)
+    papers = []
+    for i in range(n):
+        title = " ".join(rng.choices(VOCAB, k=rng.randint(0, 8)))
+        abstract = " ".join(rng.choices(VOCAB + ["of", "the", "a"], k=rng.randint(0, 40)))
+        papers.append(
+            DiscoveredPaper(
+                title=title.title() + ("!" if i % 5 == 0 else ""),
+                authors=[],
+                abstract=abstract,
+                year=rng.choice([None, 0, 1999, 2012, 2020, 2024, 2026, 2027]),
+                doi=f"10.1/{i}",
+                url=None,
+                source="test",
+                citations_count=rng.choice([None, 0, 1, 15, 400, 25000]),
+                pdf_url=rng.choice([None, "https://x/pdf"]),
+                is_open_access=rng.random() < 0.4,
+            )
+        )
+    return papers
+
+
+def _reference_lexical(papers, query_tokens: Set[str], keyword_set: Set[str], weights) -> List[float]:
+    raw_scores: List[float] = []
+    for paper in papers:
+        title_tokens = tokenize_text(paper.title)
+        abstract_tokens = tokenize_text(paper.abstract)
+        title_overlap = len(title_tokens & query_tokens) / max(1, len(title_tokens))
+        abstract_overlap = len(abstract_tokens & query_tokens) / max(1, len(abstract_tokens))
+        kw_title_overlap = len(title_tokens & keyword_set) / max(1, len(keyword_set)) if keyword_set else 0
+        kw_abstract_overlap = len(abstract_tokens & keyword_set) / max(1, len(keyword_set)) if keyword_set else 0
+        score = (
+            weights['title_overlap'] * title_overlap
+            + weights['abstract_overlap'] * abstract_overlap
+            + weights['keyword_title'] * kw_title_overlap
+            + weights['keyword_body'] * kw_abstract_overlap
+        )
+        if paper.year:
+            score += weights['recency_max'] * max(0, 1 - (CURRENT_YEAR - paper.year) / 10)
+        if paper.citations_count and paper.citations_count > 0:
+            score += weights['citations_max'] * min(1, math.log(1 + paper.citations_count) / 10)
+        if paper.pdf_url:
+            score += weights['pdf_bonus']
+        elif paper.is_open_access:
+            score += weights['oa_bonus']
+        raw_scores.append(max(0.0, score))
+
+    max_score, min_score = max(raw_scores, default=0.0), min(raw_scores, default=0.0)
+    span = max_score - min_score
+    if max_score <= 0:
+        return [0.0] * len(raw_scores)
+    return [min(1.0, max(0.0, (r - min_score) / span)) if span > 0 else 1.0 for r in raw_scores]
+
+
+def _reference_simple(papers, query_tokens: Set[str], core_terms: Set[str], weights) -> List[float]:
+    relevance_scores, citation_scores, recency_scores = [], [], []
+    for paper in papers:
+        title_tokens = tokenize_text(paper.title)
+        if not title_tokens:
+            relevance_scores.append(0.0)
+            citation_scores.append(0.0)
+            recency_scores.append(0.0)
+            continue
+        hits = len(title_tokens & query_tokens)
+        title_ratio = hits / max(1, len(title_tokens))
+        query_ratio = hits / max(1, len(query_tokens)) if query_tokens else 0.0
+        relevance = 0.6 * title_ratio + 0.4 * query_ratio if query_tokens else title_ratio
+        core_boost = 0.0
+        if core_terms:
+            title_text = (paper.title or '').lower()
+            abstract_text = (paper.abstract or '').lower()
+            n_terms = len(core_terms)
+            title_hits = sum(1 for t in core_terms if t in title_text)
+            abstract_hits = sum(1 for t in core_terms if t in abstract_text)
+            if title_hits > 0:
+                core_boost += weights.get('core_term_title_boost', 0.20) * (title_hits / n_terms)
+            if abstract_hits > 0:
+                core_boost += weights.get('core_term_abstract_boost', 0.10) * (abstract_hits / n_terms)
+        relevance_scores.append(max(0.0, relevance + core_boost))
+
+        citations = paper.citations_count or 0
+        if citations > 0 and paper.year:
+            years_since = max(1, CURRENT_YEAR - paper.year + 1)
+            citation_score = math.log10(1 + citations / math.log(years_since + 1)) / 4
+        elif citations > 0:
+            citation_score = math.log10(1 + citations) / 4
+        else:
+            citation_score = 0.0
+        citation_scores.append(min(1.0, citation_score))
+
+        if paper.year:
+            years_old = CURRENT_YEAR - paper.year
+            if years_old <= 0:
+                recency = 1.0
+            elif years_old <= 5:
+                recency = 1.0 - (years_old / 5) * 0.5
+            else:
+                recency = 0.5 - min(0.5, (years_old - 5) / 20)
+        else:
+            recency = 0.3
+        recency_scores.append(max(0.0, recency))
+
+    def normalize(scores: List[float]) -> List[float]:
+        max_s, min_s = max(scores, default=0.0), min(scores, default=0.0)
+        span = max_s - min_s
+        if span <= 0:
+            return [1.0 if max_s > 0 else 0.0] * len(scores)
+        return [(s - min_s) / span for s in scores]
+
+    rel, cit, rec = normalize(relevance_scores), normalize(citation_scores), normalize(recency_scores)
+    return [min(1.0, max(0.0, 0.55 * a + 0.15 * b + 0.30 * c)) for a, b, c in zip(rel, cit, rec)]
+
+
+@pytest.fixture(autouse=True)
+def _freeze_year(monkeypatch):
+    import app.services.paper_discovery.lexical as lexical
+
+    class _Now:
+        year = CURRENT_YEAR
+
+    class _FrozenDatetime:
+        @staticmethod
+        def now():
+            return _Now()
+
+    monkeypatch.setattr(lexical, "datetime", _FrozenDatetime)
+
+
+@pytest.mark.parametrize("keywords", [None, ["Graph", "protein", "unused"]])
+def test_lexical_ranker_matches_reference(keywords: Optional[List[str]]):
+    config = DiscoveryConfig()
+    papers = _random_papers(300)
+    query = "Graph neural networks for protein folding"
+    expected = _reference_lexical(
+        papers, tokenize_text(query), {(k or '').lower() for k in keywords or []}, config.ranking_weights,
+    )
+
+    asyncio.run(LexicalRanker(config).rank(papers, query, target_keywords=keywords))
+
+    assert [p.relevance_score for p in papers] == pytest.approx(expected, abs=1e-9)
+
+
+@pytest.mark.parametrize("core_terms", [set(), {"arabic cheque", "ocr", "folding"}])
+def test_simple_ranker_matches_reference(core_terms: Set[str]):
+    config = DiscoveryConfig()
+    papers = _random_papers(300, seed=11)
+    query = "Arabic cheque OCR with transformer attention"
+    expected = _reference_simple(papers, tokenize_text(query), core_terms, config.ranking_weights)
+
+    asyncio.run(SimpleRanker(config).rank(papers, query, core_terms=core_terms))
+
+    assert [p.relevance_score for p in papers] == pytest.approx(expected, abs=1e-9)
+
+
+def test_rankers_handle_empty_and_tokenless_batches():
+    config = DiscoveryConfig()
+    assert asyncio.run(LexicalRanker(config).rank([], "query")) == []
+    blank = [DiscoveredPaper(title="", authors=[], abstract="", year=None, doi=None, url=None, source="x")]
+    assert asyncio.run(SimpleRanker(config).rank(blank, "query"))[0].relevance_score == 0.0
+
+
+def test_bm25_prefers_rare_terms_and_is_opt_in():
+    papers = [
+        DiscoveredPaper(title=t, authors=[], abstract="", year=None, doi=None, url=None, source="x")
+        for t in ("graph networks", "graph folding", "graph methods", "protein methods")
+    ]
+    matrix = TermMatrix(papers)
+    query = tokenize_text("graph folding")
+    bm25 = matrix.bm25(query)
+    assert bm25[1] > bm25[0] == bm25[2] > bm25[3] == 0
+
+    weights = dict(DiscoveryConfig().ranking_weights)
+    base = lexical_scores(matrix, query, frozenset(), weights)
+    weights["bm25"] = 0.5
+    with_bm25 = lexical_scores(matrix, query, frozenset(), weights)
+    assert base.tolist() == pytest.approx([0.5, 1.0, 0.5, 0.0])
+    # The common term alone is worth less once rarity is weighed in
+    assert with_bm25[1] == 1.0 and with_bm25[0] < base[0]
@@ -0,0 +1,191 @@
+"""
+Tests for the ONNX Runtime inference wrappers and backend selection.
+
+Fake tokenizer/session objects stand in for transformers and onnxruntime, so
+no model export is needed. Accuracy against the real PyTorch models is
+checked by tests/bench_inference_backends.py.
+"""
+
+from __future__ import annotations
+
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.services import onnx_inference
+from app.services.embedding_service import SentenceTransformerProvider
+from app.services.onnx_inference import OnnxCrossEncoder, OnnxSentenceEmbedder, model_variant
+from app.services.paper_discovery import reranker as reranker_module
+
+
+@pytest.fixture(autouse=True)
+def _no_latched_failures(monkeypatch):
+    monkeypatch.setattr(onnx_inference, "_onnx_load_failures", set())
+
+
+class FakeTokenizer:
+    """Whitespace tokenizer: token id = word length; pairs are concatenated."""
+
+    def __call__(self, first, second=None, *, padding, truncation, max_length, return_tensors):
+        rows = []
+        for i, text in enumerate(first):
+            words = text.split() + (second[i].split() if second is not None else [])
+            rows.append([len(w) for w in words][:max_length] or [0])
+        width = max(len(r) for r in rows)
+        ids = np.zeros((len(rows), width), dtype=np.int64)
+        mask = np.zeros((len(rows), width), dtype=np.int64)
+        for i, row in enumerate(rows):
+            ids[i, : len(row)] = row
+            mask[i, : len(row)] = 1
+        return {"input_ids": ids, "attention_mask": mask, "token_type_ids": np.zeros_like(ids)}
+
+
+class FakeSession:
+    """Hidden state per token = [id, 1]; logits = [sum of ids, -1]."""
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.feeds = []
+
+    def get_inputs(self):
+        return [SimpleNamespace(name="input_ids"), SimpleNamespace(name="attention_mask")]
+
+    def run(self, output_names, feeds):
+        self.feeds.append(feeds)
+        ids = feeds["input_ids"].astype(np.float32)
+        if self.kind == "embedder":
+            return [np.stack([ids, np.ones_like(ids)], axis=-1)]
+        return [np.stack([ids.sum(axis=1), -np.ones(len(ids), dtype=np.float32)], axis=1)]
+
+
+def test_embedder_mean_pools_over_unpadded_tokens_only():
+    session = FakeSession("embedder")
+    embedder = OnnxSentenceEmbedder(session, FakeTokenizer())
+
+    raw = embedder.encode(["aa bbbb", "cccccc"], normalize_embeddings=False)
+
+    # "cccccc" is padded to two tokens; the pad must not drag its mean down
+    np.testing.assert_allclose(raw, [[3.0, 1.0], [6.0, 1.0]])
+    assert set(session.feeds[0]) == {"input_ids", "attention_mask"}
+
+
+def test_embedder_normalizes_and_handles_single_string_and_batches():
+    embedder = OnnxSentenceEmbedder(FakeSession("embedder"), FakeTokenizer())
+
+    single = embedder.encode("aaa bbbb", normalize_embeddings=True)
+    batched = embedder.encode(["aaa bbbb", "c", "dd ee"], normalize_embeddings=True, batch_size=2)
+
+    assert single.shape == (2,)
+    assert batched.shape == (3, 2)
+    np.testing.assert_allclose(np.linalg.norm(batched, axis=1), 1.0, rtol=1e-6)
+    np.testing.assert_allclose(batched[0], single, rtol=1e-6)
+
+
+def test_cross_encoder_returns_first_logit_per_pair_across_batches():
+    cross = OnnxCrossEncoder(FakeSession("cross_encoder"), FakeTokenizer())
+
+    scores = cross.predict([("q", "aa b"), ("qq", "ccc"), ("q", "")], batch_size=2)
+
+    np.testing.assert_allclose(scores, [4.0, 5.0, 1.0])
+    assert scores.dtype == np.float32
+
+
+def test_onnx_backend_selected_by_setting(monkeypatch):
+    fake = OnnxCrossEncoder(FakeSession("cross_encoder"), FakeTokenizer())
+    monkeypatch.setattr(settings, "INFERENCE_BACKEND", "onnx")
+    monkeypatch.setattr(reranker_module, "load_onnx_cross_encoder", lambda name: fake)
+    monkeypatch.setattr(reranker_module, "_CROSS_ENCODER_CACHE", {})
+
+    model = reranker_module._load_cross_encoder_model("some/cross-encoder")
+
+    assert model is fake
+    assert set(reranker_module._CROSS_ENCODER_CACHE) == {"some/cross-encoder@onnx-int8"}
+
+
+def test_model_variant_separates_backends(monkeypatch):
+    monkeypatch.setattr(settings, "INFERENCE_BACKEND", "torch")
+    assert model_variant("m") == "m"
+    monkeypatch.setattr(settings, "INFERENCE_BACKEND", "ONNX")
+    assert onnx_inference.inference_backend() == "onnx"
+    assert model_variant("m") == "m@onnx-int8"
+    monkeypatch.setattr(settings, "INFERENCE_ONNX_QUANTIZE", False)
+    assert model_variant("m") == "m@onnx"
+
+
+def test_failed_onnx_load_is_latched_and_cached_as_pytorch(monkeypatch):
+    calls = []
+
+    def broken_loader(name):
+        calls.append(name)
+        raise RuntimeError("onnx missing")
+
+    class FakeCrossEncoder:
+        def __init__(self, name):
+            self.name = name
+
+    monkeypatch.setattr(settings, "INFERENCE_BACKEND", "onnx")
+    monkeypatch.setattr(reranker_module, "load_onnx_cross_encoder", broken_loader)
+    monkeypatch.setattr(reranker_module, "_CROSS_ENCODER_CACHE", {})
+    monkeypatch.setitem(sys.modules, "sentence_transformers", SimpleNamespace(CrossEncoder=FakeCrossEncoder))
+
+    first = reranker_module._load_cross_encoder_model("some/cross-encoder")
+    second = reranker_module._load_cross_encoder_model("some/cross-encoder")
+
+    assert first is second and calls == ["some/cross-encoder"]
+    assert set(reranker_module._CROSS_ENCODER_CACHE) == {"some/cross-encoder"}
+    # Scores are keyed as the backend that actually produced them
+    assert model_variant("some/cross-encoder") == "some/cross-encoder"
+
+
+def test_embedding_model_name_carries_backend_variant(monkeypatch):
+    provider = SentenceTransformerProvider()
+    monkeypatch.setattr(settings, "INFERENCE_BACKEND", "torch")
+    assert provider.model_name == "all-MiniLM-L6-v2"
+    monkeypatch.setattr(settings, "INFERENCE_BACKEND", "onnx")
+    assert provider.model_name == "all-MiniLM-L6-v2@onnx-int8"
+
+    onnx_inference.mark_onnx_load_failed("all-MiniLM-L6-v2")
+    assert provider.model_name == "all-MiniLM-L6-v2"
+
+
+def test_export_stages_files_and_moves_model_in_last(monkeypatch, tmp_path):
+    class FakeHfTokenizer:
+        def save_pretrained(self, path):
+            (tmp_path / "saved_to").write_text(path)
+            with open(f"{path}/tokenizer.json", "w") as f:
+                f.write("{}")
+
+        def __call__(self, *texts, return_tensors):
+            return {"input_ids": "ids", "attention_mask": "mask"}
+
+    class FakeHfModel:
+        def eval(self):
+            pass
+
+    def fake_export(model, args, path, **kwargs):
+        with open(path, "w") as f:
+            f.write("graph")
+
+    loader = SimpleNamespace(from_pretrained=lambda hub_id: FakeHfModel())
+    monkeypatch.setitem(sys.modules, "transformers", SimpleNamespace(
+        AutoTokenizer=SimpleNamespace(from_pretrained=lambda hub_id: FakeHfTokenizer()),
+        AutoModel=loader,
+        AutoModelForSequenceClassification=loader,
+    ))
+    monkeypatch.setitem(sys.modules, "torch", SimpleNamespace(
+        no_grad=lambda: __import__("contextlib").nullcontext(),
+        onnx=SimpleNamespace(export=fake_export),
+    ))
+    monkeypatch.setattr(settings, "INFERENCE_ONNX_CACHE_DIR", str(tmp_path / "cache"))
+
+    path = onnx_inference.export_model("org/model", "cross_encoder", quantize=False)
+
+    model_dir = tmp_path / "cache" / "org__model"
+    assert path == str(model_dir / "model.onnx")
+    assert sorted(p.name for p in model_dir.iterdir()) == ["model.onnx", "tokenizer.json"]
+    # Written in a staging directory, never directly into the shared one
+    assert (tmp_path / "saved_to").read_text() != str(model_dir)
+    assert onnx_inference.export_model("org/model", "cross_encoder", quantize=False) == path
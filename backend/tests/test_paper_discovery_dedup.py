@@ -0,0 +1,136 @@
+"""
+Dedup guards for paper discovery.
+
+The fuzzy title pass uses an inverted token index instead of an all-pairs
+scan; these tests pin it to the exact pairwise Jaccard + year ±1 result.
+"""
+
+from __future__ import annotations
+
+import random
+
+from app.services.paper_discovery.dedup import (
+    _FUZZY_THRESHOLD,
+    _fuzzy_title_pairs,
+    _fuzzy_title_similarity,
+    dedupe_papers,
+)
+from app.services.paper_discovery.models import DiscoveredPaper, _normalize_title
+
+
+def _paper(
+    *,
+    title: str,
+    year: int | None,
+    source: str = "arxiv",
+    doi: str | None = None,
+) -> DiscoveredPaper:
+    return DiscoveredPaper(
+        title=title,
+        authors=["A. Author"],
+        abstract="Test abstract",
+        year=year,
+        doi=doi,
+        url=None,
+        source=source,
+    )
+
+
+def _pairwise_reference(titles: list[str], years: list[int | None]) -> set[tuple[int, int]]:
+    """The original O(n^2) scan, kept as the ground truth."""
+    pairs = set()
+    for i in range(len(titles)):
+        if not titles[i] or len(titles[i]) < 15:
+            continue
+        for j in range(i + 1, len(titles)):
+            if not titles[j] or len(titles[j]) < 15:
+                continue
+            yi, yj = years[i], years[j]
+            if yi and yj and abs(yi - yj) > 1:
+                continue
+            if _fuzzy_title_similarity(titles[i], titles[j]) >= _FUZZY_THRESHOLD:
+                pairs.add((i, j))
+    return pairs
+
+
+def test_fuzzy_pairs_match_pairwise_scan():
+    rng = random.Random(11)
+    vocab = [f"w{i}" for i in range(40)]
+    titles, years = [], []
+    for _ in range(400):
+        if titles and rng.random() < 0.4:
+            # Near-duplicate of an earlier title: drop or add a word
+            words = rng.choice(titles).split()
+            if len(words) > 4 and rng.random() < 0.5:
+                words.pop(rng.randrange(len(words)))
+            else:
+                words.append(rng.choice(vocab))
+        else:
+            words = rng.sample(vocab, rng.randint(2, 12))
+        titles.append(" ".join(words))
+        years.append(rng.choice([None, 2019, 2020, 2021, 2023]))
+
+    found = set(_fuzzy_title_pairs(titles, years))
+
+    assert found == _pairwise_reference(titles, years)
+    assert len(found) > 50
+
+
+def test_dedupe_merges_rephrased_title_within_one_year():
+    papers = [
+        _paper(title="Scaling laws for neural language models revisited", year=2020),
+        _paper(title="Graph attention networks for molecules", year=2021),
+        _paper(title="Scaling Laws for Neural Language Models, Revisited", year=2021, source="crossref",
+               doi="10.1000/scaling"),
+        _paper(title="Scaling laws for neural language models revisited again", year=2024),
+    ]
+
+    deduped, collapsed = dedupe_papers(papers)
+
+    assert collapsed == 1
+    assert [p.title for p in deduped] == [
+        "Scaling Laws for Neural Language Models, Revisited",
+        "Graph attention networks for molecules",
+        "Scaling laws for neural language models revisited again",
+    ]
+    assert deduped[0].merged_sources == ["crossref", "arxiv"]
+
+
+def test_short_titles_never_fuzzy_match():
+    titles = [_normalize_title(t) for t in ("Deep learning", "Deep learning!")]
+    assert list(_fuzzy_title_pairs(titles, [2020, 2020])) == []
+
+
+def test_derived_fields_are_memoized_and_reset_on_mutation(monkeypatch):
+    import app.services.paper_discovery.models as models
+
+    calls = []
+    real = models._normalize_title
+    monkeypatch.setattr(models, "_normalize_title", lambda t: calls.append(t) or real(t))
+    paper = _paper(title="Attention Is All You Need", year=2017)
+
+    assert paper.match_keys() == paper.match_keys()
+    assert paper.get_unique_key().startswith("title:")
+    assert paper.normalized_title == "attention is all you need"
+    assert len(calls) == 1
+
+    paper.doi = "https://doi.org/10.5555/ATTN"
+    assert paper.get_unique_key() == "doi:10.5555/attn"
+    assert "doi:10.5555/attn" in paper.match_keys()
+
+    paper.abstract = "Transformers replace recurrence entirely"
+    assert "transformers" in paper.abstract_tokens
+    assert "recurrence" in paper.search_text
+
+    # Non-identity fields leave the memo alone; slots reject stray attributes
+    assert paper.normalized_title == "attention is all you need"
+    before = len(calls)
+    paper.relevance_score = 0.9
+    assert paper.normalized_title == "attention is all you need"
+    assert len(calls) == before
+    try:
+        paper.not_a_field = 1
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError("DiscoveredPaper should be slotted")
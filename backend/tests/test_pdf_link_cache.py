@@ -0,0 +1,230 @@
+"""
+Tests for the PDF link cache, per-host probe budgets and background PDF
+resolution in PaperDiscoveryService.
+
+A fake store stands in for the `pdf_link_cache` table and a fake session
+records probes instead of touching the network.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+import aiohttp
+import pytest
+
+from app.core.config import settings
+from app.services.paper_discovery.config import DiscoveryConfig
+from app.services.paper_discovery.models import DiscoveredPaper
+from app.services.paper_discovery.pdf_links import (
+    KIND_CHECK,
+    STATUS_DEAD,
+    STATUS_OK,
+    HostBudget,
+    LinkKey,
+    PdfLinkEntry,
+    dead_backoff,
+)
+from app.services.paper_discovery_service import (
+    DiscoveryBatch,
+    DiscoveryResult,
+    PaperDiscoveryService,
+    _stream_batches,
+)
+
+
+class FakeStore:
+    def __init__(self, entries: Optional[Dict[LinkKey, PdfLinkEntry]] = None):
+        self.entries = entries or {}
+        self.stored: List[Dict[LinkKey, Optional[str]]] = []
+
+    async def lookup(self, keys):
+        return {k: self.entries[k] for k in keys if k in self.entries}
+
+    async def store(self, outcomes):
+        self.stored.append(dict(outcomes))
+
+
+class DeadSession:
+    """Every probe fails, as for an unreachable host."""
+
+    def __init__(self):
+        self.probed: List[str] = []
+        self.closed = False
+
+    def head(self, url, **kwargs):
+        self.probed.append(url)
+        raise aiohttp.ClientError("unreachable")
+
+    get = head
+
+
+class StatusResponse:
+    def __init__(self, url: str, status: int):
+        self.url = url
+        self.status = status
+        self.headers = {"content-type": "text/html"}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class StatusSession:
+    """Every probe answers with the status mapped to its URL."""
+
+    def __init__(self, statuses: Dict[str, int]):
+        self.statuses = statuses
+        self.closed = False
+
+    def head(self, url, **kwargs):
+        return StatusResponse(url, self.statuses[url])
+
+    get = head
+
+
+def _paper(title: str, pdf_url: Optional[str]) -> DiscoveredPaper:
+    return DiscoveredPaper(
+        title=title, authors=[], abstract="", year=2024, doi=None,
+        url=None, source="test", pdf_url=pdf_url,
+    )
+
+
+def _service(store: FakeStore) -> PaperDiscoveryService:
+    service = PaperDiscoveryService(orchestrator=object(), session=DeadSession(), config=DiscoveryConfig())
+    service._pdf_link_store = store
+    return service
+
+
+def test_dead_backoff_doubles_and_caps(monkeypatch):
+    monkeypatch.setattr(settings, "PDF_LINK_CACHE_DEAD_BACKOFF_HOURS", 6.0)
+    monkeypatch.setattr(settings, "PDF_LINK_CACHE_DEAD_MAX_DAYS", 2)
+
+    assert [dead_backoff(n) for n in (1, 2, 3)] == [timedelta(hours=6), timedelta(hours=12), timedelta(hours=24)]
+    assert dead_backoff(10) == timedelta(days=2)
+
+    now = datetime.now(timezone.utc)
+    dead = PdfLinkEntry(url="u", kind=KIND_CHECK, status=STATUS_DEAD, failures=2, checked_at=now - timedelta(hours=11))
+    assert dead.is_fresh(now)
+    dead.checked_at = now - timedelta(hours=13)
+    assert not dead.is_fresh(now)
+
+
+@pytest.mark.asyncio
+async def test_cached_outcomes_skip_probes_and_new_ones_are_stored():
+    now = datetime.now(timezone.utc)
+    store = FakeStore({
+        (KIND_CHECK, "https://a.org/live.pdf"): PdfLinkEntry(
+            url="https://a.org/live.pdf", kind=KIND_CHECK, status=STATUS_OK,
+            resolved_url="https://a.org/live.pdf", checked_at=now,
+        ),
+        (KIND_CHECK, "https://b.org/dead.pdf"): PdfLinkEntry(
+            url="https://b.org/dead.pdf", kind=KIND_CHECK, status=STATUS_DEAD,
+            failures=1, checked_at=now,
+        ),
+    })
+    service = _service(store)
+    live = _paper("Live", "https://a.org/live.pdf")
+    dead = _paper("Dead", "https://b.org/dead.pdf")
+    unknown = _paper("Unknown", "https://c.org/new.pdf")
+
+    await service._augment_pdf_links([live, dead, unknown])
+
+    assert live.pdf_url == "https://a.org/live.pdf"
+    assert dead.pdf_url is None
+    assert unknown.pdf_url is None
+    # Only the uncached link hit the network (HEAD, then ranged GET)
+    assert set(service.session.probed) == {"https://c.org/new.pdf"}
+    # An unreachable host is no verdict on the link: nothing is cached
+    assert store.stored == []
+
+
+@pytest.mark.asyncio
+async def test_only_definitive_misses_are_cached_as_dead():
+    store = FakeStore()
+    service = _service(store)
+    service.session = StatusSession({
+        "https://a.org/gone.pdf": 404,
+        "https://b.org/removed.pdf": 410,
+        "https://c.org/busy.pdf": 429,
+        "https://d.org/down.pdf": 503,
+    })
+    papers = [_paper(url, url) for url in service.session.statuses]
+
+    await service._augment_pdf_links(papers)
+
+    assert all(p.pdf_url is None for p in papers)
+    assert store.stored == [{
+        (KIND_CHECK, "https://a.org/gone.pdf"): None,
+        (KIND_CHECK, "https://b.org/removed.pdf"): None,
+    }]
+
+
+@pytest.mark.asyncio
+async def test_background_pass_leaves_unreached_papers_alone(monkeypatch):
+    monkeypatch.setattr(settings, "PDF_LINK_BACKGROUND_DEADLINE_SECONDS", 0.05)
+    service = _service(FakeStore())
+    never = asyncio.Event()
+
+    async def verify(paper, run):
+        if paper.title == "Slow":
+            await never.wait()
+        paper.pdf_url = "https://a.org/resolved.pdf"
+
+    service._verify_existing_pdf_link = verify
+    fast = _paper("Fast", "https://a.org/p.pdf")
+    slow = _paper("Slow", "https://b.org/p.pdf")
+    slow.is_open_access = True
+
+    batch = await service._augment_pdf_links_background([fast, slow], [])
+
+    assert batch.papers == [fast, slow]
+    assert fast.pdf_url == "https://a.org/resolved.pdf" and fast.is_open_access
+    # Cut off by the deadline: not probed, so not flipped to closed access
+    assert slow.pdf_url == "https://b.org/p.pdf" and slow.is_open_access
+
+
+@pytest.mark.asyncio
+async def test_host_budget_caps_concurrency_per_host():
+    budget = HostBudget(total=8, per_host=1)
+    active: Dict[str, int] = {"a": 0, "b": 0}
+    peak: Dict[str, int] = {"a": 0, "b": 0}
+
+    async def probe(host: str):
+        async with budget.slot(f"https://{host}.org/x"):
+            active[host] += 1
+            peak[host] = max(peak[host], active[host])
+            await asyncio.sleep(0.01)
+            active[host] -= 1
+
+    await asyncio.gather(*(probe(h) for h in ("a", "a", "a", "b", "b")))
+    assert peak == {"a": 1, "b": 1}
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_pdf_links_after_final():
+    resolved = asyncio.Event()
+
+    async def resolve_later(papers):
+        await resolved.wait()
+        papers[0].pdf_url = "https://a.org/p.pdf"
+        return DiscoveryBatch(stage="pdf_links", papers=papers)
+
+    async def run(callback):
+        papers = [_paper("P", None)]
+        return DiscoveryResult(papers=papers, pdf_task=asyncio.create_task(resolve_later(papers)))
+
+    stream = _stream_batches(run)
+    final = await stream.__anext__()
+    assert final.is_final and final.papers[0].pdf_url is None
+
+    resolved.set()
+    follow_up = await stream.__anext__()
+    assert follow_up.stage == "pdf_links"
+    assert follow_up.papers[0].pdf_url == "https://a.org/p.pdf"
+    with pytest.raises(StopAsyncIteration):
+        await stream.__anext__()
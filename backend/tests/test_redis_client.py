@@ -0,0 +1,44 @@
+"""
+Tests for the shared Redis client used by the cache tiers.
+
+The redis package is replaced by a stand-in whose ping fails until it is
+marked up, and the module clock is faked.
+"""
+
+import sys
+from types import SimpleNamespace
+
+from app.services import redis_client as redis_client_module
+
+
+def test_unreachable_redis_is_retried_after_cooldown(monkeypatch):
+    class FlakyRedis:
+        up = False
+        connects = 0
+
+        @classmethod
+        def from_url(cls, url, **kwargs):
+            cls.connects += 1
+            return cls()
+
+        def ping(self):
+            if not FlakyRedis.up:
+                raise ConnectionError("refused")
+
+    now = [1000.0]
+    monkeypatch.setitem(sys.modules, "redis", SimpleNamespace(Redis=FlakyRedis))
+    monkeypatch.setattr(redis_client_module, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    monkeypatch.setattr(redis_client_module, "_redis_client", None)
+    monkeypatch.setattr(redis_client_module, "_redis_retry_at", 0.0)
+
+    assert redis_client_module.get_redis_client() is None
+    FlakyRedis.up = True
+    assert redis_client_module.get_redis_client() is None  # still cooling down
+    assert FlakyRedis.connects == 1
+
+    now[0] += redis_client_module.REDIS_RETRY_SECONDS
+    assert isinstance(redis_client_module.get_redis_client(), FlakyRedis)
+    assert FlakyRedis.connects == 2
+    # Connected: reused without another ping
+    assert redis_client_module.get_redis_client() is redis_client_module.get_redis_client()
+    assert FlakyRedis.connects == 2
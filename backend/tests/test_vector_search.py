@@ -0,0 +1,107 @@
+"""
+Tests for the pgvector query helpers in app.services.vector_search.
+
+A fake session records the statements it is given and answers the
+extension-version lookup.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import List, Optional
+
+import pytest
+
+from app.core.config import settings
+from app.services import vector_search
+from app.services.vector_search import (
+    _parse_version,
+    apply_hnsw_search_hints,
+    to_pgvector_literal,
+)
+
+
+class FakeResult:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar(self):
+        return self.value
+
+
+class FakeSession:
+    def __init__(self, version: Optional[str], fail_on: Optional[str] = None):
+        self.version = version
+        self.fail_on = fail_on
+        self.statements: List[str] = []
+        self.rolled_back_savepoints = 0
+
+    @contextmanager
+    def begin_nested(self):
+        try:
+            yield
+        except Exception:
+            self.rolled_back_savepoints += 1
+            raise
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        if self.fail_on and self.fail_on in sql:
+            raise RuntimeError(f"failed: {sql}")
+        if "pg_extension" in sql:
+            return FakeResult(self.version)
+        self.statements.append(sql)
+        return FakeResult(None)
+
+
+@pytest.fixture(autouse=True)
+def _reset_version_cache(monkeypatch):
+    monkeypatch.setattr(vector_search, "_pgvector_version", None)
+
+
+def test_literal_and_version_parsing():
+    assert to_pgvector_literal([1, 0.5, -2]) == "[1.0,0.5,-2.0]"
+    assert _parse_version("0.8.0") == (0, 8, 0)
+    assert _parse_version("0.5.1-dev") == (0, 5, 1)
+
+
+def test_hints_scale_ef_search_and_enable_iterative_scan():
+    db = FakeSession("0.8.0")
+    apply_hnsw_search_hints(db, 50)
+    assert db.statements == [
+        "SET LOCAL hnsw.ef_search = 200",
+        "SET LOCAL hnsw.iterative_scan = relaxed_order",
+    ]
+
+    db.statements.clear()
+    apply_hnsw_search_hints(db, 5000)
+    assert db.statements[0] == "SET LOCAL hnsw.ef_search = 1000"
+
+
+def test_hints_respect_installed_version():
+    db = FakeSession("0.7.4")
+    apply_hnsw_search_hints(db, 3)
+    assert db.statements == ["SET LOCAL hnsw.ef_search = 40"]
+
+    vector_search._pgvector_version = None
+    db = FakeSession(None)
+    apply_hnsw_search_hints(db, 3)
+    assert db.statements == []
+
+
+def test_ef_search_floor_is_configurable(monkeypatch):
+    monkeypatch.setattr(settings, "VECTOR_SEARCH_EF_SEARCH", 100)
+    db = FakeSession("0.7.0")
+    apply_hnsw_search_hints(db, 5)
+    assert db.statements == ["SET LOCAL hnsw.ef_search = 100"]
+
+
+def test_failures_are_rolled_back_to_a_savepoint():
+    db = FakeSession("0.8.0", fail_on="iterative_scan")
+    apply_hnsw_search_hints(db, 5)
+    assert db.rolled_back_savepoints == 1
+
+    vector_search._pgvector_version = None
+    db = FakeSession("0.8.0", fail_on="pg_extension")
+    assert vector_search.pgvector_version(db) == (0,)
+    assert db.rolled_back_savepoints == 1
@@ -317,7 +317,13 @@ const PaperDiscovery: React.FC<PaperDiscoveryProps> = ({ onAddPaper, onClose, pa
           const jsonStr = line.replace(/^data:\s*/, '')
           try {
             const evt = JSON.parse(jsonStr)
-            if (evt.type === 'final' && Array.isArray(evt.papers)) {
+            if (evt.type === 'partial' && Array.isArray(evt.papers)) {
+              // Provisional results while slower sources and reranking finish;
+              // the final event replaces them. Load-more keeps its current list.
+              if (!append && searchId === currentSearchIdRef.current) {
+                setPapers(evt.papers as DiscoveredPaper[])
+              }
+            } else if (evt.type === 'final' && Array.isArray(evt.papers)) {
               // Ignore if stale
               if (searchId !== currentSearchIdRef.current) return (prev: DiscoveredPaper[]) => prev
 
@@ -338,7 +344,21 @@ const PaperDiscovery: React.FC<PaperDiscoveryProps> = ({ onAddPaper, onClose, pa
               }
               if (searchId === currentSearchIdRef.current) {
                 setSearchTime((Date.now() - startTime) / 1000)
+                // Results are usable now; a pdf_links event may still follow
+                if (append) setIsLoadingMore(false)
+                else setIsSearching(false)
               }
+            } else if (evt.type === 'pdf_links' && Array.isArray(evt.papers)) {
+              // Same papers as the final event, with PDF links resolved in the background
+              if (searchId !== currentSearchIdRef.current) continue
+              const resolved = new Map<string, DiscoveredPaper>()
+              for (const p of evt.papers as DiscoveredPaper[]) resolved.set(p.title + '|' + p.source, p)
+              setPapers(prev => prev.map(p => {
+                const update = resolved.get(p.title + '|' + p.source)
+                return update
+                  ? { ...p, pdf_url: update.pdf_url, open_access_url: update.open_access_url, is_open_access: update.is_open_access }
+                  : p
+              }))
             } else if (evt.type === 'done') {
               if (searchId === currentSearchIdRef.current) {
                 setSearchTime((Date.now() - startTime) / 1000)